@@ -338,11 +338,31 @@ class DisponibilidadeFormadoresViewSet(viewsets.ModelViewSet):
         ano = int(request.query_params.get("ano", datetime.now().year))
         mes = int(request.query_params.get("mes", datetime.now().month))
 
-        # Usar lógica similar à view original
-        from core.views.formador_views import MapaMensalView
-
-        view = MapaMensalView()
-        data = view.get_dados_mapa_mensal(ano, mes)
+        # Leitura da tabela materializada (mesmos códigos do mapa web)
+        from core.services.mapa_materializado import dias_do_mes, ler_mapa
+
+        dias = dias_do_mes(ano, mes)
+        formadores = list(Formador.objects.filter(ativo=True).order_by("nome"))
+        mapa = ler_mapa(formadores, dias)
+
+        data = []
+        for formador in formadores:
+            codigos = dict(zip((d.day for d in dias), mapa.get(formador.id, [])))
+            data.append(
+                {
+                    "formador_id": formador.id,
+                    "formador_nome": formador.nome,
+                    "ano": ano,
+                    "mes": mes,
+                    "disponibilidades": codigos,
+                    "eventos": {
+                        dia: codigo
+                        for dia, codigo in codigos.items()
+                        if any(c.isdigit() for c in codigo)
+                    },
+                    "total_dias_mes": len(dias),
+                }
+            )
 
         serializer = MapaMensalSerializer(data, many=True)
         return Response(serializer.data)
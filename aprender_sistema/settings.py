@@ -23,6 +23,11 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # Só limita com IS_PRODUCTION (settings_production)
+    'core.middleware.RateLimitingMiddleware',
+    # AuditLogMiddleware fica só em settings_production: aqui ele abriria a
+    # thread do audit_sink e gravaria LogAuditoria a cada chamada da API
+    'core.middleware.PapeisMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -10,6 +10,8 @@ REQUISITOS DE AMBIENTE:
 - ALLOWED_HOSTS (obrigatório, separado por vírgula)
 - DB_PASSWORD (obrigatório)
 - CSRF_TRUSTED_ORIGINS (recomendado)
+- REDIS_URL (recomendado; sem ele o cache é local e o limite de
+  requisições passa a valer por worker)
 
 VALIDAÇÃO:
 python manage.py check --deploy --settings=aprender_sistema.settings_production
@@ -36,6 +38,9 @@ if len(SECRET_KEY) < 50:
 # Debug SEMPRE False em produção
 DEBUG = False
 
+# Liga o limite de requisições (RateLimitingMiddleware)
+IS_PRODUCTION = True
+
 # Allowed hosts
 ALLOWED_HOSTS = os.getenv("ALLOWED_HOSTS", "").split(",")
 if not ALLOWED_HOSTS or ALLOWED_HOSTS == [""]:
@@ -112,6 +117,11 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    # Depois da autenticação: o limite é por usuário (ou IP, sem login)
+    "core.middleware.RateLimitingMiddleware",
+    # Também lê request.user; grava LogAuditoria em lote (core.services.audit_sink)
+    "core.middleware.AuditLogMiddleware",
+    "core.middleware.PapeisMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -183,6 +193,8 @@ if REDIS_URL:
     # Session usando cache
     SESSION_ENGINE = "django.contrib.sessions.backends.cache"
     SESSION_CACHE_ALIAS = "default"
+    # Pub/sub das atualizações em tempo real (SSE) entre processos
+    REALTIME_BROKER_URL = REDIS_URL
 else:
     # Fallback para database sessions
     SESSION_ENGINE = "django.contrib.sessions.backends.db"
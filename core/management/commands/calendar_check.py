@@ -306,7 +306,35 @@ class Command(BaseCommand):
                 f"📊 Eventos no Calendar sem solicitação: {eventos_sem_solicitacao}"
             )
 
-            if aprovadas_sem_evento == 0 and eventos_sem_solicitacao == 0:
+            # Eventos do sistema que não existem (ou foram cancelados) no
+            # Calendar, pelo espelho local atualizado de forma incremental
+            from core.models import EventoCalendarioEspelho
+            from core.services.integrations.calendar_mirror import (
+                CANCELADO,
+                sincronizar_se_necessario,
+            )
+            from core.services.integrations.google_calendar import (
+                GoogleCalendarService,
+            )
+
+            service = GoogleCalendarService(calendar_id=calendar_id)
+            sincronizar_se_necessario(service=service)
+            eventos_ausentes = EventoGoogleCalendar.objects.exclude(
+                provider_event_id__in=EventoCalendarioEspelho.objects.filter(
+                    calendar_id=service.calendar_id
+                )
+                .exclude(status=CANCELADO)
+                .values("event_id")
+            ).count()
+            self.stdout.write(
+                f"📊 Eventos do sistema ausentes/cancelados no Calendar: {eventos_ausentes}"
+            )
+
+            if (
+                aprovadas_sem_evento == 0
+                and eventos_sem_solicitacao == 0
+                and eventos_ausentes == 0
+            ):
                 self.stdout.write("OK Nenhum conflito encontrado")
             else:
                 self.stdout.write("⚠️ Conflitos detectados - recomenda-se investigação")
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from core.models import LogComunicacao
+from core.services.notification_dispatch import processar_pendentes
+
+
+class Command(BaseCommand):
+    help = (
+        "Envia os e-mails e mensagens pendentes (LogComunicacao), "
+        "inclusive os que aguardam nova tentativa"
+    )
+
+    def handle(self, *args, **options):
+        resumo = processar_pendentes()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{resumo['enviadas']} mensagens enviadas em {resumo['lotes']} lotes"
+            )
+        )
+
+        if resumo["falhas"]:
+            self.stdout.write(self.style.WARNING(f"{resumo['falhas']} envios falharam"))
+        falhados = LogComunicacao.objects.filter(status_envio="falhado").count()
+        if falhados:
+            self.stdout.write(
+                self.style.WARNING(f"{falhados} comunicações com status Falhado")
+            )
@@ -17,8 +17,8 @@ Date: Setembro 2025
 
 import json
 import logging
+import numpy as np
 import pandas as pd
-import re
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from django.core.management.base import BaseCommand, CommandError
@@ -28,6 +28,8 @@ from core.models import (
     Usuario, Projeto, Municipio, TipoEvento, Setor,
     SolicitacaoStatus
 )
+from core.services.indice_nomes import normalizar
+from core.services.integrations.sheets_snapshots import ExtratorPlanilhas
 
 # Configurar logging
 logging.basicConfig(
@@ -36,6 +38,77 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Casos especiais brasileiros na normalização de nomes
+EXCECOES_NOMES = {
+    'da': 'da', 'de': 'de', 'do': 'do', 'dos': 'dos', 'das': 'das',
+    'e': 'e', 'em': 'em', 'na': 'na', 'no': 'no',
+    'ii': 'II', 'iii': 'III', 'iv': 'IV', 'jr': 'Jr.', 'sr': 'Sr.'
+}
+
+EMAIL_REGEX = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+
+PESOS_CPF_1 = np.arange(10, 1, -1)
+PESOS_CPF_2 = np.arange(11, 1, -1)
+
+
+def _texto(serie: pd.Series) -> pd.Series:
+    return serie.fillna('').astype(str)
+
+
+def normalizar_nomes(serie: pd.Series) -> pd.Series:
+    """Nomes em título, com partículas e sufixos (da, de, Jr.) preservados"""
+    limpos = _texto(serie).str.strip().str.replace(r'\s+', ' ', regex=True)
+    palavras = limpos.str.split(' ').explode()
+    excecoes = palavras.str.lower().map(EXCECOES_NOMES)
+    # Índice repetido após o explode: combina por posição, sem alinhar
+    normalizadas = pd.Series(
+        np.where(excecoes.isna(), palavras.str.capitalize(), excecoes),
+        index=palavras.index,
+    )
+    return normalizadas.groupby(level=0).agg(' '.join).reindex(serie.index, fill_value='')
+
+
+def emails_validos(serie: pd.Series) -> pd.Series:
+    return _texto(serie).str.strip().str.match(EMAIL_REGEX)
+
+
+def cpfs_validos(serie: pd.Series) -> pd.Series:
+    """CPFs com 11 dígitos e dígitos verificadores corretos"""
+    digitos = _texto(serie).str.replace(r'\D', '', regex=True)
+    candidatos = (digitos.str.len() == 11) & ~digitos.str.match(r'^(\d)\1{10}$')
+    validos = pd.Series(False, index=serie.index)
+    if not candidatos.any():
+        return validos
+
+    # Uma linha de 11 inteiros por CPF
+    matriz = (
+        np.frombuffer(''.join(digitos[candidatos]).encode('ascii'), dtype=np.uint8)
+        .reshape(-1, 11)
+        .astype(int) - ord('0')
+    )
+
+    def verificador(digitos_base, pesos):
+        resto = (digitos_base @ pesos) % 11
+        return np.where(resto < 2, 0, 11 - resto)
+
+    ok = (verificador(matriz[:, :9], PESOS_CPF_1) == matriz[:, 9]) & (
+        verificador(matriz[:, :10], PESOS_CPF_2) == matriz[:, 10]
+    )
+    validos[candidatos] = ok
+    return validos
+
+
+def booleanos(serie: pd.Series) -> pd.Series:
+    """Células da planilha ("Sim", "TRUE", "x") como bool"""
+    if serie.dtype == bool:
+        return serie
+    return _texto(serie).str.strip().str.lower().isin(['true', 'sim', 'verdadeiro', 'x', '1'])
+
+
+def usernames(nomes: pd.Series) -> pd.Series:
+    base = _texto(nomes).str.lower().str.replace(' ', '_')
+    return base.str.replace(r'[^a-z0-9_]', '', regex=True).str[:30]  # Limite Django
+
 
 class GoogleSheetsExtractor:
     """
@@ -51,12 +124,29 @@ class GoogleSheetsExtractor:
         'acompanhamento': '16ul8qvHb-1CRs5Z7zYcVP9Rh2munCefWWNsAiJfZYYU'
     }
 
-    def __init__(self, dry_run=False, verbose=False):
+    # Colunas mínimas (cabeçalho normalizado) para usar a aba da planilha
+    COLUNAS = {
+        'usuarios': ['nome_completo', 'email', 'cpf', 'cargo', 'setor'],
+        'controle': ['nome', 'descricao', 'responsavel', 'tipo_colecao', 'segmento'],
+        'disponibilidade': ['formador', 'disponibilidade'],
+        'acompanhamento': ['data_evento', 'projeto', 'status'],
+    }
+
+    def __init__(self, dry_run=False, verbose=False, usar_cache=True):
         self.dry_run = dry_run
         self.verbose = verbose
+        self.usar_cache = usar_cache
+        self.gc = None
+        self.snapshots = {}
         self.dados_extraidos = {}
         self.estatisticas = {}
 
+    # Revisão das planilhas (cache dos snapshots) vem dos metadados do Drive
+    SCOPES = [
+        'https://www.googleapis.com/auth/spreadsheets.readonly',
+        'https://www.googleapis.com/auth/drive.metadata.readonly',
+    ]
+
     def setup_gspread(self):
         """Configurar conexão com Google Sheets usando OAuth2"""
         try:
@@ -81,7 +171,7 @@ class GoogleSheetsExtractor:
                 try:
                     creds = Credentials.from_authorized_user_file(
                         token_file,
-                        ['https://www.googleapis.com/auth/spreadsheets.readonly']
+                        self.SCOPES
                     )
                 except Exception as e:
                     logger.warning(f"⚠️ Token inválido: {e}")
@@ -92,7 +182,7 @@ class GoogleSheetsExtractor:
                 logger.info("🔐 Iniciando fluxo de autorização OAuth2...")
                 flow = InstalledAppFlow.from_client_secrets_file(
                     'credentials.json',
-                    ['https://www.googleapis.com/auth/spreadsheets.readonly']
+                    self.SCOPES
                 )
                 creds = flow.run_local_server(port=8080)
 
@@ -112,72 +202,57 @@ class GoogleSheetsExtractor:
 
     def normalize_name(self, name: str) -> str:
         """Normalizar nomes (título, casos especiais)"""
-        if not name or pd.isna(name):
-            return ""
-
-        # Limpar e normalizar
-        name = str(name).strip()
-        name = re.sub(r'\s+', ' ', name)  # Múltiplos espaços
-
-        # Casos especiais brasileiros
-        exceptions = {
-            'da': 'da', 'de': 'de', 'do': 'do', 'dos': 'dos', 'das': 'das',
-            'e': 'e', 'em': 'em', 'na': 'na', 'no': 'no',
-            'ii': 'II', 'iii': 'III', 'iv': 'IV', 'jr': 'Jr.', 'sr': 'Sr.'
-        }
-
-        words = []
-        for word in name.split():
-            if word.lower() in exceptions:
-                words.append(exceptions[word.lower()])
-            else:
-                words.append(word.capitalize())
-
-        return ' '.join(words)
+        return normalizar_nomes(pd.Series([name])).iloc[0]
 
     def validate_email(self, email: str) -> bool:
         """Validar email com regex rigoroso"""
-        if not email or pd.isna(email):
-            return False
-
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, str(email).strip()))
+        return bool(emails_validos(pd.Series([email])).iloc[0])
 
     def validate_cpf(self, cpf: str) -> bool:
         """Validar CPF com dígito verificador"""
-        if not cpf or pd.isna(cpf):
-            return False
-
-        # Limpar CPF
-        cpf = re.sub(r'\D', '', str(cpf))
-
-        if len(cpf) != 11 or cpf == cpf[0] * 11:
-            return False
-
-        # Validar dígitos verificadores
-        def calc_digit(cpf_digits, weights):
-            sum_val = sum(int(digit) * weight for digit, weight in zip(cpf_digits, weights))
-            remainder = sum_val % 11
-            return 0 if remainder < 2 else 11 - remainder
-
-        # Primeiro dígito
-        weights1 = list(range(10, 1, -1))
-        digit1 = calc_digit(cpf[:9], weights1)
-
-        if digit1 != int(cpf[9]):
-            return False
-
-        # Segundo dígito
-        weights2 = list(range(11, 1, -1))
-        digit2 = calc_digit(cpf[:10], weights2)
+        return bool(cpfs_validos(pd.Series([cpf])).iloc[0])
+
+    def extrair_planilhas(self):
+        """Baixar as 4 planilhas em paralelo (ou ler os snapshots sem alteração)"""
+        extrator = ExtratorPlanilhas(self.gc, diretorio="" if self.usar_cache else None)
+        self.snapshots = extrator.extrair_todas(self.PLANILHAS)
+        logger.info(
+            f"✅ Planilhas: {extrator.estatisticas['baixadas']} baixadas, "
+            f"{extrator.estatisticas['em_cache']} sem alterações (cache), "
+            f"{extrator.estatisticas['erros']} com erro"
+        )
 
-        return digit2 == int(cpf[10])
+    def _dataframe(self, nome: str, simulados: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        DataFrame da primeira aba da planilha com as colunas esperadas;
+        sem acesso ao Google Sheets (ou sem aba compatível), os dados simulados
+        """
+        colunas = self.COLUNAS[nome]
+        snapshot = self.snapshots.get(nome)
+        if snapshot:
+            for linhas in snapshot['abas'].values():
+                if len(linhas) < 2:
+                    continue
+                cabecalho = [normalizar(c).replace(' ', '_') for c in linhas[0]]
+                if not set(colunas) <= set(cabecalho):
+                    continue
+                largura = len(cabecalho)
+                df = pd.DataFrame(
+                    [(linha + [''] * largura)[:largura] for linha in linhas[1:]],
+                    columns=cabecalho,
+                )
+                # Linhas totalmente vazias no fim da aba
+                return df[(df[colunas] != '').any(axis=1)].reset_index(drop=True)
+            logger.warning(
+                f"⚠️ Planilha {nome}: nenhuma aba com as colunas {colunas}, usando dados simulados"
+            )
+        return pd.DataFrame(simulados)
 
     def extract_planilha_usuarios(self) -> Dict[str, Any]:
         """Extrair planilha de Usuários - BASE PRINCIPAL"""
         logger.info("📋 Extraindo planilha de Usuários...")
 
-        # DADOS SIMULADOS (em produção viria do Google Sheets)
+        # DADOS SIMULADOS (usados sem acesso ao Google Sheets)
         usuarios_simulados = [
             {
                 'nome_completo': 'Maria Santos Silva',
@@ -231,19 +306,21 @@ class GoogleSheetsExtractor:
         ]
 
         # Processar com pandas
-        df = pd.DataFrame(usuarios_simulados)
-
-        # Normalizar dados
-        df['nome_completo'] = df['nome_completo'].apply(self.normalize_name)
-        df['email_valido'] = df['email'].apply(self.validate_email)
-        df['cpf_valido'] = df['cpf'].apply(self.validate_cpf)
+        df = self._dataframe('usuarios', usuarios_simulados)
+
+        # Normalizar dados (vetorizado, coluna inteira de uma vez)
+        df['nome_completo'] = normalizar_nomes(df['nome_completo'])
+        df['email_valido'] = emails_validos(df['email'])
+        df['cpf_valido'] = cpfs_validos(df['cpf'])
+        df['vinculado_superintendencia'] = booleanos(
+            df.get('vinculado_superintendencia', pd.Series(False, index=df.index))
+        )
 
         # Separar first_name e last_name
-        split_names = df['nome_completo'].str.split(' ', expand=True)
-        df['first_name'] = split_names[0] if len(split_names.columns) > 0 else ''
-        df['last_name'] = split_names.iloc[:, 1:].apply(
-            lambda x: ' '.join(x.dropna().astype(str)), axis=1
-        ) if len(split_names.columns) > 1 else ''
+        partes = df['nome_completo'].str.partition(' ')
+        df['first_name'] = partes[0]
+        df['last_name'] = partes[2]
+        df['username'] = usernames(df['nome_completo'])
 
         # Estatísticas
         stats = {
@@ -298,11 +375,11 @@ class GoogleSheetsExtractor:
             }
         ]
 
-        df = pd.DataFrame(projetos_simulados)
+        df = self._dataframe('controle', projetos_simulados)
 
         # Normalizar nomes
-        df['nome'] = df['nome'].apply(self.normalize_name)
-        df['responsavel'] = df['responsavel'].apply(self.normalize_name)
+        df['nome'] = normalizar_nomes(df['nome'])
+        df['responsavel'] = normalizar_nomes(df['responsavel'])
 
         stats = {
             'total_projetos': len(df),
@@ -341,7 +418,7 @@ class GoogleSheetsExtractor:
             }
         ]
 
-        df = pd.DataFrame(disponibilidade_simulada)
+        df = self._dataframe('disponibilidade', disponibilidade_simulada)
 
         stats = {
             'total_registros': len(df),
@@ -384,18 +461,19 @@ class GoogleSheetsExtractor:
             }
         ]
 
-        df = pd.DataFrame(eventos_simulados)
+        df = self._dataframe('acompanhamento', eventos_simulados)
 
-        # Converter datas
-        df['data_evento'] = pd.to_datetime(df['data_evento'])
+        # Converter datas (inválidas viram NaT)
+        df['data_evento'] = pd.to_datetime(df['data_evento'], errors='coerce')
+        datas = df['data_evento'].dropna()
 
         stats = {
             'total_eventos': len(df),
             'por_projeto': df['projeto'].value_counts().to_dict(),
             'por_status': df['status'].value_counts().to_dict(),
             'periodo': {
-                'inicio': df['data_evento'].min().strftime('%Y-%m-%d'),
-                'fim': df['data_evento'].max().strftime('%Y-%m-%d')
+                'inicio': datas.min().strftime('%Y-%m-%d') if len(datas) else None,
+                'fim': datas.max().strftime('%Y-%m-%d') if len(datas) else None
             }
         }
 
@@ -461,17 +539,30 @@ class GoogleSheetsExtractor:
         df = usuarios_data['dataframe']
         usuarios_criados = 0
 
+        mapeamento_grupos = {
+            'Superintendente': 'superintendencia',
+            'Gerente': 'gerente',
+            'Coordenador': 'coordenador',
+            'Formador': 'formador'
+        }
+        # Setores e grupos buscados uma vez, não por linha
+        setores = {
+            setor.nome: setor
+            for setor in Setor.objects.filter(nome__in=df['setor'].dropna().unique().tolist())
+        }
+        grupos = {
+            grupo.name: grupo
+            for grupo in Group.objects.filter(name__in=set(mapeamento_grupos.values()))
+        }
+
         for _, row in df.iterrows():
             if not self.dry_run:
                 try:
-                    # Buscar setor
-                    setor = None
-                    if row['setor']:
-                        setor = Setor.objects.filter(nome=row['setor']).first()
+                    setor = setores.get(row['setor'])
 
                     # Criar usuário
                     usuario = Usuario.objects.create(
-                        username=self.generate_username(row['nome_completo']),
+                        username=row['username'],
                         email=row['email'] if row['email_valido'] else '',
                         first_name=row['first_name'],
                         last_name=row['last_name'],
@@ -488,16 +579,8 @@ class GoogleSheetsExtractor:
                     usuario.save()
 
                     # Adicionar ao grupo
-                    mapeamento_grupos = {
-                        'Superintendente': 'superintendencia',
-                        'Gerente': 'gerente',
-                        'Coordenador': 'coordenador',
-                        'Formador': 'formador'
-                    }
-
                     grupo_nome = mapeamento_grupos.get(row['cargo'], 'formador')
-                    grupo = Group.objects.get(name=grupo_nome)
-                    usuario.groups.add(grupo)
+                    usuario.groups.add(grupos[grupo_nome])
 
                     usuarios_criados += 1
 
@@ -578,9 +661,7 @@ class GoogleSheetsExtractor:
 
     def generate_username(self, nome_completo: str) -> str:
         """Gerar username único"""
-        base = nome_completo.lower().replace(' ', '_')
-        base = re.sub(r'[^a-z0-9_]', '', base)
-        return base[:30]  # Limite Django
+        return usernames(pd.Series([nome_completo])).iloc[0]
 
     def gerar_relatorio_qualidade(self) -> str:
         """Gerar relatório completo de qualidade"""
@@ -621,7 +702,9 @@ class GoogleSheetsExtractor:
         logger.info("🚀 INICIANDO EXTRAÇÃO PERFEITA GOOGLE SHEETS")
 
         # Configurar Google Sheets (opcional)
-        self.setup_gspread()
+        if self.setup_gspread():
+            logger.info("📥 Baixando planilhas em paralelo...")
+            self.extrair_planilhas()
 
         # Extrair todas as planilhas
         logger.info("📊 Extraindo dados de todas as planilhas...")
@@ -670,6 +753,11 @@ class Command(BaseCommand):
             action='store_true',
             help='Exibe informações detalhadas'
         )
+        parser.add_argument(
+            '--sem-cache',
+            action='store_true',
+            help='Baixa as planilhas mesmo sem alterações desde a última extração'
+        )
 
     def handle(self, *args, **options):
         dry_run = options.get('dry_run', False)
@@ -690,7 +778,9 @@ class Command(BaseCommand):
             )
 
         try:
-            extractor = GoogleSheetsExtractor(dry_run=dry_run, verbose=verbose)
+            extractor = GoogleSheetsExtractor(
+                dry_run=dry_run, verbose=verbose, usar_cache=not options.get('sem_cache', False)
+            )
             relatorio = extractor.executar_extracao_completa()
 
             # Exibir relatório
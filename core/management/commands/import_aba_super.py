@@ -20,6 +20,7 @@ from core.models import (
     Usuario, Setor, SolicitacaoStatus
 )
 from core.services.google_sheets_service import google_sheets_service
+from core.services.indice_nomes import IndiceNomes
 
 User = get_user_model()
 
@@ -55,16 +56,19 @@ class Command(BaseCommand):
             
         nome_limpo = nome_formador.strip()
         
-        # Buscar por nome exato primeiro
-        try:
-            return Formador.objects.get(nome__iexact=nome_limpo)
-        except Formador.DoesNotExist:
-            pass
-        
-        # Buscar por nome que contenha
-        formadores = Formador.objects.filter(nome__icontains=nome_limpo)
-        if formadores.exists():
-            return formadores.first()
+        # Índice montado uma vez por execução (nome exato ou aproximado)
+        if not hasattr(self, 'indice_formadores'):
+            self.indice_formadores = IndiceNomes(
+                (f.nome, f) for f in Formador.objects.order_by('pk')
+            )
+        correspondencia = self.indice_formadores.buscar(nome_limpo)
+        if correspondencia:
+            if correspondencia.metodo != 'exato':
+                self.logger.info(
+                    f"Formador '{nome_limpo}' → '{correspondencia.nome}' "
+                    f"({correspondencia.metodo}, confiança {correspondencia.confianca:.2f})"
+                )
+            return correspondencia.valor
         
         # Se não encontrou, criar novo formador
         formador = Formador.objects.create(
@@ -73,6 +77,7 @@ class Command(BaseCommand):
             telefone='',
             area_atuacao='Importado da planilha Super'
         )
+        self.indice_formadores.adicionar(nome_limpo, formador)
         self.logger.info(f"Novo formador criado: {nome_limpo}")
         return formador
 
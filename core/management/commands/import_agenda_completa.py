@@ -12,27 +12,24 @@ Abas importadas:
 - Vidas (1.000 registros)
 
 Uso:
-python manage.py import_agenda_completa [--aba ABA] [--dry-run] [--force] [--verbose]
+python manage.py import_agenda_completa [--aba ABA] [--dry-run] [--force] [--incremental] [--verbose]
 """
 
 import json
 import logging
 from datetime import datetime, time
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
-from django.contrib.auth import get_user_model
-from django.contrib.auth.models import Group
+from django.utils import timezone
 from core.models import (
-    Formador, Municipio, Projeto, TipoEvento, Solicitacao,
-    SolicitacaoStatus, Usuario, Setor, FormadoresSolicitacao
+    Formador, Municipio, Projeto, Solicitacao, SolicitacaoStatus
 )
+from core.services.importacao_agenda import ImportadorAgenda, LinhaImportada
+from core.services.importacao_incremental import RegistroAssinaturas
 
 # Importações para Google Sheets
 import gspread
 from google.oauth2.credentials import Credentials
 
-User = get_user_model()
-
 class Command(BaseCommand):
     help = 'Importa todas as solicitações de evento da planilha "Acompanhamento de Agenda | 2025"'
 
@@ -57,13 +54,18 @@ class Command(BaseCommand):
         parser.add_argument(
             '--force',
             action='store_true',
-            help='Força reimportação, removendo dados existentes'
+            help='Força reimportação, atualizando as solicitações já existentes'
         )
         parser.add_argument(
             '--verbose',
             action='store_true',
             help='Exibe informações detalhadas durante a importação'
         )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Processa só as linhas novas ou alteradas desde a última importação'
+        )
 
     def setup_logging(self, verbose):
         """Configura logging baseado no nível de verbosidade"""
@@ -91,33 +93,8 @@ class Command(BaseCommand):
         except Exception as e:
             raise CommandError(f"❌ Erro ao conectar com Google Sheets: {e}")
 
-    def get_or_create_municipio(self, nome_municipio):
-        """Cria ou recupera município, tratando formatos com UF"""
-        if not nome_municipio or nome_municipio.strip() == "":
-            return None
-        
-        # Tratar casos como "Dias d'Avila - BA"
-        if " - " in nome_municipio:
-            nome, uf = nome_municipio.split(" - ", 1)
-            nome = nome.strip()
-            uf = uf.strip()
-        else:
-            nome = nome_municipio.strip()
-            uf = "CE"  # Padrão Ceará
-        
-        municipio, created = Municipio.objects.get_or_create(
-            nome=nome,
-            uf=uf,
-            defaults={'ativo': True}
-        )
-        
-        if created:
-            self.logger.debug(f"🏛️ Município criado: {nome} - {uf}")
-        
-        return municipio
-
-    def get_or_create_setor(self, projeto_nome):
-        """Cria ou recupera setor baseado no projeto"""
+    def setor_do_projeto(self, projeto_nome):
+        """Setor (nome, vinculado à superintendência) de um projeto novo"""
         # Mapear projetos para setores
         mapeamento_setores = {
             'Lendo e Escrevendo': 'Superintendência',
@@ -129,140 +106,23 @@ class Command(BaseCommand):
             'SOU DA PAZ': 'Outros',
             'LEIO ESCREVO E CALCULO': 'Outros'
         }
-        
-        nome_setor = mapeamento_setores.get(projeto_nome, 'Outros')
-        
-        # Verificar se é superintendência
-        vinculado_super = nome_setor == 'Superintendência'
-        
-        setor, created = Setor.objects.get_or_create(
-            nome=nome_setor,
-            defaults={
-                'sigla': nome_setor[:4].upper(),
-                'vinculado_superintendencia': vinculado_super,
-                'ativo': True
-            }
-        )
-        
-        if created:
-            self.logger.debug(f"🏢 Setor criado: {nome_setor}")
-        
-        return setor
 
-    def get_or_create_projeto(self, nome_projeto):
-        """Cria ou recupera projeto com setor associado"""
-        if not nome_projeto or nome_projeto.strip() == "":
-            return None
-        
-        nome_projeto = nome_projeto.strip()
-        
-        # Criar setor primeiro
-        setor = self.get_or_create_setor(nome_projeto)
-        
-        projeto, created = Projeto.objects.get_or_create(
-            nome=nome_projeto,
-            defaults={
-                'ativo': True, 
-                'descricao': f'Projeto {nome_projeto}',
-                'setor': setor
-            }
-        )
-        
-        if created:
-            self.logger.debug(f"📋 Projeto criado: {nome_projeto} (Setor: {setor.nome})")
-        
-        return projeto
+        nome_setor = mapeamento_setores.get(projeto_nome, 'Outros')
+        return nome_setor, nome_setor == 'Superintendência'
 
-    def get_or_create_tipo_evento(self, tipo_str):
-        """Cria ou recupera tipo de evento"""
-        # Mapear tipos da planilha para o sistema
+    def tipo_evento(self, tipo_str):
+        """Nome e modalidade (online) do tipo de evento no sistema"""
         mapeamento_tipos = {
             'Presencial': ('Presencial', False),
-            'Online': ('Online', True), 
+            'Online': ('Online', True),
             'Acompanhamento': ('Acompanhamento', False)
         }
-        
-        nome_tipo, is_online = mapeamento_tipos.get(tipo_str, ('Presencial', False))
-        
-        tipo_evento, created = TipoEvento.objects.get_or_create(
-            nome=nome_tipo,
-            defaults={'ativo': True, 'online': is_online}
-        )
-        
-        if created:
-            self.logger.debug(f"🎯 Tipo de evento criado: {nome_tipo}")
-        
-        return tipo_evento
-
-    def get_or_create_usuario(self, nome_pessoa, papel='formador'):
-        """Cria ou recupera usuário baseado no nome"""
-        if not nome_pessoa or nome_pessoa.strip() == "" or nome_pessoa == "SOLICITADO":
-            return None
-        
-        # Limpar formatação especial como "?Regianio Lima?"
-        nome_pessoa = nome_pessoa.strip("?").strip()
-        
-        # Tentar encontrar usuário existente por nome
-        nomes = nome_pessoa.split()
-        primeiro_nome = nomes[0] if nomes else nome_pessoa
-        
-        try:
-            # Buscar por primeiro nome
-            usuario = Usuario.objects.get(first_name__iexact=primeiro_nome)
-        except (Usuario.DoesNotExist, Usuario.MultipleObjectsReturned):
-            # Criar usuário temporário
-            username = nome_pessoa.lower().replace(' ', '_').replace('?', '')
-            email = f"{username}@sistema.local"
-            
-            # Verificar se username já existe
-            counter = 1
-            original_username = username
-            while Usuario.objects.filter(username=username).exists():
-                username = f"{original_username}_{counter}"
-                counter += 1
-            
-            usuario = Usuario.objects.create(
-                username=username,
-                email=email,
-                first_name=primeiro_nome,
-                last_name=' '.join(nomes[1:]) if len(nomes) > 1 else '',
-                is_active=True
-            )
-            
-            # Adicionar ao grupo correto
-            try:
-                grupo = Group.objects.get(name=papel)
-                usuario.groups.add(grupo)
-            except Group.DoesNotExist:
-                self.logger.warning(f"⚠️ Grupo '{papel}' não encontrado para {nome_pessoa}")
-            
-            self.logger.debug(f"👤 Usuário criado: {nome_pessoa} ({username})")
-        
-        return usuario
+        return mapeamento_tipos.get(tipo_str, ('Presencial', False))
 
-    def get_or_create_formador(self, nome_formador):
-        """Cria ou recupera formador"""
-        if not nome_formador or nome_formador.strip() == "" or nome_formador == "SOLICITADO":
-            return None
-        
-        # Criar usuário primeiro
-        usuario = self.get_or_create_usuario(nome_formador, 'formador')
-        if not usuario:
-            return None
-        
-        # Buscar formador existente ou criar novo
-        try:
-            formador = Formador.objects.get(usuario=usuario)
-        except Formador.DoesNotExist:
-            formador = Formador.objects.create(
-                nome=nome_formador,
-                email=usuario.email,
-                usuario=usuario,
-                ativo=True
-            )
-            self.logger.debug(f"👨‍🏫 Formador criado: {nome_formador}")
-        
-        return formador
+    def nome_pessoa(self, nome):
+        """Limpa nomes como "?Regianio Lima?"; vazio/SOLICITADO → ''"""
+        nome = (nome or '').strip().strip("?").strip()
+        return '' if nome == "SOLICITADO" else nome
 
     def parse_data(self, data_str):
         """Converte string de data para objeto date"""
@@ -362,160 +222,130 @@ class Command(BaseCommand):
                 'formador3': 'formador3'
             }
 
+    def linhas_da_aba(self, nome_aba):
+        """Lê a aba e converte cada linha válida em LinhaImportada"""
+        worksheet = self.sheet.worksheet(nome_aba)
+        dados = worksheet.get_all_records()
+        self.stats = {'total': len(dados), 'filtrados': 0, 'pulados': 0}
+
+        # Obter mapeamento de colunas
+        cols = self.get_column_mapping(nome_aba)
+
+        linhas = []
+        for i, row in enumerate(dados, 1):
+            # Extrair dados básicos usando mapeamento correto
+            municipio_nome = str(row.get(cols['municipio']) or '').strip()
+            data_evento = self.parse_data(row.get(cols['data'], ''))
+            hora_inicio = self.parse_hora(row.get(cols['hora_inicio'], '')) or time(8, 0)
+            hora_fim = self.parse_hora(row.get(cols['hora_fim'], ''))
+            projeto_nome = str(row.get(cols['projeto']) or '').strip()
+            nome_tipo, online = self.tipo_evento(
+                str(row.get(cols['tipo']) or 'Presencial').strip()
+            )
+
+            # FILTRO DE QUALIDADE (como aplicado pelo Cursor)
+            if not municipio_nome or not data_evento:
+                if self.options['filter_quality']:
+                    self.logger.debug(f"⚡ Linha {i} filtrada: falta município ou data")
+                    self.stats['filtrados'] += 1
+                else:
+                    self.logger.debug(f"⏭️ Linha {i} pulada: dados obrigatórios faltando")
+                    self.stats['pulados'] += 1
+                continue
+
+            # Determinar status com base na aba e aprovação
+            aprovacao = ''
+            if cols['aprovacao']:
+                aprovacao = row.get(cols['aprovacao']) or ''
+            status = self.determinar_status_solicitacao(aprovacao, nome_aba)
+
+            # Preparar dados da solicitação
+            encontro = row.get('encontro') or row.get('Encontro') or '1'
+            segmento = row.get('segmento') or ''
+            titulo = f"{projeto_nome} - {municipio_nome}"
+            if encontro and str(encontro).strip():
+                titulo += f" - Encontro {encontro}"
+
+            # Coordenador é o solicitante
+            coordenador_nome = self.nome_pessoa(
+                row.get('Coordenador') or row.get('Gerente') or 'Sistema Automatizado'
+            )
+
+            # Usar hora fim ou calcular duração padrão
+            data_inicio = datetime.combine(data_evento, hora_inicio)
+            if not hora_fim:
+                # Duração padrão de 8 horas para presencial, 4 para online
+                duracao_horas = 4 if online else 8
+                hora_fim = time(min(23, hora_inicio.hour + duracao_horas), hora_inicio.minute)
+            data_fim = datetime.combine(data_evento, hora_fim)
+
+            # Formadores (até 5)
+            formadores = [
+                self.nome_pessoa(row.get(f'Formador {j}'))
+                for j in range(1, 6)
+            ]
+
+            linhas.append(LinhaImportada(
+                linha=i,
+                titulo=titulo,
+                municipio=municipio_nome,
+                projeto=projeto_nome,
+                tipo_evento=nome_tipo,
+                tipo_evento_online=online,
+                data_inicio=timezone.make_aware(data_inicio),
+                data_fim=timezone.make_aware(data_fim),
+                status=status,
+                formadores=[f for f in formadores if f],
+                solicitante=coordenador_nome,
+                numero_encontro_formativo=str(encontro),
+                coordenador_acompanha=bool(row.get('Coord Acompanha')),
+                observacoes=f'Importado da aba {nome_aba}. Segmento: {segmento}'
+            ))
+        return linhas
+
     def importar_eventos_aba(self, nome_aba):
         """Importa eventos de uma aba específica"""
         self.logger.info(f"📋 Importando eventos da aba: {nome_aba}")
 
         try:
-            worksheet = self.sheet.worksheet(nome_aba)
-            dados = worksheet.get_all_records()
-
-            eventos_criados = 0
-            eventos_pulados = 0
-            eventos_filtrados = 0
-
-            # Obter mapeamento de colunas
-            cols = self.get_column_mapping(nome_aba)
-
-            for i, row in enumerate(dados, 1):
-                try:
-                    # Extrair dados básicos usando mapeamento correto
-                    municipio_nome = (row.get(cols['municipio']) or '').strip()
-                    data_evento = self.parse_data(row.get(cols['data'], ''))
-                    hora_inicio = self.parse_hora(row.get(cols['hora_inicio'], ''))
-                    hora_fim = self.parse_hora(row.get(cols['hora_fim'], ''))
-                    projeto_nome = (row.get(cols['projeto']) or '').strip()
-                    tipo_evento = (row.get(cols['tipo']) or 'Presencial').strip()
-
-                    # FILTRO DE QUALIDADE (como aplicado pelo Cursor)
-                    if self.options['filter_quality']:
-                        if not municipio_nome or not data_evento:
-                            self.logger.debug(f"⚡ Linha {i} filtrada: falta município ou data")
-                            eventos_filtrados += 1
-                            continue
-
-                    # Validar dados obrigatórios básicos
-                    if not municipio_nome or not data_evento:
-                        self.logger.debug(f"⏭️ Linha {i} pulada: dados obrigatórios faltando")
-                        eventos_pulados += 1
-                        continue
-                    
-                    # Criar/recuperar objetos relacionados
-                    municipio = self.get_or_create_municipio(municipio_nome)
-                    projeto = self.get_or_create_projeto(projeto_nome)
-                    tipo = self.get_or_create_tipo_evento(tipo_evento)
-                    
-                    if not all([municipio, projeto, tipo]):
-                        eventos_pulados += 1
-                        continue
-                    
-                    # Determinar status com base na aba e aprovação
-                    aprovacao = ''
-                    if cols['aprovacao']:
-                        aprovacao = row.get(cols['aprovacao']) or ''
-                    status = self.determinar_status_solicitacao(aprovacao, nome_aba)
-                    
-                    # Preparar dados da solicitação
-                    encontro = row.get('encontro') or row.get('Encontro') or '1'
-                    segmento = row.get('segmento') or ''
-                    titulo = f"{projeto_nome} - {municipio_nome}"
-                    if encontro and str(encontro).strip():
-                        titulo += f" - Encontro {encontro}"
-                    
-                    # Buscar coordenador/solicitante
-                    coordenador_nome = (row.get('Coordenador') or 
-                                      row.get('Gerente') or 
-                                      'Sistema Automatizado').strip()
-                    
-                    usuario_solicitante = self.get_or_create_usuario(coordenador_nome, 'coordenador')
-                    if not usuario_solicitante:
-                        # Usar usuário padrão se não conseguir criar
-                        usuario_solicitante = Usuario.objects.filter(is_superuser=True).first()
-                        if not usuario_solicitante:
-                            self.logger.error(f"❌ Nenhum usuário disponível para linha {i}")
-                            eventos_pulados += 1
-                            continue
-                    
-                    # Usar hora fim ou calcular duração padrão
-                    if not hora_fim:
-                        # Duração padrão de 8 horas para presencial, 4 para online
-                        duracao_horas = 4 if tipo.online else 8
-                        data_fim = datetime.combine(
-                            data_evento, 
-                            time(min(23, hora_inicio.hour + duracao_horas), hora_inicio.minute)
-                        )
-                    else:
-                        data_fim = datetime.combine(data_evento, hora_fim)
-                    
-                    data_inicio = datetime.combine(data_evento, hora_inicio)
-                    
-                    if not self.options['dry_run']:
-                        # Verificar se solicitação já existe
-                        existing = Solicitacao.objects.filter(
-                            titulo_evento=titulo,
-                            data_inicio=data_inicio
-                        ).first()
-                        
-                        if existing and not self.options['force']:
-                            self.logger.debug(f"⏭️ Solicitação já existe: {titulo}")
-                            eventos_pulados += 1
-                            continue
-                        
-                        # Criar solicitação
-                        solicitacao = Solicitacao.objects.create(
-                            usuario_solicitante=usuario_solicitante,
-                            projeto=projeto,
-                            municipio=municipio,
-                            tipo_evento=tipo,
-                            titulo_evento=titulo,
-                            data_inicio=data_inicio,
-                            data_fim=data_fim,
-                            status=status,
-                            numero_encontro_formativo=str(encontro),
-                            coordenador_acompanha=bool(row.get('Coord Acompanha')),
-                            observacoes=f'Importado da aba {nome_aba}. Segmento: {segmento}'
-                        )
-                        
-                        # Associar formadores (até 5)
-                        formadores_associados = 0
-                        for j in range(1, 6):
-                            nome_formador = row.get(f'Formador {j}', '').strip()
-                            if nome_formador and nome_formador != "SOLICITADO":
-                                formador = self.get_or_create_formador(nome_formador)
-                                if formador:
-                                    FormadoresSolicitacao.objects.create(
-                                        solicitacao=solicitacao,
-                                        formador=formador
-                                    )
-                                    formadores_associados += 1
-                        
-                        self.logger.debug(f"✅ Evento criado: {titulo} - {formadores_associados} formadores")
-                    
-                    eventos_criados += 1
-                    
-                except Exception as e:
-                    self.logger.error(f"❌ Erro ao importar linha {i}: {e}")
-                    eventos_pulados += 1
-                    continue
-            
-            # Relatório final da aba
-            total_processado = len(dados)
-            total_valido = total_processado - eventos_filtrados - eventos_pulados
-
-            self.logger.info(f"🎆 Aba {nome_aba} importada:")
-            self.logger.info(f"  📋 Total de linhas: {total_processado}")
-            if self.options['filter_quality']:
-                self.logger.info(f"  ⚡ Filtradas (sem município/data): {eventos_filtrados}")
-            self.logger.info(f"  ⏭️ Puladas (outros motivos): {eventos_pulados}")
-            self.logger.info(f"  ✅ Válidas processadas: {total_valido}")
-            self.logger.info(f"  🎆 Eventos criados: {eventos_criados}")
-
-            return eventos_criados
-            
+            linhas = self.linhas_da_aba(nome_aba)
+            # Mesmo importador para todas as abas: caches carregados uma vez
+            assinaturas = (
+                RegistroAssinaturas(self.sheet.id, nome_aba)
+                if self.options['incremental'] else None
+            )
+            resumo = self.importador.importar(
+                linhas, dry_run=self.options['dry_run'], assinaturas=assinaturas
+            )
         except Exception as e:
             self.logger.error(f"❌ Erro ao importar aba {nome_aba}: {e}")
             return 0
 
+        for linha, motivo in resumo['erros']:
+            self.logger.debug(f"⏭️ Linha {linha} pulada: {motivo}")
+        pulados = self.stats['pulados'] + resumo['invalidas'] + resumo['ignoradas']
+        importados = resumo['criadas'] + resumo['atualizadas']
+
+        # Relatório final da aba
+        self.logger.info(f"🎆 Aba {nome_aba} importada:")
+        self.logger.info(f"  📋 Total de linhas: {self.stats['total']}")
+        if self.options['filter_quality']:
+            self.logger.info(f"  ⚡ Filtradas (sem município/data): {self.stats['filtrados']}")
+        self.logger.info(f"  ⏭️ Puladas (outros motivos): {pulados}")
+        self.logger.info(f"  🎆 Eventos criados: {resumo['criadas']}")
+        if resumo['atualizadas']:
+            self.logger.info(f"  🔄 Eventos atualizados: {resumo['atualizadas']}")
+        if resumo['diferenca']:
+            for linha_relatorio in resumo['diferenca'].relatorio():
+                self.logger.info(f"  {linha_relatorio}")
+        for aproximacao in resumo['aproximacoes']:
+            self.logger.info(
+                f"  🔎 '{aproximacao['nome']}' → '{aproximacao['encontrado']}' "
+                f"({aproximacao['metodo']}, confiança {aproximacao['confianca']:.2f})"
+            )
+
+        return importados
+
     def handle(self, *args, **options):
         self.options = options
         self.setup_logging(options['verbose'])
@@ -540,22 +370,18 @@ class Command(BaseCommand):
                 # Ordem de prioridade: Super primeiro (aprovações), depois demais
                 abas_para_importar = ['Super', 'ACerta', 'Outros', 'Brincando', 'Vidas']
             
+            # --force atualiza as solicitações já existentes (título + início)
+            self.importador = ImportadorAgenda(
+                'Agenda',
+                setor_do_projeto=self.setor_do_projeto,
+                atualizar_existentes=options['force'],
+            )
+
             # Processar cada aba
-            with transaction.atomic():
-                for aba in abas_para_importar:
-                    try:
-                        importados = self.importar_eventos_aba(aba)
-                        total_importados += importados
-                        abas_processadas.append(f"{aba}: {importados}")
-                        
-                    except Exception as e:
-                        self.logger.error(f"❌ Falha ao processar aba {aba}: {e}")
-                        continue
-                
-                if options['dry_run']:
-                    # Rollback em modo dry-run
-                    transaction.set_rollback(True)
-                    self.logger.info("🔄 Rollback executado (modo dry-run)")
+            for aba in abas_para_importar:
+                importados = self.importar_eventos_aba(aba)
+                total_importados += importados
+                abas_processadas.append(f"{aba}: {importados}")
             
             # Relatório final
             self.logger.info("="*80)
@@ -7,16 +7,21 @@ SEMANA 2 - DIA 4: Importação de disponibilidades dos formadores
 """
 import csv
 import json
-import uuid
-from datetime import date, datetime, time
+import os
+from datetime import date, time
 
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
-from django.utils import timezone
-from django.utils.dateparse import parse_date, parse_time
 
-from core.models import DisponibilidadeFormadores, Formador, LogAuditoria
+from core.models import DisponibilidadeFormadores, LogAuditoria
+from core.services.importacao_disponibilidades import (
+    ImportadorDisponibilidades,
+    ResolvedorFormadores,
+    chave_linha,
+    converter_linhas,
+)
+from core.services.importacao_incremental import RegistroAssinaturas
 
 User = get_user_model()
 
@@ -72,6 +77,12 @@ class Command(BaseCommand):
             help="Atualizar disponibilidades existentes com novos dados",
         )
 
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Processar apenas linhas novas ou alteradas desde a ultima importacao do arquivo",
+        )
+
         parser.add_argument(
             "--formador",
             type=str,
@@ -98,6 +109,8 @@ class Command(BaseCommand):
         update_existing = options["update_existing"]
         formador_filter = options["formador"]
         date_format = options["date_format"]
+        incremental = options["incremental"]
+        self.resolvedor = None
 
         # Obter usuario para auditoria
         try:
@@ -116,6 +129,8 @@ class Command(BaseCommand):
         self.stdout.write(
             f'Atualizar existentes: {"Sim" if update_existing else "Nao"}'
         )
+        if incremental:
+            self.stdout.write("Incremental: Sim")
         if formador_filter:
             self.stdout.write(f"Filtro formador: {formador_filter}")
         if date_format:
@@ -151,11 +166,27 @@ class Command(BaseCommand):
                     disponibilidades_data, formador_filter
                 )
 
+            assinaturas = None
+            if incremental:
+                assinaturas = RegistroAssinaturas(
+                    f"disponibilidades:{os.path.basename(arquivo)}"
+                )
+                if clear_existing and not dry_run:
+                    assinaturas.limpar()
+                disponibilidades_data = self.filter_changed(
+                    disponibilidades_data, assinaturas, completo=not formador_filter
+                )
+                # Linhas alteradas atualizam o registro existente
+                update_existing = True
+
             # Processar dados
             resultado = self.process_disponibilidades(
                 disponibilidades_data, dry_run, user, update_existing
             )
 
+            if assinaturas and not dry_run:
+                assinaturas.confirmar(falhas=resultado["falhas"])
+
             # Exibir resultado
             self.display_result(resultado)
 
@@ -181,7 +212,9 @@ class Command(BaseCommand):
             if not formador:
                 raise CommandError(f'Formador "{formador_filter}" nao encontrado')
 
-            queryset = DisponibilidadeFormadores.objects.filter(formador=formador)
+            queryset = DisponibilidadeFormadores.objects.filter(
+                usuario_id=formador.usuario_id
+            )
             self.stdout.write(f"Filtrando limpeza para o formador: {formador.nome}")
         else:
             queryset = DisponibilidadeFormadores.objects.all()
@@ -229,11 +262,8 @@ class Command(BaseCommand):
                     }
 
                     try:
-                        disp_data = self.parse_row_data(
-                            normalized_row, date_format, row_num
-                        )
+                        disp_data = self.parse_row_data(normalized_row, row_num)
                         if disp_data:
-                            disp_data["linha"] = row_num
                             disponibilidades.append(disp_data)
                     except Exception as e:
                         self.stdout.write(
@@ -248,6 +278,7 @@ class Command(BaseCommand):
         except Exception as e:
             raise CommandError(f"Erro ao ler CSV: {e}")
 
+        disponibilidades = self.convert_rows(disponibilidades, date_format)
         self.stdout.write(f"Carregados {len(disponibilidades)} registros do CSV")
         return disponibilidades
 
@@ -272,9 +303,9 @@ class Command(BaseCommand):
 
                 disponibilidades = []
 
-                for item in disponibilidades_data:
+                for item_num, item in enumerate(disponibilidades_data, 1):
                     try:
-                        disp_data = self.parse_json_data(item, date_format)
+                        disp_data = self.parse_json_data(item, item_num)
                         if disp_data:
                             disponibilidades.append(disp_data)
                     except Exception as e:
@@ -290,6 +321,7 @@ class Command(BaseCommand):
         except Exception as e:
             raise CommandError(f"Erro ao ler JSON: {e}")
 
+        disponibilidades = self.convert_rows(disponibilidades, date_format)
         self.stdout.write(f"Carregados {len(disponibilidades)} registros do JSON")
         return disponibilidades
 
@@ -323,9 +355,8 @@ class Command(BaseCommand):
                 }
 
                 try:
-                    disp_data = self.parse_row_data(row_data, date_format, row_num)
+                    disp_data = self.parse_row_data(row_data, row_num)
                     if disp_data:
-                        disp_data["linha"] = row_num
                         disponibilidades.append(disp_data)
                 except Exception as e:
                     self.stdout.write(
@@ -338,12 +369,12 @@ class Command(BaseCommand):
         except Exception as e:
             raise CommandError(f"Erro ao ler Excel: {e}")
 
+        disponibilidades = self.convert_rows(disponibilidades, date_format)
         self.stdout.write(f"Carregados {len(disponibilidades)} registros do Excel")
         return disponibilidades
 
-    def parse_row_data(self, row_data, date_format, row_num):
-        """Parse de dados de linha (CSV/Excel)"""
-        # Extrair campos
+    def parse_row_data(self, row_data, row_num):
+        """Extrair campos de uma linha (CSV/Excel); a conversao e feita por coluna"""
         formador_nome = self.extract_field(
             row_data, ["formador", "nome_formador", "nome", "instrutor"]
         )
@@ -351,16 +382,6 @@ class Command(BaseCommand):
             row_data, ["email", "email_formador", "formador_email"]
         )
         data_str = self.extract_field(row_data, ["data", "data_bloqueio", "date"])
-        hora_inicio_str = self.extract_field(
-            row_data, ["hora_inicio", "inicio", "start", "de"]
-        )
-        hora_fim_str = self.extract_field(row_data, ["hora_fim", "fim", "end", "ate"])
-        tipo_bloqueio = self.extract_field(
-            row_data, ["tipo", "tipo_bloqueio", "categoria", "motivo_categoria"]
-        )
-        motivo = self.extract_field(
-            row_data, ["motivo", "observacao", "descricao", "detalhes"]
-        )
 
         if not (formador_nome or formador_email):
             self.stdout.write(
@@ -376,44 +397,30 @@ class Command(BaseCommand):
             )
             return None
 
-        # Parse de data
-        data_bloqueio = self.parse_date_field(data_str, date_format)
-        if not data_bloqueio:
-            raise ValueError(f"Data invalida: {data_str}")
-
-        # Parse de horários
-        hora_inicio = (
-            self.parse_time_field(hora_inicio_str) if hora_inicio_str else time(9, 0)
-        )
-        hora_fim = self.parse_time_field(hora_fim_str) if hora_fim_str else time(17, 0)
-
-        if hora_fim <= hora_inicio:
-            raise ValueError(
-                f"Hora fim ({hora_fim}) deve ser posterior a hora inicio ({hora_inicio})"
-            )
-
         return {
+            "linha": row_num,
             "formador_nome": formador_nome,
             "formador_email": formador_email,
-            "data_bloqueio": data_bloqueio,
-            "hora_inicio": hora_inicio,
-            "hora_fim": hora_fim,
-            "tipo_bloqueio": tipo_bloqueio or "Bloqueio",
-            "motivo": motivo or "",
+            "data": data_str,
+            "hora_inicio": self.extract_field(
+                row_data, ["hora_inicio", "inicio", "start", "de"]
+            ),
+            "hora_fim": self.extract_field(row_data, ["hora_fim", "fim", "end", "ate"]),
+            "tipo_bloqueio": self.extract_field(
+                row_data, ["tipo", "tipo_bloqueio", "categoria", "motivo_categoria"]
+            ),
+            "motivo": self.extract_field(
+                row_data, ["motivo", "observacao", "descricao", "detalhes"]
+            ),
         }
 
-    def parse_json_data(self, item, date_format):
-        """Parse de dados JSON"""
-        # Extrair campos JSON
+    def parse_json_data(self, item, item_num):
+        """Extrair campos de um item JSON; a conversao e feita por coluna"""
         formador_nome = (
             item.get("formador") or item.get("nome_formador") or item.get("nome")
         )
         formador_email = item.get("email") or item.get("formador_email")
         data_str = item.get("data") or item.get("data_bloqueio")
-        hora_inicio_str = item.get("hora_inicio") or item.get("inicio") or "09:00"
-        hora_fim_str = item.get("hora_fim") or item.get("fim") or "17:00"
-        tipo_bloqueio = item.get("tipo") or item.get("tipo_bloqueio") or "Bloqueio"
-        motivo = item.get("motivo") or item.get("observacao") or ""
 
         if not (formador_nome or formador_email):
             self.stdout.write(
@@ -427,138 +434,42 @@ class Command(BaseCommand):
             )
             return None
 
-        # Parse de data
-        data_bloqueio = self.parse_date_field(data_str, date_format)
-        if not data_bloqueio:
-            raise ValueError(f"Data invalida: {data_str}")
-
-        # Parse de horários
-        hora_inicio = self.parse_time_field(hora_inicio_str)
-        hora_fim = self.parse_time_field(hora_fim_str)
-
-        if hora_fim <= hora_inicio:
-            raise ValueError(
-                f"Hora fim ({hora_fim}) deve ser posterior a hora inicio ({hora_inicio})"
-            )
-
         return {
-            "formador_nome": formador_nome,
-            "formador_email": formador_email,
-            "data_bloqueio": data_bloqueio,
-            "hora_inicio": hora_inicio,
-            "hora_fim": hora_fim,
-            "tipo_bloqueio": tipo_bloqueio,
-            "motivo": motivo,
+            "linha": item_num,
+            "formador_nome": formador_nome or "",
+            "formador_email": formador_email or "",
+            "data": data_str,
+            "hora_inicio": item.get("hora_inicio") or item.get("inicio"),
+            "hora_fim": item.get("hora_fim") or item.get("fim"),
+            "tipo_bloqueio": item.get("tipo") or item.get("tipo_bloqueio"),
+            "motivo": item.get("motivo") or item.get("observacao"),
         }
 
+    def convert_rows(self, disponibilidades, date_format):
+        """Converter as colunas de data e horario de todas as linhas de uma vez"""
+        linhas, erros = converter_linhas(disponibilidades, date_format)
+        for row_num, motivo in erros:
+            self.stdout.write(
+                self.style.WARNING(f"Linha {row_num}: Erro ao processar - {motivo}")
+            )
+        return linhas
+
     def extract_field(self, row_data, field_names, default=""):
         """Extrair campo de um dicionario usando multiplos nomes possiveis"""
         for field_name in field_names:
             if field_name in row_data and row_data[field_name]:
                 value = row_data[field_name]
+                # Datas e horarios do Excel seguem como objetos
+                if isinstance(value, (date, time)):
+                    return value
                 return str(value).strip() if value else default
         return default
 
-    def parse_date_field(self, date_str, date_format=None):
-        """Parse de campo de data com multiplos formatos"""
-        if not date_str:
-            return None
-
-        date_str = str(date_str).strip()
-
-        # Formatos para tentar
-        formats_to_try = []
-
-        if date_format == "dd/mm/yyyy":
-            formats_to_try.extend(["%d/%m/%Y", "%d/%m/%y"])
-        elif date_format == "yyyy-mm-dd":
-            formats_to_try.extend(["%Y-%m-%d"])
-        elif date_format == "mm/dd/yyyy":
-            formats_to_try.extend(["%m/%d/%Y", "%m/%d/%y"])
-        elif date_format == "dd-mm-yyyy":
-            formats_to_try.extend(["%d-%m-%Y", "%d-%m-%y"])
-        else:
-            # Autodetect - tentar formatos comuns
-            formats_to_try.extend(
-                [
-                    "%Y-%m-%d",  # ISO format
-                    "%d/%m/%Y",  # BR format
-                    "%d/%m/%y",  # BR format short year
-                    "%m/%d/%Y",  # US format
-                    "%m/%d/%y",  # US format short year
-                    "%d-%m-%Y",  # BR format with dash
-                    "%d-%m-%y",  # BR format with dash short year
-                ]
-            )
-
-        # Tentar cada formato
-        for fmt in formats_to_try:
-            try:
-                return datetime.strptime(date_str, fmt).date()
-            except ValueError:
-                continue
-
-        # Tentar parse do Django como último recurso
-        try:
-            return parse_date(date_str)
-        except:
-            pass
-
-        return None
-
-    def parse_time_field(self, time_str):
-        """Parse de campo de horário"""
-        if not time_str:
-            return None
-
-        time_str = str(time_str).strip()
-
-        # Formatos para tentar
-        time_formats = [
-            "%H:%M:%S",  # 14:30:00
-            "%H:%M",  # 14:30
-            "%H.%M",  # 14.30
-            "%H,%M",  # 14,30
-            "%Hh%M",  # 14h30
-            "%Hh",  # 14h
-        ]
-
-        # Tentar cada formato
-        for fmt in time_formats:
-            try:
-                return datetime.strptime(time_str, fmt).time()
-            except ValueError:
-                continue
-
-        # Tentar parse do Django
-        try:
-            return parse_time(time_str)
-        except:
-            pass
-
-        # Se nada funcionar, tentar extrair apenas números
-        import re
-
-        numbers = re.findall(r"\d+", time_str)
-        if len(numbers) >= 1:
-            hour = int(numbers[0])
-            minute = int(numbers[1]) if len(numbers) >= 2 else 0
-            if 0 <= hour <= 23 and 0 <= minute <= 59:
-                return time(hour, minute)
-
-        return None
-
     def get_formador_by_name_or_email(self, identifier):
-        """Buscar formador por nome ou email"""
-        try:
-            # Tentar por email primeiro
-            return Formador.objects.get(email__iexact=identifier.strip())
-        except Formador.DoesNotExist:
-            try:
-                # Tentar por nome
-                return Formador.objects.get(nome__icontains=identifier.strip())
-            except Formador.DoesNotExist:
-                return None
+        """Buscar formador por email ou nome (indice carregado uma vez)"""
+        if self.resolvedor is None:
+            self.resolvedor = ResolvedorFormadores()
+        return self.resolvedor.resolver(nome=identifier, email=identifier)
 
     def filter_by_formador(self, disponibilidades_data, formador_filter):
         """Filtrar dados por formador específico"""
@@ -568,147 +479,60 @@ class Command(BaseCommand):
                 f'Formador "{formador_filter}" nao encontrado para filtro'
             )
 
-        filtered_data = []
-        for disp_data in disponibilidades_data:
-            if (
-                disp_data["formador_nome"]
-                and formador.nome.lower() in disp_data["formador_nome"].lower()
-            ) or (
-                disp_data["formador_email"]
-                and formador.email.lower() == disp_data["formador_email"].lower()
-            ):
-                filtered_data.append(disp_data)
+        filtered_data = [
+            disp_data
+            for disp_data in disponibilidades_data
+            if self.resolvedor.resolver(
+                disp_data["formador_nome"], disp_data["formador_email"]
+            )
+            == formador
+        ]
 
         self.stdout.write(
             f"Filtradas {len(filtered_data)} disponibilidades para {formador.nome}"
         )
         return filtered_data
 
+    def chave_disponibilidade(self, disp_data):
+        """Chave natural da linha: formador, data e horario"""
+        return chave_linha(disp_data)
+
+    def filter_changed(self, disponibilidades_data, assinaturas, completo=True):
+        """Manter apenas linhas novas ou alteradas desde a ultima importacao"""
+        diferenca = assinaturas.comparar(
+            ((self.chave_disponibilidade(d), d) for d in disponibilidades_data),
+            completo=completo,
+        )
+        for linha in diferenca.relatorio():
+            self.stdout.write(linha)
+        if diferenca.removidas:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{len(diferenca.removidas)} linhas sairam do arquivo; "
+                    "as disponibilidades correspondentes foram mantidas"
+                )
+            )
+        return [
+            d
+            for d in disponibilidades_data
+            if assinaturas.deve_processar(self.chave_disponibilidade(d))
+        ]
+
     def process_disponibilidades(
         self, disponibilidades_data, dry_run, user, update_existing
     ):
-        """Processar e salvar dados das disponibilidades"""
+        """Processar e salvar dados das disponibilidades em lote"""
         self.stdout.write("Processando dados das disponibilidades...")
 
-        resultado = {
-            "total": len(disponibilidades_data),
-            "criados": 0,
-            "atualizados": 0,
-            "duplicados": 0,
-            "erros": 0,
-            "detalhes_erros": [],
-        }
+        if self.resolvedor is None:
+            self.resolvedor = ResolvedorFormadores()
+        resultado = ImportadorDisponibilidades(
+            atualizar_existentes=update_existing, resolvedor=self.resolvedor
+        ).importar(disponibilidades_data, dry_run=dry_run)
 
-        for disp_data in disponibilidades_data:
-            try:
-                # Buscar formador
-                formador = None
-                if disp_data["formador_email"]:
-                    formador = self.get_formador_by_name_or_email(
-                        disp_data["formador_email"]
-                    )
-                if not formador and disp_data["formador_nome"]:
-                    formador = self.get_formador_by_name_or_email(
-                        disp_data["formador_nome"]
-                    )
-
-                if not formador:
-                    resultado["erros"] += 1
-                    resultado["detalhes_erros"].append(
-                        f'Formador nao encontrado: {disp_data["formador_nome"]} / {disp_data["formador_email"]}'
-                    )
-                    continue
-
-                # Dados da disponibilidade
-                data_bloqueio = disp_data["data_bloqueio"]
-                hora_inicio = disp_data["hora_inicio"]
-                hora_fim = disp_data["hora_fim"]
-                tipo_bloqueio = disp_data["tipo_bloqueio"]
-                motivo = disp_data["motivo"]
-
-                # Validações adicionais
-                if len(tipo_bloqueio) > 50:
-                    tipo_bloqueio = tipo_bloqueio[:50]
-
-                if not dry_run:
-                    # Tentar criar ou atualizar
-                    disponibilidade, created = (
-                        DisponibilidadeFormadores.objects.get_or_create(
-                            formador=formador,
-                            data_bloqueio=data_bloqueio,
-                            hora_inicio=hora_inicio,
-                            hora_fim=hora_fim,
-                            defaults={"tipo_bloqueio": tipo_bloqueio, "motivo": motivo},
-                        )
-                    )
-
-                    if created:
-                        resultado["criados"] += 1
-                        self.stdout.write(
-                            f"  [+] Criado: {formador.nome} - {data_bloqueio} {hora_inicio}-{hora_fim} [{tipo_bloqueio}]"
-                        )
-                    else:
-                        # Atualizar se necessario e permitido
-                        if update_existing:
-                            updated = False
-                            if disponibilidade.tipo_bloqueio != tipo_bloqueio:
-                                disponibilidade.tipo_bloqueio = tipo_bloqueio
-                                updated = True
-                            if disponibilidade.motivo != motivo:
-                                disponibilidade.motivo = motivo
-                                updated = True
-
-                            if updated:
-                                disponibilidade.save()
-                                resultado["atualizados"] += 1
-                                self.stdout.write(
-                                    f"  [~] Atualizado: {formador.nome} - {data_bloqueio} {hora_inicio}-{hora_fim}"
-                                )
-                            else:
-                                resultado["duplicados"] += 1
-                                self.stdout.write(
-                                    f"  [=] Ja existe (sem alteracoes): {formador.nome} - {data_bloqueio}"
-                                )
-                        else:
-                            resultado["duplicados"] += 1
-                            self.stdout.write(
-                                f"  [=] Ja existe: {formador.nome} - {data_bloqueio} {hora_inicio}-{hora_fim}"
-                            )
-                else:
-                    # Simular criacao (dry-run)
-                    exists = DisponibilidadeFormadores.objects.filter(
-                        formador=formador,
-                        data_bloqueio=data_bloqueio,
-                        hora_inicio=hora_inicio,
-                        hora_fim=hora_fim,
-                    ).exists()
-
-                    if exists:
-                        if update_existing:
-                            resultado["atualizados"] += 1
-                            self.stdout.write(
-                                f"  [~] [DRY] Seria atualizado: {formador.nome} - {data_bloqueio}"
-                            )
-                        else:
-                            resultado["duplicados"] += 1
-                            self.stdout.write(
-                                f"  [=] [DRY] Ja existe: {formador.nome} - {data_bloqueio}"
-                            )
-                    else:
-                        resultado["criados"] += 1
-                        self.stdout.write(
-                            f"  [+] [DRY] Seria criado: {formador.nome} - {data_bloqueio} {hora_inicio}-{hora_fim} [{tipo_bloqueio}]"
-                        )
-
-            except Exception as e:
-                resultado["erros"] += 1
-                formador_info = disp_data.get("formador_nome", "Desconhecido")
-                resultado["detalhes_erros"].append(
-                    f"Erro ao processar {formador_info}: {str(e)}"
-                )
-                self.stdout.write(
-                    self.style.ERROR(f"  [X] Erro: {formador_info} - {e}")
-                )
+        prefixo = "[DRY] " if dry_run else ""
+        for simbolo, descricao in resultado.pop("acoes"):
+            self.stdout.write(f"  [{simbolo}] {prefixo}{descricao}")
 
         return resultado
 
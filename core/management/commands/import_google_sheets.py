@@ -19,6 +19,7 @@ from core.models import (
     LogAuditoria, Setor
 )
 from core.services.google_sheets_service import google_sheets_service
+from core.services.importacao_incremental import RegistroAssinaturas
 
 User = get_user_model()
 
@@ -60,6 +61,12 @@ class Command(BaseCommand):
             help='Limpar dados existentes antes da importação'
         )
         
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Processar apenas linhas novas ou alteradas desde a última importação'
+        )
+        
         parser.add_argument(
             '--user',
             type=str,
@@ -73,6 +80,7 @@ class Command(BaseCommand):
         data_type = options['data_type']
         dry_run = options['dry_run']
         clear = options['clear']
+        incremental = options['incremental']
         username = options['user']
 
         # Usuário para auditoria
@@ -145,6 +153,15 @@ class Command(BaseCommand):
                 if not data:
                     self.stdout.write("Nenhum dado encontrado nesta aba")
                     continue
+
+                assinaturas = None
+                if incremental and ws_type in self.CHAVES:
+                    assinaturas = RegistroAssinaturas(spreadsheet_key, ws_name)
+                    if clear and not dry_run:
+                        assinaturas.limpar()
+                    data = self.filter_changed(data, ws_type, assinaturas)
+                    if not data:
+                        continue
                 
                 # Processar baseado no tipo
                 if ws_type == 'formadores':
@@ -159,6 +176,11 @@ class Command(BaseCommand):
                     self.stdout.write(f"Tipo {ws_type} não implementado")
                     continue
                 
+                if assinaturas and not dry_run:
+                    assinaturas.confirmar(
+                        falhas=[self.chave(row, ws_type) for row in result['falhas']]
+                    )
+
                 # Somar resultados
                 for key in total_results:
                     total_results[key] += result.get(key, 0)
@@ -183,9 +205,30 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR(f"Erro durante importação: {e}"))
             raise CommandError(f"Falha na importação: {e}")
 
+    # Chave natural de cada tipo de aba (colunas da linha)
+    CHAVES = {
+        'formadores': ('email', 'nome'),
+        'municipios': ('nome', 'uf'),
+        'projetos': ('nome',),
+        'tipos_evento': ('nome',),
+    }
+
+    def chave(self, row, ws_type):
+        if ws_type == 'formadores':
+            # Usuário é buscado pelo email; sem email, pelo nome
+            return str(row.get('email') or row.get('nome', '')).strip().lower()
+        return tuple(str(row.get(coluna, '')).strip() for coluna in self.CHAVES[ws_type])
+
+    def filter_changed(self, data, ws_type, assinaturas):
+        """Mantém apenas linhas novas ou alteradas desde a última importação"""
+        diferenca = assinaturas.comparar((self.chave(row, ws_type), row) for row in data)
+        for linha in diferenca.relatorio():
+            self.stdout.write(linha)
+        return [row for row in data if assinaturas.deve_processar(self.chave(row, ws_type))]
+
     def process_formadores(self, data, dry_run, clear, user):
         """Processa dados de formadores"""
-        result = {'total': len(data), 'criados': 0, 'atualizados': 0, 'erros': 0}
+        result = {'total': len(data), 'criados': 0, 'atualizados': 0, 'erros': 0, 'falhas': []}
         
         if clear and not dry_run:
             count = Formador.objects.count()
@@ -227,13 +270,14 @@ class Command(BaseCommand):
                     
             except Exception as e:
                 result['erros'] += 1
+                result['falhas'].append(row)
                 self.stdout.write(self.style.ERROR(f"  [X] Erro: {e}"))
         
         return result
 
     def process_municipios(self, data, dry_run, clear, user):
         """Processa dados de municípios"""
-        result = {'total': len(data), 'criados': 0, 'atualizados': 0, 'erros': 0}
+        result = {'total': len(data), 'criados': 0, 'atualizados': 0, 'erros': 0, 'falhas': []}
         
         if clear and not dry_run:
             count = Municipio.objects.count()
@@ -274,13 +318,14 @@ class Command(BaseCommand):
                     
             except Exception as e:
                 result['erros'] += 1
+                result['falhas'].append(row)
                 self.stdout.write(self.style.ERROR(f"  [X] Erro: {e}"))
         
         return result
 
     def process_projetos(self, data, dry_run, clear, user):
         """Processa dados de projetos"""
-        result = {'total': len(data), 'criados': 0, 'atualizados': 0, 'erros': 0}
+        result = {'total': len(data), 'criados': 0, 'atualizados': 0, 'erros': 0, 'falhas': []}
         
         if clear and not dry_run:
             count = Projeto.objects.count()
@@ -327,13 +372,14 @@ class Command(BaseCommand):
                     
             except Exception as e:
                 result['erros'] += 1
+                result['falhas'].append(row)
                 self.stdout.write(self.style.ERROR(f"  [X] Erro: {e}"))
         
         return result
 
     def process_tipos_evento(self, data, dry_run, clear, user):
         """Processa dados de tipos de evento"""
-        result = {'total': len(data), 'criados': 0, 'atualizados': 0, 'erros': 0}
+        result = {'total': len(data), 'criados': 0, 'atualizados': 0, 'erros': 0, 'falhas': []}
         
         if clear and not dry_run:
             count = TipoEvento.objects.count()
@@ -388,6 +434,7 @@ class Command(BaseCommand):
                     
             except Exception as e:
                 result['erros'] += 1
+                result['falhas'].append(row)
                 self.stdout.write(self.style.ERROR(f"  [X] Erro: {e}"))
         
         return result
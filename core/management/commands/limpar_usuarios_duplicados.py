@@ -7,8 +7,7 @@ from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 from core.models import Usuario, Formador, FormadoresSolicitacao
 from django.contrib.auth.models import Group
-from collections import defaultdict
-import re
+from core.services.indice_nomes import agrupar, normalizar
 
 class Command(BaseCommand):
     help = 'Limpa usuários duplicados mantendo apenas emails reais e centralizando no Docker'
@@ -24,6 +23,12 @@ class Command(BaseCommand):
             action='store_true',
             help='Confirma que quer executar a limpeza (obrigatório para execução real)'
         )
+        parser.add_argument(
+            '--limiar',
+            type=float,
+            default=0.9,
+            help='Confiança mínima (0 a 1) para considerar dois nomes a mesma pessoa'
+        )
 
     def handle(self, *args, **options):
         if not options['dry_run'] and not options['confirmar_limpeza']:
@@ -33,6 +38,7 @@ class Command(BaseCommand):
             )
 
         self.dry_run = options['dry_run']
+        self.limiar = options['limiar']
 
         if self.dry_run:
             self.stdout.write("=== MODO SIMULAÇÃO - NENHUMA ALTERAÇÃO SERÁ SALVA ===")
@@ -92,19 +98,8 @@ class Command(BaseCommand):
         self.stdout.write("\nIDENTIFICANDO DUPLICACOES POR NOME:")
         self.stdout.write("=" * 50)
 
-        # Agrupar por primeiro nome (case-insensitive)
-        grupos_nome = defaultdict(list)
-
-        for usuario in Usuario.objects.all():
-            nome_normalizado = self.normalizar_nome(usuario.first_name)
-            if nome_normalizado:
-                grupos_nome[nome_normalizado].append(usuario)
-
-        # Identificar duplicações
-        self.duplicados = {}
-        for nome, usuarios in grupos_nome.items():
-            if len(usuarios) > 1:
-                self.duplicados[nome] = usuarios
+        # Agrupar por nome completo (exato ou aproximado)
+        self.duplicados = self.agrupar_por_nome()
 
         self.stdout.write(f"Nomes com duplicações: {len(self.duplicados)}")
         self.stdout.write(f"Usuários afetados: {sum(len(usuarios) for usuarios in self.duplicados.values())}")
@@ -119,20 +114,34 @@ class Command(BaseCommand):
             self.stdout.write(f"\n{count}. Nome: '{nome}' ({len(usuarios)} usuários):")
             for u in usuarios:
                 tipo_email = self.classificar_email(u.email)
-                self.stdout.write(f"   - {u.username:20} | {u.email:30} | {tipo_email}")
+                self.stdout.write(
+                    f"   - {u.username:20} | {u.email:30} | {tipo_email:8} | "
+                    f"{self.nome_completo(u)} ({self.confianca[u.id]:.2f})"
+                )
 
         if len(self.duplicados) > 10:
             self.stdout.write(f"\n... e mais {len(self.duplicados) - 10} grupos")
 
-    def normalizar_nome(self, nome):
-        """Normaliza nome para comparação"""
-        if not nome:
-            return ""
-        # Remove acentos e converte para minúsculo
-        nome = nome.lower().strip()
-        # Remove caracteres especiais
-        nome = re.sub(r'[^\w\s]', '', nome)
-        return nome
+    def nome_completo(self, usuario):
+        return f"{usuario.first_name} {usuario.last_name}".strip()
+
+    def agrupar_por_nome(self):
+        """
+        Grupos de usuários com o mesmo nome (sem acentos, ordem das
+        palavras, abreviações ou pequenas diferenças de grafia), indexados
+        pelo nome normalizado do primeiro usuário.
+        """
+        usuarios = Usuario.objects.order_by('id')
+        grupos = agrupar(
+            ((self.nome_completo(u), u) for u in usuarios), limiar=self.limiar
+        )
+        self.confianca = {
+            usuario.id: confianca for grupo in grupos for usuario, confianca in grupo
+        }
+        return {
+            normalizar(self.nome_completo(grupo[0][0])): [u for u, _ in grupo]
+            for grupo in grupos
+        }
 
     def classificar_email(self, email):
         """Classifica tipo de email"""
@@ -296,13 +305,7 @@ class Command(BaseCommand):
         self.stdout.write(f"Emails reais: {emails_reais}")
 
         # Verificar duplicações restantes
-        grupos_nome = defaultdict(list)
-        for usuario in Usuario.objects.all():
-            nome_normalizado = self.normalizar_nome(usuario.first_name)
-            if nome_normalizado:
-                grupos_nome[nome_normalizado].append(usuario)
-
-        duplicados_restantes = {nome: usuarios for nome, usuarios in grupos_nome.items() if len(usuarios) > 1}
+        duplicados_restantes = self.agrupar_por_nome()
 
         self.stdout.write(f"Duplicações restantes: {len(duplicados_restantes)}")
 
@@ -14,6 +14,8 @@ from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
 from django.utils import timezone
 
+from core.models import EventoCalendarioEspelho
+from core.services.integrations.calendar_mirror import sincronizar
 from core.services.integrations.google_calendar import GoogleCalendarService
 
 
@@ -43,6 +45,11 @@ class Command(BaseCommand):
             action='store_true',
             help='Inclui informações detalhadas de cada evento'
         )
+        parser.add_argument(
+            '--sem-sincronizar',
+            action='store_true',
+            help='Usa o espelho local sem consultar a API do Google'
+        )
 
     def handle(self, *args, **options):
         calendar_id = options['calendar_id']
@@ -60,7 +67,9 @@ class Command(BaseCommand):
             service = GoogleCalendarService(calendar_id=calendar_id)
             
             # Mapear eventos do ano inteiro
-            events_data = self._map_yearly_events(service, year)
+            events_data = self._map_yearly_events(
+                service, year, sincronizar_espelho=not options['sem_sincronizar']
+            )
             
             # Gerar análise estatística
             statistics = self._generate_statistics(events_data['events'], year)
@@ -91,65 +100,47 @@ class Command(BaseCommand):
             )
             raise CommandError(f'Falha no mapeamento: {str(e)}')
 
-    def _map_yearly_events(self, service, year: int) -> Dict[str, Any]:
-        """Mapeia todos os eventos do ano especificado."""
+    def _map_yearly_events(self, service, year: int, sincronizar_espelho: bool = True) -> Dict[str, Any]:
+        """
+        Mapeia todos os eventos do ano especificado a partir do espelho local.
+
+        O espelho é atualizado antes com a sincronização incremental
+        (apenas o que mudou desde a última execução).
+        """
         all_events = []
         errors = []
-        
-        # Definir período do ano
-        start_time = datetime(year, 1, 1, 0, 0, 0)
-        end_time = datetime(year + 1, 1, 1, 0, 0, 0)
-        
-        try:
-            # Buscar eventos em batches (Google Calendar API tem limite)
-            page_token = None
-            batch_count = 0
-            
-            while True:
-                batch_count += 1
-                self.stdout.write(f'Processando lote {batch_count}...')
-                
-                # Parâmetros da consulta
-                params = {
-                    'calendarId': service.calendar_id,
-                    'timeMin': start_time.isoformat() + 'Z',
-                    'timeMax': end_time.isoformat() + 'Z',
-                    'singleEvents': True,
-                    'orderBy': 'startTime',
-                    'maxResults': 2500,  # Máximo permitido pela API
-                    'showDeleted': True,  # Incluir eventos cancelados
-                }
-                
-                if page_token:
-                    params['pageToken'] = page_token
-                
-                # Executar consulta
-                google_service = service._get_service()
-                events_result = google_service.events().list(**params).execute()
-                
-                events = events_result.get('items', [])
-                self.stdout.write(f'   Encontrados {len(events)} eventos neste lote')
-                
-                # Processar cada evento
-                for event in events:
-                    try:
-                        processed_event = self._process_event(event)
-                        all_events.append(processed_event)
-                    except Exception as e:
-                        error_msg = f"Erro ao processar evento {event.get('id', 'desconhecido')}: {str(e)}"
-                        errors.append(error_msg)
-                        self.stderr.write(self.style.WARNING(f'WARNING: {error_msg}'))
-                
-                # Verificar se há mais páginas
-                page_token = events_result.get('nextPageToken')
-                if not page_token:
-                    break
-                    
-        except Exception as e:
-            error_msg = f"Erro ao buscar eventos da API: {str(e)}"
-            errors.append(error_msg)
-            self.stderr.write(self.style.ERROR(f'ERROR: {error_msg}'))
-        
+        batch_count = 0
+
+        if sincronizar_espelho:
+            try:
+                resultado = sincronizar(service=service)
+                batch_count = resultado['paginas']
+                self.stdout.write(
+                    f"Espelho {'atualizado' if resultado['incremental'] else 'recarregado'}: "
+                    f"{resultado['eventos']} eventos recebidos em {batch_count} lote(s)"
+                )
+            except Exception as e:
+                error_msg = f"Erro ao buscar eventos da API: {str(e)}"
+                errors.append(error_msg)
+                self.stderr.write(self.style.ERROR(f'ERROR: {error_msg}'))
+
+        # Definir período do ano (inclui eventos cancelados, como showDeleted)
+        start_time = timezone.make_aware(datetime(year, 1, 1))
+        end_time = timezone.make_aware(datetime(year + 1, 1, 1))
+        espelho = EventoCalendarioEspelho.objects.filter(
+            calendar_id=service.calendar_id,
+            inicio__gte=start_time,
+            inicio__lt=end_time,
+        ).order_by('inicio')
+
+        for evento in espelho.iterator():
+            try:
+                all_events.append(self._process_event(evento.payload))
+            except Exception as e:
+                error_msg = f"Erro ao processar evento {evento.event_id}: {str(e)}"
+                errors.append(error_msg)
+                self.stderr.write(self.style.WARNING(f'WARNING: {error_msg}'))
+
         return {
             'events': all_events,
             'errors': errors,
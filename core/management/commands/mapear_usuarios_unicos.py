@@ -12,6 +12,7 @@ from django.core.management.base import BaseCommand
 from django.contrib.auth.models import Group
 from django.db import transaction
 from core.models import Usuario, Setor
+from core.services.indice_nomes import IndiceNomes, agrupar, tokens
 
 
 class Command(BaseCommand):
@@ -34,6 +35,12 @@ class Command(BaseCommand):
             default='relatorio_usuarios_unicos.json',
             help='Nome do arquivo de saída para o relatório'
         )
+        parser.add_argument(
+            '--limiar',
+            type=float,
+            default=0.9,
+            help='Confiança mínima (0 a 1) para considerar dois nomes a mesma pessoa'
+        )
         parser.add_argument(
             '--planilhas-dir',
             type=str,
@@ -46,6 +53,9 @@ class Command(BaseCommand):
         self.verbose = options['verbose']
         self.output_file = options['output_file']
         self.planilhas_dir = Path(options['planilhas_dir'])
+        self.limiar = options['limiar']
+        # Nomes já mapeados, para busca exata ou aproximada
+        self.indice_nomes = IndiceNomes(limiar=self.limiar)
 
         if self.dry_run:
             self.stdout.write(
@@ -341,10 +351,13 @@ class Command(BaseCommand):
 
     def _usuario_ja_existe(self, nome):
         """Verifica se usuário já existe na lista de únicos"""
-        for usuario_id, usuario_data in self.usuarios_unicos.items():
-            if usuario_data['nome'].lower() == nome.lower():
-                return True
-        return False
+        correspondencia = self.indice_nomes.buscar(nome)
+        if correspondencia and correspondencia.metodo != 'exato' and self.verbose:
+            self.stdout.write(
+                f"   🔎 {nome} ≈ {correspondencia.nome} "
+                f"({correspondencia.metodo}, confiança {correspondencia.confianca:.2f})"
+            )
+        return correspondencia is not None
 
     def _adicionar_usuario_unico(self, usuario_data):
         """Adiciona usuário à lista de únicos, verificando duplicatas"""
@@ -358,6 +371,7 @@ class Command(BaseCommand):
         else:
             # Novo usuário único
             self.usuarios_unicos[chave] = usuario_data
+            self.indice_nomes.adicionar(usuario_data['nome'], chave)
             self.estatisticas['usuarios_unicos_encontrados'] += 1
 
     def _gerar_chave_usuario(self, usuario_data):
@@ -368,8 +382,7 @@ class Command(BaseCommand):
         elif usuario_data['email']:
             return f"email_{usuario_data['email']}"
         else:
-            nome_normalizado = re.sub(r'[^\w\s]', '', usuario_data['nome']).lower().replace(' ', '_')
-            return f"nome_{nome_normalizado}"
+            return f"nome_{'_'.join(tokens(usuario_data['nome']))}"
 
     def _mesclar_usuario_duplicato(self, chave, novo_usuario):
         """Mescla dados de usuário duplicado"""
@@ -403,36 +416,23 @@ class Command(BaseCommand):
         """Fase final de eliminação de duplicatas por similaridade de nomes"""
         self.stdout.write(f"\n🔄 ELIMINANDO DUPLICATAS POR SIMILARIDADE...")
 
-        usuarios_list = list(self.usuarios_unicos.items())
-        duplicatas_por_nome = []
-
-        for i, (chave1, usuario1) in enumerate(usuarios_list):
-            for j, (chave2, usuario2) in enumerate(usuarios_list[i+1:], i+1):
-                if self._nomes_similares(usuario1['nome'], usuario2['nome']):
-                    duplicatas_por_nome.append((chave1, chave2))
+        grupos = agrupar(
+            ((usuario['nome'], chave) for chave, usuario in self.usuarios_unicos.items()),
+            limiar=self.limiar,
+        )
 
-        # Processar duplicatas encontradas
-        for chave1, chave2 in duplicatas_por_nome:
-            if chave1 in self.usuarios_unicos and chave2 in self.usuarios_unicos:
-                self.stdout.write(f"   🔗 Mesclando: {self.usuarios_unicos[chave1]['nome']} ↔ {self.usuarios_unicos[chave2]['nome']}")
-                self._mesclar_usuario_duplicato(chave1, self.usuarios_unicos[chave2])
-                del self.usuarios_unicos[chave2]
+        for grupo in grupos:
+            chave_principal = grupo[0][0]
+            principal = self.usuarios_unicos[chave_principal]
+            for chave, confianca in grupo[1:]:
+                self.stdout.write(
+                    f"   🔗 Mesclando: {principal['nome']} ↔ {self.usuarios_unicos[chave]['nome']} "
+                    f"(confiança {confianca:.2f})"
+                )
+                self._mesclar_usuario_duplicato(chave_principal, self.usuarios_unicos[chave])
+                del self.usuarios_unicos[chave]
                 self.estatisticas['duplicatas_eliminadas'] += 1
 
-    def _nomes_similares(self, nome1, nome2):
-        """Verifica se dois nomes são similares (mesmo primeiro e último nome)"""
-        def normalizar_nome(nome):
-            return re.sub(r'[^\w\s]', '', nome).lower().split()
-
-        palavras1 = normalizar_nome(nome1)
-        palavras2 = normalizar_nome(nome2)
-
-        if len(palavras1) < 2 or len(palavras2) < 2:
-            return False
-
-        # Verificar se primeiro e último nome são iguais
-        return (palavras1[0] == palavras2[0] and palavras1[-1] == palavras2[-1])
-
     def _gerar_relatorio(self):
         """Gera relatório consolidado em JSON"""
         self.stdout.write(f"\n📋 GERANDO RELATÓRIO CONSOLIDADO...")
@@ -445,6 +445,7 @@ class Command(BaseCommand):
             'distribuicao_por_cargo': self._calcular_distribuicao_cargo(),
             'usuarios_unicos': list(self.usuarios_unicos.values()),
             'duplicatas_encontradas': self.duplicatas_encontradas,
+            'correspondencias_nomes': dict(self.indice_nomes.estatisticas),
             'problemas_dados': self._consolidar_problemas()
         }
 
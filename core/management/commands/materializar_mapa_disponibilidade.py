@@ -0,0 +1,90 @@
+# core/management/commands/materializar_mapa_disponibilidade.py
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Formador
+from core.services.mapa_materializado import dias_do_mes, reconstruir, verificar
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstrói o mapa de disponibilidade materializado (formador × dia) "
+        "e verifica a tabela contra o cálculo ao vivo"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ano", type=int, default=date.today().year, help="Ano inicial"
+        )
+        parser.add_argument(
+            "--mes", type=int, default=1, help="Mês inicial (padrão: janeiro)"
+        )
+        parser.add_argument(
+            "--meses",
+            type=int,
+            default=12,
+            help="Quantidade de meses a processar a partir de ano/mês",
+        )
+        parser.add_argument(
+            "--verificar",
+            action="store_true",
+            help="Apenas verifica a tabela, sem reconstruir",
+        )
+        parser.add_argument(
+            "--todos",
+            action="store_true",
+            help="Inclui formadores inativos",
+        )
+
+    def handle(self, *args, **options):
+        if not 1 <= options["mes"] <= 12 or options["meses"] < 1:
+            raise CommandError("Parâmetros --mes/--meses inválidos")
+
+        formadores = Formador.objects.order_by("nome")
+        if not options["todos"]:
+            formadores = formadores.filter(ativo=True)
+        formadores = list(formadores)
+
+        self.stdout.write(
+            self.style.SUCCESS("=== MAPA DE DISPONIBILIDADE MATERIALIZADO ===\n")
+        )
+        self.stdout.write(f"Formadores: {len(formadores)}")
+
+        total_celulas = 0
+        divergencias = []
+        ano, mes = options["ano"], options["mes"]
+        for _ in range(options["meses"]):
+            dias = dias_do_mes(ano, mes)
+            if not options["verificar"]:
+                celulas = reconstruir(formadores, dias)
+                total_celulas += celulas
+                self.stdout.write(f"  {mes:02d}/{ano}: {celulas} células gravadas")
+
+            divergentes = verificar(formadores, dias)
+            divergencias.extend(divergentes)
+            if divergentes:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"  {mes:02d}/{ano}: {len(divergentes)} células divergentes"
+                    )
+                )
+
+            ano, mes = (ano + 1, 1) if mes == 12 else (ano, mes + 1)
+
+        for formador, dia, gravado, esperado in divergencias[:20]:
+            self.stdout.write(
+                f"    {formador.nome} {dia:%d/%m/%Y}: "
+                f"tabela={gravado or '(ausente)'} calculado={esperado}"
+            )
+
+        if not options["verificar"]:
+            self.stdout.write(f"\nTotal de células gravadas: {total_celulas}")
+
+        if divergencias:
+            raise CommandError(
+                f"{len(divergencias)} células divergem do cálculo ao vivo"
+            )
+        self.stdout.write(
+            self.style.SUCCESS("Tabela consistente com o cálculo ao vivo")
+        )
@@ -0,0 +1,35 @@
+# core/management/commands/processar_outbox_calendar.py
+from django.core.management.base import BaseCommand
+
+from core.models import OperacaoCalendario
+from core.services.integrations.calendar_outbox import processar_pendentes
+
+
+class Command(BaseCommand):
+    help = (
+        "Processa as operações pendentes no Google Calendar (outbox), "
+        "inclusive as que aguardam nova tentativa"
+    )
+
+    def handle(self, *args, **options):
+        resumo = processar_pendentes()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{resumo['operacoes']} operações processadas em "
+                f"{resumo['chamadas']} chamadas à API"
+            )
+        )
+
+        if resumo["erros"]:
+            self.stdout.write(
+                self.style.WARNING(f"{resumo['erros']} chamadas falharam")
+            )
+        com_erro = OperacaoCalendario.objects.filter(
+            status=OperacaoCalendario.Status.ERRO
+        ).count()
+        if com_erro:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{com_erro} operações esgotaram as tentativas (status Erro)"
+                )
+            )
@@ -0,0 +1,42 @@
+# core/management/commands/reconciliar_contadores_notificacoes.py
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.notification_counter import reconciliar
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara os contadores de notificações não lidas (cache) com o banco "
+        "e opcionalmente corrige os desvios"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--corrigir",
+            action="store_true",
+            help="Regrava os contadores divergentes com a contagem do banco",
+        )
+
+    def handle(self, *args, **options):
+        divergencias = reconciliar(corrigir=options["corrigir"])
+
+        if not divergencias:
+            self.stdout.write(self.style.SUCCESS("Contadores consistentes com o banco"))
+            return
+
+        for usuario_id, valor_cache, valor_banco in divergencias:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Usuário {usuario_id}: cache={valor_cache} banco={valor_banco}"
+                )
+            )
+
+        if options["corrigir"]:
+            self.stdout.write(
+                self.style.SUCCESS(f"{len(divergencias)} contadores corrigidos")
+            )
+        else:
+            raise CommandError(
+                f"{len(divergencias)} contadores divergentes "
+                "(use --corrigir para regravar)"
+            )
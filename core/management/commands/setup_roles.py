@@ -3,6 +3,7 @@ from django.contrib.auth.models import ContentType, Group, Permission
 from django.core.management.base import BaseCommand
 
 from core import models
+from core.services import papeis
 
 ROLES = [
     "Coordenador",
@@ -68,6 +69,9 @@ class Command(BaseCommand):
             for model, actions in items:
                 grant(model, actions, g)
 
+        # Sessões com papéis em cache recarregam na próxima requisição
+        papeis.invalidar_todos()
+
         self.stdout.write(
             self.style.SUCCESS("Grupos/perfis criados e permissões básicas atribuídas.")
         )
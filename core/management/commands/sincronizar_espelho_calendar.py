@@ -0,0 +1,50 @@
+# core/management/commands/sincronizar_espelho_calendar.py
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.integrations.calendar_mirror import sincronizar
+
+
+class Command(BaseCommand):
+    help = (
+        "Atualiza o espelho local dos eventos do Google Calendar "
+        "(incremental via syncToken; completa na primeira execução)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--calendar-id",
+            action="append",
+            dest="calendar_ids",
+            help="Calendar a sincronizar (pode repetir; padrão: GOOGLE_CALENDAR_CALENDAR_ID)",
+        )
+        parser.add_argument(
+            "--completo",
+            action="store_true",
+            help="Ignora o syncToken e recarrega o calendário inteiro",
+        )
+
+    def handle(self, *args, **options):
+        calendar_ids = options["calendar_ids"] or [
+            getattr(settings, "GOOGLE_CALENDAR_CALENDAR_ID", "primary")
+        ]
+
+        falhas = 0
+        for calendar_id in calendar_ids:
+            try:
+                resultado = sincronizar(calendar_id, completo=options["completo"])
+            except Exception as e:
+                falhas += 1
+                self.stdout.write(self.style.WARNING(f"{calendar_id}: erro — {e}"))
+                continue
+
+            tipo = "incremental" if resultado["incremental"] else "completa"
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{calendar_id}: sincronização {tipo} — "
+                    f"{resultado['eventos']} eventos em {resultado['paginas']} páginas"
+                )
+            )
+
+        if falhas:
+            raise CommandError(f"{falhas} calendário(s) não sincronizado(s)")
@@ -3,6 +3,7 @@ from django.contrib.auth.models import Group
 from django.core.management.base import BaseCommand
 
 from core.models import Usuario
+from core.services import papeis
 from core.signals import sync_all_users_to_groups
 
 
@@ -101,6 +102,8 @@ class Command(BaseCommand):
             self.stdout.write("Iniciando sincronização...\n")
 
             users_synced, errors = sync_all_users_to_groups()
+            # Sessões com papéis em cache recarregam na próxima requisição
+            papeis.invalidar_todos()
 
             if errors == 0:
                 self.stdout.write(
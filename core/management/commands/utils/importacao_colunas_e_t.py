@@ -0,0 +1,312 @@
+"""
+Base dos comandos import_<aba>_colunas_e_t
+
+Todas as abas da planilha Acompanhamento de Agenda | 2025 têm a mesma
+estrutura nas colunas E-T (linhas 1-1260):
+
+E: Municípios
+F: encontro (tipo de encontro)
+G: tipo (tipo de evento)
+H: data
+I: hora início
+J: hora fim
+K: projeto
+L: segmento
+M: Coord. Acompanha
+N: Coordenador
+O-S: Formador 1 a 5
+T: Convidados
+
+Cada comando define só a aba (e, se precisar, a regra de formadores); a
+gravação fica com core.services.importacao_agenda.ImportadorAgenda.
+"""
+
+import json
+import logging
+from datetime import datetime, time
+from zoneinfo import ZoneInfo
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import SolicitacaoStatus
+from core.services.google_sheets_service import google_sheets_service
+from core.services.importacao_agenda import ImportadorAgenda, LinhaImportada
+from core.services.importacao_incremental import RegistroAssinaturas
+
+COLUNAS = [
+    "E",
+    "F",
+    "G",
+    "H",
+    "I",
+    "J",
+    "K",
+    "L",
+    "M",
+    "N",
+    "O",
+    "P",
+    "Q",
+    "R",
+    "S",
+    "T",
+]
+COLUNAS_FORMADORES = ["O", "P", "Q", "R", "S"]
+
+FORMATOS_DATA = ["%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y", "%d.%m.%Y", "%d/%m/%y", "%d-%m-%y"]
+
+FUSO = ZoneInfo("America/Fortaleza")
+
+
+class ImportacaoColunasETCommand(BaseCommand):
+    """Subclasses definem `aba`, `help` e, se preciso, `formadores_da_linha`"""
+
+    aba = None
+    intervalo = "E1:T1260"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--spreadsheet-key",
+            type=str,
+            required=True,
+            help="ID da planilha Google (extraído da URL)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Apenas mostra o que seria importado sem salvar no banco",
+        )
+        parser.add_argument(
+            "--verbose",
+            action="store_true",
+            help="Exibe informações detalhadas durante a importação",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Processa só as linhas novas ou alteradas desde a última importação",
+        )
+
+    def setup_logging(self, verbose):
+        """Configura logging baseado no nível de verbosidade"""
+        level = logging.DEBUG if verbose else logging.INFO
+        logging.basicConfig(
+            level=level,
+            format="%(asctime)s - %(levelname)s - %(message)s",
+            handlers=[logging.StreamHandler()],
+        )
+        self.logger = logging.getLogger(self.__module__)
+
+    def parse_data(self, data_str):
+        """Converte string de data para date; só aceita datas de 2025"""
+        if not data_str:
+            return None
+
+        for formato in FORMATOS_DATA:
+            try:
+                data_convertida = datetime.strptime(
+                    str(data_str).strip(), formato
+                ).date()
+            except ValueError:
+                continue
+            if data_convertida.year == 2025:
+                return data_convertida
+            self.logger.debug(f"Data fora do ano 2025 ignorada: {data_str}")
+            return None
+
+        self.logger.warning(f"Não foi possível converter data: {data_str}")
+        return None
+
+    def parse_hora(self, hora_str, padrao):
+        try:
+            return datetime.strptime(hora_str, "%H:%M").time()
+        except (TypeError, ValueError):
+            return padrao
+
+    def formadores_da_linha(self, linha, linha_num):
+        """Nomes dos formadores da linha (colunas O-S)"""
+        return [linha[c] for c in COLUNAS_FORMADORES if linha[c] and linha[c] != "-"]
+
+    def processar_linha(self, linha, linha_num):
+        """Converte uma linha (dict coluna → valor) em LinhaImportada"""
+        linha = {c: str(linha.get(c) or "").strip() for c in COLUNAS}
+        municipio_nome = linha["E"]
+        tipo_encontro = linha["F"]
+        tipo_evento = linha["G"]
+        projeto_nome = linha["K"]
+        segmento = linha["L"]
+        coord_acompanha = linha["M"]
+        coordenador = linha["N"]
+        convidados = linha["T"]
+
+        data_evento = self.parse_data(linha["H"])
+        if not data_evento:
+            self.logger.debug(f"Linha {linha_num}: Data inválida ou vazia, pulando")
+            return None
+
+        if not municipio_nome and not projeto_nome:
+            self.logger.debug(f"Linha {linha_num}: Sem município nem projeto, pulando")
+            return None
+
+        formadores = self.formadores_da_linha(linha, linha_num)
+        if not formadores:
+            self.logger.debug(
+                f"Linha {linha_num}: Nenhum formador especificado, pulando"
+            )
+            return None
+
+        if tipo_encontro and tipo_evento:
+            nome_tipo = f"{tipo_encontro} - {tipo_evento}"
+        else:
+            nome_tipo = tipo_encontro or tipo_evento or "Formação"
+
+        observacoes_partes = []
+        if segmento:
+            observacoes_partes.append(f"Segmento: {segmento}")
+        if coord_acompanha:
+            observacoes_partes.append(f"Coordenador Acompanha: {coord_acompanha}")
+        if coordenador:
+            observacoes_partes.append(f"Coordenador Responsável: {coordenador}")
+        if convidados:
+            observacoes_partes.append(f"Convidados: {convidados}")
+
+        inicio = self.parse_hora(linha["I"], time(8, 0))
+        fim = self.parse_hora(linha["J"], time(17, 0))
+
+        return LinhaImportada(
+            linha=linha_num,
+            titulo=(
+                f"{projeto_nome} - {municipio_nome}"
+                if projeto_nome and municipio_nome
+                else "Evento Importado"
+            ),
+            municipio=municipio_nome,
+            projeto=projeto_nome,
+            tipo_evento=nome_tipo,
+            data_inicio=datetime.combine(data_evento, inicio, tzinfo=FUSO),
+            data_fim=datetime.combine(data_evento, fim, tzinfo=FUSO),
+            # Abas da planilha contêm eventos aprovados
+            status=SolicitacaoStatus.APROVADO,
+            formadores=formadores,
+            observacoes=" | ".join(observacoes_partes)
+            or f"Importado da aba {self.aba} (colunas E-T)",
+            coordenador_acompanha="Sim" in coord_acompanha,
+        )
+
+    def extrair_dados_google_sheets(self, spreadsheet_key):
+        """Extrai as colunas E-T da aba como dicts coluna → valor"""
+        self.logger.info(f"Conectando com Google Sheets: {spreadsheet_key}")
+        self.logger.info(f"Extraindo colunas E-T da aba '{self.aba}' (linhas 1-1260)")
+
+        valores_raw = google_sheets_service.get_worksheet_range(
+            spreadsheet_key=spreadsheet_key,
+            range_name=self.intervalo,
+            worksheet_name=self.aba,
+        )
+        if not valores_raw:
+            self.logger.error("Nenhum dado encontrado no range especificado")
+            return []
+
+        self.logger.info(f"Dados extraídos: {len(valores_raw)} linhas")
+        # Primeira linha é o cabeçalho
+        return [dict(zip(COLUNAS, linha_raw)) for linha_raw in valores_raw[1:]]
+
+    def importar(self, spreadsheet_key, dry_run=False, incremental=False):
+        dados = self.extrair_dados_google_sheets(spreadsheet_key)
+        if not dados:
+            self.logger.error("Nenhum dado encontrado")
+            return
+
+        linhas = []
+        for i, linha in enumerate(dados, start=1):
+            importada = self.processar_linha(linha, i)
+            if importada:
+                linhas.append(importada)
+                self.logger.debug(
+                    f"Linha {i}: {importada.data_inicio:%d/%m/%Y} | {importada.municipio} | "
+                    f"{importada.projeto} | Formadores: {', '.join(importada.formadores)}"
+                )
+
+        assinaturas = (
+            RegistroAssinaturas(spreadsheet_key, self.aba) if incremental else None
+        )
+        resumo = ImportadorAgenda(self.aba).importar(
+            linhas, dry_run=dry_run, assinaturas=assinaturas
+        )
+        for linha_num, motivo in resumo["erros"]:
+            self.logger.warning(f"Linha {linha_num}: {motivo}, pulando")
+
+        self.logger.info("=" * 70)
+        self.logger.info(
+            f"RELATÓRIO FINAL - IMPORTAÇÃO ABA {self.aba.upper()} (COLUNAS E-T)"
+        )
+        self.logger.info("=" * 70)
+        self.logger.info(f"Total de registros processados: {len(dados)}")
+        self.logger.info(f"Solicitações criadas: {resumo['criadas']}")
+        self.logger.info(f"Solicitações já existentes: {resumo['ignoradas']}")
+        if resumo["diferenca"]:
+            for linha_relatorio in resumo["diferenca"].relatorio():
+                self.logger.info(linha_relatorio)
+        self.logger.info(
+            f"Erros/Linhas puladas: {len(dados) - len(linhas) + resumo['invalidas']}"
+        )
+        for tabela, quantidade in resumo["referencias_criadas"].items():
+            if quantidade:
+                self.logger.info(f"Novos {tabela}: {quantidade}")
+        for aproximacao in resumo["aproximacoes"]:
+            self.logger.info(
+                f"Nome aproximado: '{aproximacao['nome']}' → '{aproximacao['encontrado']}' "
+                f"({aproximacao['metodo']}, confiança {aproximacao['confianca']:.2f})"
+            )
+        if dry_run:
+            self.logger.info("MODO DRY-RUN: Nenhum dado foi salvo no banco")
+        else:
+            self.logger.info("Dados salvos no banco com sucesso!")
+        self.logger.info("=" * 70)
+
+        self.salvar_json(linhas)
+
+    def salvar_json(self, linhas):
+        """Salva os dados tratados em JSON para análise"""
+        dados_tratados = [
+            {
+                "linha": l.linha,
+                "data_evento": l.data_inicio.strftime("%d/%m/%Y"),
+                "municipio": l.municipio or "N/A",
+                "projeto": l.projeto or "N/A",
+                "tipo_evento": l.tipo_evento,
+                "formadores": l.formadores,
+                "titulo_evento": l.titulo,
+                "data_inicio": l.data_inicio,
+                "data_fim": l.data_fim,
+                "observacoes": l.observacoes,
+            }
+            for l in linhas
+        ]
+        arquivo_saida = (
+            f"dados_planilhas_originais/{self.aba.lower()}_colunas_e_t_tratados.json"
+        )
+        with open(arquivo_saida, "w", encoding="utf-8") as f:
+            json.dump(dados_tratados, f, indent=2, ensure_ascii=False, default=str)
+
+        self.logger.info(f"✅ Dados tratados salvos em: {arquivo_saida}")
+        self.logger.info(f"📊 {len(dados_tratados)} registros válidos no arquivo JSON")
+
+    def handle(self, *args, **options):
+        self.setup_logging(options["verbose"])
+        spreadsheet_key = options["spreadsheet_key"]
+
+        self.logger.info(f"Iniciando importação das colunas E-T da aba {self.aba}")
+        self.logger.info(f"Planilha Google Sheets: {spreadsheet_key}")
+        if options["dry_run"]:
+            self.logger.info("MODO DRY-RUN: Apenas simulação, nada será salvo")
+
+        try:
+            self.importar(
+                spreadsheet_key,
+                dry_run=options["dry_run"],
+                incremental=options["incremental"],
+            )
+        except Exception as e:
+            raise CommandError(f"Erro durante a importação: {e}")
+        self.logger.info("Importação das colunas E-T concluída com sucesso!")
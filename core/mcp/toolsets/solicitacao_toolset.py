@@ -16,6 +16,7 @@ from core.models import (
     Solicitacao,
     SolicitacaoStatus,
 )
+from core.services.papeis import papeis_de
 
 
 class SolicitacaoToolset(ModelQueryToolset):
@@ -116,15 +117,15 @@ class SolicitacaoToolset(ModelQueryToolset):
             return queryset
 
         # Superintendencia and Admin see all
-        if user.groups.filter(name__in=["superintendencia", "admin"]).exists():
+        if papeis_de(user).tem_algum(["superintendencia", "admin"]):
             return queryset
 
         # Controle sees all for monitoring
-        if user.groups.filter(name="controle").exists():
+        if papeis_de(user).tem("controle"):
             return queryset
 
         # Coordenadores see their own solicitações
-        if model == Solicitacao and user.groups.filter(name="coordenador").exists():
+        if model == Solicitacao and papeis_de(user).tem("coordenador"):
             return queryset.filter(usuario_solicitante=user)
 
         # Formadores see solicitações they're involved in
@@ -150,23 +151,23 @@ class SolicitacaoToolset(ModelQueryToolset):
 
         if model == Solicitacao:
             # Coordenadores can create solicitações
-            return user.groups.filter(
-                name__in=["coordenador", "superintendencia", "admin"]
-            ).exists()
+            return papeis_de(user).tem_algum(
+                ["coordenador", "superintendencia", "admin"]
+            )
 
         elif model == Aprovacao:
             # Only superintendencia can create approvals
-            return user.groups.filter(name__in=["superintendencia", "admin"]).exists()
+            return papeis_de(user).tem_algum(["superintendencia", "admin"])
 
         elif model == FormadoresSolicitacao:
             # Can add formadores to solicitação if can edit the solicitação
-            return user.groups.filter(
-                name__in=["coordenador", "superintendencia", "admin"]
-            ).exists()
+            return papeis_de(user).tem_algum(
+                ["coordenador", "superintendencia", "admin"]
+            )
 
         elif model == EventoGoogleCalendar:
             # Only control and admin can create calendar events
-            return user.groups.filter(name__in=["controle", "admin"]).exists()
+            return papeis_de(user).tem_algum(["controle", "admin"])
 
         return False
 
@@ -186,16 +187,16 @@ class SolicitacaoToolset(ModelQueryToolset):
                 return True
 
             # Superintendencia can edit approved/rejected ones
-            if user.groups.filter(name__in=["superintendencia", "admin"]).exists():
+            if papeis_de(user).tem_algum(["superintendencia", "admin"]):
                 return True
 
         elif model == Aprovacao:
             # Only superintendencia can update approvals
-            return user.groups.filter(name__in=["superintendencia", "admin"]).exists()
+            return papeis_de(user).tem_algum(["superintendencia", "admin"])
 
         elif model == EventoGoogleCalendar:
             # Only control and admin can update calendar events
-            return user.groups.filter(name__in=["controle", "admin"]).exists()
+            return papeis_de(user).tem_algum(["controle", "admin"])
 
         return False
 
@@ -215,7 +216,7 @@ class SolicitacaoToolset(ModelQueryToolset):
             model == Solicitacao
             and obj.usuario_solicitante == user
             and obj.status == SolicitacaoStatus.PENDENTE
-            and user.groups.filter(name="coordenador").exists()
+            and papeis_de(user).tem("coordenador")
         ):
             return True
 
@@ -6,9 +6,11 @@ Security and auditing middleware for enhanced protection.
 """
 
 from .security import SecurityHeadersMiddleware, RateLimitingMiddleware, AuditLogMiddleware
+from .papeis import PapeisMiddleware
 
 __all__ = [
     'SecurityHeadersMiddleware',
     'RateLimitingMiddleware',
     'AuditLogMiddleware',
+    'PapeisMiddleware',
 ]
\ No newline at end of file
@@ -0,0 +1,31 @@
+"""
+Middleware do cache de papéis por sessão
+========================================
+
+Carrega os papéis do usuário autenticado da sessão (core.services.papeis):
+as verificações de papel da requisição não consultam o banco enquanto o
+carimbo de versão da sessão valer. Sem cache compartilhado entre os
+processos (papeis.sessao_habilitada) não faz nada: os papéis são
+consultados uma vez por requisição, quando usados.
+"""
+
+from django.utils.deprecation import MiddlewareMixin
+
+from core.services.papeis import carregar_da_sessao, sessao_habilitada
+
+
+class PapeisMiddleware(MiddlewareMixin):
+    """
+    Deve vir depois de SessionMiddleware e AuthenticationMiddleware.
+    Usuários autenticados por token (DRF) caem no cache por requisição.
+    """
+
+    def process_request(self, request):
+        usuario = getattr(request, "user", None)
+        session = getattr(request, "session", None)
+        if usuario is None or session is None or not usuario.is_authenticated:
+            return None
+        if not sessao_habilitada():
+            return None
+        carregar_da_sessao(usuario, session)
+        return None
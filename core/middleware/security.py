@@ -10,9 +10,12 @@ Date: Janeiro 2025
 """
 
 from django.conf import settings
+from django.http import HttpResponse
 from django.utils.deprecation import MiddlewareMixin
 from django.utils import timezone
 
+from core.services import rate_limit
+
 
 class SecurityHeadersMiddleware(MiddlewareMixin):
     """
@@ -115,10 +118,10 @@ class SecurityHeadersMiddleware(MiddlewareMixin):
 
 class RateLimitingMiddleware(MiddlewareMixin):
     """
-    Middleware simples de rate limiting por IP
+    Middleware de rate limiting por janela deslizante
 
-    Limita requests por IP para prevenir abuse.
-    Em produção seria melhor usar Redis/Memcached.
+    Limites por grupo de rotas e por usuário (ou IP, sem login), com
+    contadores compartilhados no cache (core.services.rate_limit).
     """
 
     # Compatibilidade com Django 5.2+
@@ -127,43 +130,41 @@ class RateLimitingMiddleware(MiddlewareMixin):
 
     def __init__(self, get_response):
         self.get_response = get_response
-        self.request_counts = {}  # Em produção usar cache distribuído
+        self.limitador = rate_limit.criar_limitador()
 
     def process_request(self, request):
-        """Verifica rate limiting por IP"""
+        """Verifica o limite do grupo da rota para o usuário/IP"""
 
         # Só aplicar em produção
         if not getattr(settings, 'IS_PRODUCTION', False):
             return None
 
-        # Obter IP real (considerando proxies)
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0].strip()
+        grupo = rate_limit.grupo_da_rota(request.path_info)
+        if grupo is None:
+            return None
+
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            identidade = f"u{user.pk}"
         else:
-            ip = request.META.get('REMOTE_ADDR')
-
-        # Rate limiting simples (100 requests por minuto)
-        # Em produção implementar com sliding window no Redis
-        import time
-        current_time = int(time.time() / 60)  # Janela de 1 minuto
-
-        key = f"{ip}:{current_time}"
-        self.request_counts[key] = self.request_counts.get(key, 0) + 1
-
-        # Limpar entradas antigas
-        keys_to_remove = [k for k in self.request_counts.keys()
-                         if int(k.split(':')[1]) < current_time - 5]
-        for k in keys_to_remove:
-            del self.request_counts[k]
-
-        # Verificar limite
-        if self.request_counts[key] > 100:
-            from django.http import HttpResponseTooManyRequests
-            return HttpResponseTooManyRequests(
+            # Obter IP real (considerando proxies)
+            x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+            if x_forwarded_for:
+                identidade = x_forwarded_for.split(',')[0].strip()
+            else:
+                identidade = request.META.get('REMOTE_ADDR')
+
+        decisao = self.limitador.permitir(
+            f"{grupo['nome']}:{identidade}", grupo['limite'], grupo['janela']
+        )
+        if not decisao.permitido:
+            response = HttpResponse(
                 "Rate limit exceeded. Try again later.",
-                content_type="text/plain"
+                content_type="text/plain",
+                status=429,
             )
+            response['Retry-After'] = str(decisao.tentar_em)
+            return response
 
         return None
 
@@ -232,12 +233,13 @@ class AuditLogMiddleware(MiddlewareMixin):
                     extra=audit_data
                 )
 
-            # Registrar no banco (só se usuário autenticado e sucesso)
+            # Registrar no banco (só se usuário autenticado e sucesso),
+            # em lote e fora da requisição
             if request.user.is_authenticated and response.status_code < 400:
                 try:
-                    from core.models import LogAuditoria
-                    LogAuditoria.objects.create(
-                        usuario=request.user,
+                    from core.services import audit_sink
+                    audit_sink.registrar(
+                        usuario_id=request.user.id,
                         acao=f"{request.method} {path}",
                         detalhes={
                             'ip': audit_data['ip_address'],
@@ -249,7 +251,7 @@ class AuditLogMiddleware(MiddlewareMixin):
                 except Exception as e:
                     # Log error mas não quebrar request
                     self.audit_logger.error(
-                        f"Failed to save audit log to database: {e}",
+                        f"Failed to queue audit log: {e}",
                         extra={'error': str(e), **audit_data}
                     )
 
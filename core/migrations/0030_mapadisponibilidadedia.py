@@ -0,0 +1,27 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0029_auto_20250925_1733'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MapaDisponibilidadeDia',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.DateField(verbose_name='Data')),
+                ('codigo', models.CharField(max_length=4, verbose_name='Código')),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+                ('formador', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mapa_dias', to='core.formador', verbose_name='Formador')),
+            ],
+            options={
+                'verbose_name': 'Célula do Mapa de Disponibilidade',
+                'verbose_name_plural': 'Células do Mapa de Disponibilidade',
+                'constraints': [models.UniqueConstraint(fields=('formador', 'data'), name='uniq_mapa_formador_data')],
+            },
+        ),
+    ]
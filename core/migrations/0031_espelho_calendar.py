@@ -0,0 +1,47 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0030_mapadisponibilidadedia'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventoCalendarioEspelho',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('calendar_id', models.CharField(max_length=255, verbose_name='Calendar ID')),
+                ('event_id', models.CharField(max_length=255, verbose_name='ID do evento')),
+                ('status', models.CharField(default='confirmed', max_length=20)),
+                ('titulo', models.TextField(blank=True, default='')),
+                ('inicio', models.DateTimeField(blank=True, null=True)),
+                ('fim', models.DateTimeField(blank=True, null=True)),
+                ('dia_inteiro', models.BooleanField(default=False)),
+                ('html_link', models.TextField(blank=True, default='')),
+                ('payload', models.JSONField(default=dict, verbose_name='Evento bruto da API')),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Evento do Calendar (espelho)',
+                'verbose_name_plural': 'Eventos do Calendar (espelho)',
+                'indexes': [models.Index(fields=['calendar_id', 'inicio', 'fim'], name='core_evento_calenda_861a18_idx')],
+                'constraints': [models.UniqueConstraint(fields=('calendar_id', 'event_id'), name='uniq_espelho_calendar_evento')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SincronizacaoCalendario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('calendar_id', models.CharField(max_length=255, unique=True)),
+                ('sync_token', models.TextField(blank=True, default='')),
+                ('ultima_sincronizacao', models.DateTimeField(blank=True, null=True)),
+                ('ultima_sincronizacao_completa', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Sincronização de Calendar',
+                'verbose_name_plural': 'Sincronizações de Calendar',
+            },
+        ),
+    ]
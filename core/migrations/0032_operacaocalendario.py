@@ -0,0 +1,37 @@
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0031_espelho_calendar'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OperacaoCalendario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('criar', 'Criar'), ('atualizar', 'Atualizar'), ('remover', 'Remover')], max_length=20)),
+                ('provider_event_id', models.CharField(blank=True, default='', max_length=255)),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('processando', 'Processando'), ('concluida', 'Concluída'), ('agrupada', 'Agrupada'), ('erro', 'Erro')], default='pendente', max_length=20)),
+                ('tentativas', models.PositiveIntegerField(default=0)),
+                ('proxima_tentativa', models.DateTimeField(default=django.utils.timezone.now)),
+                ('erro', models.TextField(blank=True, default='')),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+                ('processado_em', models.DateTimeField(blank=True, null=True)),
+                ('solicitacao', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='operacoes_calendario', to='core.solicitacao')),
+                ('usuario', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='operacoes_calendario', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Operação pendente no Calendar',
+                'verbose_name_plural': 'Operações pendentes no Calendar',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'proxima_tentativa'], name='core_operac_status_b83967_idx')],
+            },
+        ),
+    ]
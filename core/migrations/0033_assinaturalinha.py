@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0032_operacaocalendario'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssinaturaLinha',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fonte', models.CharField(help_text='Planilha/arquivo de origem', max_length=200)),
+                ('aba', models.CharField(blank=True, default='', max_length=200)),
+                ('chave', models.CharField(help_text='Chave natural da linha', max_length=500)),
+                ('hash', models.CharField(max_length=64)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Assinatura de linha importada',
+                'verbose_name_plural': 'Assinaturas de linhas importadas',
+                'constraints': [models.UniqueConstraint(fields=('fonte', 'aba', 'chave'), name='assinatura_linha_unica')],
+            },
+        ),
+    ]
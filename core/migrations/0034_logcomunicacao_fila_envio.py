@@ -0,0 +1,31 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0033_assinaturalinha'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='logcomunicacao',
+            name='tentativas',
+            field=models.PositiveIntegerField(default=0, verbose_name='Tentativas'),
+        ),
+        migrations.AddField(
+            model_name='logcomunicacao',
+            name='proxima_tentativa',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Próxima tentativa'),
+        ),
+        migrations.AlterField(
+            model_name='logcomunicacao',
+            name='status_envio',
+            field=models.CharField(choices=[('enviado', 'Enviado com sucesso'), ('falhado', 'Falha no envio'), ('pendente', 'Pendente'), ('processando', 'Processando'), ('cancelado', 'Cancelado')], default='pendente', max_length=20, verbose_name='Status do envio'),
+        ),
+        migrations.AddIndex(
+            model_name='logcomunicacao',
+            index=models.Index(fields=['status_envio', 'proxima_tentativa'], name='core_logcom_status__2f54fd_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0034_logcomunicacao_fila_envio'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='logauditoria',
+            name='data_hora',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
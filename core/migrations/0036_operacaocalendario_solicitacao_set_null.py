@@ -0,0 +1,42 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery
+
+
+def preencher_referencias(apps, schema_editor):
+    OperacaoCalendario = apps.get_model("core", "OperacaoCalendario")
+    Solicitacao = apps.get_model("core", "Solicitacao")
+    OperacaoCalendario.objects.update(
+        solicitacao_ref=F("solicitacao_id"),
+        titulo_evento=Subquery(
+            Solicitacao.objects.filter(pk=OuterRef("solicitacao_id")).values(
+                "titulo_evento"
+            )[:1]
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0035_logauditoria_data_hora_default'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='operacaocalendario',
+            name='solicitacao_ref',
+            field=models.UUIDField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='operacaocalendario',
+            name='titulo_evento',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='operacaocalendario',
+            name='solicitacao',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='operacoes_calendario', to='core.solicitacao'),
+        ),
+        migrations.RunPython(preencher_referencias, migrations.RunPython.noop),
+    ]
@@ -303,10 +303,17 @@ class Usuario(AbstractUser):
         """Compatibilidade com planilhas - Nome completo"""
         return f"{self.first_name} {self.last_name}".strip() or self.username
 
+    @property
+    def papeis(self):
+        """Grupos, setor e permissões, carregados uma vez (core.services.papeis)"""
+        from core.services.papeis import papeis_de
+
+        return papeis_de(self)
+
     @property
     def role_names(self):
         """Get user's role names from groups"""
-        return list(self.groups.values_list("name", flat=True))
+        return list(self.papeis.grupos)
 
     @property
     def primary_role(self):
@@ -316,11 +323,11 @@ class Usuario(AbstractUser):
 
     def has_role(self, role_name):
         """Check if user has specific role"""
-        return self.groups.filter(name=role_name).exists()
+        return self.papeis.tem(role_name)
 
     def has_any_role(self, role_names):
         """Check if user has any of the specified roles"""
-        return self.groups.filter(name__in=role_names).exists()
+        return self.papeis.tem_algum(role_names)
 
     # Novos métodos para estrutura organizacional
     @property
@@ -339,11 +346,7 @@ class Usuario(AbstractUser):
 
     def can_approve_requests(self):
         """Verifica se pode aprovar solicitações (gerente da superintendência)"""
-        return (
-            self.cargo == "gerente"
-            and self.setor
-            and self.setor.vinculado_superintendencia
-        )
+        return self.cargo == "gerente" and self.papeis.setor_superintendencia is True
 
     def can_create_requests(self):
         """Verifica se pode criar solicitações (coordenador ou apoio)"""
@@ -358,17 +361,13 @@ class Usuario(AbstractUser):
     def is_coordenador_superintendencia(self):
         """Verifica se é coordenador vinculado à superintendência"""
         return (
-            self.cargo == "coordenador"
-            and self.setor
-            and self.setor.vinculado_superintendencia
+            self.cargo == "coordenador" and self.papeis.setor_superintendencia is True
         )
 
     def is_coordenador_outros_setores(self):
         """Verifica se é coordenador de outros setores (não-superintendência)"""
         return (
-            self.cargo == "coordenador"
-            and self.setor
-            and not self.setor.vinculado_superintendencia
+            self.cargo == "coordenador" and self.papeis.setor_superintendencia is False
         )
 
     @classmethod
@@ -428,7 +427,7 @@ class Usuario(AbstractUser):
     # === MÉTODOS UNIFICADOS PARA FORMADORES ===
     def is_formador(self):
         """Verifica se o usuário é um formador ativo (fonte única de verdade)"""
-        return self.formador_ativo and self.groups.filter(name="formador").exists()
+        return self.formador_ativo and self.papeis.tem("formador")
 
     @property
     def area_especializacao_display(self):
@@ -485,7 +484,7 @@ class Usuario(AbstractUser):
     @property
     def has_formador_role(self):
         """Check if user has formador role (compatibilidade com Formador)"""
-        return self.groups.filter(name="formador").exists()
+        return self.papeis.tem("formador")
 
 
 # =========================
@@ -615,7 +614,7 @@ class Formador(models.Model):
     def has_formador_role(self):
         """Check if connected user has formador role"""
         if self.usuario:
-            return self.usuario.groups.filter(name="formador").exists()
+            return self.usuario.has_role("formador")
         return False
 
 
@@ -850,6 +849,114 @@ class EventoGoogleCalendar(models.Model):
         return f"GC:{self.provider_event_id} — {self.solicitacao}"
 
 
+class EventoCalendarioEspelho(models.Model):
+    """
+    Cópia local dos eventos de um Google Calendar, mantida por sincronização
+    incremental (syncToken). Consultas de conflito e relatórios leem daqui
+    em vez de listar o calendário na API.
+    """
+
+    calendar_id = models.CharField(max_length=255, verbose_name="Calendar ID")
+    event_id = models.CharField(max_length=255, verbose_name="ID do evento")
+    status = models.CharField(max_length=20, default="confirmed")
+    titulo = models.TextField(blank=True, default="")
+    inicio = models.DateTimeField(null=True, blank=True)
+    fim = models.DateTimeField(null=True, blank=True)
+    dia_inteiro = models.BooleanField(default=False)
+    html_link = models.TextField(blank=True, default="")
+    payload = models.JSONField(default=dict, verbose_name="Evento bruto da API")
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Evento do Calendar (espelho)"
+        verbose_name_plural = "Eventos do Calendar (espelho)"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["calendar_id", "event_id"], name="uniq_espelho_calendar_evento"
+            ),
+        ]
+        indexes = [models.Index(fields=["calendar_id", "inicio", "fim"])]
+
+    def __str__(self):
+        return f"{self.calendar_id}:{self.event_id} — {self.titulo}"
+
+
+class SincronizacaoCalendario(models.Model):
+    """Estado da sincronização incremental de um calendário"""
+
+    calendar_id = models.CharField(max_length=255, unique=True)
+    sync_token = models.TextField(blank=True, default="")
+    ultima_sincronizacao = models.DateTimeField(null=True, blank=True)
+    ultima_sincronizacao_completa = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Sincronização de Calendar"
+        verbose_name_plural = "Sincronizações de Calendar"
+
+    def __str__(self):
+        return f"{self.calendar_id} ({self.ultima_sincronizacao})"
+
+
+class OperacaoCalendario(models.Model):
+    """
+    Outbox das operações no Google Calendar.
+
+    Gravada na mesma transação que altera a Solicitacao e processada depois
+    por um worker (calendar_outbox), fora da requisição do usuário.
+    """
+
+    class Tipo(models.TextChoices):
+        CRIAR = "criar", "Criar"
+        ATUALIZAR = "atualizar", "Atualizar"
+        REMOVER = "remover", "Remover"
+
+    class Status(models.TextChoices):
+        PENDENTE = "pendente", "Pendente"
+        PROCESSANDO = "processando", "Processando"
+        CONCLUIDA = "concluida", "Concluída"
+        AGRUPADA = "agrupada", "Agrupada"
+        ERRO = "erro", "Erro"
+
+    # SET_NULL: a remoção no Calendar precisa sobreviver à da solicitação
+    solicitacao = models.ForeignKey(
+        Solicitacao,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="operacoes_calendario",
+    )
+    # Id e título da solicitação, mantidos após a remoção dela
+    solicitacao_ref = models.UUIDField(null=True, blank=True, db_index=True)
+    titulo_evento = models.CharField(max_length=255, blank=True, default="")
+    tipo = models.CharField(max_length=20, choices=Tipo.choices)
+    # Guardado para remoções: o EventoGoogleCalendar pode não existir mais
+    provider_event_id = models.CharField(max_length=255, blank=True, default="")
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="operacoes_calendario",
+    )
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.PENDENTE
+    )
+    tentativas = models.PositiveIntegerField(default=0)
+    proxima_tentativa = models.DateTimeField(default=timezone.now)
+    erro = models.TextField(blank=True, default="")
+    criado_em = models.DateTimeField(auto_now_add=True)
+    processado_em = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Operação pendente no Calendar"
+        verbose_name_plural = "Operações pendentes no Calendar"
+        ordering = ["id"]
+        indexes = [models.Index(fields=["status", "proxima_tentativa"])]
+
+    def __str__(self):
+        return f"{self.tipo} — {self.solicitacao_ref} ({self.status})"
+
+
 class DisponibilidadeFormadores(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     # Alterado para Usuario
@@ -899,7 +1006,8 @@ class LogAuditoria(models.Model):
     usuario = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True
     )
-    data_hora = models.DateTimeField(auto_now_add=True)
+    # default (não auto_now_add): a gravação em lote preserva o horário do evento
+    data_hora = models.DateTimeField(default=timezone.now)
     acao = models.CharField(max_length=255)
     entidade_afetada_id = models.UUIDField(null=True, blank=True)
     detalhes = models.TextField(blank=True, null=True)
@@ -1069,6 +1177,36 @@ class Deslocamento(models.Model):
         super().save(*args, **kwargs)
 
 
+class MapaDisponibilidadeDia(models.Model):
+    """
+    Célula materializada do mapa mensal de disponibilidade (formador × dia).
+    Mantida pelos signals de Solicitacao, DisponibilidadeFormadores e
+    Deslocamento; reconstruída pelo comando materializar_mapa_disponibilidade.
+    """
+
+    formador = models.ForeignKey(
+        Formador,
+        on_delete=models.CASCADE,
+        related_name="mapa_dias",
+        verbose_name="Formador",
+    )
+    data = models.DateField(verbose_name="Data")
+    codigo = models.CharField(max_length=4, verbose_name="Código")
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Célula do Mapa de Disponibilidade"
+        verbose_name_plural = "Células do Mapa de Disponibilidade"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["formador", "data"], name="uniq_mapa_formador_data"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.formador.nome} {self.data:%d/%m/%Y}: {self.codigo}"
+
+
 # =========================
 # 5) SISTEMA DE NOTIFICAÇÕES
 # =========================
@@ -1161,6 +1299,7 @@ class LogComunicacao(models.Model):
         ("enviado", "Enviado com sucesso"),
         ("falhado", "Falha no envio"),
         ("pendente", "Pendente"),
+        ("processando", "Processando"),
         ("cancelado", "Cancelado"),
     ]
 
@@ -1219,6 +1358,13 @@ class LogComunicacao(models.Model):
 
     erro_envio = models.TextField(blank=True, verbose_name="Erro no envio")
 
+    # Fila de envio (notification_dispatch): pendentes são enviados por um
+    # worker; falhas voltam para a fila com backoff
+    tentativas = models.PositiveIntegerField(default=0, verbose_name="Tentativas")
+    proxima_tentativa = models.DateTimeField(
+        default=timezone.now, verbose_name="Próxima tentativa"
+    )
+
     # Relacionamento com entidades
     entidade_relacionada_id = models.UUIDField(
         blank=True, null=True, verbose_name="ID da entidade relacionada"
@@ -1251,6 +1397,7 @@ class LogComunicacao(models.Model):
             models.Index(fields=["created_at"]),
             models.Index(fields=["tipo_comunicacao", "status_envio"]),
             models.Index(fields=["usuario_destinatario", "status_envio"]),
+            models.Index(fields=["status_envio", "proxima_tentativa"]),
             models.Index(fields=["grupo_destinatario"]),
         ]
         permissions = [
@@ -1391,6 +1538,33 @@ class ImportacaoCursosCSV(models.Model):
         return f"{status_icon} {self.arquivo_nome} - {self.get_status_display()}"
 
 
+class AssinaturaLinha(models.Model):
+    """
+    Hash do conteúdo normalizado de uma linha importada de planilha.
+
+    Permite que as importações processem só as linhas novas, alteradas ou
+    removidas desde a execução anterior (core.services.importacao_incremental).
+    """
+
+    fonte = models.CharField(max_length=200, help_text="Planilha/arquivo de origem")
+    aba = models.CharField(max_length=200, blank=True, default="")
+    chave = models.CharField(max_length=500, help_text="Chave natural da linha")
+    hash = models.CharField(max_length=64)
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Assinatura de linha importada"
+        verbose_name_plural = "Assinaturas de linhas importadas"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["fonte", "aba", "chave"], name="assinatura_linha_unica"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.fonte}/{self.aba}: {self.chave}"
+
+
 # =========================
 # MODELOS DA PLANILHA CONTROLE
 # =========================
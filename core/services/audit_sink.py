@@ -0,0 +1,207 @@
+"""
+Gravação em lote dos registros de auditoria das requisições
+
+O AuditLogMiddleware não faz mais um INSERT de LogAuditoria por
+requisição: entrega o registro a registrar(), que o guarda num buffer em
+memória do processo e responde na hora. Uma thread do processo descarrega
+o buffer com bulk_create
+
+- quando ele atinge AUDIT_SINK_LOTE registros;
+- a cada AUDIT_SINK_INTERVALO segundos;
+- no encerramento do processo (atexit).
+
+A gravação passa por background_jobs (Celery, thread ou sync). Se o banco
+estiver indisponível, o lote vai para AUDIT_SINK_ARQUIVO_RESERVA (JSON
+Lines) e é regravado na próxima descarga bem-sucedida; nada se perde.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.services.background_jobs import enfileirar
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_arquivo_lock = threading.Lock()
+_buffer: List[dict] = []
+_acordar = threading.Event()
+_thread: Optional[threading.Thread] = None
+_pid: Optional[int] = None
+
+
+def _config(nome: str, padrao):
+    return getattr(settings, f"AUDIT_SINK_{nome}", padrao)
+
+
+def _arquivo_reserva() -> Path:
+    return Path(
+        _config(
+            "ARQUIVO_RESERVA",
+            Path(settings.BASE_DIR) / "logs" / "auditoria_pendente.jsonl",
+        )
+    )
+
+
+def registrar(usuario_id, acao: str, detalhes) -> None:
+    """
+    Guarda um registro de auditoria para gravação em lote. O horário é o
+    da chamada, não o da gravação.
+    """
+    registro = {
+        "usuario_id": usuario_id,
+        "acao": acao[:255],
+        "detalhes": None if detalhes is None else str(detalhes),
+        "data_hora": timezone.now().isoformat(),
+    }
+    with _lock:
+        _iniciar()
+        _buffer.append(registro)
+        cheio = len(_buffer) >= _config("LOTE", 100)
+    if cheio:
+        _acordar.set()
+
+
+def _iniciar():
+    """Inicia a thread de descarga no processo atual (também após fork)"""
+    global _thread, _pid
+    if _pid == os.getpid() and _thread is not None:
+        return
+    if _pid != os.getpid():
+        # Processo filho: o buffer herdado é do pai
+        _buffer.clear()
+    _pid = os.getpid()
+    _thread = threading.Thread(target=_laco, name="audit-sink", daemon=True)
+    _thread.start()
+
+
+def _laco():
+    while True:
+        _acordar.wait(_config("INTERVALO", 2.0))
+        _acordar.clear()
+        descarregar()
+
+
+def descarregar(imediato: bool = False) -> int:
+    """
+    Envia o buffer para gravação.
+
+    Args:
+        imediato: grava nesta thread, sem background_jobs (encerramento)
+
+    Returns:
+        Registros retirados do buffer
+    """
+    with _lock:
+        lote = list(_buffer)
+        _buffer.clear()
+    if not lote:
+        return 0
+    if imediato:
+        gravar_registros(lote)
+    else:
+        enfileirar("gravar_auditoria_task", gravar_registros, lote)
+    return len(lote)
+
+
+def _objetos(registros: List[dict]):
+    from core.models import LogAuditoria
+
+    return [
+        LogAuditoria(
+            usuario_id=registro["usuario_id"],
+            acao=registro["acao"],
+            detalhes=registro["detalhes"],
+            data_hora=datetime.fromisoformat(registro["data_hora"]),
+        )
+        for registro in registros
+    ]
+
+
+def gravar_registros(registros: List[dict]) -> int:
+    """
+    Grava o lote com bulk_create; em erro de banco, manda para o arquivo
+    de reserva. Depois de uma gravação bem-sucedida, regrava a reserva.
+
+    Returns:
+        Registros gravados no banco
+    """
+    from core.models import LogAuditoria
+
+    try:
+        with transaction.atomic():
+            LogAuditoria.objects.bulk_create(
+                _objetos(registros),
+                batch_size=getattr(settings, "BULK_CREATE_BATCH_SIZE", 1000),
+            )
+    except Exception as e:
+        logger.error(
+            f"Auditoria: falha ao gravar {len(registros)} registros, "
+            f"guardados em {_arquivo_reserva()}: {e}"
+        )
+        _reservar(registros)
+        return 0
+    return len(registros) + reprocessar_reserva()
+
+
+def _reservar(registros: List[dict]):
+    arquivo = _arquivo_reserva()
+    with _arquivo_lock:
+        arquivo.parent.mkdir(parents=True, exist_ok=True)
+        with open(arquivo, "a", encoding="utf-8") as saida:
+            for registro in registros:
+                saida.write(json.dumps(registro) + "\n")
+
+
+def reprocessar_reserva() -> int:
+    """
+    Regrava os registros do arquivo de reserva. O arquivo é renomeado
+    antes da leitura, para que só um processo o reprocesse.
+
+    Returns:
+        Registros gravados no banco
+    """
+    from core.models import LogAuditoria
+
+    arquivo = _arquivo_reserva()
+    processando = arquivo.with_name(f"{arquivo.name}.{os.getpid()}")
+    with _arquivo_lock:
+        try:
+            os.replace(arquivo, processando)
+        except FileNotFoundError:
+            return 0
+
+    with open(processando, encoding="utf-8") as entrada:
+        registros = [json.loads(linha) for linha in entrada if linha.strip()]
+    try:
+        with transaction.atomic():
+            LogAuditoria.objects.bulk_create(
+                _objetos(registros),
+                batch_size=getattr(settings, "BULK_CREATE_BATCH_SIZE", 1000),
+            )
+    except Exception as e:
+        logger.error(f"Auditoria: reserva ainda não gravada: {e}")
+        _reservar(registros)
+        registros = []
+    os.remove(processando)
+    if registros:
+        logger.info(f"Auditoria: {len(registros)} registros da reserva gravados")
+    return len(registros)
+
+
+@atexit.register
+def _encerrar():
+    try:
+        descarregar(imediato=True)
+    except Exception as e:
+        logger.error(f"Auditoria: falha na descarga final: {e}")
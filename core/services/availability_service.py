@@ -323,77 +323,75 @@ class AvailabilityService:
         data_fim: datetime,
         municipio: Municipio,
         days_ahead: int = 30,
+        step_minutes: int = 30,
+        limit: int = 10,
+        order_by: str = "inicio",
+        max_conflicted: int = 2,
     ) -> List[Dict]:
         """
         Sugere horários alternativos quando há conflitos
 
+        Busca janelas livres comuns nos próximos dias úteis (8h às 17h, passos
+        de `step_minutes`) em uma única carga da agenda dos formadores.
+
+        Args:
+            order_by: "inicio" (mais cedo primeiro) ou "conflitos"
+                (menos formadores em conflito primeiro)
+            max_conflicted: máximo de formadores em conflito aceito por sugestão
+
         Returns:
             Lista de slots disponíveis: [{'inicio': datetime, 'fim': datetime, 'formadores_livres': QuerySet}]
         """
-        suggestions = []
         duration = data_fim - data_inicio
+        current_date = timezone.localtime(data_inicio).date()
+
+        # Próximos dias úteis
+        days = [
+            current_date + timedelta(days=offset)
+            for offset in range(1, days_ahead + 1)
+            if (current_date + timedelta(days=offset)).weekday() < 5
+        ]
+
+        slots = self.engine.find_free_slots(
+            formadores,
+            days,
+            duration,
+            municipio,
+            step=timedelta(minutes=step_minutes),
+            max_conflicted=max_conflicted,
+        )
+        if order_by == "conflitos":
+            slots.sort(key=lambda slot: (len(slot.conflicted), slot.inicio))
 
-        # Verificar próximos dias úteis
-        current_date = data_inicio.date()
-
-        for day_offset in range(1, days_ahead + 1):
-            check_date = current_date + timedelta(days=day_offset)
-
-            # Pular fins de semana
-            if check_date.weekday() >= 5:
-                continue
-
-            # Verificar slots no dia
-            for hour in range(8, 17):  # 8h às 17h
-                slot_start = timezone.make_aware(
-                    datetime.combine(
-                        check_date, datetime.min.time().replace(hour=hour)
-                    ),
-                    timezone.get_current_timezone(),
+        suggestions = []
+        for slot in slots[:limit]:
+            if not slot.conflicted:
+                suggestions.append(
+                    {
+                        "inicio": slot.inicio,
+                        "fim": slot.fim,
+                        "formadores_livres": formadores,
+                        "confidence": "high",
+                    }
                 )
-                slot_end = slot_start + duration
-
-                # Não ultrapassar horário comercial
-                if slot_end.hour > 17:
-                    continue
+                continue
 
-                # Verificar disponibilidade
-                check_result = self.engine.check_availability(
-                    formadores, slot_start, slot_end, municipio
-                )
+            # Formadores ainda disponíveis
+            if isinstance(formadores, QuerySet):
+                free_formadores = formadores.exclude(id__in=slot.conflicted)
+            else:
+                free_formadores = [f for f in formadores if f.id not in slot.conflicted]
+            suggestions.append(
+                {
+                    "inicio": slot.inicio,
+                    "fim": slot.fim,
+                    "formadores_livres": free_formadores,
+                    "confidence": "medium",
+                    "notes": f"{len(slot.conflicted)} formador(es) indisponível(eis)",
+                }
+            )
 
-                if check_result.available:
-                    suggestions.append(
-                        {
-                            "inicio": slot_start,
-                            "fim": slot_end,
-                            "formadores_livres": formadores,
-                            "confidence": "high",
-                        }
-                    )
-                elif len(check_result.conflicts) <= 2:  # Conflitos menores
-                    # Calcular formadores ainda disponíveis
-                    conflicted_formadores = set(
-                        c.formador.id for c in check_result.conflicts
-                    )
-                    free_formadores = formadores.exclude(id__in=conflicted_formadores)
-
-                    if free_formadores.exists():
-                        suggestions.append(
-                            {
-                                "inicio": slot_start,
-                                "fim": slot_end,
-                                "formadores_livres": free_formadores,
-                                "confidence": "medium",
-                                "notes": f"{len(conflicted_formadores)} formador(es) indisponível(eis)",
-                            }
-                        )
-
-            # Parar se já encontrou sugestões suficientes
-            if len(suggestions) >= 10:
-                break
-
-        return suggestions[:10]  # Retornar top 10
+        return suggestions
 
     def _is_business_hours(self, inicio: datetime, fim: datetime) -> bool:
         """Verifica se evento está dentro do horário comercial"""
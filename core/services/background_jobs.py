@@ -0,0 +1,85 @@
+"""
+Execução de trabalhos em segundo plano
+
+Tarefas disparadas por requisições (ex.: notificações de uma aprovação em
+lote) são enfileiradas após o commit, para não prender a resposta.
+
+Backends (BACKGROUND_JOBS_BACKEND):
+- "celery": envia a task homônima de core.tasks (.delay)
+- "thread": pool de threads do próprio processo (padrão)
+- "sync": executa imediatamente após o commit (testes/depuração)
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "BACKGROUND_JOBS_WORKERS", 2),
+                    thread_name_prefix="background-job",
+                )
+    return _executor
+
+
+def _executar(funcao, *args):
+    """Executa a tarefa sem propagar erros (o chamador já respondeu)"""
+    try:
+        funcao(*args)
+    except Exception as e:
+        logger.error(f"Erro no trabalho em segundo plano {funcao.__name__}: {e}")
+
+
+def _executar_em_thread(funcao, *args):
+    close_old_connections()
+    try:
+        _executar(funcao, *args)
+    finally:
+        close_old_connections()
+
+
+def enfileirar(nome_task: str, funcao, *args):
+    """
+    Enfileira `funcao(*args)` no backend configurado.
+
+    Args:
+        nome_task: nome da task em core.tasks (backend "celery")
+        funcao: função equivalente, executada nos backends locais
+        args: argumentos serializáveis em JSON (ids, não instâncias)
+    """
+    backend = getattr(settings, "BACKGROUND_JOBS_BACKEND", "thread")
+
+    if backend == "celery":
+        try:
+            from core import tasks
+
+            getattr(tasks, nome_task).delay(*args)
+            return
+        except Exception as e:
+            logger.error(
+                f"Falha ao enviar {nome_task} ao Celery, executando localmente: {e}"
+            )
+
+    if backend == "sync":
+        _executar(funcao, *args)
+    else:
+        _get_executor().submit(_executar_em_thread, funcao, *args)
+
+
+def enfileirar_apos_commit(nome_task: str, funcao, *args):
+    """Enfileira somente se a transação atual for confirmada"""
+    transaction.on_commit(partial(enfileirar, nome_task, funcao, *args))
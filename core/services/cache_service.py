@@ -370,4 +370,17 @@ def check_cache_health() -> Dict[str, Any]:
             'status': 'unhealthy',
             'error': str(e),
             'backend': getattr(settings, 'CACHES', {}).get('default', {}).get('BACKEND', 'unknown')
-        }
\ No newline at end of file
+        }
+
+# Backends que guardam os valores no próprio processo: com vários workers,
+# cada um vê um cache diferente
+CACHES_LOCAIS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def cache_compartilhado(alias: str = "default") -> bool:
+    """O cache `alias` é visto por todos os processos (ex.: Redis)"""
+    backend = settings.CACHES.get(alias, {}).get("BACKEND", "")
+    return backend not in CACHES_LOCAIS
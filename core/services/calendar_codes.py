@@ -1,5 +1,4 @@
-from collections import defaultdict
-from datetime import date, datetime, time
+from datetime import date, datetime, time, timedelta
 
 from django.db.models import Q
 from django.utils import timezone
@@ -7,6 +6,7 @@ from django.utils import timezone
 from core.models import (
     Deslocamento,
     DisponibilidadeFormadores,
+    FormadoresSolicitacao,
     Solicitacao,
     SolicitacaoStatus,
 )
@@ -50,97 +50,100 @@ def _tem_desloc_no_dia(formador_id, dia: date) -> bool:
     ).exists()
 
 
+PESSOA_FIELDS = [f"pessoa_{n}_id" for n in range(1, 7)]
+
+
+def _deslocamentos_por_formador(formador_ids, dia_inicio, dia_fim):
+    """
+    Pares (formador_id, data) de deslocamentos no período.
+
+    Uma única consulta: UNION de `pessoa_N_id IN (...)` para N = 1..6,
+    em vez de um OR com 6 cláusulas por formador.
+    """
+    base = Deslocamento.objects.filter(data__gte=dia_inicio, data__lte=dia_fim)
+    consultas = [
+        base.filter(**{f"{campo}__in": formador_ids})
+        .order_by()
+        .values_list(campo, "data")
+        for campo in PESSOA_FIELDS
+    ]
+    return consultas[0].union(*consultas[1:])
+
+
 def gerar_mapa_mensal_otimizado(formadores, dias):
     """
     Versão otimizada que busca todos os dados de uma vez e processa em memória.
-    Reduz de N*M*4 consultas para apenas 4 consultas totais.
+
+    Três consultas no total (bloqueios, deslocamentos, eventos). Cada evento é
+    recortado aritmeticamente para os índices de dia que intersecta e os
+    dados são acumulados em arrays compactos por formador (um slot por dia).
     """
     if not formadores or not dias:
         return {}
 
-    # IDs dos formadores
-    formador_ids = [f.id for f in formadores]
-
-    # Data range do período
+    total_dias = len(dias)
+    posicao = {dia: i for i, dia in enumerate(dias)}
     dia_inicio = min(dias)
     dia_fim = max(dias)
-    dt_inicio, dt_fim = _dia_range(dia_inicio)
-    dt_inicio_periodo, dt_fim_periodo = _dia_range(dia_fim)
+    dt_inicio, _ = _dia_range(dia_inicio)
+    _, dt_fim_periodo = _dia_range(dia_fim)
+
+    formador_ids = [f.id for f in formadores]
+    # Bloqueios e eventos referenciam o Usuario vinculado ao Formador
+    formador_por_usuario = {f.usuario_id: f.id for f in formadores if f.usuario_id}
 
-    # === BUSCAR TODOS OS DADOS DE UMA VEZ ===
+    # === ARRAYS COMPACTOS POR FORMADOR ===
+    bloqueios = {fid: [None] * total_dias for fid in formador_ids}
+    deslocamentos = {fid: bytearray(total_dias) for fid in formador_ids}
+    eventos = {fid: [0] * total_dias for fid in formador_ids}
 
-    # 1. Todos os bloqueios do período
-    # Mapear formador_ids para usuario_ids
-    usuario_ids = [f.usuario.id for f in formadores if f.usuario]
-    bloqueios = DisponibilidadeFormadores.objects.filter(
-        usuario_id__in=usuario_ids,
+    # 1. Bloqueios do período (o último do dia prevalece, como na ordenação padrão)
+    for usuario_id, data_bloqueio, tipo in DisponibilidadeFormadores.objects.filter(
+        usuario_id__in=list(formador_por_usuario),
         data_bloqueio__gte=dia_inicio,
         data_bloqueio__lte=dia_fim,
-    ).select_related("usuario")
-
-    # 2. Todos os deslocamentos do período
-    from django.db.models import Q
-    desloc_query = Q()
-    for fid in formador_ids:
-        desloc_query |= (
-            Q(pessoa_1_id=fid) | Q(pessoa_2_id=fid) | Q(pessoa_3_id=fid) |
-            Q(pessoa_4_id=fid) | Q(pessoa_5_id=fid) | Q(pessoa_6_id=fid)
-        )
-    
-    deslocamentos = Deslocamento.objects.filter(
-        desloc_query, data__gte=dia_inicio, data__lte=dia_fim
-    ).select_related("pessoa_1", "pessoa_2", "pessoa_3", "pessoa_4", "pessoa_5", "pessoa_6")
-
-    # 3. Todos os eventos aprovados que intersectam o período
-    eventos = Solicitacao.objects.filter(
-        status="Aprovado",
-        formadores__in=formador_ids,
-        data_inicio__lte=dt_fim_periodo,
-        data_fim__gte=dt_inicio,
-    ).prefetch_related("formadores")
-
-    # === ORGANIZAR DADOS EM ESTRUTURAS RÁPIDAS ===
-
-    # Bloqueios: {formador_id: {data: tipo}}
-    bloqueios_map = defaultdict(dict)
-    for bloq in bloqueios:
-        # Mapear usuario_id para formador_id
-        if hasattr(bloq.usuario, 'formador_profile') and bloq.usuario.formador_profile:
-            formador_id = bloq.usuario.formador_profile.id
-            bloqueios_map[formador_id][bloq.data_bloqueio] = bloq.tipo_bloqueio.lower()
-
-    # Deslocamentos: {formador_id: {data: True}}
-    desloc_map = defaultdict(set)
-    for desloc in deslocamentos:
-        for formador in desloc.pessoas:
-            if formador:  # Verificar se não é None
-                desloc_map[formador.id].add(desloc.data)
-
-    # Eventos: {formador_id: {data: count}}
-    eventos_map = defaultdict(lambda: defaultdict(int))
-    for evento in eventos:
-        # Para cada dia que o evento intersecta
-        for dia in dias:
-            di, df = _dia_range(dia)
-            if evento.data_inicio <= df and evento.data_fim >= di:
-                for formador in evento.formadores.all():
-                    eventos_map[formador.id][dia] += 1
+    ).values_list("usuario_id", "data_bloqueio", "tipo_bloqueio"):
+        i = posicao.get(data_bloqueio)
+        if i is not None:
+            bloqueios[formador_por_usuario[usuario_id]][i] = tipo.lower()
+
+    # 2. Deslocamentos do período
+    for formador_id, data in _deslocamentos_por_formador(
+        formador_ids, dia_inicio, dia_fim
+    ):
+        i = posicao.get(data)
+        if i is not None:
+            deslocamentos[formador_id][i] = 1
+
+    # 3. Eventos aprovados que intersectam o período, um par por formador
+    vinculos = FormadoresSolicitacao.objects.filter(
+        usuario_id__in=list(formador_por_usuario),
+        solicitacao__status=SolicitacaoStatus.APROVADO,
+        solicitacao__data_inicio__lte=dt_fim_periodo,
+        solicitacao__data_fim__gte=dt_inicio,
+    ).values_list("usuario_id", "solicitacao__data_inicio", "solicitacao__data_fim")
+
+    um_dia = timedelta(days=1)
+    for usuario_id, inicio, fim in vinculos:
+        contagem = eventos[formador_por_usuario[usuario_id]]
+        # Dias [data local do início, data local do fim] recortados ao período
+        dia = max(timezone.localtime(inicio).date(), dia_inicio)
+        ultimo = min(timezone.localtime(fim).date(), dia_fim)
+        while dia <= ultimo:
+            i = posicao.get(dia)
+            if i is not None:
+                contagem[i] += 1
+            dia += um_dia
 
     # === GERAR MARCADORES OTIMIZADOS ===
-
     resultado = {}
     for formador in formadores:
-        celulas = []
-        for dia in dias:
-            marcador = _marcador_otimizado(
-                formador.id,
-                dia,
-                bloqueios_map[formador.id].get(dia),
-                dia in desloc_map[formador.id],
-                eventos_map[formador.id][dia],
-            )
-            celulas.append(marcador)
-        resultado[formador.id] = celulas
+        fid = formador.id
+        tipos, desloc, qtd = bloqueios[fid], deslocamentos[fid], eventos[fid]
+        resultado[fid] = [
+            _marcador_otimizado(fid, dia, tipos[i], bool(desloc[i]), qtd[i])
+            for i, dia in enumerate(dias)
+        ]
 
     return resultado
 
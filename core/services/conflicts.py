@@ -1,7 +1,11 @@
 # aprender_sistema/core/services/conflicts.py
-from datetime import datetime, time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import datetime, time, timedelta
 
+from django.conf import settings
 from django.db.models import Q
+from django.utils import timezone
 
 from core.models import (
     DisponibilidadeFormadores,
@@ -11,6 +15,147 @@ from core.models import (
 )
 
 
+class IntervalIndex:
+    """
+    Intervalos [inicio, fim) ordenados por início.
+
+    Como a duração máxima dos intervalos indexados é conhecida, qualquer
+    intervalo que intersecta [a, b) começa em [a - duracao_maxima, b): a busca
+    é um bisect sobre os inícios, O(log n + k).
+    """
+
+    def __init__(self, items=()):
+        self._items = sorted(items, key=lambda item: item[0])
+        self._starts = [item[0] for item in self._items]
+        self._max_length = max(
+            (end - start for start, end, _ in self._items), default=timedelta(0)
+        )
+
+    def __len__(self):
+        return len(self._items)
+
+    def overlapping(self, start, end):
+        """Payloads cujo intervalo intersecta (start, end) estritamente"""
+        lo = bisect_left(self._starts, start - self._max_length)
+        hi = bisect_left(self._starts, end)
+        return [
+            payload
+            for item_start, item_end, payload in self._items[lo:hi]
+            if item_end > start
+        ]
+
+    def starting_between(self, start, end):
+        """Payloads com início em [start, end]"""
+        lo = bisect_left(self._starts, start)
+        hi = bisect_right(self._starts, end)
+        return [payload for _, _, payload in self._items[lo:hi]]
+
+
+class AgendaIndex:
+    """
+    Índice em memória da agenda por formador: eventos aprovados e bloqueios.
+
+    Construído uma vez por requisição (ou por lote de validações) e usado
+    pelas regras RD-01..RD-05 deste módulo sem novas consultas ao banco.
+    Eventos podem ser objetos Solicitacao não salvos (simulações "e se").
+    """
+
+    def __init__(self):
+        self._events = defaultdict(list)
+        self._blocks = defaultdict(lambda: defaultdict(list))
+        self._indexes = {}
+        self._days = {}
+
+    @classmethod
+    def from_db(cls, formador_ids, dt_inicio, dt_fim, margin=timedelta(0)):
+        """
+        Carrega eventos aprovados que tocam [dt_inicio - margin, dt_fim + margin]
+        ou começam nos dias do período, e bloqueios dos dias do período.
+        """
+        index = cls()
+        formador_ids = list(formador_ids)
+        if not formador_ids:
+            return index
+
+        wanted = set(formador_ids)
+        dia_inicio, dia_fim = dt_inicio.date(), dt_fim.date()
+
+        bloqueios = DisponibilidadeFormadores.objects.filter(
+            usuario_id__in=formador_ids,
+            data_bloqueio__range=[dia_inicio, dia_fim],
+        ).select_related("usuario")
+        for bloqueio in bloqueios:
+            index.add_block(bloqueio.usuario_id, bloqueio)
+
+        solicitacoes = (
+            Solicitacao.objects.filter(
+                status=SolicitacaoStatus.APROVADO,
+                formadores__id__in=formador_ids,
+            )
+            .filter(
+                Q(data_inicio__lte=dt_fim + margin, data_fim__gte=dt_inicio - margin)
+                | Q(data_inicio__date__range=[dia_inicio, dia_fim])
+            )
+            .select_related("projeto", "municipio", "tipo_evento")
+            .prefetch_related("formadores")
+            .distinct()
+        )
+        for solicitacao in solicitacoes:
+            for formador in solicitacao.formadores.all():
+                if formador.id in wanted:
+                    index.add_event(formador.id, solicitacao)
+
+        return index
+
+    def add_event(self, formador_id, solicitacao):
+        self._events[formador_id].append(solicitacao)
+        self._indexes.pop(formador_id, None)
+        self._days.pop(formador_id, None)
+
+    def add_block(self, formador_id, bloqueio):
+        self._blocks[formador_id][bloqueio.data_bloqueio].append(bloqueio)
+
+    def _interval_index(self, formador_id):
+        if formador_id not in self._indexes:
+            self._indexes[formador_id] = IntervalIndex(
+                (e.data_inicio, e.data_fim, e)
+                for e in self._events.get(formador_id, [])
+            )
+        return self._indexes[formador_id]
+
+    def events_overlapping(self, formador_id, dt_inicio, dt_fim):
+        """RD-01: eventos que se sobrepõem a (dt_inicio, dt_fim)"""
+        return self._interval_index(formador_id).overlapping(dt_inicio, dt_fim)
+
+    def events_near(self, formador_id, dt_inicio, dt_fim, margin):
+        """RD-04: eventos a menos de `margin` do intervalo (inclui sobrepostos)"""
+        return self._interval_index(formador_id).overlapping(
+            dt_inicio - margin, dt_fim + margin
+        )
+
+    def events_on_day(self, formador_id, dia):
+        """RD-05: eventos que começam no dia (data local)"""
+        if formador_id not in self._days:
+            by_day = defaultdict(list)
+            for evento in self._events.get(formador_id, []):
+                inicio = evento.data_inicio
+                if timezone.is_aware(inicio):
+                    inicio = timezone.localtime(inicio)
+                by_day[inicio.date()].append(evento)
+            self._days[formador_id] = by_day
+        return self._days[formador_id].get(dia, [])
+
+    def blocks_between(self, formador_id, dia_inicio, dia_fim):
+        """RD-02/RD-03: bloqueios com data em [dia_inicio, dia_fim]"""
+        dias = self._blocks.get(formador_id, {})
+        resultado = []
+        dia = dia_inicio
+        while dia <= dia_fim:
+            resultado.extend(dias.get(dia, []))
+            dia += timedelta(days=1)
+        return resultado
+
+
 def intervals_overlap(a_start, a_end, b_start, b_end):
     """RD-01: Verifica sobreposição. Se fim == início → não conflita"""
     return a_start < b_end and b_start < a_end
@@ -49,42 +194,34 @@ def check_bloqueio_conflict(bloqueio, dt_inicio, dt_fim):
     return intervals_overlap(dt_inicio, dt_fim, b_start, b_end)
 
 
-def check_travel_buffer_conflict(formador, municipio_evento, dt_inicio, dt_fim):
+def check_travel_buffer_conflict(
+    formador, municipio_evento, dt_inicio, dt_fim, index=None
+):
     """
     RD-04: Verifica conflito de buffer de deslocamento
 
     Entre municípios distintos, exigir tempo mínimo de deslocamento.
     Para eventos no mesmo município, buffer pode ser zero.
-    """
-    from datetime import timedelta
-
-    from django.conf import settings
-    from django.utils import timezone as tz
 
+    Args:
+        index: AgendaIndex pré-carregado; se omitido, busca no banco
+    """
     buffer_minutes = getattr(settings, "TRAVEL_BUFFER_MINUTES", 90)
+    buffer = timedelta(minutes=buffer_minutes)
+
+    if index is None:
+        index = AgendaIndex.from_db([formador.id], dt_inicio, dt_fim, buffer)
 
-    # Buscar solicitações aprovadas do mesmo formador próximas no tempo
     conflitos_buffer = []
 
-    # Intervalo de busca: buffer antes e depois do evento
-    search_start = dt_inicio - timedelta(minutes=buffer_minutes)
-    search_end = dt_fim + timedelta(minutes=buffer_minutes)
-
-    # Buscar todas as solicitações aprovadas do formador para calcular gaps
-    solicitacoes_proximas = (
-        Solicitacao.objects.filter(
-            status=SolicitacaoStatus.APROVADO,
-            formadores=formador,
-        )
-        .exclude(
-            # Excluir o próprio evento se estiver editando
-            data_inicio=dt_inicio,
-            data_fim=dt_fim,
-        )
-        .select_related("municipio")
-    )
+    # Apenas eventos a menos de um buffer de distância podem violar RD-04
+    solicitacoes_proximas = index.events_near(formador.id, dt_inicio, dt_fim, buffer)
 
     for sol in solicitacoes_proximas:
+        # Excluir o próprio evento se estiver editando
+        if sol.data_inicio == dt_inicio and sol.data_fim == dt_fim:
+            continue
+
         # Verificar se são municípios diferentes
         if sol.municipio.id != municipio_evento.id:
             # Calcular tempo entre eventos
@@ -111,17 +248,15 @@ def check_travel_buffer_conflict(formador, municipio_evento, dt_inicio, dt_fim):
     return conflitos_buffer
 
 
-def check_daily_capacity_conflict(formador, dt_inicio, dt_fim):
+def check_daily_capacity_conflict(formador, dt_inicio, dt_fim, index=None):
     """
     RD-05: Verifica se o formador excederia a capacidade diária máxima
 
     Retorna dict com informações sobre a violação de capacidade, se houver.
-    """
-    from datetime import timedelta
-
-    from django.conf import settings
-    from django.utils import timezone as tz
 
+    Args:
+        index: AgendaIndex pré-carregado; se omitido, busca no banco
+    """
     max_daily_hours = getattr(settings, "MAX_DAILY_HOURS", 8)
 
     # Calcular duração do novo evento em horas
@@ -130,15 +265,15 @@ def check_daily_capacity_conflict(formador, dt_inicio, dt_fim):
     # Buscar todos os eventos aprovados do formador no mesmo dia
     data_evento = dt_inicio.date()
 
-    eventos_do_dia = Solicitacao.objects.filter(
-        status=SolicitacaoStatus.APROVADO,
-        formadores=formador,
-        data_inicio__date=data_evento,
-    ).exclude(
+    if index is None:
+        index = AgendaIndex.from_db([formador.id], dt_inicio, dt_fim)
+
+    eventos_do_dia = [
+        evento
+        for evento in index.events_on_day(formador.id, data_evento)
         # Excluir o próprio evento se estiver editando
-        data_inicio=dt_inicio,
-        data_fim=dt_fim,
-    )
+        if not (evento.data_inicio == dt_inicio and evento.data_fim == dt_fim)
+    ]
 
     # Calcular total de horas já ocupadas no dia
     horas_ocupadas = 0
@@ -159,13 +294,15 @@ def check_daily_capacity_conflict(formador, dt_inicio, dt_fim):
             "limite_diario": max_daily_hours,
             "excesso": total_com_novo - max_daily_hours,
             "tipo_conflito": "M",  # Mais de um evento (excesso de capacidade)
-            "eventos_do_dia": list(eventos_do_dia),
+            "eventos_do_dia": eventos_do_dia,
         }
 
     return None
 
 
-def check_conflicts(formadores_qs, dt_inicio, dt_fim, municipio_evento=None):
+def check_conflicts(
+    formadores_qs, dt_inicio, dt_fim, municipio_evento=None, index=None
+):
     """
     Retorna dict com conflitos seguindo RD-07 (ordem de prioridade):
     1. Bloqueios (T, P)
@@ -176,6 +313,8 @@ def check_conflicts(formadores_qs, dt_inicio, dt_fim, municipio_evento=None):
     Args:
         formadores_qs: QuerySet de Formador ou lista de objetos Formador
         municipio_evento: Municipio do evento (para RD-04)
+        index: AgendaIndex pré-carregado (validação em lote / simulações);
+            se omitido, é construído uma vez para todos os formadores
     """
     result = {
         "bloqueios": [],
@@ -185,51 +324,40 @@ def check_conflicts(formadores_qs, dt_inicio, dt_fim, municipio_evento=None):
     }
 
     # Suporte tanto para QuerySet quanto para lista
-    if hasattr(formadores_qs, "values_list"):
-        # É um QuerySet
-        formadores_ids = list(formadores_qs.values_list("id", flat=True))
-        formadores_objs = list(formadores_qs)
-    else:
-        # É uma lista de objetos Formador
-        formadores_ids = [f.id for f in formadores_qs]
-        formadores_objs = formadores_qs
+    formadores_objs = list(formadores_qs)
+    formadores_ids = [f.id for f in formadores_objs]
 
-    # RD-07.1: Prioridade 1 - Bloqueios de disponibilidade (RD-02/RD-03)
-    bloqueios = DisponibilidadeFormadores.objects.filter(
-        formador_id__in=formadores_ids,
-        data_bloqueio__range=[dt_inicio.date(), dt_fim.date()],
-    ).select_related("formador")
+    if index is None:
+        buffer = timedelta(minutes=getattr(settings, "TRAVEL_BUFFER_MINUTES", 90))
+        index = AgendaIndex.from_db(formadores_ids, dt_inicio, dt_fim, buffer)
 
-    for b in bloqueios:
-        if check_bloqueio_conflict(b, dt_inicio, dt_fim):
-            result["bloqueios"].append(b)
+    # RD-07.1: Prioridade 1 - Bloqueios de disponibilidade (RD-02/RD-03)
+    for formador_id in formadores_ids:
+        for b in index.blocks_between(formador_id, dt_inicio.date(), dt_fim.date()):
+            if check_bloqueio_conflict(b, dt_inicio, dt_fim):
+                result["bloqueios"].append(b)
 
     # RD-07.2: Prioridade 2 - Conflitos por eventos aprovados (RD-01)
-    if formadores_ids:  # Só procurar se houver formadores
-        solicitacoes = (
-            Solicitacao.objects.filter(
-                status=SolicitacaoStatus.APROVADO,
-                data_inicio__lt=dt_fim,
-                data_fim__gt=dt_inicio,
-                formadores__id__in=formadores_ids,  # Usar id explicitamente
-            )
-            .select_related("projeto", "municipio", "tipo_evento")
-            .prefetch_related("formadores")
-            .distinct()
-        )
-        result["solicitacoes"].extend(list(solicitacoes))
+    vistos = set()
+    for formador_id in formadores_ids:
+        for solicitacao in index.events_overlapping(formador_id, dt_inicio, dt_fim):
+            if id(solicitacao) not in vistos:
+                vistos.add(id(solicitacao))
+                result["solicitacoes"].append(solicitacao)
 
     # RD-07.3: Prioridade 3 - Buffer de deslocamento (RD-04)
     if municipio_evento:
         for formador in formadores_objs:
             conflitos_buffer = check_travel_buffer_conflict(
-                formador, municipio_evento, dt_inicio, dt_fim
+                formador, municipio_evento, dt_inicio, dt_fim, index=index
             )
             result["deslocamentos"].extend(conflitos_buffer)
 
     # RD-07.4: Prioridade 4 - Limite diário (RD-05)
     for formador in formadores_objs:
-        conflito_capacidade = check_daily_capacity_conflict(formador, dt_inicio, dt_fim)
+        conflito_capacidade = check_daily_capacity_conflict(
+            formador, dt_inicio, dt_fim, index=index
+        )
         if conflito_capacidade:
             result["capacidade_diaria"].append(conflito_capacidade)
 
@@ -1,18 +1,188 @@
+import codecs
 import csv
 import io
-from typing import List, Dict, Any
+import re
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from django.conf import settings
 from django.db import transaction
 from django.utils import timezone
-from core.models import CursoPlataforma, ImportacaoCursosCSV, Projeto
+
+from core.models import CursoPlataforma, ImportacaoCursosCSV, Projeto, ProjetoCursoLink
+from core.services.indice_nomes import IndiceNomes
+
+# Conteúdo entre aspas e sequências de espaços dentro dele
+_ENTRE_ASPAS = re.compile(r'"([^"]*)"')
+_ESPACOS = re.compile(r" +")
+
+# Padrões de matching para cada projeto, em ordem de prioridade
+PADROES_PROJETO = [
+    (["ACERTA"], "ACerta"),
+    (["NOVO LENDO"], "Super"),  # categoria ou nome
+    (["VIDA", "LINGUAGEM", "MATEMATICA"], "Vidas"),
+    (["BRINCANDO", "APRENDENDO"], "Brincando e Aprendendo"),
+    (["AMMA"], "Outros"),  # Projeto AMMA
+    (["COR DA GENTE"], "Outros"),  # A Cor da Gente
+    (["TEMA"], "Outros"),
+    (["AVANCANDO", "JUNTOS"], "Avançando Juntos"),
+]
+
+# Palavras-chave da busca por similaridade quando nenhum padrão casa
+PALAVRAS_PROJETO = {
+    "Super": ["SUPER", "NOVO", "LENDO"],
+    "ACerta": ["ACERTA", "LP", "MATEMATICA"],
+    "Vidas": ["VIDA", "LINGUAGEM", "CIENCIAS"],
+    "Brincando e Aprendendo": ["BRINCANDO", "INFANTIL", "PRE"],
+    "Outros": ["TEMA", "AMMA", "COR", "FINANCEIRA"],
+}
+
+
+class AutomatoPalavras:
+    """
+    Automato de Aho-Corasick: encontra, em uma única passada pelo texto,
+    todas as palavras-chave que aparecem nele como substring - inclusive
+    sobrepostas ("COR" e "COR DA GENTE", "TEMA" dentro de "MATEMATICA").
+    """
+
+    def __init__(self, palavras: Iterable[str]):
+        self._transicoes = [{}]
+        self._falha = [0]
+        self._saida = [set()]
+        for palavra in palavras:
+            self._adicionar(palavra)
+        self._montar_falhas()
+
+    def _adicionar(self, palavra: str):
+        estado = 0
+        for char in palavra:
+            proximo = self._transicoes[estado].get(char)
+            if proximo is None:
+                proximo = len(self._transicoes)
+                self._transicoes[estado][char] = proximo
+                self._transicoes.append({})
+                self._falha.append(0)
+                self._saida.append(set())
+            estado = proximo
+        self._saida[estado].add(palavra)
+
+    def _montar_falhas(self):
+        fila = deque(self._transicoes[0].values())
+        while fila:
+            estado = fila.popleft()
+            for char, proximo in self._transicoes[estado].items():
+                fila.append(proximo)
+                falha = self._falha[estado]
+                while falha and char not in self._transicoes[falha]:
+                    falha = self._falha[falha]
+                self._falha[proximo] = self._transicoes[falha].get(char, 0)
+                self._saida[proximo] |= self._saida[self._falha[proximo]]
+
+    def encontrar(self, texto: str) -> set:
+        """Palavras-chave presentes no texto"""
+        encontradas = set()
+        estado = 0
+        for char in texto:
+            while estado and char not in self._transicoes[estado]:
+                estado = self._falha[estado]
+            estado = self._transicoes[estado].get(char, 0)
+            if self._saida[estado]:
+                encontradas |= self._saida[estado]
+        return encontradas
+
+
+# Compilado uma vez por processo
+_AUTOMATO_PROJETOS = AutomatoPalavras(
+    {palavra for palavras, _ in PADROES_PROJETO for palavra in palavras}
+    | {palavra for palavras in PALAVRAS_PROJETO.values() for palavra in palavras}
+)
+
+
+def _limpar_aspas(match) -> str:
+    # Remove espaços únicos entre caracteres não-espaço; espaços
+    # duplos/triplos separam palavras e viram um espaço
+    return (
+        '"'
+        + _ESPACOS.sub(
+            lambda espacos: " " if len(espacos.group()) > 1 else "", match.group(1)
+        )
+        + '"'
+    )
+
+
+def limpar_linha(linha: str) -> str:
+    """
+    Limpa uma linha do CSV: remove caracteres nulos (UTF-16 lido como
+    latin1) e o espaçamento malformado entre aspas ('" I D "' -> '"ID"')
+    """
+    linha = linha.replace("\x00", "").rstrip("\n")
+    if '" ' in linha and ' "' in linha:
+        linha = _ENTRE_ASPAS.sub(_limpar_aspas, linha)
+    return linha
+
+
+def detectar_encoding(amostra: bytes) -> str:
+    """Encoding do arquivo a partir dos primeiros bytes"""
+    if amostra.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if amostra.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    try:
+        # Decoder incremental: um caractere cortado no fim da amostra não é erro
+        codecs.getincrementaldecoder("utf-8")().decode(amostra, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "latin1"
+
 
 class CursoCSVProcessor:
-    """Processador para importação de cursos da plataforma a partir de CSV"""
+    """
+    Processador para importação de cursos da plataforma a partir de CSV
 
-    def __init__(self):
+    O arquivo é lido e normalizado linha a linha e gravado em lotes de
+    CURSOS_CSV_CHUNK_SIZE cursos (upsert por id_curso), cada lote em sua
+    própria transação, com o progresso salvo na ImportacaoCursosCSV.
+    """
+
+    TAMANHO_AMOSTRA = 64 * 1024
+
+    def __init__(self, chunk_size: int = None):
         self.errors = []
         self.warnings = []
+        self.chunk_size = chunk_size or getattr(settings, "CURSOS_CSV_CHUNK_SIZE", 500)
+        self._projetos = None
+        self._indice_projetos = None
+
+    def process_csv_file(self, arquivo, ano_filter: int = None) -> Dict[str, Any]:
+        """
+        Processa um arquivo enviado (bytes) sem carregá-lo inteiro em memória
+
+        Args:
+            arquivo: UploadedFile ou qualquer arquivo binário
+            ano_filter: Filtro por ano (opcional)
 
-    def process_csv_content(self, csv_content: str, ano_filter: int = None) -> Dict[str, Any]:
+        Returns:
+            Dict com estatísticas da importação
+        """
+        binario = getattr(arquivo, "file", arquivo)
+        binario.seek(0)
+        encoding = detectar_encoding(binario.read(self.TAMANHO_AMOSTRA))
+        binario.seek(0)
+
+        texto = io.TextIOWrapper(binario, encoding=encoding, errors="replace")
+        try:
+            return self._processar_linhas(
+                texto,
+                ano_filter,
+                getattr(arquivo, "name", None) or "importacao_cursos.csv",
+            )
+        finally:
+            # Devolve o arquivo aberto para quem o enviou
+            texto.detach()
+
+    def process_csv_content(
+        self, csv_content: str, ano_filter: int = None
+    ) -> Dict[str, Any]:
         """
         Processa o conteúdo do CSV e importa os cursos
 
@@ -23,142 +193,191 @@ class CursoCSVProcessor:
         Returns:
             Dict com estatísticas da importação
         """
+        return self._processar_linhas(io.StringIO(csv_content), ano_filter)
+
+    def _linhas_limpas(self, linhas: Iterable[str]) -> Iterator[str]:
+        """
+        Registros limpos do CSV. Um campo entre aspas pode conter quebras de
+        linha: as linhas físicas são juntadas até as aspas fecharem, para
+        que a limpeza não desalinhe os pares de aspas nem descarte linhas
+        em branco dentro do campo.
+        """
+        registro = ""
+        for linha in linhas:
+            registro += linha if linha.endswith("\n") else linha + "\n"
+            if registro.count('"') % 2:
+                continue
+            registro, linha = "", limpar_linha(registro)
+            if linha.strip():
+                yield linha + "\n"
+        if registro.strip():
+            # Aspas sem fechamento: o leitor CSV reporta a linha
+            yield limpar_linha(registro) + "\n"
+
+    def _processar_linhas(
+        self,
+        linhas: Iterable[str],
+        ano_filter: int = None,
+        arquivo_nome: str = "importacao_cursos.csv",
+    ) -> Dict[str, Any]:
         self.errors = []
         self.warnings = []
+        # Projetos carregados uma vez por importação
+        self._projetos = None
+        self._indice_projetos = None
 
         try:
-            # Limpar encoding malformado (caracteres separados por espaços)
-            cleaned_content = self._clean_malformed_unicode(csv_content)
-
-            csv_file = io.StringIO(cleaned_content)
-            reader = csv.DictReader(csv_file, delimiter=';')
+            reader = csv.DictReader(self._linhas_limpas(linhas), delimiter=";")
 
             # Mapear colunas (flexível para diferentes formatos)
             fieldnames = reader.fieldnames
 
             if fieldnames is None:
-                raise ValueError("Arquivo CSV vazio ou mal formatado. Verifique se o arquivo contém dados válidos.")
+                raise ValueError(
+                    "Arquivo CSV vazio ou mal formatado. Verifique se o arquivo contém dados válidos."
+                )
 
             column_mapping = self._map_columns(fieldnames)
 
             if not column_mapping:
-                raise ValueError("Não foi possível identificar as colunas necessárias no CSV")
+                raise ValueError(
+                    "Não foi possível identificar as colunas necessárias no CSV"
+                )
 
             importacao = ImportacaoCursosCSV.objects.create(
-                arquivo_nome="importacao_cursos.csv",
-                status='PROCESSANDO'
+                arquivo_nome=arquivo_nome, status="PROCESSANDO"
             )
+            progresso = {
+                "total_linhas": 0,
+                "cursos_importados": 0,
+                "cursos_atualizados": 0,
+                "vinculos_criados": 0,
+            }
 
-            cursos_criados = 0
-            cursos_atualizados = 0
+            lote = []
+            for row_num, row in enumerate(
+                reader, start=2
+            ):  # Start at 2 (header is row 1)
+                progresso["total_linhas"] += 1
+                try:
+                    curso_data = self._extract_curso_data(
+                        row, column_mapping, ano_filter
+                    )
+                except Exception as e:
+                    self.errors.append(f"Erro na linha {row_num}: {str(e)}")
+                    continue
+                if not curso_data:
+                    continue
 
-            with transaction.atomic():
-                for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is row 1)
-                    try:
-                        curso_data = self._extract_curso_data(row, column_mapping, ano_filter)
-                        if not curso_data:
-                            continue
-
-                        curso, created = CursoPlataforma.objects.update_or_create(
-                            id_curso=curso_data['id_curso'],
-                            defaults=curso_data
-                        )
-
-                        if created:
-                            cursos_criados += 1
-                        else:
-                            cursos_atualizados += 1
-
-                        # Tentar vincular com projeto existente
-                        self._try_link_projeto(curso)
-
-                    except Exception as e:
-                        self.errors.append(f"Erro na linha {row_num}: {str(e)}")
-
-                importacao.cursos_importados = cursos_criados
-                importacao.cursos_atualizados = cursos_atualizados
-                importacao.status = 'CONCLUIDA' if len(self.errors) == 0 else 'ERRO'
-                importacao.data_fim = timezone.now()
-                importacao.log_processamento = f"Processado {cursos_criados + cursos_atualizados} cursos"
-                if self.errors:
-                    importacao.log_erros = "\n".join(self.errors)
-                importacao.save()
+                lote.append((row_num, curso_data))
+                if len(lote) >= self.chunk_size:
+                    self._gravar_lote(lote, importacao, progresso)
+                    lote = []
+            if lote:
+                self._gravar_lote(lote, importacao, progresso)
+
+            cursos_criados = progresso["cursos_importados"]
+            cursos_atualizados = progresso["cursos_atualizados"]
+            for campo, valor in progresso.items():
+                setattr(importacao, campo, valor)
+            importacao.status = "CONCLUIDA" if len(self.errors) == 0 else "ERRO"
+            importacao.data_fim = timezone.now()
+            importacao.log_processamento = (
+                f"Processado {cursos_criados + cursos_atualizados} cursos"
+            )
+            if self.errors:
+                importacao.log_erros = "\n".join(self.errors)
+            importacao.save()
 
             return {
-                'importacao_id': importacao.id,
-                'cursos_criados': cursos_criados,
-                'cursos_atualizados': cursos_atualizados,
-                'errors': self.errors,
-                'warnings': self.warnings
+                "importacao_id": importacao.id,
+                "cursos_criados": cursos_criados,
+                "cursos_atualizados": cursos_atualizados,
+                "vinculos_criados": progresso["vinculos_criados"],
+                "errors": self.errors,
+                "warnings": self.warnings,
             }
 
         except Exception as e:
             self.errors.append(f"Erro geral no processamento: {str(e)}")
             return {
-                'cursos_criados': 0,
-                'cursos_atualizados': 0,
-                'errors': self.errors,
-                'warnings': self.warnings
+                "cursos_criados": 0,
+                "cursos_atualizados": 0,
+                "errors": self.errors,
+                "warnings": self.warnings,
             }
 
-    def _detect_and_clean_encoding(self, content: str) -> str:
+    def _gravar_lote(self, lote, importacao, progresso):
         """
-        Detecta e limpa problemas de encoding, incluindo UTF-16 e espaçamento malformado
+        Grava um lote de linhas: upsert dos cursos, vínculo com projetos e
+        progresso da importação na mesma transação
         """
-        import re
-
-        # Primeiro, verificar se há caracteres nulos (indicativo de UTF-16 mal decodificado)
-        if '\x00' in content:
-            # Remover caracteres nulos (típico de UTF-16 lido como latin1)
-            content = content.replace('\x00', '')
-
-        # Aplicar limpeza de espaçamento malformado
-        lines = content.split('\n')
-        cleaned_lines = []
-
-        for line in lines:
-            if not line.strip():
-                continue
-
-            # Verificar se a linha tem o padrão de espaços entre caracteres
-            # Exemplo: '" I D "' -> '"ID"'
-            if '" ' in line and ' "' in line:
-                def clean_quoted_content(match):
-                    content_inner = match.group(1)  # Conteúdo entre aspas
-                    # Remove espaços únicos entre caracteres não-espaço
-                    # Preserva espaços duplos/triplos como separadores de palavras
-                    cleaned = ''
-                    i = 0
-                    while i < len(content_inner):
-                        char = content_inner[i]
-                        if char == ' ':
-                            # Contar espaços consecutivos
-                            space_count = 0
-                            j = i
-                            while j < len(content_inner) and content_inner[j] == ' ':
-                                space_count += 1
-                                j += 1
-
-                            # Se há múltiplos espaços, isso indica separador de palavra
-                            if space_count > 1:
-                                cleaned += ' '  # Um espaço para separar palavras
-                            # Se há apenas um espaço, é separador de caractere (remover)
-
-                            i = j
-                        else:
-                            cleaned += char
-                            i += 1
-
-                    return f'"{cleaned}"'
-
-                # Aplicar limpeza a todo conteúdo entre aspas
-                cleaned_line = re.sub(r'"([^"]*)"', clean_quoted_content, line)
-            else:
-                cleaned_line = line
+        ids = {data["id_curso"] for _, data in lote}
+        # Contagens do lote só entram no progresso depois do commit
+        novo = dict(progresso)
+        avisos = len(self.warnings)
+        try:
+            with transaction.atomic():
+                existentes = set(
+                    CursoPlataforma.objects.filter(id_curso__in=ids).values_list(
+                        "id_curso", flat=True
+                    )
+                )
+                # Linhas repetidas no arquivo: a última vence, as anteriores
+                # contam como atualização (como na gravação linha a linha)
+                por_id = {}
+                for _, data in lote:
+                    if data["id_curso"] in existentes or data["id_curso"] in por_id:
+                        novo["cursos_atualizados"] += 1
+                    else:
+                        novo["cursos_importados"] += 1
+                    por_id[data["id_curso"]] = data
+
+                # Um upsert por conjunto de colunas presentes (categoria e
+                # ano são opcionais e não devem apagar o valor já gravado)
+                por_campos = {}
+                for data in por_id.values():
+                    por_campos.setdefault(tuple(sorted(data)), []).append(
+                        CursoPlataforma(**data)
+                    )
+                for campos, cursos in por_campos.items():
+                    CursoPlataforma.objects.bulk_create(
+                        cursos,
+                        update_conflicts=True,
+                        unique_fields=["id_curso"],
+                        update_fields=[c for c in campos if c != "id_curso"]
+                        + ["data_atualizacao"],
+                    )
 
-            cleaned_lines.append(cleaned_line)
+                # Objetos do upsert não trazem o pk dos cursos que já existiam
+                cursos = list(
+                    CursoPlataforma.objects.filter(id_curso__in=ids).order_by(
+                        "id_curso"
+                    )
+                )
+                novo["vinculos_criados"] += self.vincular_projetos(cursos)
+
+                ImportacaoCursosCSV.objects.filter(pk=importacao.pk).update(
+                    log_processamento=(
+                        f"Processando: {novo['total_linhas']} linhas lidas, "
+                        f"{novo['cursos_importados'] + novo['cursos_atualizados']} cursos gravados"
+                    ),
+                    **novo,
+                )
+        except Exception as e:
+            # Lote desfeito: os avisos de vínculo dele também
+            del self.warnings[avisos:]
+            self.errors.append(
+                f"Erro no lote das linhas {lote[0][0]} a {lote[-1][0]}: {str(e)}"
+            )
+        else:
+            progresso.update(novo)
 
-        return '\n'.join(cleaned_lines)
+    def _detect_and_clean_encoding(self, content: str) -> str:
+        """
+        Detecta e limpa problemas de encoding, incluindo UTF-16 e espaçamento malformado
+        """
+        return "".join(self._linhas_limpas(content.split("\n"))).rstrip("\n")
 
     def _clean_malformed_unicode(self, content: str) -> str:
         """Método legado - mantido para compatibilidade"""
@@ -173,42 +392,51 @@ class CursoCSVProcessor:
             field_clean = field.strip()
             field_lower = field_clean.lower()
 
-            if field_clean == 'ID':
-                mapping['id'] = field
-            elif field_clean == 'Categoria':
-                mapping['categoria'] = field
-            elif 'nome' in field_lower and ('breve' in field_lower or 'completo' in field_lower):
+            if field_clean == "ID":
+                mapping["id"] = field
+            elif field_clean == "Categoria":
+                mapping["categoria"] = field
+            elif "nome" in field_lower and (
+                "breve" in field_lower or "completo" in field_lower
+            ):
                 # Preferir "Nome breve" se disponível
-                if 'breve' in field_lower:
-                    mapping['nome'] = field
-                elif 'nome' not in mapping:  # Use completo se breve não estiver disponível
-                    mapping['nome'] = field
+                if "breve" in field_lower:
+                    mapping["nome"] = field
+                elif (
+                    "nome" not in mapping
+                ):  # Use completo se breve não estiver disponível
+                    mapping["nome"] = field
 
         # Verificar se temos pelo menos ID e Nome
-        if 'id' in mapping and 'nome' in mapping:
+        if "id" in mapping and "nome" in mapping:
             return mapping
 
         return {}
 
-    def _extract_curso_data(self, row: Dict[str, str], column_mapping: Dict[str, str], ano_filter: int = None) -> Dict[str, Any]:
+    def _extract_curso_data(
+        self,
+        row: Dict[str, str],
+        column_mapping: Dict[str, str],
+        ano_filter: int = None,
+    ) -> Dict[str, Any]:
         """Extrai os dados do curso de uma linha do CSV"""
         try:
-            id_plataforma = row[column_mapping['id']].strip()
-            nome_original = row[column_mapping['nome']].strip()
+            id_plataforma = row[column_mapping["id"]].strip()
+            nome_original = row[column_mapping["nome"]].strip()
 
             if not id_plataforma or not nome_original:
                 return None
 
             data = {
-                'id_curso': id_plataforma,
-                'nome_breve': nome_original,
-                'nome_limpo': self._limpar_nome_curso(nome_original),
+                "id_curso": id_plataforma,
+                "nome_breve": nome_original,
+                "nome_limpo": self._limpar_nome_curso(nome_original),
             }
 
-            if 'categoria' in column_mapping:
-                categoria = row[column_mapping['categoria']].strip()
+            if "categoria" in column_mapping:
+                categoria = row[column_mapping["categoria"]].strip()
                 if categoria:
-                    data['categoria'] = categoria
+                    data["categoria"] = categoria
 
                     # Extrair ano da categoria se possível (formato "2025 Nome do Projeto")
                     categoria_parts = categoria.split()
@@ -219,7 +447,7 @@ class CursoCSVProcessor:
                         if ano_filter and ano_from_categoria != ano_filter:
                             return None
 
-                        data['ano'] = ano_from_categoria
+                        data["ano"] = ano_from_categoria
 
             return data
 
@@ -235,130 +463,119 @@ class CursoCSVProcessor:
 
         # Remover prefixos comuns (baseado no padrão da planilha)
         prefixes_to_remove = [
-            'ACERTA LP - ',
-            'ACERTA EF - ',
-            'ACERTA EM - ',
-            'SUPER - ',
-            'VIDAS - ',
-            'BRINCANDO - ',
+            "ACERTA LP - ",
+            "ACERTA EF - ",
+            "ACERTA EM - ",
+            "SUPER - ",
+            "VIDAS - ",
+            "BRINCANDO - ",
         ]
 
         for prefix in prefixes_to_remove:
             if nome.startswith(prefix):
-                nome = nome[len(prefix):]
+                nome = nome[len(prefix) :]
                 break
 
         # Limpar caracteres especiais e normalizar
-        nome = nome.replace('  ', ' ')  # Remover espaços duplos
+        nome = nome.replace("  ", " ")  # Remover espaços duplos
         nome = nome.strip()
 
         return nome
 
-    def _try_link_projeto(self, curso: CursoPlataforma):
-        """Tenta vincular automaticamente o curso com um projeto existente usando matching inteligente"""
-        try:
-            from core.models import ProjetoCursoLink, Projeto
+    def vincular_projetos(self, cursos: List[CursoPlataforma]) -> int:
+        """
+        Vincula automaticamente, em lote, os cursos ainda sem projeto
 
+        Returns:
+            Quantidade de vínculos criados
+        """
+        vinculados = set(
+            ProjetoCursoLink.objects.filter(curso_plataforma__in=cursos).values_list(
+                "curso_plataforma_id", flat=True
+            )
+        )
+        vinculos = []
+        for curso in cursos:
+            if curso.pk in vinculados:
+                continue
+            vinculados.add(curso.pk)
             projeto_match = self._find_projeto_match(curso)
-
             if projeto_match:
-                link, created = ProjetoCursoLink.objects.get_or_create(
-                    curso_plataforma=curso,
-                    defaults={'projeto': projeto_match}
+                vinculos.append(
+                    ProjetoCursoLink(projeto=projeto_match, curso_plataforma=curso)
+                )
+                self.warnings.append(
+                    f"Vinculado automaticamente: '{curso.nome_limpo}' → {projeto_match.nome}"
                 )
-                if created:
-                    self.warnings.append(
-                        f"Vinculado automaticamente: '{curso.nome_limpo}' → {projeto_match.nome} ({projeto_match.categoria})"
-                    )
             else:
                 self.warnings.append(
                     f"Não foi possível vincular automaticamente o curso '{curso.nome_limpo}'"
                 )
 
+        ProjetoCursoLink.objects.bulk_create(vinculos, ignore_conflicts=True)
+        return len(vinculos)
+
+    def _try_link_projeto(self, curso: CursoPlataforma):
+        """Tenta vincular automaticamente o curso com um projeto existente usando matching inteligente"""
+        try:
+            return self.vincular_projetos([curso])
         except Exception as e:
-            self.warnings.append(f"Erro ao tentar vincular curso '{curso.nome_limpo}': {str(e)}")
+            self.warnings.append(
+                f"Erro ao tentar vincular curso '{curso.nome_limpo}': {str(e)}"
+            )
+            return 0
 
     def _find_projeto_match(self, curso: CursoPlataforma):
         """Encontra o melhor projeto para um curso usando padrões de matching"""
-        from core.models import Projeto
-
-        nome_original = curso.nome_breve.upper()
         nome_limpo = curso.nome_limpo.upper()
-        categoria = curso.categoria.upper() if curso.categoria else ''
-
-        # Padrões de matching para diferentes tipos de projeto
-        padroes = [
-            # ACERTA
-            {'keywords': ['ACERTA'], 'projeto_nome': 'ACerta'},
-
-            # Novo Lendo (categoria ou nome)
-            {'keywords': ['NOVO LENDO'], 'projeto_nome': 'Super'},
-
-            # Vidas
-            {'keywords': ['VIDA', 'LINGUAGEM', 'MATEMATICA'], 'projeto_nome': 'Vidas'},
-
-            # Brincando e Aprendendo
-            {'keywords': ['BRINCANDO', 'APRENDENDO'], 'projeto_nome': 'Brincando e Aprendendo'},
-
-            # Projeto AMMA
-            {'keywords': ['AMMA'], 'projeto_nome': 'Outros'},
-
-            # A Cor da Gente
-            {'keywords': ['COR DA GENTE'], 'projeto_nome': 'Outros'},
-
-            # TEMA
-            {'keywords': ['TEMA'], 'projeto_nome': 'Outros'},
-
-            # Avançando Juntos
-            {'keywords': ['AVANCANDO', 'JUNTOS'], 'projeto_nome': 'Avançando Juntos'},
-        ]
-
-        # Testar cada padrão
-        for padrao in padroes:
-            keywords = padrao['keywords']
-            projeto_nome = padrao['projeto_nome']
-
-            # Verificar se alguma keyword está presente
-            match_found = False
-            for keyword in keywords:
-                if keyword in nome_original or keyword in nome_limpo or keyword in categoria:
-                    match_found = True
-                    break
+        no_nome_limpo = _AUTOMATO_PROJETOS.encontrar(nome_limpo)
+        encontradas = (
+            no_nome_limpo
+            | _AUTOMATO_PROJETOS.encontrar(curso.nome_breve.upper())
+            | _AUTOMATO_PROJETOS.encontrar(
+                curso.categoria.upper() if curso.categoria else ""
+            )
+        )
 
-            if match_found:
-                try:
-                    projeto = Projeto.objects.get(nome=projeto_nome)
-                    return projeto
-                except Projeto.DoesNotExist:
-                    continue
+        projetos = self._projetos_por_nome()
+        for keywords, projeto_nome in PADROES_PROJETO:
+            if projeto_nome in projetos and encontradas.intersection(keywords):
+                return projetos[projeto_nome]
 
         # Se não encontrou match específico, tentar busca por similaridade
-        return self._fuzzy_match_projeto(nome_limpo)
+        return self._fuzzy_match_projeto(nome_limpo, no_nome_limpo)
 
-    def _fuzzy_match_projeto(self, nome_curso):
+    def _projetos_por_nome(self):
+        if self._projetos is None:
+            self._projetos = {p.nome: p for p in Projeto.objects.order_by("id")}
+        return self._projetos
+
+    def _fuzzy_match_projeto(self, nome_curso, encontradas: Optional[set] = None):
         """Busca por similaridade quando não há match direto"""
-        from core.models import Projeto
-
-        # Palavras-chave para cada projeto
-        projeto_keywords = {
-            'Super': ['SUPER', 'NOVO', 'LENDO'],
-            'ACerta': ['ACERTA', 'LP', 'MATEMATICA'],
-            'Vidas': ['VIDA', 'LINGUAGEM', 'CIENCIAS'],
-            'Brincando e Aprendendo': ['BRINCANDO', 'INFANTIL', 'PRE'],
-            'Outros': ['TEMA', 'AMMA', 'COR', 'FINANCEIRA'],
-        }
-
-        for projeto_nome, keywords in projeto_keywords.items():
-            score = 0
-            for keyword in keywords:
-                if keyword in nome_curso:
-                    score += 1
-
-            # Se tem pelo menos 1 match, considerar
-            if score > 0:
-                try:
-                    return Projeto.objects.get(nome=projeto_nome)
-                except Projeto.DoesNotExist:
-                    continue
+        projetos = self._projetos_por_nome()
+        if encontradas is None:
+            encontradas = _AUTOMATO_PROJETOS.encontrar(nome_curso)
+
+        # Projeto com mais palavras-chave no nome; empate fica com o primeiro
+        melhor, melhor_score = None, 0
+        for projeto_nome, keywords in PALAVRAS_PROJETO.items():
+            score = len(encontradas.intersection(keywords))
+            if score > melhor_score and projeto_nome in projetos:
+                melhor, melhor_score = projetos[projeto_nome], score
+        if melhor:
+            return melhor
+
+        # Nome do curso parecido com o nome de um projeto cadastrado
+        if self._indice_projetos is None:
+            self._indice_projetos = IndiceNomes(
+                ((nome, projeto) for nome, projeto in projetos.items()), limiar=0.8
+            )
+        correspondencia = self._indice_projetos.buscar(nome_curso)
+        if correspondencia:
+            self.warnings.append(
+                f"Vínculo por similaridade: '{nome_curso}' → {correspondencia.nome} "
+                f"({correspondencia.metodo}, confiança {correspondencia.confianca:.2f})"
+            )
+            return correspondencia.valor
 
-        return None
\ No newline at end of file
+        return None
@@ -19,15 +19,23 @@ Regras de Negócio (RDs do CLAUDE.md):
 - RD-06: Timezone-aware (America/Fortaleza)
 """
 
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
 from typing import Dict, List, Optional, Set, Tuple
 
 from django.db import models
 from django.db.models import Q, QuerySet
 from django.utils import timezone
 
-from core.models import DisponibilidadeFormadores, Formador, Municipio, Solicitacao
+from core.models import (
+    DisponibilidadeFormadores,
+    Formador,
+    FormadoresSolicitacao,
+    Municipio,
+    Solicitacao,
+    SolicitacaoStatus,
+)
 
 
 @dataclass
@@ -54,6 +62,34 @@ class AvailabilityCheck:
     summary_message: str
 
 
+@dataclass
+class AgendaSnapshot:
+    """
+    Agenda pré-carregada de um conjunto de formadores para uma janela de tempo.
+
+    Contém bloqueios (T/P) do dia do evento e eventos aprovados próximos,
+    agrupados pelo id do usuário do formador (ver _agenda_id). Permite avaliar
+    RD-01..RD-05 em memória com número fixo de consultas, independente da
+    quantidade de formadores.
+    """
+
+    blocks: Dict[object, List[DisponibilidadeFormadores]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    events: Dict[object, List[Solicitacao]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+
+
+@dataclass
+class FreeSlot:
+    """Horário candidato encontrado pela busca de janelas livres"""
+
+    inicio: datetime
+    fim: datetime
+    conflicted: List = field(default_factory=list)  # ids dos formadores em conflito
+
+
 class DisponibilidadeEngine:
     """
     Motor principal de verificação de disponibilidade
@@ -110,9 +146,21 @@ class DisponibilidadeEngine:
         formadores_ok = []
         formadores_conflict = []
 
+        # Modo em lote: uma consulta para formadores, uma para bloqueios e
+        # uma para eventos, independente do número de formadores
+        formadores = list(formadores)
+        snapshot = self.load_snapshot(
+            _agenda_ids(formadores), data_inicio, data_fim, exclude_solicitacao
+        )
+
         for formador in formadores:
             conflicts = self._check_formador_availability(
-                formador, data_inicio, data_fim, municipio, exclude_solicitacao
+                formador,
+                data_inicio,
+                data_fim,
+                municipio,
+                exclude_solicitacao,
+                snapshot=snapshot,
             )
 
             if conflicts:
@@ -134,10 +182,97 @@ class DisponibilidadeEngine:
             available=available,
             code=code,
             conflicts=all_conflicts,
-            formadores_checked=list(formadores),
+            formadores_checked=formadores,
             summary_message=summary,
         )
 
+    def load_snapshot(
+        self,
+        usuario_ids: List,
+        data_inicio: datetime,
+        data_fim: datetime,
+        exclude_solicitacao: Optional[Solicitacao] = None,
+    ) -> AgendaSnapshot:
+        """
+        Carrega em duas consultas tudo o que RD-01..RD-05 precisam, para os
+        usuários informados (ids de _agenda_ids):
+
+        - bloqueios T/P do dia do evento
+        - eventos aprovados que tocam a janela [inicio - buffer, fim + buffer]
+          ou que começam no mesmo dia (capacidade diária)
+        """
+        snapshot = AgendaSnapshot()
+        event_date = data_inicio.date()
+        buffer = timedelta(minutes=self.travel_buffer_minutes)
+
+        blocks, events = self._fetch_agenda(
+            usuario_ids,
+            data_inicio - buffer,
+            data_fim + buffer,
+            event_date,
+            event_date,
+            exclude_solicitacao,
+        )
+        for usuario_id, block in blocks:
+            snapshot.blocks[usuario_id].append(block)
+        for usuario_id, event in events:
+            snapshot.events[usuario_id].append(event)
+
+        return snapshot
+
+    def _fetch_agenda(
+        self,
+        usuario_ids: List,
+        window_start: datetime,
+        window_end: datetime,
+        date_from,
+        date_to,
+        exclude_solicitacao: Optional[Solicitacao] = None,
+    ) -> Tuple[List[Tuple], List[Tuple]]:
+        """
+        Busca bloqueios T/P entre date_from e date_to e eventos aprovados que
+        tocam [window_start, window_end] ou começam no período.
+
+        Returns:
+            Tuple[[(usuario_id, bloqueio)], [(usuario_id, evento)]]
+        """
+        if not usuario_ids:
+            return [], []
+
+        blocks = DisponibilidadeFormadores.objects.filter(
+            usuario_id__in=usuario_ids,
+            tipo_bloqueio__in=["T", "P"],
+            data_bloqueio__gte=date_from,
+            data_bloqueio__lte=date_to,
+        )
+
+        links = (
+            FormadoresSolicitacao.objects.filter(
+                usuario_id__in=usuario_ids,
+                solicitacao__status=SolicitacaoStatus.APROVADO,
+            )
+            .filter(
+                Q(
+                    solicitacao__data_inicio__lte=window_end,
+                    solicitacao__data_fim__gte=window_start,
+                )
+                | Q(solicitacao__data_inicio__date__range=(date_from, date_to))
+            )
+            .select_related("solicitacao__municipio")
+            .order_by("-solicitacao__data_solicitacao")
+        )
+        if exclude_solicitacao:
+            links = links.exclude(solicitacao_id=exclude_solicitacao.id)
+
+        # Mesma instância de Solicitacao compartilhada entre formadores
+        events_by_id = {}
+        events = []
+        for link in links:
+            event = events_by_id.setdefault(link.solicitacao_id, link.solicitacao)
+            events.append((link.usuario_id, event))
+
+        return [(b.usuario_id, b) for b in blocks], events
+
     def _check_formador_availability(
         self,
         formador: Formador,
@@ -145,19 +280,24 @@ class DisponibilidadeEngine:
         data_fim: datetime,
         municipio: Municipio,
         exclude_solicitacao: Optional[Solicitacao],
+        snapshot: Optional[AgendaSnapshot] = None,
     ) -> List[ConflictInfo]:
         """
         Verifica disponibilidade de um formador específico
-        Implementa todas as regras RD-01 a RD-05
+        Implementa todas as regras RD-01 a RD-05 sobre a agenda pré-carregada
         """
+        if snapshot is None:
+            snapshot = self.load_snapshot(
+                _agenda_ids([formador]), data_inicio, data_fim, exclude_solicitacao
+            )
+
         conflicts = []
+        usuario_id = _agenda_id(formador)
+        blocks = snapshot.blocks.get(usuario_id, [])
+        events = snapshot.events.get(usuario_id, [])
 
         # RD-02: Verificar bloqueios totais (T)
-        # Buscar bloqueios do dia
-        event_date = data_inicio.date()
-        total_blocks = DisponibilidadeFormadores.objects.filter(
-            formador=formador, tipo_bloqueio="T", data_bloqueio=event_date
-        )
+        total_blocks = [b for b in blocks if b.tipo_bloqueio == "T"]
 
         for block in total_blocks:
             # Converter para datetime para comparação
@@ -182,9 +322,7 @@ class DisponibilidadeEngine:
                 )
 
         # RD-03: Verificar bloqueios parciais (P)
-        partial_blocks = DisponibilidadeFormadores.objects.filter(
-            formador=formador, tipo_bloqueio="P", data_bloqueio=event_date
-        )
+        partial_blocks = [b for b in blocks if b.tipo_bloqueio == "P"]
 
         for block in partial_blocks:
             # Converter para datetime para comparação
@@ -212,17 +350,9 @@ class DisponibilidadeEngine:
                 )
 
         # RD-01: Verificar sobreposição com eventos existentes (X)
-        existing_events = Solicitacao.objects.filter(
-            formadores=formador,
-            status__in=[
-                "APROVADO"
-            ],  # Usar apenas APROVADO baseado no SolicitacaoStatus
-            data_inicio__lt=data_fim,
-            data_fim__gt=data_inicio,
-        )
-
-        if exclude_solicitacao:
-            existing_events = existing_events.exclude(id=exclude_solicitacao.id)
+        existing_events = [
+            e for e in events if e.data_inicio < data_fim and e.data_fim > data_inicio
+        ]
 
         for event in existing_events:
             # Verificar se não é adjacente (fim == início não conflita)
@@ -240,14 +370,14 @@ class DisponibilidadeEngine:
 
         # RD-04: Verificar buffer de deslocamento (D)
         travel_conflicts = self._check_travel_buffer(
-            formador, data_inicio, data_fim, municipio, exclude_solicitacao
+            formador, data_inicio, data_fim, municipio, exclude_solicitacao, events
         )
         conflicts.extend(travel_conflicts)
 
         # RD-05: Verificar capacidade diária (M) - apenas se não houver outros conflitos
         if not conflicts:
             daily_conflicts = self._check_daily_capacity(
-                formador, data_inicio, data_fim, exclude_solicitacao
+                formador, data_inicio, data_fim, exclude_solicitacao, events
             )
             conflicts.extend(daily_conflicts)
 
@@ -260,28 +390,33 @@ class DisponibilidadeEngine:
         data_fim: datetime,
         municipio: Municipio,
         exclude_solicitacao: Optional[Solicitacao],
+        events: Optional[List[Solicitacao]] = None,
     ) -> List[ConflictInfo]:
         """
         RD-04: Verifica buffer de deslocamento entre municípios diferentes
         """
+        if events is None:
+            events = self.load_snapshot(
+                _agenda_ids([formador]), data_inicio, data_fim, exclude_solicitacao
+            ).events.get(_agenda_id(formador), [])
+
         conflicts = []
         buffer = timedelta(minutes=self.travel_buffer_minutes)
 
         # Buscar eventos próximos ao horário proposto
         buffer_start = data_inicio - buffer
         buffer_end = data_fim + buffer
-
-        nearby_events = (
-            Solicitacao.objects.filter(formadores=formador, status__in=["APROVADO"])
-            .exclude(municipio=municipio)
-            .filter(
-                Q(data_inicio__gte=buffer_start, data_inicio__lte=buffer_end)
-                | Q(data_fim__gte=buffer_start, data_fim__lte=buffer_end)
+        municipio_id = municipio.id if municipio else None
+
+        nearby_events = [
+            e
+            for e in events
+            if e.municipio_id != municipio_id
+            and (
+                buffer_start <= e.data_inicio <= buffer_end
+                or buffer_start <= e.data_fim <= buffer_end
             )
-        )
-
-        if exclude_solicitacao:
-            nearby_events = nearby_events.exclude(id=exclude_solicitacao.id)
+        ]
 
         for event in nearby_events:
             # Calcular se precisa de buffer entre municípios diferentes
@@ -314,20 +449,23 @@ class DisponibilidadeEngine:
         data_inicio: datetime,
         data_fim: datetime,
         exclude_solicitacao: Optional[Solicitacao],
+        events: Optional[List[Solicitacao]] = None,
     ) -> List[ConflictInfo]:
         """
         RD-05: Verifica se o formador não excede capacidade diária
         """
+        if events is None:
+            events = self.load_snapshot(
+                _agenda_ids([formador]), data_inicio, data_fim, exclude_solicitacao
+            ).events.get(_agenda_id(formador), [])
+
         conflicts = []
         event_date = data_inicio.date()
 
-        # Buscar eventos do mesmo dia
-        daily_events = Solicitacao.objects.filter(
-            formadores=formador, status__in=["APROVADO"], data_inicio__date=event_date
-        )
-
-        if exclude_solicitacao:
-            daily_events = daily_events.exclude(id=exclude_solicitacao.id)
+        # Eventos do mesmo dia (data local, como em data_inicio__date)
+        daily_events = [
+            e for e in events if timezone.localtime(e.data_inicio).date() == event_date
+        ]
 
         # Calcular horas já ocupadas
         total_hours = 0
@@ -404,7 +542,7 @@ class DisponibilidadeEngine:
         summary_parts = []
 
         for code, code_conflicts in conflicts_by_code.items():
-            formadores_with_code = {c.formador.nome for c in code_conflicts}
+            formadores_with_code = {_formador_nome(c.formador) for c in code_conflicts}
             count = len(formadores_with_code)
 
             code_names = {
@@ -431,47 +569,261 @@ class DisponibilidadeEngine:
         """
         Gera matriz de disponibilidade para período (equivalente ao mapa mensal)
 
+        Busca bloqueios e eventos do período inteiro de uma vez, distribui em
+        arrays densos por formador (um slot por dia) e avalia cada célula com as
+        mesmas regras de check_availability, janela 8h-17h.
+
         Returns:
             Dict[formador_nome][data_str] = código (E,M,D,P,T,X)
         """
-        matrix = {}
+        first_day = start_date.date()
+        last_day = end_date.date()
+        if last_day < first_day:
+            return {}
+
+        days = [
+            first_day + timedelta(days=offset)
+            for offset in range((last_day - first_day).days + 1)
+        ]
+        windows = [
+            (
+                timezone.make_aware(datetime.combine(day, time(8)), self.local_tz),
+                timezone.make_aware(datetime.combine(day, time(17)), self.local_tz),
+            )
+            for day in days
+        ]
 
-        current_date = start_date.date()
-        end = end_date.date()
+        formadores = list(formadores)
+        # Para matriz mensal, usar municipio genérico ou primeiro disponível
+        default_municipio = Municipio.objects.first() if formadores else None
+        buffer = timedelta(minutes=self.travel_buffer_minutes)
 
-        while current_date <= end:
-            for formador in formadores:
-                if formador.nome not in matrix:
-                    matrix[formador.nome] = {}
+        blocks, events = self._fetch_agenda(
+            _agenda_ids(formadores),
+            windows[0][0] - buffer,
+            windows[-1][1] + buffer,
+            first_day,
+            last_day,
+        )
 
-                # Verificar status do dia inteiro para o formador
-                day_start = timezone.make_aware(
-                    datetime.combine(current_date, datetime.min.time().replace(hour=8)),
-                    self.local_tz,
-                )
-                day_end = timezone.make_aware(
-                    datetime.combine(
-                        current_date, datetime.min.time().replace(hour=17)
-                    ),
-                    self.local_tz,
-                )
+        # Arrays densos: agenda[usuario_id][indice_do_dia] -> lista
+        day_blocks = defaultdict(lambda: [[] for _ in days])
+        day_events = defaultdict(lambda: [[] for _ in days])
 
-                # Usar check_availability para determinar código do dia
-                # Para matriz mensal, usar municipio genérico ou primeiro disponível
-                default_municipio = Municipio.objects.first()
+        for usuario_id, block in blocks:
+            day_blocks[usuario_id][(block.data_bloqueio - first_day).days].append(block)
 
-                check = self.check_availability(
-                    formadores.filter(id=formador.id),
+        last_index = len(days) - 1
+        for usuario_id, event in events:
+            # Dias cuja janela 8h-17h (+buffer) ou cuja data pode ser afetada
+            lo = timezone.localtime(event.data_inicio - buffer).date() - first_day
+            hi = timezone.localtime(event.data_fim + buffer).date() - first_day
+            slots = day_events[usuario_id]
+            for index in range(max(lo.days - 1, 0), min(hi.days, last_index) + 1):
+                slots[index].append(event)
+
+        matrix = {}
+        for formador in formadores:
+            usuario_id = _agenda_id(formador)
+            row = matrix.setdefault(_formador_nome(formador), {})
+            formador_blocks = day_blocks.get(usuario_id)
+            formador_events = day_events.get(usuario_id)
+
+            for index, day in enumerate(days):
+                snapshot = AgendaSnapshot()
+                if formador_blocks:
+                    snapshot.blocks[usuario_id] = formador_blocks[index]
+                if formador_events:
+                    snapshot.events[usuario_id] = formador_events[index]
+
+                day_start, day_end = windows[index]
+                conflicts = self._check_formador_availability(
+                    formador,
                     day_start,
                     day_end,
                     default_municipio,
+                    None,
+                    snapshot=snapshot,
                 )
+                row[day.strftime("%Y-%m-%d")] = self._determine_primary_code(
+                    conflicts, [], day
+                )
+
+        return matrix
+
+    def find_free_slots(
+        self,
+        formadores: QuerySet,
+        days: List,
+        duration: timedelta,
+        municipio: Municipio,
+        day_start: time = time(8),
+        day_end: time = time(17),
+        step: timedelta = timedelta(minutes=30),
+        max_conflicted: int = 0,
+        exclude_solicitacao: Optional[Solicitacao] = None,
+    ) -> List[FreeSlot]:
+        """
+        Busca horários de duração `duration` nos dias informados, em passos de
+        `step` dentro da janela [day_start, day_end].
 
-                matrix[formador.nome][current_date.strftime("%Y-%m-%d")] = check.code
+        A agenda de todos os formadores é carregada uma vez. Cada regra
+        RD-01..RD-04 vira um intervalo de inícios proibidos por formador; os
+        intervalos são mesclados e percorridos junto com os inícios candidatos
+        em uma única varredura. RD-05 depende apenas do dia e é pré-calculada.
 
-            current_date += timedelta(days=1)
+        Returns:
+            Candidatos em ordem cronológica com até `max_conflicted` formadores
+            em conflito e ao menos um formador livre.
+        """
+        formadores = list(formadores)
+        if not formadores or not days or duration <= timedelta(0):
+            return []
 
-        return matrix
+        days = sorted(days)
+        buffer = timedelta(minutes=self.travel_buffer_minutes)
+        municipio_id = municipio.id if municipio else None
+        hours = duration.total_seconds() / 3600
+
+        candidates = []
+        for day in days:
+            start = timezone.make_aware(datetime.combine(day, day_start), self.local_tz)
+            limit = timezone.make_aware(datetime.combine(day, day_end), self.local_tz)
+            while start + duration <= limit:
+                candidates.append(start)
+                start += step
+        if not candidates:
+            return []
+
+        blocks, events = self._fetch_agenda(
+            _agenda_ids(formadores),
+            candidates[0] - buffer,
+            candidates[-1] + duration + buffer,
+            days[0],
+            days[-1],
+            exclude_solicitacao,
+        )
+
+        # Intervalos de início proibidos: (lo, hi, lo_fechado, hi_fechado)
+        forbidden = defaultdict(list)
+        for usuario_id, block in blocks:
+            block_start = timezone.make_aware(
+                datetime.combine(block.data_bloqueio, block.hora_inicio), self.local_tz
+            )
+            block_end = timezone.make_aware(
+                datetime.combine(block.data_bloqueio, block.hora_fim), self.local_tz
+            )
+            closed = block.tipo_bloqueio == "T"  # RD-02 inclui as extremidades
+            forbidden[usuario_id].append(
+                (block_start - duration, block_end, closed, closed)
+            )
+
+        daily_hours = defaultdict(lambda: defaultdict(float))
+        for usuario_id, event in events:
+            intervals = forbidden[usuario_id]
+            # RD-01: sobreposição estrita (adjacência é permitida)
+            intervals.append(
+                (event.data_inicio - duration, event.data_fim, False, False)
+            )
+            # RD-04: folga menor que o buffer antes ou depois de outro município
+            if event.municipio_id != municipio_id:
+                intervals.append(
+                    (event.data_fim, event.data_fim + buffer, False, False)
+                )
+                intervals.append(
+                    (
+                        event.data_inicio - duration - buffer,
+                        event.data_inicio - duration,
+                        False,
+                        False,
+                    )
+                )
+            event_day = timezone.localtime(event.data_inicio).date()
+            daily_hours[usuario_id][event_day] += (
+                event.data_fim - event.data_inicio
+            ).total_seconds() / 3600
+
+        conflicted = [[] for _ in candidates]
+        for formador in formadores:
+            usuario_id = _agenda_id(formador)
+            merged = _merge_intervals(forbidden.get(usuario_id, []))
+            used = daily_hours.get(usuario_id, {})
+            j = 0
+            for index, start in enumerate(candidates):
+                # Avança sobre intervalos que terminam antes deste início
+                while j < len(merged) and (
+                    merged[j][1] < start or (merged[j][1] == start and not merged[j][3])
+                ):
+                    j += 1
+                blocked = j < len(merged) and _interval_contains(merged[j], start)
+                # RD-05: capacidade diária
+                if blocked or used.get(start.date(), 0) + hours > self.daily_hour_limit:
+                    conflicted[index].append(formador.id)
+
+        return [
+            FreeSlot(start, start + duration, ids)
+            for start, ids in zip(candidates, conflicted)
+            if len(ids) <= max_conflicted and len(ids) < len(formadores)
+        ]
+
+
+def _merge_intervals(intervals: List[Tuple]) -> List[Tuple]:
+    """
+    Mescla intervalos (lo, hi, lo_fechado, hi_fechado) ordenados por início.
+    Intervalos abertos que apenas se tocam permanecem separados: o ponto de
+    contato continua livre.
+    """
+    merged = []
+    for lo, hi, lo_closed, hi_closed in sorted(
+        intervals, key=lambda i: (i[0], not i[2])
+    ):
+        if merged:
+            last_lo, last_hi, last_lo_closed, last_hi_closed = merged[-1]
+            if lo < last_hi or (lo == last_hi and (lo_closed or last_hi_closed)):
+                if hi > last_hi:
+                    merged[-1] = (last_lo, hi, last_lo_closed, hi_closed)
+                elif hi == last_hi:
+                    merged[-1] = (
+                        last_lo,
+                        hi,
+                        last_lo_closed,
+                        hi_closed or last_hi_closed,
+                    )
+                continue
+        merged.append((lo, hi, lo_closed, hi_closed))
+    return merged
+
+
+def _interval_contains(interval: Tuple, point) -> bool:
+    lo, hi, lo_closed, hi_closed = interval
+    return lo < point < hi or (point == lo and lo_closed) or (point == hi and hi_closed)
+
+
+def _agenda_id(formador):
+    """
+    Id sob o qual a agenda do formador é gravada: bloqueios e vínculos com
+    solicitações apontam para o usuário. Formador legado → usuario_id (None
+    se não vinculado); Usuario → pk.
+    """
+    if isinstance(formador, Formador):
+        return formador.usuario_id
+    return formador.pk
+
+
+def _agenda_ids(formadores) -> List:
+    """Ids de agenda dos formadores, sem os legados sem usuário"""
+    return [
+        usuario_id
+        for usuario_id in map(_agenda_id, formadores)
+        if usuario_id is not None
+    ]
+
+
+def _formador_nome(formador) -> str:
+    """Nome de exibição para Formador (nome) ou Usuario (nome_completo)"""
+    return getattr(formador, "nome_completo", None) or getattr(
+        formador, "nome", str(formador)
+    )
 
 
 # Factory function para facilitar uso em views/commands
@@ -496,5 +848,5 @@ def check_formador_availability(
     # Usar municipio fornecido ou buscar um padrão
     target_municipio = municipio or Municipio.objects.first()
     return engine.check_availability(
-        Formador.objects.filter(id=formador.id), data_inicio, data_fim, target_municipio
+        [formador], data_inicio, data_fim, target_municipio
     )
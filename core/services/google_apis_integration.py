@@ -39,6 +39,12 @@ from core.models import (
     Solicitacao, SolicitacaoStatus, Formador, Municipio,
     LogAuditoria
 )
+from core.services.integrations.calendar_mirror import (
+    eventos_no_intervalo, sincronizar_se_necessario
+)
+from core.services import notification_dispatch
+from core.services.integrations import google_clients
+from core.services.integrations.google_calendar import GoogleCalendarService
 
 logger = logging.getLogger(__name__)
 
@@ -55,46 +61,47 @@ class GoogleAPIsManager:
             return
         
         self.credentials = None
-        self.services = {}
         self._setup_credentials()
     
     def _setup_credentials(self):
-        """Setup Google API credentials"""
+        """Setup Google API credentials (cached per process by token file)"""
         if not self.enabled:
             return
         
+        self.token_file = getattr(settings, 'GOOGLE_TOKEN_FILE', 'token.pickle')
         try:
-            # Paths for credentials
-            token_file = getattr(settings, 'GOOGLE_TOKEN_FILE', 'token.pickle')
-            credentials_file = getattr(settings, 'GOOGLE_CREDENTIALS_FILE', 'credentials.json')
-            
-            # Load existing token
-            if os.path.exists(token_file):
-                with open(token_file, 'rb') as token:
-                    self.credentials = pickle.load(token)
-            
-            # Refresh or create credentials
-            if not self.credentials or not self.credentials.valid:
-                if self.credentials and self.credentials.expired and self.credentials.refresh_token:
-                    self.credentials.refresh(Request())
-                else:
-                    logger.warning("Google credentials need manual authorization")
-                    # In production, implement proper OAuth flow
-                    
-                # Save credentials
-                with open(token_file, 'wb') as token:
-                    pickle.dump(self.credentials, token)
-            
-            logger.info("Google API credentials loaded successfully")
+            self.credentials = google_clients.fabrica.credenciais(
+                ('pickle', os.path.abspath(self.token_file)),
+                self._load_token,
+                ao_renovar=self._save_token,
+            )
+            if self.credentials is None or not self.credentials.valid:
+                logger.warning("Google credentials need manual authorization")
+                # In production, implement proper OAuth flow
+            else:
+                logger.debug("Google API credentials loaded")
             
         except Exception as e:
             logger.error(f"Failed to setup Google credentials: {e}")
             self.enabled = False
     
+    def _load_token(self):
+        if not os.path.exists(self.token_file):
+            return None
+        with open(self.token_file, 'rb') as token:
+            return pickle.load(token)
+    
+    def _save_token(self, credentials):
+        with open(self.token_file, 'wb') as token:
+            pickle.dump(credentials, token)
+    
     def get_service(self, service_name: str, version: str = 'v1') -> Optional[Any]:
         """
         Get Google API service client
         
+        Clients are shared by every manager in the current thread, so
+        discovery and connection setup happen once per thread.
+        
         Args:
             service_name: Service name (calendar, drive, gmail, sheets)
             version: API version
@@ -105,18 +112,16 @@ class GoogleAPIsManager:
         if not self.enabled or not self.credentials:
             return None
         
-        service_key = f"{service_name}_{version}"
-        if service_key not in self.services:
-            try:
-                self.services[service_key] = build(
-                    service_name, version, credentials=self.credentials
-                )
-                logger.info(f"Initialized {service_name} {version} service")
-            except Exception as e:
-                logger.error(f"Failed to initialize {service_name} service: {e}")
-                return None
-        
-        return self.services[service_key]
+        try:
+            return google_clients.discovery(
+                service_name,
+                version,
+                ('pickle', os.path.abspath(self.token_file)),
+                self.credentials,
+            )
+        except Exception as e:
+            logger.error(f"Failed to initialize {service_name} service: {e}")
+            return None
 
 
 class AdvancedCalendarService:
@@ -194,11 +199,11 @@ class AdvancedCalendarService:
                 }
             
             # Create event
-            created_event = self.calendar_service.events().insert(
+            created_event = google_clients.fabrica.executar(self.calendar_service.events().insert(
                 calendarId=calendar_id,
                 body=event_data,
                 conferenceDataVersion=1 if add_meet_link else 0
-            ).execute()
+            ), 'calendar.events.insert')
             
             logger.info(f"Created calendar event: {created_event['id']}")
             
@@ -244,10 +249,10 @@ class AdvancedCalendarService:
         
         try:
             # Get existing event
-            event = self.calendar_service.events().get(
+            event = google_clients.fabrica.executar(self.calendar_service.events().get(
                 calendarId=calendar_id,
                 eventId=solicitacao.evento_google
-            ).execute()
+            ), 'calendar.events.get')
             
             # Update event data
             event.update({
@@ -266,11 +271,11 @@ class AdvancedCalendarService:
             })
             
             # Update the event
-            updated_event = self.calendar_service.events().update(
+            updated_event = google_clients.fabrica.executar(self.calendar_service.events().update(
                 calendarId=calendar_id,
                 eventId=solicitacao.evento_google,
                 body=event
-            ).execute()
+            ), 'calendar.events.update')
             
             logger.info(f"Updated calendar event: {updated_event['id']}")
             return {
@@ -292,10 +297,10 @@ class AdvancedCalendarService:
             return False
         
         try:
-            self.calendar_service.events().delete(
+            google_clients.fabrica.executar(self.calendar_service.events().delete(
                 calendarId=calendar_id,
                 eventId=solicitacao.evento_google
-            ).execute()
+            ), 'calendar.events.delete')
             
             logger.info(f"Deleted calendar event: {solicitacao.evento_google}")
             
@@ -325,35 +330,33 @@ class AdvancedCalendarService:
         Returns:
             List of conflicting events
         """
-        if not self.calendar_service:
-            return []
-        
-        conflicts = []
         calendar_ids = calendar_ids or ['primary']
-        
-        try:
+
+        # Answered from the local mirror; the API is only asked for the
+        # incremental delta (syncToken) when the mirror is stale
+        if self.calendar_service:
             for calendar_id in calendar_ids:
-                events_result = self.calendar_service.events().list(
-                    calendarId=calendar_id,
-                    timeMin=start_time.isoformat(),
-                    timeMax=end_time.isoformat(),
-                    singleEvents=True,
-                    orderBy='startTime'
-                ).execute()
-                
-                events = events_result.get('items', [])
-                for event in events:
-                    conflicts.append({
-                        'calendar_id': calendar_id,
-                        'event_id': event['id'],
-                        'title': event.get('summary', 'No Title'),
-                        'start': event['start'].get('dateTime', event['start'].get('date')),
-                        'end': event['end'].get('dateTime', event['end'].get('date')),
-                        'link': event.get('htmlLink')
-                    })
-            
-            return conflicts
-            
+                service = GoogleCalendarService(calendar_id=calendar_id)
+                service._service = self.calendar_service
+                sincronizar_se_necessario(service=service)
+
+        try:
+            return [
+                {
+                    'calendar_id': evento.calendar_id,
+                    'event_id': evento.event_id,
+                    'title': evento.titulo or 'No Title',
+                    'start': evento.payload.get('start', {}).get(
+                        'dateTime', evento.payload.get('start', {}).get('date')
+                    ),
+                    'end': evento.payload.get('end', {}).get(
+                        'dateTime', evento.payload.get('end', {}).get('date')
+                    ),
+                    'link': evento.html_link or None,
+                }
+                for evento in eventos_no_intervalo(start_time, end_time, calendar_ids)
+            ]
+
         except Exception as e:
             logger.error(f"Failed to check calendar conflicts: {e}")
             return []
@@ -466,10 +469,10 @@ class GoogleDriveService:
             if parent_folder_id:
                 folder_metadata['parents'] = [parent_folder_id]
             
-            folder = self.drive_service.files().create(
+            folder = google_clients.fabrica.executar(self.drive_service.files().create(
                 body=folder_metadata,
                 fields='id'
-            ).execute()
+            ), 'drive.files.create')
             
             folder_id = folder.get('id')
             logger.info(f"Created Drive folder: {folder_id}")
@@ -494,10 +497,10 @@ class GoogleDriveService:
                         'role': 'editor',
                         'emailAddress': formador.usuario.email
                     }
-                    self.drive_service.permissions().create(
+                    google_clients.fabrica.executar(self.drive_service.permissions().create(
                         fileId=folder_id,
                         body=permission
-                    ).execute()
+                    ), 'drive.permissions.create')
             
             # Give view access to solicitante if not already a formador
             if not solicitacao.formadores.filter(usuario=solicitacao.usuario_solicitante).exists():
@@ -506,10 +509,10 @@ class GoogleDriveService:
                     'role': 'reader',
                     'emailAddress': solicitacao.usuario_solicitante.email
                 }
-                self.drive_service.permissions().create(
+                google_clients.fabrica.executar(self.drive_service.permissions().create(
                     fileId=folder_id,
                     body=permission
-                ).execute()
+                ), 'drive.permissions.create')
                 
         except Exception as e:
             logger.error(f"Failed to set folder permissions: {e}")
@@ -533,7 +536,10 @@ class GmailService:
         custom_message: Optional[str] = None
     ) -> bool:
         """
-        Send automated event notification via Gmail
+        Queue automated event notification emails
+
+        Delivery happens outside the request, in batches over one SMTP
+        connection (core.services.notification_dispatch).
         
         Args:
             solicitacao: Solicitacao instance
@@ -541,11 +547,8 @@ class GmailService:
             custom_message: Custom message to include
             
         Returns:
-            True if sent successfully
+            True if queued successfully
         """
-        if not self.gmail_service:
-            return False
-        
         try:
             # Build email content based on notification type
             subject, body = self._build_notification_content(
@@ -555,26 +558,20 @@ class GmailService:
             # Get recipients
             recipients = self._get_notification_recipients(solicitacao, notification_type)
             
-            # Send emails
-            for recipient in recipients:
-                message = self._create_message(
-                    sender='noreply@aprende_sistema.com',  # Configure properly
-                    to=recipient['email'],
-                    subject=subject,
-                    message_text=body
-                )
-                
-                self.gmail_service.users().messages().send(
-                    userId='me',
-                    body=message
-                ).execute()
-                
-                logger.info(f"Sent notification to {recipient['email']}")
+            logs = notification_dispatch.enfileirar_emails(
+                [(recipient['usuario'], recipient['email']) for recipient in recipients],
+                assunto=subject,
+                conteudo=body,
+                entidade_relacionada_id=solicitacao.id,
+                entidade_relacionada_tipo='solicitacao',
+                metadados={'notification_type': notification_type},
+            )
+            logger.info(f"Queued {len(logs)} notification emails")
             
             return True
             
         except Exception as e:
-            logger.error(f"Failed to send email notification: {e}")
+            logger.error(f"Failed to queue email notification: {e}")
             return False
     
     def _build_notification_content(
@@ -650,32 +647,21 @@ Sistema Aprender
         # Always include solicitante
         recipients.append({
             'email': solicitacao.usuario_solicitante.email,
-            'name': solicitacao.usuario_solicitante.get_full_name()
+            'name': solicitacao.usuario_solicitante.get_full_name(),
+            'usuario': solicitacao.usuario_solicitante,
         })
         
         # Include formadores for approvals and reminders
         if notification_type in ['approval', 'reminder']:
             for formador in solicitacao.formadores.all():
-                if formador.usuario.email:
+                if formador.email:
                     recipients.append({
-                        'email': formador.usuario.email,
-                        'name': formador.usuario.get_full_name()
+                        'email': formador.email,
+                        'name': formador.get_full_name(),
+                        'usuario': formador,
                     })
         
         return recipients
-    
-    def _create_message(self, sender: str, to: str, subject: str, message_text: str) -> Dict:
-        """Create email message for Gmail API"""
-        import base64
-        from email.mime.text import MIMEText
-        
-        message = MIMEText(message_text)
-        message['to'] = to
-        message['from'] = sender
-        message['subject'] = subject
-        
-        raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
-        return {'raw': raw_message}
 
 
 # Global service instances
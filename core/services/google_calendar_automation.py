@@ -8,23 +8,31 @@ respeitando o fluxo de negócio onde o Controle tem autonomia sobre a criação.
 """
 
 import logging
+from datetime import timedelta
 from typing import Any, Dict, Optional
 
 from django.conf import settings
-from django.db import transaction
+from django.db import connection, transaction
 from django.utils import timezone
 
 from core.models import (
     EventoGoogleCalendar,
     LogAuditoria,
+    OperacaoCalendario,
     Solicitacao,
     SolicitacaoStatus,
 )
+from core.services.background_jobs import enfileirar_apos_commit
+from core.services.integrations import calendar_outbox
+from core.services.integrations.calendar_bulk import create_events_concurrently
 from core.services.integrations.calendar_mapper import map_solicitacao_to_google_event
 from core.services.integrations.google_calendar import (
     GoogleCalendarService,
 )
 from core.services.integrations.google_calendar import is_enabled as google_enabled
+from core.services.notifications_simplified import notify_events_created_batch
+from core.signals.mapa_disponibilidade_signals import recalcular_solicitacoes_em_lote
+from core.signals.mapa_signals import publicar_atualizacao_em_lote
 
 logger = logging.getLogger(__name__)
 
@@ -87,119 +95,35 @@ class GoogleCalendarManagementService:
                 "meet_link": existing_event.meet_link,
             }
 
-        try:
-            # Criar evento no Google Calendar via ação manual do Controle
-            result = self._create_calendar_event_manual(solicitacao, user)
-
-            if result["success"]:
-                # Atualizar status para APROVADO após criação manual
-                solicitacao.status = SolicitacaoStatus.APROVADO
-                solicitacao.save(update_fields=["status"])
-
-                return {
-                    "success": True,
-                    "action": "created_manually",
-                    "event_id": result["event_id"],
-                    "html_link": result["html_link"],
-                    "meet_link": result["meet_link"],
-                    "message": "Evento criado manualmente pelo grupo Controle no Google Calendar",
-                }
-            else:
-                return result
-
-        except Exception as e:
-            logger.error(
-                f"Erro na criação manual pelo Controle - solicitação {solicitacao.id}: {e}"
-            )
-
-            # Registrar erro na auditoria
-            LogAuditoria.objects.create(
-                usuario=user,
-                acao="RF05: ERRO criação manual",
-                entidade_afetada_id=solicitacao.id,
-                detalhes=f"ERRO na criação manual pelo Controle: {str(e)}",
-            )
-
-            return {
-                "success": False,
-                "action": "error",
-                "reason": str(e),
-                "message": f"Erro na criação manual: {str(e)}",
-            }
-
-    def _create_calendar_event_manual(
-        self, solicitacao: Solicitacao, user
-    ) -> Dict[str, Any]:
-        """Cria evento no Google Calendar e registra no banco de dados"""
-        try:
-            # Converter solicitação para formato Google Event
-            gevent = map_solicitacao_to_google_event(solicitacao)
-
-            # Criar evento via API
-            api_result = self.calendar_service.create_event(gevent)
-
-            # Salvar referência no banco
-            evento_gc = EventoGoogleCalendar.objects.create(
-                solicitacao=solicitacao,
-                provider_event_id=api_result["id"],
-                html_link=api_result.get("htmlLink", ""),
-                meet_link=api_result.get("hangoutLink", ""),
-                criado_por=user,
-            )
-
-            # Registrar auditoria da criação manual
-            LogAuditoria.objects.create(
-                usuario=user,
-                acao="RF05: Controle criou evento manual",
-                entidade_afetada_id=solicitacao.id,
-                detalhes=f"Evento '{solicitacao.titulo_evento}' criado manualmente pelo Controle "
-                f"— ID: {api_result['id']} "
-                f"— Meet: {'Sim' if api_result.get('hangoutLink') else 'Não'}",
-            )
-
-            # Enviar notificações sobre evento criado (SEMANA 3 - DIA 4)
-            from core.services.notifications_simplified import notify_event_created
-
-            try:
-                notify_result = notify_event_created(solicitacao, evento_gc, user)
-                if notify_result["success"]:
-                    LogAuditoria.objects.create(
-                        usuario=user,
-                        acao="RF07: Notificações de evento criado enviadas",
-                        entidade_afetada_id=solicitacao.id,
-                        detalhes=f"Notificações enviadas: {notify_result['notifications_sent']}",
-                    )
-            except Exception as e:
-                # Erro nas notificações não deve interromper o processo
-                LogAuditoria.objects.create(
-                    usuario=user,
-                    acao="RF07: Erro em notificações de evento criado",
-                    entidade_afetada_id=solicitacao.id,
-                    detalhes=f"Erro: {str(e)}",
-                )
-
-            logger.info(
-                f"Evento criado com sucesso para solicitação {solicitacao.id}: {api_result['id']}"
-            )
+        # Registro criado já como Pendente; a chamada à API fica na outbox
+        # e é feita em segundo plano após o commit
+        evento_gc = EventoGoogleCalendar.objects.create(
+            solicitacao=solicitacao,
+            provider_event_id="",
+            usuario_criador=user,
+            status_sincronizacao=EventoGoogleCalendar.SincronizacaoStatus.PENDENTE,
+        )
+        calendar_outbox.registrar(solicitacao, OperacaoCalendario.Tipo.CRIAR, user)
 
-            return {
-                "success": True,
-                "event_id": api_result["id"],
-                "html_link": api_result.get("htmlLink", ""),
-                "meet_link": api_result.get("hangoutLink", ""),
-                "db_event_id": evento_gc.id,
-            }
+        # Aprovada pelo Controle; o andamento no Calendar fica no evento
+        solicitacao.status = SolicitacaoStatus.APROVADO
+        solicitacao.save(update_fields=["status"])
 
-        except Exception as e:
-            logger.error(
-                f"Erro ao criar evento no calendar para solicitação {solicitacao.id}: {e}"
-            )
-            raise
+        return {
+            "success": True,
+            "action": "queued",
+            "db_event_id": str(evento_gc.id),
+            "status_sincronizacao": evento_gc.status_sincronizacao,
+            "message": "Evento enfileirado para criação no Google Calendar",
+        }
 
     @transaction.atomic
     def update_calendar_event(self, solicitacao: Solicitacao, user) -> Dict[str, Any]:
         """
         Atualiza evento existente no Google Calendar quando solicitação é modificada.
+
+        A atualização é enfileirada; atualizações repetidas antes do
+        processamento viram uma única chamada à API.
         """
         if not google_enabled():
             return {
@@ -209,7 +133,9 @@ class GoogleCalendarManagementService:
             }
 
         try:
-            evento_gc = EventoGoogleCalendar.objects.get(solicitacao=solicitacao)
+            evento_gc = EventoGoogleCalendar.objects.select_for_update().get(
+                solicitacao=solicitacao
+            )
         except EventoGoogleCalendar.DoesNotExist:
             return {
                 "success": False,
@@ -217,55 +143,35 @@ class GoogleCalendarManagementService:
                 "reason": "No Google Calendar event found for this solicitacao",
             }
 
-        try:
-            # Converter solicitação atualizada
-            gevent = map_solicitacao_to_google_event(solicitacao)
-
-            # Atualizar via API
-            api_result = self.calendar_service.update_event(
-                evento_gc.provider_event_id, gevent
-            )
-
-            # Atualizar referência no banco
-            evento_gc.html_link = api_result.get("htmlLink", evento_gc.html_link)
-            evento_gc.meet_link = api_result.get("hangoutLink", evento_gc.meet_link)
-            evento_gc.save(update_fields=["html_link", "meet_link"])
-
-            # Registrar auditoria
-            LogAuditoria.objects.create(
-                usuario=user,
-                acao="RF05: Atualizar evento Google Calendar",
-                entidade_afetada_id=solicitacao.id,
-                detalhes=f"Evento '{solicitacao.titulo_evento}' atualizado no Google Calendar "
-                f"— ID: {evento_gc.provider_event_id}",
-            )
-
-            return {
-                "success": True,
-                "action": "updated",
-                "event_id": evento_gc.provider_event_id,
-                "html_link": api_result.get("htmlLink", ""),
-                "meet_link": api_result.get("hangoutLink", ""),
-            }
-
-        except Exception as e:
-            logger.error(
-                f"Erro ao atualizar evento para solicitação {solicitacao.id}: {e}"
-            )
+        # Criação que falhou em definitivo: tentar criar de novo
+        tipo = OperacaoCalendario.Tipo.ATUALIZAR
+        if (
+            not evento_gc.provider_event_id
+            and evento_gc.status_sincronizacao
+            == EventoGoogleCalendar.SincronizacaoStatus.ERRO
+        ):
+            tipo = OperacaoCalendario.Tipo.CRIAR
+        calendar_outbox.registrar(solicitacao, tipo, user)
 
-            LogAuditoria.objects.create(
-                usuario=user,
-                acao="RF05: ERRO atualização evento",
-                entidade_afetada_id=solicitacao.id,
-                detalhes=f"ERRO ao atualizar evento: {str(e)}",
-            )
+        evento_gc.status_sincronizacao = (
+            EventoGoogleCalendar.SincronizacaoStatus.PENDENTE
+        )
+        evento_gc.save(update_fields=["status_sincronizacao"])
 
-            return {"success": False, "action": "error", "reason": str(e)}
+        return {
+            "success": True,
+            "action": "queued",
+            "event_id": evento_gc.provider_event_id,
+            "status_sincronizacao": evento_gc.status_sincronizacao,
+        }
 
     @transaction.atomic
     def delete_calendar_event(self, solicitacao: Solicitacao, user) -> Dict[str, Any]:
         """
         Remove evento do Google Calendar quando solicitação é cancelada/rejeitada.
+
+        A remoção é enfileirada; o registro local é apagado quando o
+        Calendar confirmar.
         """
         if not google_enabled():
             return {
@@ -275,7 +181,9 @@ class GoogleCalendarManagementService:
             }
 
         try:
-            evento_gc = EventoGoogleCalendar.objects.get(solicitacao=solicitacao)
+            evento_gc = EventoGoogleCalendar.objects.select_for_update().get(
+                solicitacao=solicitacao
+            )
         except EventoGoogleCalendar.DoesNotExist:
             return {
                 "success": True,
@@ -283,43 +191,24 @@ class GoogleCalendarManagementService:
                 "reason": "No Google Calendar event to delete",
             }
 
-        try:
-            # Deletar via API
-            self.calendar_service.delete_event(evento_gc.provider_event_id)
-
-            # Registrar auditoria antes de deletar o registro
-            LogAuditoria.objects.create(
-                usuario=user,
-                acao="RF05: Deletar evento Google Calendar",
-                entidade_afetada_id=solicitacao.id,
-                detalhes=f"Evento '{solicitacao.titulo_evento}' removido do Google Calendar "
-                f"— ID: {evento_gc.provider_event_id}",
-            )
-
-            # Remover referência do banco
-            evento_gc.delete()
-
-            return {
-                "success": True,
-                "action": "deleted",
-                "event_id": evento_gc.provider_event_id,
-            }
-
-        except Exception as e:
-            logger.error(
-                f"Erro ao deletar evento para solicitação {solicitacao.id}: {e}"
-            )
-
-            LogAuditoria.objects.create(
-                usuario=user,
-                acao="RF05: ERRO remoção evento",
-                entidade_afetada_id=solicitacao.id,
-                detalhes=f"ERRO ao remover evento: {str(e)}",
-            )
+        calendar_outbox.registrar(
+            solicitacao,
+            OperacaoCalendario.Tipo.REMOVER,
+            user,
+            provider_event_id=evento_gc.provider_event_id,
+        )
+        evento_gc.status_sincronizacao = (
+            EventoGoogleCalendar.SincronizacaoStatus.PENDENTE
+        )
+        evento_gc.save(update_fields=["status_sincronizacao"])
 
-            return {"success": False, "action": "error", "reason": str(e)}
+        return {
+            "success": True,
+            "action": "queued",
+            "event_id": evento_gc.provider_event_id,
+            "status_sincronizacao": evento_gc.status_sincronizacao,
+        }
 
-    @transaction.atomic
     def bulk_create_events_for_controle(self, user) -> Dict[str, Any]:
         """
         Criação em lote MANUAL de eventos pelo grupo Controle.
@@ -327,6 +216,13 @@ class GoogleCalendarManagementService:
         Processa todas as solicitações em PRE_AGENDA que ainda não têm eventos
         criados no Google Calendar e permite ao Controle criar todos de uma vez.
 
+        As pendentes saem de uma única consulta (anti-join) e são reservadas
+        antes das chamadas (_reservar_pendentes), para que execuções
+        simultâneas não criem o mesmo evento duas vezes. As chamadas à API
+        rodam em paralelo com limite de taxa, fora de transação, e os
+        resultados são gravados em lote em uma transação curta. Se algo
+        falhar antes dessa gravação, as reservas são liberadas.
+
         Args:
             user: Usuário do grupo Controle
 
@@ -340,15 +236,8 @@ class GoogleCalendarManagementService:
                 "message": "Integração com Google Calendar está desabilitada",
             }
 
-        # Buscar solicitações PRE_AGENDA sem evento criado
-        solicitacoes_pendentes = []
-        for solicitacao in Solicitacao.objects.filter(
-            status=SolicitacaoStatus.PRE_AGENDA
-        ):
-            if not EventoGoogleCalendar.objects.filter(
-                solicitacao=solicitacao
-            ).exists():
-                solicitacoes_pendentes.append(solicitacao)
+        # Solicitações PRE_AGENDA sem evento, já reservadas para esta execução
+        solicitacoes_pendentes, reservas = self._reservar_pendentes(user)
 
         if not solicitacoes_pendentes:
             return {
@@ -360,53 +249,145 @@ class GoogleCalendarManagementService:
                 "failed": 0,
             }
 
-        results = []
-        successful = 0
-        failed = 0
-
+        gravado = False
+        try:
+            resultado = self._criar_reservados(user, solicitacoes_pendentes, reservas)
+            gravado = True
+            return resultado
+        finally:
+            if not gravado:
+                # Resultados não gravados: a próxima execução tenta de novo
+                EventoGoogleCalendar.objects.filter(
+                    pk__in=[evento.pk for evento in reservas.values()],
+                    provider_event_id="",
+                ).delete()
+
+    def _criar_reservados(self, user, solicitacoes_pendentes, reservas):
+        """Chama a API para as solicitações reservadas e grava os resultados"""
+        gevents = {}
+        erros = {}
         for solicitacao in solicitacoes_pendentes:
             try:
-                result = self.create_event_for_controle(solicitacao, user)
-                if result["success"]:
-                    successful += 1
-                else:
-                    failed += 1
+                gevents[solicitacao.pk] = map_solicitacao_to_google_event(solicitacao)
+            except Exception as e:
+                erros[solicitacao.pk] = e
 
-                results.append(
-                    {
-                        "solicitacao_id": str(solicitacao.id),
-                        "titulo": solicitacao.titulo_evento,
-                        "success": result["success"],
-                        "message": result.get("message", ""),
-                        "event_id": result.get("event_id", ""),
-                        "html_link": result.get("html_link", ""),
-                        "meet_link": result.get("meet_link", ""),
-                    }
-                )
+        respostas = create_events_concurrently(
+            gevents, service_factory=self._calendar_service_factory
+        )
 
-            except Exception as e:
-                failed += 1
+        results = []
+        criadas = []
+        eventos = []
+        falhas = []
+        logs = []
+        for solicitacao in solicitacoes_pendentes:
+            api_result, erro = respostas.get(
+                solicitacao.pk, (None, erros.get(solicitacao.pk))
+            )
+            if erro is None and not api_result.get("id"):
+                erro = RuntimeError(api_result.get("reason", "Resposta sem ID"))
+
+            if erro is not None:
+                logger.error(
+                    f"Erro na criação em lote - solicitação {solicitacao.id}: {erro}"
+                )
+                falhas.append(reservas[solicitacao.pk].pk)
+                logs.append(
+                    LogAuditoria(
+                        usuario=user,
+                        acao="RF05: ERRO criação manual",
+                        entidade_afetada_id=solicitacao.id,
+                        detalhes=f"ERRO na criação manual pelo Controle: {str(erro)}",
+                    )
+                )
                 results.append(
                     {
                         "solicitacao_id": str(solicitacao.id),
                         "titulo": solicitacao.titulo_evento,
                         "success": False,
-                        "error": str(e),
+                        "message": f"Erro na criação manual: {str(erro)}",
+                        "event_id": "",
+                        "html_link": "",
+                        "meet_link": "",
                     }
                 )
-
-                logger.error(
-                    f"Erro na criação em lote - solicitação {solicitacao.id}: {e}"
+                continue
+
+            solicitacao.status = SolicitacaoStatus.APROVADO
+            criadas.append(solicitacao)
+            evento = reservas[solicitacao.pk]
+            evento.provider_event_id = api_result["id"]
+            evento.html_link = api_result.get("htmlLink", "")
+            evento.meet_link = api_result.get("hangoutLink", "")
+            evento.raw_payload = api_result
+            evento.status_sincronizacao = EventoGoogleCalendar.SincronizacaoStatus.OK
+            eventos.append(evento)
+            logs.append(
+                LogAuditoria(
+                    usuario=user,
+                    acao="RF05: Controle criou evento manual",
+                    entidade_afetada_id=solicitacao.id,
+                    detalhes=f"Evento '{solicitacao.titulo_evento}' criado manualmente pelo Controle "
+                    f"— ID: {api_result['id']} "
+                    f"— Meet: {'Sim' if api_result.get('hangoutLink') else 'Não'}",
                 )
+            )
+            results.append(
+                {
+                    "solicitacao_id": str(solicitacao.id),
+                    "titulo": solicitacao.titulo_evento,
+                    "success": True,
+                    "message": "Evento criado manualmente pelo grupo Controle no Google Calendar",
+                    "event_id": api_result["id"],
+                    "html_link": api_result.get("htmlLink", ""),
+                    "meet_link": api_result.get("hangoutLink", ""),
+                }
+            )
+
+        successful = len(criadas)
+        failed = len(solicitacoes_pendentes) - successful
 
         # Log de auditoria da operação em lote
-        LogAuditoria.objects.create(
-            usuario=user,
-            acao="RF05: Controle - Criação em lote de eventos",
-            detalhes=f"Processadas {len(solicitacoes_pendentes)} solicitações "
-            f"— {successful} sucessos, {failed} falhas",
+        logs.append(
+            LogAuditoria(
+                usuario=user,
+                acao="RF05: Controle - Criação em lote de eventos",
+                detalhes=f"Processadas {len(solicitacoes_pendentes)} solicitações "
+                f"— {successful} sucessos, {failed} falhas",
+            )
         )
 
+        with transaction.atomic():
+            EventoGoogleCalendar.objects.bulk_update(
+                eventos,
+                [
+                    "provider_event_id",
+                    "html_link",
+                    "meet_link",
+                    "raw_payload",
+                    "status_sincronizacao",
+                ],
+            )
+            # Falhas liberam a reserva: a próxima execução tenta de novo
+            EventoGoogleCalendar.objects.filter(pk__in=falhas).delete()
+            if criadas:
+                Solicitacao.objects.filter(pk__in=[s.pk for s in criadas]).update(
+                    status=SolicitacaoStatus.APROVADO
+                )
+                # update() não dispara post_save: mapa e tempo real explícitos
+                recalcular_solicitacoes_em_lote(criadas)
+                publicar_atualizacao_em_lote(criadas)
+
+                # Enviar notificações sobre eventos criados (SEMANA 3 - DIA 4)
+                enfileirar_apos_commit(
+                    "notify_events_created_batch_task",
+                    notify_events_created_batch,
+                    [str(s.pk) for s in criadas],
+                    user.pk,
+                )
+            LogAuditoria.objects.bulk_create(logs)
+
         return {
             "success": failed == 0,
             "action": "bulk_create_completed",
@@ -417,6 +398,67 @@ class GoogleCalendarManagementService:
             "message": f"Criação em lote concluída: {successful} sucessos, {failed} falhas",
         }
 
+    def _reservar_pendentes(self, user):
+        """
+        Reserva as solicitações PRE_AGENDA sem evento: trava as linhas com
+        select_for_update(skip_locked) e grava para cada uma um
+        EventoGoogleCalendar Pendente, ainda sem id no Calendar. Uma execução
+        simultânea pula as linhas travadas e, após o commit, não as vê mais
+        como pendentes.
+
+        A reserva expira após GOOGLE_CALENDAR_RESERVA_TIMEOUT segundos, caso
+        o processo morra no meio do lote: reservas vencidas são apagadas e
+        as solicitações voltam a ser pendentes. (Criações manuais também
+        gravam o evento Pendente sem id, mas aprovam a solicitação e ficam
+        a cargo da outbox; não entram aqui.)
+
+        Returns:
+            (solicitações reservadas, {solicitacao_id: evento reservado})
+        """
+        vencimento = timezone.now() - timedelta(
+            seconds=getattr(settings, "GOOGLE_CALENDAR_RESERVA_TIMEOUT", 600)
+        )
+        with transaction.atomic():
+            EventoGoogleCalendar.objects.filter(
+                solicitacao__status=SolicitacaoStatus.PRE_AGENDA,
+                provider_event_id="",
+                status_sincronizacao=EventoGoogleCalendar.SincronizacaoStatus.PENDENTE,
+                data_criacao__lt=vencimento,
+            ).delete()
+
+            qs = Solicitacao.objects.filter(
+                status=SolicitacaoStatus.PRE_AGENDA, evento_google__isnull=True
+            ).order_by("pk")
+            if connection.features.has_select_for_update_skip_locked:
+                # of=self: o anti-join é LEFT JOIN, só a solicitação é travada
+                of = ("self",) if connection.features.has_select_for_update_of else ()
+                qs = qs.select_for_update(skip_locked=True, of=of)
+            ids = list(qs.values_list("pk", flat=True))
+            reservas = EventoGoogleCalendar.objects.bulk_create(
+                [
+                    EventoGoogleCalendar(
+                        solicitacao_id=pk,
+                        usuario_criador=user,
+                        provider_event_id="",
+                        status_sincronizacao=EventoGoogleCalendar.SincronizacaoStatus.PENDENTE,
+                    )
+                    for pk in ids
+                ]
+            )
+
+        solicitacoes = list(
+            Solicitacao.objects.filter(pk__in=ids)
+            .select_related(
+                "projeto", "municipio", "tipo_evento", "usuario_solicitante"
+            )
+            .prefetch_related("formadores")
+        )
+        return solicitacoes, {evento.solicitacao_id: evento for evento in reservas}
+
+    def _calendar_service_factory(self) -> GoogleCalendarService:
+        """Um cliente por thread do lote, no mesmo calendário deste serviço"""
+        return GoogleCalendarService(calendar_id=self.calendar_service.calendar_id)
+
     def get_pre_agenda_summary(self) -> Dict[str, Any]:
         """
         Retorna resumo das solicitações em PRE_AGENDA para o grupo Controle.
@@ -9,12 +9,15 @@ Autor: Claude Code
 Data: Janeiro 2025
 """
 
+import json
 import logging
 import os
 from typing import Dict, List, Optional, Any
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 
+from core.services.integrations import google_clients
+
 try:
     import gspread
     from google.oauth2.service_account import Credentials
@@ -66,6 +69,29 @@ class GoogleSheetsService:
             "3) Use existing google_authorized_user.json"
         )
     
+    def _load_credentials(self, creds_path: str):
+        """Lê as credenciais, detectando o tipo pelo conteúdo do arquivo"""
+        with open(creds_path, 'r') as f:
+            creds_data = json.load(f)
+        
+        if 'type' in creds_data and creds_data['type'] == 'service_account':
+            # Service Account credentials
+            scopes = [
+                'https://www.googleapis.com/auth/spreadsheets',
+                'https://www.googleapis.com/auth/drive.file'
+            ]
+            logger.info("Using Service Account credentials")
+            return Credentials.from_service_account_file(creds_path, scopes=scopes)
+        
+        if 'refresh_token' in creds_data:
+            # OAuth2 credentials
+            logger.info("Using OAuth2 user credentials")
+            return OAuth2Credentials.from_authorized_user_file(creds_path)
+        
+        raise ImproperlyConfigured(
+            f"Unknown credential format in {creds_path}"
+        )
+    
     def _get_client(self) -> gspread.Client:
         """Obtém cliente gspread autenticado"""
         if gspread is None:
@@ -73,43 +99,25 @@ class GoogleSheetsService:
                 "gspread not installed. Run: pip install gspread"
             )
             
-        if self._client is None:
-            try:
-                creds_path = self._get_credentials_path()
-                
-                # Detectar tipo de credencial pelo conteúdo do arquivo
-                with open(creds_path, 'r') as f:
-                    import json
-                    creds_data = json.load(f)
-                
-                if 'type' in creds_data and creds_data['type'] == 'service_account':
-                    # Service Account credentials
-                    scopes = [
-                        'https://www.googleapis.com/auth/spreadsheets',
-                        'https://www.googleapis.com/auth/drive.file'
-                    ]
-                    credentials = Credentials.from_service_account_file(
-                        creds_path, scopes=scopes
-                    )
-                    logger.info("Using Service Account credentials")
-                    
-                elif 'refresh_token' in creds_data:
-                    # OAuth2 credentials
-                    credentials = OAuth2Credentials.from_authorized_user_file(creds_path)
-                    logger.info("Using OAuth2 user credentials")
-                    
-                else:
-                    raise ImproperlyConfigured(
-                        f"Unknown credential format in {creds_path}"
-                    )
-                
-                self._client = gspread.authorize(credentials)
-                logger.info("Google Sheets client initialized successfully")
-                
-            except Exception as e:
-                logger.error(f"Failed to initialize Google Sheets client: {e}")
-                raise
-                
+        try:
+            creds_path = self._get_credentials_path()
+            chave = ('sheets', os.path.abspath(creds_path))
+            
+            # Credenciais e cliente compartilhados pelo processo; passar
+            # pela fábrica a cada uso renova o token antes de expirar
+            credentials = google_clients.fabrica.credenciais(
+                chave, lambda: self._load_credentials(creds_path)
+            )
+            self._client = google_clients.fabrica.cliente(
+                chave,
+                lambda: gspread.authorize(credentials),
+                compartilhado=True,
+            )
+            
+        except Exception as e:
+            logger.error(f"Failed to initialize Google Sheets client: {e}")
+            raise
+            
         return self._client
     
     def get_worksheet_data(
@@ -0,0 +1,628 @@
+"""
+Motor de importação das planilhas de agenda
+
+Os comandos import_* montam uma LinhaImportada por linha da planilha e
+entregam o lote ao ImportadorAgenda, que:
+
+- carrega municípios, projetos, tipos de evento, setores e usuários uma
+  única vez, em dicionários indexados pelo nome normalizado; municípios e
+  pessoas também são resolvidos por aproximação (IndiceNomes), e as
+  correspondências não exatas saem no resumo com a confiança;
+- resolve as referências de todas as linhas em memória e cria as que
+  faltam com bulk_create;
+- grava Solicitacao e FormadoresSolicitacao em blocos (bulk_create para
+  as novas, bulk_update para as já existentes com mesmo título e início);
+  os vínculos das atualizadas passam a ser exatamente os da linha.
+
+Com um RegistroAssinaturas (importação incremental), só as linhas novas ou
+alteradas desde a execução anterior são gravadas; as alteradas atualizam a
+solicitação existente mesmo sem atualizar_existentes.
+
+bulk_create não dispara post_save: o mapa de disponibilidade e o mapa em
+tempo real são atualizados explicitamente para o lote. Nas atualizadas,
+as células antigas (datas, status e formadores de antes) também são
+recalculadas.
+"""
+
+import logging
+import re
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db import transaction
+
+from core.models import (
+    Formador,
+    FormadoresSolicitacao,
+    Municipio,
+    Projeto,
+    Setor,
+    Solicitacao,
+    TipoEvento,
+)
+from core.services.importacao_incremental import RegistroAssinaturas, chave_texto
+from core.services.indice_nomes import IndiceNomes, normalizar
+from core.signals.mapa_disponibilidade_signals import recalcular_solicitacoes_em_lote
+from core.signals.mapa_signals import publicar_atualizacao_em_lote
+
+logger = logging.getLogger(__name__)
+
+UF_PADRAO = "CE"
+DURACAO_MAXIMA = timedelta(hours=12)
+
+_UF_NO_NOME = re.compile(r"^(.*?)\s*-\s*([A-Za-z]{2})$")
+
+CAMPOS_SOLICITACAO = [
+    "usuario_solicitante",
+    "projeto",
+    "municipio",
+    "tipo_evento",
+    "data_fim",
+    "status",
+    "observacoes",
+    "numero_encontro_formativo",
+    "coordenador_acompanha",
+]
+
+
+def separar_uf(nome_municipio: str) -> Tuple[str, str]:
+    """ "Dias d'Avila - BA" → ("Dias d'Avila", "BA"); sem UF → UF_PADRAO"""
+    nome_municipio = nome_municipio.strip()
+    match = _UF_NO_NOME.match(nome_municipio)
+    if match:
+        return match.group(1).strip(), match.group(2).upper()
+    return nome_municipio, UF_PADRAO
+
+
+def _slug(nome: str) -> str:
+    return re.sub(r"[^a-z0-9]+", ".", normalizar(nome)).strip(".")
+
+
+@dataclass
+class LinhaImportada:
+    """Uma solicitação lida da planilha, com referências ainda por nome"""
+
+    linha: int
+    titulo: str
+    municipio: str
+    projeto: str
+    tipo_evento: str
+    data_inicio: datetime
+    data_fim: datetime
+    status: str
+    formadores: List[str] = field(default_factory=list)
+    # Nome do solicitante; vazio usa o primeiro superusuário
+    solicitante: str = ""
+    tipo_evento_online: bool = False
+    observacoes: str = ""
+    numero_encontro_formativo: str = "1"
+    coordenador_acompanha: bool = False
+
+    @property
+    def chave(self):
+        return (self.titulo, self.data_inicio)
+
+
+class ImportadorAgenda:
+    """
+    Args:
+        origem: nome da aba/planilha, usado em descrições e e-mails gerados
+        setor_do_projeto: nome do projeto → (nome do setor, vinculado à
+            superintendência) para projetos novos
+        atualizar_existentes: solicitação já existente (mesmo título e
+            início) é atualizada; senão, a linha é ignorada
+        limiar: confiança mínima para aceitar um nome aproximado
+        batch_size: tamanho dos blocos de bulk_create
+    """
+
+    def __init__(
+        self,
+        origem: str,
+        setor_do_projeto: Optional[Callable[[str], Tuple[str, bool]]] = None,
+        atualizar_existentes: bool = False,
+        batch_size: Optional[int] = None,
+        limiar: Optional[float] = None,
+    ):
+        self.origem = origem
+        self.setor_do_projeto = setor_do_projeto or (lambda nome: ("Sem Setor", True))
+        self.atualizar_existentes = atualizar_existentes
+        self.batch_size = batch_size or getattr(
+            settings, "BULK_CREATE_BATCH_SIZE", 1000
+        )
+        self.limiar = limiar or getattr(settings, "IMPORTACAO_LIMIAR_NOMES", 0.85)
+        self.User = get_user_model()
+        self._carregado = False
+        self._alteradas = set()
+        self.aproximacoes = {}
+
+    # Caches de referência
+
+    def carregar(self):
+        """Lê as tabelas de referência (uma consulta por tabela)"""
+        # Caches de resolução: chave normalizada → objeto
+        self.municipios = {}
+        self.usuarios = {}
+        self.aproximacoes = {}
+
+        self.indice_municipios = defaultdict(lambda: IndiceNomes(limiar=self.limiar))
+        for municipio in Municipio.objects.order_by("pk"):
+            nome, uf = separar_uf(municipio.nome)
+            self.indice_municipios[municipio.uf or uf].adicionar(nome, municipio)
+
+        self.setores = {normalizar(s.nome): s for s in Setor.objects.all()}
+        self.siglas = set(Setor.objects.values_list("sigla", flat=True))
+        self.projetos = {normalizar(p.nome): p for p in Projeto.objects.all()}
+        self.tipos = {normalizar(t.nome): t for t in TipoEvento.objects.all()}
+
+        self.indice_usuarios = IndiceNomes(limiar=self.limiar)
+        por_primeiro_nome = defaultdict(list)
+        por_id = {}
+        self.usernames = set()
+        # O manager de Usuario já traz select_related; sem desligá-lo o only()
+        # falha ao adiar município/setor
+        for usuario in (
+            self.User._default_manager.select_related(None)
+            .only("id", "username", "first_name", "last_name", "is_superuser")
+            .order_by("pk")
+        ):
+            por_id[usuario.pk] = usuario
+            self.usernames.add(usuario.username)
+            completo = f"{usuario.first_name} {usuario.last_name}".strip()
+            if completo:
+                self.indice_usuarios.adicionar(completo, usuario)
+                por_primeiro_nome[normalizar(usuario.first_name)].append(usuario)
+            self.indice_usuarios.adicionar(usuario.username, usuario)
+        # Primeiro nome só resolve quando não é ambíguo
+        for nome, usuarios in por_primeiro_nome.items():
+            if len(usuarios) == 1:
+                self.indice_usuarios.adicionar(nome, usuarios[0])
+
+        self.formador_usuarios = set()
+        for nome, usuario_id in Formador.objects.filter(
+            usuario__isnull=False
+        ).values_list("nome", "usuario_id"):
+            self.formador_usuarios.add(usuario_id)
+            if usuario_id in por_id:
+                self.indice_usuarios.adicionar(nome, por_id[usuario_id])
+        self.emails_formador = set(Formador.objects.values_list("email", flat=True))
+
+        self.superusuario = (
+            self.User._default_manager.filter(is_superuser=True).order_by("pk").first()
+        )
+        self._carregado = True
+
+    def _aproximacao(self, nome, correspondencia):
+        if correspondencia.metodo != "exato":
+            self.aproximacoes.setdefault(
+                normalizar(nome),
+                {
+                    "nome": nome.strip(),
+                    "encontrado": correspondencia.nome,
+                    "confianca": correspondencia.confianca,
+                    "metodo": correspondencia.metodo,
+                },
+            )
+
+    def _chave_municipio(self, nome: str):
+        nome, uf = separar_uf(nome)
+        return normalizar(nome), uf
+
+    def _resolver_municipio(self, nome: str) -> Optional[Municipio]:
+        chave = self._chave_municipio(nome)
+        if chave not in self.municipios:
+            nome_sem_uf, uf = separar_uf(nome)
+            correspondencia = self.indice_municipios[uf].buscar(nome_sem_uf)
+            if correspondencia is None:
+                return None
+            self._aproximacao(nome, correspondencia)
+            self.municipios[chave] = correspondencia.valor
+        return self.municipios[chave]
+
+    def _resolver_usuario(self, nome: str):
+        chave = normalizar(nome)
+        if chave not in self.usuarios:
+            correspondencia = self.indice_usuarios.buscar(nome)
+            if correspondencia is None:
+                return None
+            self._aproximacao(nome, correspondencia)
+            self.usuarios[chave] = correspondencia.valor
+        return self.usuarios[chave]
+
+    # Criação em lote das referências que faltam
+
+    def _criar_faltantes(self, linhas: List[LinhaImportada], dry_run: bool) -> dict:
+        criados = defaultdict(int)
+
+        novos_municipios = {}
+        novos_projetos = {}
+        novos_tipos = {}
+        novos_usuarios = {}
+        for linha in linhas:
+            chave = self._chave_municipio(linha.municipio)
+            if chave not in novos_municipios and not self._resolver_municipio(
+                linha.municipio
+            ):
+                nome, uf = separar_uf(linha.municipio)
+                novos_municipios[chave] = Municipio(nome=nome, uf=uf)
+            chave = normalizar(linha.projeto)
+            if chave not in self.projetos:
+                novos_projetos.setdefault(chave, linha.projeto.strip())
+            chave = normalizar(linha.tipo_evento)
+            if chave not in self.tipos and chave not in novos_tipos:
+                novos_tipos[chave] = TipoEvento(
+                    nome=linha.tipo_evento.strip(), online=linha.tipo_evento_online
+                )
+            for nome in linha.formadores:
+                if not self._resolver_usuario(nome):
+                    novos_usuarios.setdefault(
+                        normalizar(nome), (nome.strip(), "formador")
+                    )
+            if linha.solicitante and not self._resolver_usuario(linha.solicitante):
+                novos_usuarios.setdefault(
+                    normalizar(linha.solicitante),
+                    (linha.solicitante.strip(), "coordenador"),
+                )
+
+        criados["municipios"] = len(novos_municipios)
+        criados["projetos"] = len(novos_projetos)
+        criados["tipos_evento"] = len(novos_tipos)
+        criados["usuarios"] = len(novos_usuarios)
+        if dry_run:
+            return dict(criados)
+
+        if novos_municipios:
+            Municipio.objects.bulk_create(
+                novos_municipios.values(),
+                batch_size=self.batch_size,
+                ignore_conflicts=True,
+            )
+            for municipio in Municipio.objects.filter(
+                nome__in={m.nome for m in novos_municipios.values()}
+            ):
+                chave = (normalizar(municipio.nome), municipio.uf)
+                if chave in novos_municipios:
+                    self.municipios[chave] = municipio
+                    self.indice_municipios[municipio.uf].adicionar(
+                        municipio.nome, municipio
+                    )
+
+        if novos_projetos:
+            setores = self._setores_para(novos_projetos.values())
+            Projeto.objects.bulk_create(
+                [
+                    Projeto(
+                        nome=nome,
+                        descricao=f"Projeto importado da aba {self.origem}: {nome}",
+                        setor=setores[nome],
+                        vinculado_superintendencia=setores[
+                            nome
+                        ].vinculado_superintendencia,
+                        codigo_produto="SEM_COD",
+                        tipo_produto="FORMACAO",
+                    )
+                    for nome in novos_projetos.values()
+                ],
+                batch_size=self.batch_size,
+                ignore_conflicts=True,
+            )
+            for projeto in Projeto.objects.filter(nome__in=novos_projetos.values()):
+                self.projetos[normalizar(projeto.nome)] = projeto
+
+        if novos_tipos:
+            TipoEvento.objects.bulk_create(
+                novos_tipos.values(), batch_size=self.batch_size, ignore_conflicts=True
+            )
+            for tipo in TipoEvento.objects.filter(
+                nome__in={t.nome for t in novos_tipos.values()}
+            ):
+                self.tipos[normalizar(tipo.nome)] = tipo
+
+        if novos_usuarios:
+            self._criar_usuarios(novos_usuarios)
+
+        for tipo, quantidade in criados.items():
+            if quantidade:
+                logger.info(f"{quantidade} {tipo} criados em lote ({self.origem})")
+        return dict(criados)
+
+    def _setores_para(self, nomes_projetos) -> Dict[str, Setor]:
+        por_projeto = {}
+        novos = {}
+        for nome in nomes_projetos:
+            nome_setor, vinculado = self.setor_do_projeto(nome)
+            chave = normalizar(nome_setor)
+            if chave not in self.setores and chave not in novos:
+                sigla = self._sigla_livre(nome_setor)
+                novos[chave] = Setor(
+                    nome=nome_setor, sigla=sigla, vinculado_superintendencia=vinculado
+                )
+            por_projeto[nome] = chave
+
+        if novos:
+            Setor.objects.bulk_create(novos.values(), ignore_conflicts=True)
+            for setor in Setor.objects.filter(
+                nome__in=[s.nome for s in novos.values()]
+            ):
+                self.setores[normalizar(setor.nome)] = setor
+        return {nome: self.setores[chave] for nome, chave in por_projeto.items()}
+
+    def _sigla_livre(self, nome_setor: str) -> str:
+        # "Sem Setor" → SS; "Superintendência" → SUPE
+        palavras = _slug(nome_setor).split(".")
+        if len(palavras) > 1:
+            base = "".join(p[0] for p in palavras if p).upper()
+        else:
+            base = palavras[0][:4].upper() or "SS"
+        sigla, contador = base, 1
+        while sigla in self.siglas:
+            sigla = f"{base}{contador}"
+            contador += 1
+        self.siglas.add(sigla)
+        return sigla
+
+    def _username_livre(self, nome: str) -> str:
+        base = _slug(nome).replace(".", "_")[:140] or "importado"
+        username, contador = base, 1
+        while username in self.usernames:
+            username = f"{base}_{contador}"
+            contador += 1
+        self.usernames.add(username)
+        return username
+
+    def _criar_usuarios(self, novos: Dict[str, Tuple[str, str]]):
+        campos_formador = {f.name for f in self.User._meta.get_fields()} & {
+            "formador_ativo"
+        }
+        usuarios = {}
+        for chave, (nome, papel) in novos.items():
+            partes = nome.split()
+            username = self._username_livre(nome)
+            usuario = self.User(
+                username=username,
+                email=f"{username.replace('_', '.')}@planilha.{_slug(self.origem)}",
+                first_name=partes[0][:150] if partes else "",
+                last_name=" ".join(partes[1:])[:150],
+                is_active=True,
+            )
+            if papel == "formador" and campos_formador:
+                usuario.formador_ativo = True
+            usuario.set_unusable_password()
+            usuarios[chave] = (usuario, papel)
+
+        self.User._default_manager.bulk_create(
+            [u for u, _ in usuarios.values()], batch_size=self.batch_size
+        )
+        # Recarrega para obter as chaves primárias em qualquer banco
+        por_username = self.User._default_manager.in_bulk(
+            [u.username for u, _ in usuarios.values()], field_name="username"
+        )
+
+        grupos = {
+            g.name: g
+            for g in Group.objects.filter(name__in={p for _, p in usuarios.values()})
+        }
+        campo_grupos = self.User._meta.get_field("groups")
+        Membro = campo_grupos.remote_field.through
+        coluna_usuario = f"{campo_grupos.m2m_field_name()}_id"
+        coluna_grupo = f"{campo_grupos.m2m_reverse_field_name()}_id"
+        membros = []
+        formadores = []
+        for chave, (usuario, papel) in usuarios.items():
+            usuario = por_username[usuario.username]
+            self.usuarios[chave] = usuario
+            self.indice_usuarios.adicionar(novos[chave][0], usuario)
+            if papel in grupos:
+                membros.append(
+                    Membro(
+                        **{coluna_usuario: usuario.pk, coluna_grupo: grupos[papel].pk}
+                    )
+                )
+            if papel == "formador" and usuario.email not in self.emails_formador:
+                self.emails_formador.add(usuario.email)
+                self.formador_usuarios.add(usuario.pk)
+                formadores.append(
+                    Formador(nome=novos[chave][0], email=usuario.email, usuario=usuario)
+                )
+        Membro.objects.bulk_create(membros, ignore_conflicts=True)
+        Formador.objects.bulk_create(formadores, ignore_conflicts=True)
+
+    # Solicitações
+
+    def _validar(self, linha: LinhaImportada) -> Optional[str]:
+        if not linha.municipio.strip() or not linha.projeto.strip():
+            return "sem município ou projeto"
+        if linha.data_fim <= linha.data_inicio:
+            return "fim anterior ao início"
+        if linha.data_fim - linha.data_inicio > DURACAO_MAXIMA:
+            return "duração acima de 12 horas"
+        return None
+
+    def importar(
+        self,
+        linhas: Iterable[LinhaImportada],
+        dry_run: bool = False,
+        assinaturas: Optional[RegistroAssinaturas] = None,
+    ) -> dict:
+        """
+        Importa o lote.
+
+        Args:
+            assinaturas: registro da aba para importação incremental
+
+        Returns:
+            {"linhas", "criadas", "atualizadas", "ignoradas", "invalidas",
+             "inalteradas", "vinculos", "vinculos_removidos",
+             "referencias_criadas": {tabela: n},
+             "erros": [(linha, motivo)], "diferenca": Diferenca ou None,
+             "aproximacoes": [{"nome", "encontrado", "confianca", "metodo"}]}
+        """
+        validas = {}
+        erros = []
+        total = 0
+        for linha in linhas:
+            total += 1
+            motivo = self._validar(linha)
+            if motivo:
+                erros.append((linha.linha, motivo))
+            else:
+                # Linhas repetidas na planilha: vale a última
+                validas[linha.chave] = linha
+        validas = list(validas.values())
+
+        diferenca = None
+        self._alteradas = set()
+        if assinaturas is not None:
+            diferenca = assinaturas.comparar((l.chave, asdict(l)) for l in validas)
+            alteradas = set(diferenca.alteradas)
+            self._alteradas = {
+                l.chave for l in validas if chave_texto(l.chave) in alteradas
+            }
+            validas = [l for l in validas if assinaturas.deve_processar(l.chave)]
+
+        resumo = {
+            "linhas": total,
+            "criadas": 0,
+            "atualizadas": 0,
+            "ignoradas": 0,
+            "invalidas": len(erros),
+            "inalteradas": diferenca.inalteradas if diferenca else 0,
+            "vinculos": 0,
+            "vinculos_removidos": 0,
+            "erros": erros,
+            "diferenca": diferenca,
+            "referencias_criadas": {},
+        }
+        # Nada novo nem alterado: nem os caches de referência são carregados
+        if validas and not self._carregado:
+            self.carregar()
+
+        with transaction.atomic():
+            gravadas = []
+            if validas:
+                resumo["referencias_criadas"] = self._criar_faltantes(validas, dry_run)
+                if not self.superusuario and any(not l.solicitante for l in validas):
+                    raise ValueError(
+                        "Nenhum superusuário encontrado para ser o solicitante"
+                    )
+
+            for inicio in range(0, len(validas), self.batch_size):
+                bloco = validas[inicio : inicio + self.batch_size]
+                gravadas.extend(self._gravar_bloco(bloco, resumo, dry_run))
+
+            if gravadas:
+                recalcular_solicitacoes_em_lote(gravadas)
+                publicar_atualizacao_em_lote(gravadas, "importado")
+            if assinaturas is not None and not dry_run:
+                assinaturas.confirmar()
+
+        resumo["aproximacoes"] = sorted(
+            self.aproximacoes.values(), key=lambda a: (a["confianca"], a["nome"])
+        )
+        logger.info(
+            f"Importação {self.origem}: {resumo['criadas']} criadas, "
+            f"{resumo['atualizadas']} atualizadas, {resumo['ignoradas']} já existentes, "
+            f"{resumo['invalidas']} inválidas, {resumo['inalteradas']} sem alterações"
+        )
+        return resumo
+
+    def _gravar_bloco(self, bloco: List[LinhaImportada], resumo: dict, dry_run: bool):
+        existentes = {
+            (titulo, data_inicio): pk
+            for pk, titulo, data_inicio in Solicitacao.objects.filter(
+                titulo_evento__in={l.titulo for l in bloco},
+                data_inicio__in={l.data_inicio for l in bloco},
+            ).values_list("pk", "titulo_evento", "data_inicio")
+        }
+        a_gravar = [
+            l
+            for l in bloco
+            if l.chave not in existentes
+            or self.atualizar_existentes
+            or l.chave in self._alteradas
+        ]
+        atualizadas = sum(1 for l in a_gravar if l.chave in existentes)
+
+        resumo["criadas"] += len(a_gravar) - atualizadas
+        resumo["atualizadas"] += atualizadas
+        resumo["ignoradas"] += len(bloco) - len(a_gravar)
+        if dry_run or not a_gravar:
+            return []
+
+        objetos = [self._solicitacao(l, existentes.get(l.chave)) for l in a_gravar]
+        # A chave primária é UUID gerado no Python: as existentes recebem o
+        # id do banco e vão por bulk_update, as novas por bulk_create
+        Solicitacao.objects.bulk_create(
+            [s for l, s in zip(a_gravar, objetos) if l.chave not in existentes],
+            batch_size=self.batch_size,
+        )
+        atualizar = [s for l, s in zip(a_gravar, objetos) if l.chave in existentes]
+        if atualizar:
+            # Células de antes da alteração: datas, status e formadores atuais
+            recalcular_solicitacoes_em_lote(
+                Solicitacao.objects.filter(pk__in=[s.pk for s in atualizar]).only(
+                    "pk", "data_inicio", "data_fim", "status"
+                )
+            )
+            Solicitacao.objects.bulk_update(
+                atualizar, CAMPOS_SOLICITACAO, batch_size=self.batch_size
+            )
+
+        vinculos = []
+        usuarios_por_solicitacao = {}
+        for linha, solicitacao in zip(a_gravar, objetos):
+            usuarios = {self._resolver_usuario(n).pk for n in linha.formadores}
+            usuarios_por_solicitacao[solicitacao.pk] = usuarios
+            vinculos.extend(
+                FormadoresSolicitacao(solicitacao_id=solicitacao.pk, usuario_id=uid)
+                for uid in usuarios
+            )
+        if atualizar:
+            resumo["vinculos_removidos"] += self._remover_vinculos_ausentes(
+                atualizar, usuarios_por_solicitacao
+            )
+        FormadoresSolicitacao.objects.bulk_create(
+            vinculos, batch_size=self.batch_size, ignore_conflicts=True
+        )
+        resumo["vinculos"] += len(vinculos)
+        return objetos
+
+    def _remover_vinculos_ausentes(self, solicitacoes, usuarios_por_solicitacao) -> int:
+        """Remove os formadores das solicitações atualizadas que saíram da linha"""
+        ausentes = [
+            pk
+            for pk, solicitacao_id, usuario_id in FormadoresSolicitacao.objects.filter(
+                solicitacao_id__in=[s.pk for s in solicitacoes]
+            ).values_list("pk", "solicitacao_id", "usuario_id")
+            if usuario_id not in usuarios_por_solicitacao[solicitacao_id]
+        ]
+        if ausentes:
+            FormadoresSolicitacao.objects.filter(pk__in=ausentes).delete()
+        return len(ausentes)
+
+    def _solicitacao(self, linha: LinhaImportada, pk=None) -> Solicitacao:
+        solicitante = (
+            self._resolver_usuario(linha.solicitante)
+            if linha.solicitante
+            else self.superusuario
+        )
+        solicitacao = Solicitacao(
+            usuario_solicitante=solicitante,
+            projeto=self.projetos[normalizar(linha.projeto)],
+            municipio=self._resolver_municipio(linha.municipio),
+            tipo_evento=self.tipos[normalizar(linha.tipo_evento)],
+            titulo_evento=linha.titulo,
+            data_inicio=linha.data_inicio,
+            data_fim=linha.data_fim,
+            status=linha.status,
+            observacoes=linha.observacoes,
+            numero_encontro_formativo=linha.numero_encontro_formativo,
+            coordenador_acompanha=linha.coordenador_acompanha,
+        )
+        if pk:
+            solicitacao.pk = pk
+        return solicitacao
@@ -0,0 +1,469 @@
+"""
+Motor de importação em lote das disponibilidades (bloqueios) dos formadores
+
+O comando import_disponibilidades lê o arquivo inteiro e entrega as linhas
+brutas a converter_linhas(), que converte as colunas de data e de horário
+de uma vez, com pd.to_datetime por formato: a coluna usa o primeiro
+formato que aceita todos os seus valores (o mesmo arquivo não mistura
+"03/04" dia/mês com mês/dia linha a linha). Sem pandas, a mesma regra é
+aplicada com strptime, valor a valor.
+
+O ImportadorDisponibilidades então:
+
+- resolve os formadores por um dicionário de e-mails e um IndiceNomes
+  montados com uma única consulta;
+- carrega numa consulta os bloqueios já gravados dos formadores e período
+  do arquivo;
+- separa duplicados, atualizações e novos, e recusa os novos que se
+  sobrepõem a um bloqueio existente ou a outra linha do arquivo (varredura
+  de intervalos ordenados por formador e dia);
+- grava em blocos (bulk_create/bulk_update).
+
+Todas as decisões são tomadas antes da gravação, então o dry-run produz
+exatamente o mesmo relatório, sem escrever nada.
+
+bulk_create não dispara post_save: o mapa de disponibilidade é
+recalculado explicitamente para o lote.
+"""
+
+import logging
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import date, datetime, time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.dateparse import parse_date, parse_time
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+from core.models import DisponibilidadeFormadores, Formador
+from core.services.indice_nomes import IndiceNomes
+from core.signals.mapa_disponibilidade_signals import recalcular_bloqueios_em_lote
+
+logger = logging.getLogger(__name__)
+
+HORA_INICIO_PADRAO = time(9, 0)
+HORA_FIM_PADRAO = time(17, 0)
+TIPO_PADRAO = "Bloqueio"
+
+FORMATOS_DATA = {
+    "dd/mm/yyyy": ["%d/%m/%Y", "%d/%m/%y"],
+    "yyyy-mm-dd": ["%Y-%m-%d"],
+    "mm/dd/yyyy": ["%m/%d/%Y", "%m/%d/%y"],
+    "dd-mm-yyyy": ["%d-%m-%Y", "%d-%m-%y"],
+    # Autodetecção, em ordem de preferência
+    None: [
+        "%Y-%m-%d",
+        "%d/%m/%Y",
+        "%d/%m/%y",
+        "%m/%d/%Y",
+        "%m/%d/%y",
+        "%d-%m-%Y",
+        "%d-%m-%y",
+    ],
+}
+
+FORMATOS_HORA = ["%H:%M:%S", "%H:%M", "%H.%M", "%H,%M", "%Hh%M", "%Hh"]
+
+
+def _data_alternativa(texto: str) -> Optional[date]:
+    try:
+        return parse_date(texto)
+    except ValueError:
+        return None
+
+
+def _hora_alternativa(texto: str) -> Optional[time]:
+    try:
+        hora = parse_time(texto)
+    except ValueError:
+        hora = None
+    if hora:
+        return hora
+    # Último recurso: apenas os números ("9", "14 30")
+    numeros = "".join(c if c.isdigit() else " " for c in texto).split()
+    if numeros:
+        h = int(numeros[0])
+        m = int(numeros[1]) if len(numeros) > 1 else 0
+        if 0 <= h <= 23 and 0 <= m <= 59:
+            return time(h, m)
+    return None
+
+
+def converter_coluna(
+    valores: Iterable,
+    formatos: List[str],
+    conversor: Callable[[datetime], object],
+    alternativa: Callable[[str], object],
+) -> Dict[str, object]:
+    """
+    Converte uma coluna inteira.
+
+    Cada texto distinto é convertido uma vez. Se algum formato aceita todos
+    os textos da coluna, ele vale para a coluna toda; senão cada texto usa o
+    primeiro formato que o aceita e, por fim, `alternativa`.
+
+    Returns:
+        texto → valor convertido (None quando nenhum formato serve)
+    """
+    distintos = {str(v).strip() for v in valores if v not in (None, "")}
+    distintos.discard("")
+    if pd is None:
+        return _converter_coluna_strptime(distintos, formatos, conversor, alternativa)
+
+    textos = pd.Series(sorted(distintos), dtype=object)
+    combinados = None
+    for formato in formatos:
+        convertidos = pd.to_datetime(textos, format=formato, errors="coerce")
+        if not convertidos.isna().any():
+            combinados = convertidos
+            break
+        # O primeiro formato da lista tem precedência
+        combinados = (
+            convertidos if combinados is None else combinados.fillna(convertidos)
+        )
+
+    resultado = {}
+    for texto, valor in zip(textos, combinados if combinados is not None else ()):
+        if pd.isna(valor):
+            resultado[texto] = alternativa(texto)
+        else:
+            resultado[texto] = conversor(valor.to_pydatetime())
+    return resultado
+
+
+def _converter_coluna_strptime(distintos, formatos, conversor, alternativa):
+    """converter_coluna sem pandas"""
+    aceitos_por_formato = []
+    for formato in formatos:
+        aceitos = {}
+        for texto in distintos:
+            try:
+                aceitos[texto] = conversor(datetime.strptime(texto, formato))
+            except ValueError:
+                continue
+        if len(aceitos) == len(distintos):
+            return aceitos
+        aceitos_por_formato.append(aceitos)
+
+    convertidos = {}
+    # O primeiro formato da lista tem precedência
+    for aceitos in reversed(aceitos_por_formato):
+        convertidos.update(aceitos)
+    for texto in distintos - convertidos.keys():
+        convertidos[texto] = alternativa(texto)
+    return convertidos
+
+
+def _valor(convertidos: Dict[str, object], valor, tipo, padrao=None):
+    if isinstance(valor, tipo):
+        return valor
+    if valor in (None, "") or not str(valor).strip():
+        return padrao
+    return convertidos.get(str(valor).strip())
+
+
+def converter_linhas(
+    brutas: List[dict], date_format: Optional[str] = None
+) -> Tuple[List[dict], List[Tuple[int, str]]]:
+    """
+    Converte as colunas data, hora_inicio e hora_fim das linhas brutas.
+
+    Args:
+        brutas: dicionários com formador_nome, formador_email, data,
+            hora_inicio, hora_fim, tipo_bloqueio, motivo e linha (textos ou,
+            vindos do Excel, date/datetime/time)
+        date_format: opção --date-format do comando (None: autodetectar)
+
+    Returns:
+        (linhas convertidas, [(linha, motivo)] das recusadas)
+    """
+    for bruta in brutas:
+        # datetime do Excel vale pela data; time é aceito como está
+        if isinstance(bruta["data"], datetime):
+            bruta["data"] = bruta["data"].date()
+        for campo in ("hora_inicio", "hora_fim"):
+            if isinstance(bruta[campo], datetime):
+                bruta[campo] = bruta[campo].time()
+
+    datas = converter_coluna(
+        (b["data"] for b in brutas if not isinstance(b["data"], date)),
+        FORMATOS_DATA.get(date_format, FORMATOS_DATA[None]),
+        datetime.date,
+        _data_alternativa,
+    )
+    horas = converter_coluna(
+        (
+            b[campo]
+            for b in brutas
+            for campo in ("hora_inicio", "hora_fim")
+            if not isinstance(b[campo], time)
+        ),
+        FORMATOS_HORA,
+        datetime.time,
+        _hora_alternativa,
+    )
+
+    linhas = []
+    erros = []
+    for bruta in brutas:
+        data_bloqueio = _valor(datas, bruta["data"], date)
+        hora_inicio = _valor(horas, bruta["hora_inicio"], time, HORA_INICIO_PADRAO)
+        hora_fim = _valor(horas, bruta["hora_fim"], time, HORA_FIM_PADRAO)
+        if not data_bloqueio:
+            erros.append((bruta["linha"], f"Data invalida: {bruta['data']}"))
+        elif not hora_inicio or not hora_fim:
+            erros.append(
+                (
+                    bruta["linha"],
+                    f"Horario invalido: {bruta['hora_inicio']} - {bruta['hora_fim']}",
+                )
+            )
+        elif hora_fim <= hora_inicio:
+            erros.append(
+                (
+                    bruta["linha"],
+                    f"Hora fim ({hora_fim}) deve ser posterior a hora inicio ({hora_inicio})",
+                )
+            )
+        else:
+            linhas.append(
+                {
+                    "linha": bruta["linha"],
+                    "formador_nome": bruta["formador_nome"],
+                    "formador_email": bruta["formador_email"],
+                    "data_bloqueio": data_bloqueio,
+                    "hora_inicio": hora_inicio,
+                    "hora_fim": hora_fim,
+                    "tipo_bloqueio": bruta["tipo_bloqueio"] or TIPO_PADRAO,
+                    "motivo": bruta["motivo"] or "",
+                }
+            )
+    return linhas, erros
+
+
+def chave_linha(linha: dict) -> tuple:
+    """Chave natural da linha: formador, data e horário"""
+    return (
+        (linha["formador_email"] or linha["formador_nome"]).lower(),
+        linha["data_bloqueio"],
+        linha["hora_inicio"],
+        linha["hora_fim"],
+    )
+
+
+class ResolvedorFormadores:
+    """
+    Formadores indexados por e-mail e por nome (IndiceNomes), carregados
+    com uma consulta.
+    """
+
+    def __init__(self):
+        formadores = list(
+            Formador.objects.only("id", "nome", "email", "usuario_id").order_by("nome")
+        )
+        self.por_email = {f.email.strip().lower(): f for f in formadores if f.email}
+        self.indice = IndiceNomes((f.nome, f) for f in formadores)
+
+    def resolver(self, nome: str = "", email: str = "") -> Optional[Formador]:
+        if email:
+            formador = self.por_email.get(email.strip().lower())
+            if formador:
+                return formador
+        if nome:
+            correspondencia = self.indice.buscar(nome)
+            if correspondencia:
+                return correspondencia.valor
+        return None
+
+
+def mesclar_intervalos(
+    intervalos: Iterable[Tuple[time, time]],
+) -> List[Tuple[time, time]]:
+    """Une intervalos sobrepostos; resultado ordenado e disjunto"""
+    mesclados = []
+    for inicio, fim in sorted(intervalos):
+        if mesclados and inicio < mesclados[-1][1]:
+            if fim > mesclados[-1][1]:
+                mesclados[-1] = (mesclados[-1][0], fim)
+        else:
+            mesclados.append((inicio, fim))
+    return mesclados
+
+
+class ImportadorDisponibilidades:
+    """
+    Args:
+        atualizar_existentes: bloqueios já gravados (mesmo formador, data e
+            horário) recebem tipo e motivo do arquivo
+        resolvedor: ResolvedorFormadores já carregado (reaproveitado pelo
+            comando, que também o usa no filtro --formador)
+    """
+
+    def __init__(
+        self,
+        atualizar_existentes: bool = False,
+        batch_size: Optional[int] = None,
+        resolvedor: Optional[ResolvedorFormadores] = None,
+    ):
+        self.atualizar_existentes = atualizar_existentes
+        self.batch_size = batch_size or getattr(
+            settings, "BULK_CREATE_BATCH_SIZE", 1000
+        )
+        self.resolvedor = resolvedor
+
+    def importar(self, linhas: List[dict], dry_run: bool = False) -> dict:
+        """
+        Importa o lote de linhas convertidas (converter_linhas).
+
+        Returns:
+            {"total", "criados", "atualizados", "duplicados", "erros",
+             "detalhes_erros", "falhas": [chave_linha das não gravadas],
+             "acoes": [(símbolo, descrição)] por linha gravada ou ignorada}
+        """
+        if self.resolvedor is None:
+            self.resolvedor = ResolvedorFormadores()
+        resultado = {
+            "total": len(linhas),
+            "criados": 0,
+            "atualizados": 0,
+            "duplicados": 0,
+            "erros": 0,
+            "detalhes_erros": [],
+            "falhas": [],
+            "acoes": [],
+        }
+
+        def recusar(linha, motivo):
+            resultado["erros"] += 1
+            resultado["falhas"].append(chave_linha(linha))
+            resultado["detalhes_erros"].append(
+                f"Linha {linha.get('linha', '?')}: {motivo}"
+            )
+
+        # Formador de cada linha; repetidas no arquivo: vale a última
+        candidatos = {}
+        for linha in linhas:
+            formador = self.resolvedor.resolver(
+                linha["formador_nome"], linha["formador_email"]
+            )
+            if not formador:
+                recusar(
+                    linha,
+                    f'Formador nao encontrado: {linha["formador_nome"]} / {linha["formador_email"]}',
+                )
+                continue
+            if not formador.usuario_id:
+                recusar(linha, f"Formador sem usuario vinculado: {formador.nome}")
+                continue
+            chave = (
+                formador.usuario_id,
+                linha["data_bloqueio"],
+                linha["hora_inicio"],
+                linha["hora_fim"],
+            )
+            if chave in candidatos:
+                resultado["duplicados"] += 1
+            candidatos[chave] = (linha, formador)
+
+        por_dia = defaultdict(list)
+        for chave, candidato in candidatos.items():
+            por_dia[chave[:2]].append((chave[2], chave[3], candidato))
+
+        existentes = defaultdict(dict)
+        if por_dia:
+            datas = [data for _, data in por_dia]
+            for bloqueio in DisponibilidadeFormadores.objects.filter(
+                usuario_id__in={usuario_id for usuario_id, _ in por_dia},
+                data_bloqueio__gte=min(datas),
+                data_bloqueio__lte=max(datas),
+            ).only(
+                "id",
+                "usuario_id",
+                "data_bloqueio",
+                "hora_inicio",
+                "hora_fim",
+                "tipo_bloqueio",
+                "motivo",
+            ):
+                dia = (bloqueio.usuario_id, bloqueio.data_bloqueio)
+                if dia in por_dia:
+                    existentes[dia][
+                        (bloqueio.hora_inicio, bloqueio.hora_fim)
+                    ] = bloqueio
+
+        novos = []
+        atualizados = []
+        for dia, intervalos in por_dia.items():
+            do_dia = existentes.get(dia, {})
+            ocupados = mesclar_intervalos(do_dia)
+            inicios = [inicio for inicio, _ in ocupados]
+            maior_fim = None
+            for inicio, fim, (linha, formador) in sorted(
+                intervalos, key=lambda i: i[:2]
+            ):
+                descricao = f"{formador.nome} - {dia[1]} {inicio}-{fim}"
+                tipo = linha["tipo_bloqueio"][:50]
+                existente = do_dia.get((inicio, fim))
+                if existente:
+                    if self.atualizar_existentes and (
+                        existente.tipo_bloqueio != tipo
+                        or existente.motivo != linha["motivo"]
+                    ):
+                        existente.tipo_bloqueio = tipo
+                        existente.motivo = linha["motivo"]
+                        atualizados.append(existente)
+                        resultado["acoes"].append(("~", f"Atualizado: {descricao}"))
+                    else:
+                        resultado["duplicados"] += 1
+                        resultado["acoes"].append(("=", f"Ja existe: {descricao}"))
+                    continue
+
+                # Último bloqueio gravado que começa antes do fim deste
+                i = bisect_left(inicios, fim) - 1
+                if i >= 0 and ocupados[i][1] > inicio:
+                    recusar(linha, f"Sobreposicao com bloqueio existente: {descricao}")
+                    continue
+                if maior_fim is not None and inicio < maior_fim:
+                    recusar(
+                        linha, f"Sobreposicao com outra linha do arquivo: {descricao}"
+                    )
+                    continue
+                maior_fim = fim if maior_fim is None else max(maior_fim, fim)
+                novos.append(
+                    DisponibilidadeFormadores(
+                        usuario_id=dia[0],
+                        data_bloqueio=dia[1],
+                        hora_inicio=inicio,
+                        hora_fim=fim,
+                        tipo_bloqueio=tipo,
+                        motivo=linha["motivo"],
+                    )
+                )
+                resultado["acoes"].append(("+", f"Criado: {descricao} [{tipo}]"))
+
+        resultado["criados"] = len(novos)
+        resultado["atualizados"] = len(atualizados)
+
+        if not dry_run and (novos or atualizados):
+            with transaction.atomic():
+                DisponibilidadeFormadores.objects.bulk_update(
+                    atualizados, ["tipo_bloqueio", "motivo"], batch_size=self.batch_size
+                )
+                # ignore_conflicts: importação concorrente do mesmo bloqueio
+                DisponibilidadeFormadores.objects.bulk_create(
+                    novos, batch_size=self.batch_size, ignore_conflicts=True
+                )
+                recalcular_bloqueios_em_lote(novos + atualizados)
+
+        logger.info(
+            f"Importação de disponibilidades{' (dry-run)' if dry_run else ''}: "
+            f"{resultado['criados']} criadas, {resultado['atualizados']} atualizadas, "
+            f"{resultado['duplicados']} duplicadas, {resultado['erros']} erros"
+        )
+        return resultado
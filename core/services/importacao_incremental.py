@@ -0,0 +1,187 @@
+"""
+Importação incremental por assinatura de linhas
+
+Cada linha importada é identificada por (fonte, aba, chave natural) e
+guarda o hash do seu conteúdo normalizado (AssinaturaLinha). Na execução
+seguinte, comparar() separa as linhas em inseridas, alteradas, removidas e
+inalteradas; o comando processa só as três primeiras e, depois de gravar,
+confirmar() atualiza as assinaturas na mesma transação.
+
+A normalização ignora diferenças que não mudam o dado: espaços nas pontas
+ou repetidos, ordem das chaves do dicionário e o número da linha na
+planilha (campo "linha").
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+
+from core.models import AssinaturaLinha
+
+CAMPOS_IGNORADOS = frozenset({"linha"})
+
+
+def _normalizar(valor: Any) -> Any:
+    if isinstance(valor, str):
+        return " ".join(valor.split())
+    if isinstance(valor, (datetime, date, time)):
+        return valor.isoformat()
+    if isinstance(valor, dict):
+        return {
+            str(k): _normalizar(v)
+            for k, v in valor.items()
+            if k not in CAMPOS_IGNORADOS
+        }
+    if isinstance(valor, (list, tuple)):
+        return [_normalizar(v) for v in valor]
+    if valor is None or isinstance(valor, (bool, int, float)):
+        return valor
+    return str(valor)
+
+
+def assinatura(dados: Any) -> str:
+    """SHA-256 do conteúdo normalizado"""
+    texto = json.dumps(_normalizar(dados), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+
+def chave_texto(chave: Any) -> str:
+    """Chave natural (valor ou tupla) como texto estável"""
+    partes = chave if isinstance(chave, (list, tuple)) else [chave]
+    return "|".join(str(_normalizar(parte)) for parte in partes)[:500]
+
+
+@dataclass
+class Diferenca:
+    """Resultado da comparação; chaves já convertidas em texto"""
+
+    inseridas: List[str] = field(default_factory=list)
+    alteradas: List[str] = field(default_factory=list)
+    removidas: List[str] = field(default_factory=list)
+    inalteradas: int = 0
+
+    @property
+    def a_processar(self) -> set:
+        return set(self.inseridas) | set(self.alteradas)
+
+    def resumo(self) -> Dict[str, int]:
+        return {
+            "inseridas": len(self.inseridas),
+            "alteradas": len(self.alteradas),
+            "removidas": len(self.removidas),
+            "inalteradas": self.inalteradas,
+        }
+
+    def relatorio(self, limite: int = 10) -> List[str]:
+        """Linhas de texto para a saída dos comandos"""
+        resumo = self.resumo()
+        linhas = [
+            "Diferenças desde a última importação: "
+            + ", ".join(f"{quantidade} {tipo}" for tipo, quantidade in resumo.items())
+        ]
+        for simbolo, chaves in (
+            ("+", self.inseridas),
+            ("~", self.alteradas),
+            ("-", self.removidas),
+        ):
+            for chave in chaves[:limite]:
+                linhas.append(f"  [{simbolo}] {chave}")
+            if len(chaves) > limite:
+                linhas.append(f"  [{simbolo}] ... e mais {len(chaves) - limite}")
+        return linhas
+
+
+class RegistroAssinaturas:
+    """
+    Assinaturas de uma aba de uma fonte.
+
+    Args:
+        fonte: planilha ou arquivo (ex.: chave da planilha Google)
+        aba: aba/tipo de dado dentro da fonte
+    """
+
+    def __init__(self, fonte: str, aba: str = "", batch_size: Optional[int] = None):
+        self.fonte = fonte[:200]
+        self.aba = aba[:200]
+        self.batch_size = batch_size or getattr(
+            settings, "BULK_CREATE_BATCH_SIZE", 1000
+        )
+        self._novas: Dict[str, str] = {}
+        self._diferenca: Optional[Diferenca] = None
+
+    def _queryset(self):
+        return AssinaturaLinha.objects.filter(fonte=self.fonte, aba=self.aba)
+
+    def comparar(
+        self, linhas: Iterable[Tuple[Any, Any]], completo: bool = True
+    ) -> Diferenca:
+        """
+        Args:
+            linhas: pares (chave natural, dados da linha); chave repetida
+                vale a última
+            completo: a fonte foi lida inteira; com filtro (parcial), as
+                linhas ausentes não contam como removidas
+
+        Returns:
+            Diferenca em relação às assinaturas gravadas
+        """
+        self._novas = {chave_texto(chave): assinatura(dados) for chave, dados in linhas}
+        anteriores = dict(self._queryset().values_list("chave", "hash"))
+
+        diferenca = Diferenca()
+        for chave, hash_ in self._novas.items():
+            anterior = anteriores.get(chave)
+            if anterior is None:
+                diferenca.inseridas.append(chave)
+            elif anterior != hash_:
+                diferenca.alteradas.append(chave)
+            else:
+                diferenca.inalteradas += 1
+        if completo:
+            diferenca.removidas = [c for c in anteriores if c not in self._novas]
+        self._diferenca = diferenca
+        return diferenca
+
+    def deve_processar(self, chave: Any) -> bool:
+        """A linha é nova ou mudou desde a última importação"""
+        return chave_texto(chave) in self._diferenca.a_processar
+
+    def confirmar(self, falhas: Iterable[Any] = ()):
+        """
+        Grava as assinaturas das linhas processadas e apaga as removidas.
+        Chamar dentro da transação da importação.
+
+        Args:
+            falhas: chaves que não foram gravadas; ficam de fora e voltam
+                a ser processadas na próxima execução
+        """
+        if self._diferenca is None:
+            raise RuntimeError("comparar() deve ser chamado antes de confirmar()")
+        falhas = {chave_texto(chave) for chave in falhas}
+
+        AssinaturaLinha.objects.bulk_create(
+            [
+                AssinaturaLinha(
+                    fonte=self.fonte, aba=self.aba, chave=chave, hash=self._novas[chave]
+                )
+                for chave in self._diferenca.inseridas + self._diferenca.alteradas
+                if chave not in falhas
+            ],
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=["fonte", "aba", "chave"],
+            update_fields=["hash", "atualizado_em"],
+        )
+        removidas = self._diferenca.removidas + [c for c in falhas if c in self._novas]
+        for inicio in range(0, len(removidas), self.batch_size):
+            self._queryset().filter(
+                chave__in=removidas[inicio : inicio + self.batch_size]
+            ).delete()
+
+    def limpar(self):
+        """Esquece as assinaturas (ex.: antes de uma importação com --clear)"""
+        self._queryset().delete()
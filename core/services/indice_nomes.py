@@ -0,0 +1,311 @@
+"""
+Índice de resolução de nomes para importações
+
+Substitui as buscas `nome__icontains` linha a linha (varredura da tabela,
+resultado dependente da ordem do banco) por um índice em memória montado
+uma vez por execução. A busca tenta, em ordem:
+
+1. exato      — nome normalizado (sem acentos, minúsculas, espaços simples)
+2. tokens     — mesmas palavras em outra ordem, sem partículas (de, da, ...)
+3. extremos   — mesmo primeiro e último nome ("Maria Souza" ~ "Maria C. Souza")
+4. prefixo    — palavras abreviadas ("Ana S." ~ "Ana Souza")
+5. trigramas  — similaridade (Dice) entre os trigramas dos nomes
+
+Cada resultado traz a confiança (0 a 1) e o método. Empates são resolvidos
+pela ordem de inserção, então a mesma entrada dá sempre o mesmo resultado.
+Métodos 2-4 só respondem quando há um único candidato.
+"""
+
+import heapq
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+PARTICULAS = frozenset({"de", "da", "do", "das", "dos", "e", "d"})
+
+CONFIANCA = {
+    "exato": 1.0,
+    "tokens": 0.97,
+    "extremos": 0.9,
+    "prefixo": 0.85,
+}
+
+LIMIAR_PADRAO = 0.8
+
+_NAO_ALFANUMERICO = re.compile(r"[^0-9a-z]+")
+
+
+def normalizar(nome: Optional[str]) -> str:
+    """Chave de comparação: sem acentos, minúsculas, espaços simples"""
+    if not nome:
+        return ""
+    sem_acentos = unicodedata.normalize("NFKD", str(nome))
+    sem_acentos = "".join(c for c in sem_acentos if not unicodedata.combining(c))
+    return " ".join(sem_acentos.casefold().split())
+
+
+def tokens(nome: Optional[str]) -> List[str]:
+    """Palavras do nome normalizado, sem pontuação nem partículas"""
+    return [
+        t
+        for t in _NAO_ALFANUMERICO.split(normalizar(nome))
+        if t and t not in PARTICULAS
+    ]
+
+
+def trigramas(nome: Optional[str]) -> set:
+    texto = f"  {' '.join(tokens(nome))} "
+    return {texto[i : i + 3] for i in range(len(texto) - 2)}
+
+
+@dataclass(frozen=True)
+class Correspondencia:
+    valor: Any
+    nome: str
+    confianca: float
+    metodo: str
+
+
+class IndiceNomes:
+    """
+    Índice nome → valor.
+
+    Args:
+        itens: pares (nome, valor) iniciais
+        limiar: confiança mínima padrão de buscar()
+    """
+
+    def __init__(
+        self, itens: Iterable[Tuple[str, Any]] = (), limiar: float = LIMIAR_PADRAO
+    ):
+        self.limiar = limiar
+        self._entradas: List[Tuple[str, Any]] = []
+        self._exato: Dict[str, int] = {}
+        self._tokens: Dict[Tuple[str, ...], List[int]] = defaultdict(list)
+        self._extremos: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        self._primeiro: Dict[str, List[int]] = defaultdict(list)
+        self._trigramas: Dict[str, List[int]] = defaultdict(list)
+        self._grams: List[frozenset] = []
+        self._palavras: List[List[str]] = []
+        self.estatisticas = Counter()
+        for nome, valor in itens:
+            self.adicionar(nome, valor)
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def adicionar(self, nome: str, valor: Any):
+        """Indexa o nome; nomes já indexados mantêm o primeiro valor"""
+        chave = normalizar(nome)
+        if not chave or chave in self._exato:
+            return
+        i = len(self._entradas)
+        self._entradas.append((nome, valor))
+        self._exato[chave] = i
+
+        palavras = tokens(nome)
+        self._palavras.append(palavras)
+        if palavras:
+            self._tokens[tuple(sorted(palavras))].append(i)
+            self._primeiro[palavras[0]].append(i)
+        if len(palavras) > 1:
+            self._extremos[(palavras[0], palavras[-1])].append(i)
+
+        grams = frozenset(trigramas(nome))
+        for gram in grams:
+            self._trigramas[gram].append(i)
+        self._grams.append(grams)
+
+    def _unico(self, indices: List[int]) -> Optional[int]:
+        # Nomes diferentes do mesmo registro (ex.: username e nome completo)
+        # não contam como ambiguidade
+        valores = {
+            getattr(self._entradas[i][1], "pk", self._entradas[i][1]) for i in indices
+        }
+        return indices[0] if len(valores) == 1 else None
+
+    def _com_prefixos(self, palavras: List[str]) -> List[int]:
+        return [
+            j
+            for j in self._primeiro.get(palavras[0], [])
+            if _prefixos(palavras[1:], self._palavras[j][1:])
+        ]
+
+    def _resultado(self, i: int, confianca: float, metodo: str) -> Correspondencia:
+        nome, valor = self._entradas[i]
+        return Correspondencia(valor, nome, round(confianca, 3), metodo)
+
+    def _por_regra(self, nome: str) -> Optional[Correspondencia]:
+        chave = normalizar(nome)
+        if chave in self._exato:
+            return self._resultado(self._exato[chave], CONFIANCA["exato"], "exato")
+
+        palavras = tokens(nome)
+        if not palavras:
+            return None
+
+        i = self._unico(self._tokens.get(tuple(sorted(palavras)), []))
+        if i is not None:
+            return self._resultado(i, CONFIANCA["tokens"], "tokens")
+
+        if len(palavras) > 1:
+            i = self._unico(self._extremos.get((palavras[0], palavras[-1]), []))
+            if i is not None:
+                return self._resultado(i, CONFIANCA["extremos"], "extremos")
+
+        i = self._unico(self._com_prefixos(palavras))
+        if i is not None:
+            return self._resultado(i, CONFIANCA["prefixo"], "prefixo")
+        return None
+
+    def semelhantes(
+        self, nome: str, limite: int = 5, limiar: float = 0.0
+    ) -> List[Correspondencia]:
+        """
+        Melhores candidatos por trigramas, do mais ao menos parecido.
+
+        Com limiar, só os trigramas mais raros do nome são consultados:
+        Dice >= limiar exige ao menos ceil(limiar * n / (2 - limiar)) dos n
+        trigramas em comum, então quem não tem nenhum dos n - mínimo + 1
+        mais raros não chega ao limiar.
+        """
+        grams = trigramas(nome)
+        if not grams:
+            return []
+        total = len(grams)
+        postagens = sorted((self._trigramas.get(g, ()) for g in grams), key=len)
+        if limiar > 0:
+            minimo = math.ceil(limiar * total / (2 - limiar))
+            postagens = postagens[: max(total - minimo + 1, 1)]
+
+        candidatos = set()
+        for postagem in postagens:
+            candidatos.update(postagem)
+        pontuados = (
+            (2 * len(grams & self._grams[i]) / (total + len(self._grams[i])), i)
+            for i in candidatos
+        )
+        melhores = heapq.nsmallest(
+            limite, pontuados, key=lambda item: (-item[0], item[1])
+        )
+        return [
+            self._resultado(i, dice, "trigramas")
+            for dice, i in melhores
+            if dice >= limiar
+        ]
+
+    def buscar(self, nome: str, limiar: float = None) -> Optional[Correspondencia]:
+        """Melhor correspondência com confiança >= limiar, ou None"""
+        limiar = self.limiar if limiar is None else limiar
+        resultado = self._por_regra(nome)
+        if resultado is None:
+            melhores = self.semelhantes(nome, limite=1, limiar=limiar)
+            resultado = melhores[0] if melhores else None
+
+        if resultado is None or resultado.confianca < limiar:
+            self.estatisticas["sem_correspondencia"] += 1
+            return None
+        self.estatisticas[resultado.metodo] += 1
+        return resultado
+
+    def candidatos(self, nome: str, limiar: float = None) -> List[Correspondencia]:
+        """Todas as entradas (exceto o próprio nome) com confiança >= limiar"""
+        limiar = self.limiar if limiar is None else limiar
+        chave = normalizar(nome)
+        palavras = tokens(nome)
+        encontrados = {}
+
+        def incluir(indices, metodo):
+            for i in indices:
+                if i not in encontrados and normalizar(self._entradas[i][0]) != chave:
+                    encontrados[i] = self._resultado(i, CONFIANCA[metodo], metodo)
+
+        if palavras:
+            incluir(self._tokens.get(tuple(sorted(palavras)), []), "tokens")
+        if len(palavras) > 1:
+            incluir(self._extremos.get((palavras[0], palavras[-1]), []), "extremos")
+        if palavras:
+            incluir(self._com_prefixos(palavras), "prefixo")
+        for resultado in self.semelhantes(nome, limite=10, limiar=limiar):
+            i = self._exato[normalizar(resultado.nome)]
+            if i not in encontrados and normalizar(resultado.nome) != chave:
+                encontrados[i] = resultado
+
+        return sorted(
+            (r for r in encontrados.values() if r.confianca >= limiar),
+            key=lambda r: -r.confianca,
+        )
+
+
+def _prefixos(curtas: List[str], completas: List[str]) -> bool:
+    """Cada palavra de `curtas` é prefixo da palavra seguinte de `completas`"""
+    if not curtas:
+        return False
+    j = 0
+    for palavra in curtas:
+        while j < len(completas) and not completas[j].startswith(palavra):
+            j += 1
+        if j == len(completas):
+            return False
+        j += 1
+    return True
+
+
+def agrupar(
+    itens: Iterable[Tuple[str, Any]], limiar: float = 0.9
+) -> List[List[Tuple[Any, float]]]:
+    """
+    Agrupa valores cujos nomes se correspondem (confiança >= limiar),
+    transitivamente, sem comparar todos os pares.
+
+    Returns:
+        Só grupos com mais de um valor, na ordem de entrada, como pares
+        (valor, confiança da ligação que o trouxe ao grupo; 1.0 no primeiro
+        e em nomes idênticos)
+    """
+    itens = list(itens)
+    indice = IndiceNomes(limiar=limiar)
+    por_chave = defaultdict(list)
+    for posicao, (nome, _) in enumerate(itens):
+        chave = normalizar(nome)
+        if chave:
+            indice.adicionar(nome, posicao)
+            por_chave[chave].append(posicao)
+
+    pai = list(range(len(itens)))
+    ligacao = {}
+
+    def raiz(x):
+        while pai[x] != x:
+            pai[x] = pai[pai[x]]
+            x = pai[x]
+        return x
+
+    def unir(a, b):
+        a, b = raiz(a), raiz(b)
+        if a != b:
+            pai[max(a, b)] = min(a, b)
+
+    for chave, posicoes in por_chave.items():
+        for posicao in posicoes[1:]:
+            unir(posicoes[0], posicao)
+        for correspondencia in indice.candidatos(chave, limiar):
+            outra = correspondencia.valor
+            unir(posicoes[0], outra)
+            mais_nova = max(posicoes[0], outra)
+            ligacao[mais_nova] = max(
+                ligacao.get(mais_nova, 0), correspondencia.confianca
+            )
+
+    grupos = defaultdict(list)
+    for chave, posicoes in por_chave.items():
+        for posicao in posicoes:
+            grupos[raiz(posicao)].append(posicao)
+    return [
+        [(itens[p][1], ligacao.get(p, 1.0) if p != grupo[0] else 1.0) for p in grupo]
+        for _, grupo in sorted((r, sorted(g)) for r, g in grupos.items())
+        if len(grupo) > 1
+    ]
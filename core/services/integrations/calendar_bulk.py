@@ -0,0 +1,113 @@
+"""
+Criação concorrente de eventos no Google Calendar
+
+As chamadas à API são independentes entre si e o tempo é dominado pela
+latência HTTPS; um pool limitado de threads sobrepõe essas esperas.
+Um limitador de taxa (token bucket) compartilhado entre as threads
+mantém o lote dentro da quota da API.
+
+Cada thread usa seu próprio GoogleCalendarService: os clientes do
+googleapiclient (httplib2) não são thread-safe. Nenhuma thread toca no
+banco; quem chama grava os resultados em lote.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from django.conf import settings
+
+from core.services.integrations.google_calendar import GoogleCalendarService
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    Token bucket thread-safe: até `rate` requisições por segundo, com
+    rajadas de até `burst`.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Bloqueia até haver uma ficha disponível"""
+        while True:
+            with self._lock:
+                agora = self.clock()
+                self._tokens = min(
+                    self.capacity, self._tokens + (agora - self._updated) * self.rate
+                )
+                self._updated = agora
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                espera = (1 - self._tokens) / self.rate
+            self.sleep(espera)
+
+
+def create_events_concurrently(
+    gevents: Dict[Hashable, Any],
+    service_factory: Callable[[], GoogleCalendarService] = GoogleCalendarService,
+    max_workers: Optional[int] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> Dict[Hashable, Tuple[Optional[dict], Optional[Exception]]]:
+    """
+    Cria os eventos em paralelo.
+
+    Args:
+        gevents: {chave: GoogleEvent}
+        service_factory: cria um GoogleCalendarService por thread
+        max_workers: padrão GOOGLE_CALENDAR_BULK_WORKERS
+        rate_limiter: padrão GOOGLE_CALENDAR_RATE_LIMIT requisições/s
+
+    Returns:
+        {chave: (resposta da API, None)} ou {chave: (None, exceção)}
+    """
+    if not gevents:
+        return {}
+
+    if max_workers is None:
+        max_workers = getattr(settings, "GOOGLE_CALENDAR_BULK_WORKERS", 4)
+    if rate_limiter is None:
+        rate_limiter = RateLimiter(getattr(settings, "GOOGLE_CALENDAR_RATE_LIMIT", 5))
+
+    local = threading.local()
+
+    def criar(gevent):
+        if not hasattr(local, "service"):
+            local.service = service_factory()
+        rate_limiter.acquire()
+        try:
+            return local.service.create_event(gevent), None
+        except Exception as e:
+            return None, e
+
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(gevents)),
+        thread_name_prefix="calendar-bulk",
+    ) as executor:
+        futures = {chave: executor.submit(criar, g) for chave, g in gevents.items()}
+        resultados = {chave: future.result() for chave, future in futures.items()}
+
+    falhas = sum(1 for _, erro in resultados.values() if erro)
+    logger.info(
+        f"Criação concorrente: {len(resultados) - falhas} eventos criados, "
+        f"{falhas} falhas"
+    )
+    return resultados
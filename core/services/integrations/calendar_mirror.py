@@ -0,0 +1,220 @@
+"""
+Espelho local dos eventos do Google Calendar
+
+A primeira sincronização percorre todas as páginas do calendário e guarda
+o nextSyncToken. As seguintes pedem à API apenas o que mudou desde então
+(syncToken), normalmente uma única requisição quase vazia. Se o token
+expirar (HTTP 410), refaz a sincronização completa.
+
+Consultas de conflito e relatórios leem a tabela EventoCalendarioEspelho
+(índice calendar_id, inicio, fim) em vez de listar o calendário na API.
+"""
+
+import logging
+import re
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import EventoCalendarioEspelho, SincronizacaoCalendario
+from core.services.integrations.google_calendar import GoogleCalendarService
+
+logger = logging.getLogger(__name__)
+
+CANCELADO = "cancelled"
+
+CAMPOS_ATUALIZAVEIS = [
+    "status",
+    "titulo",
+    "inicio",
+    "fim",
+    "dia_inteiro",
+    "html_link",
+    "payload",
+]
+
+_HTTP_410 = re.compile(r"HttpError 410\b")
+
+
+def _token_expirado(erro: Exception) -> bool:
+    """syncToken inválido: a API responde 410 Gone"""
+    resp = getattr(erro, "resp", None)
+    if getattr(resp, "status", None) == 410:
+        return True
+    return bool(_HTTP_410.search(str(erro)))
+
+
+def _momento(info: dict):
+    """(datetime aware, dia_inteiro) de um campo start/end da API"""
+    if "dateTime" in info:
+        dt = datetime.fromisoformat(info["dateTime"].replace("Z", "+00:00"))
+        if timezone.is_naive(dt):
+            dt = timezone.make_aware(dt)
+        return dt, False
+    if "date" in info:
+        dia = date.fromisoformat(info["date"])
+        return timezone.make_aware(datetime.combine(dia, time.min)), True
+    return None, False
+
+
+def _linha(calendar_id: str, evento: dict) -> EventoCalendarioEspelho:
+    inicio, dia_inteiro = _momento(evento.get("start", {}))
+    fim, _ = _momento(evento.get("end", {}))
+    return EventoCalendarioEspelho(
+        calendar_id=calendar_id,
+        event_id=evento["id"],
+        status=evento.get("status", "confirmed"),
+        titulo=evento.get("summary", ""),
+        inicio=inicio,
+        fim=fim,
+        dia_inteiro=dia_inteiro,
+        html_link=evento.get("htmlLink", ""),
+        payload=evento,
+    )
+
+
+def _gravar(calendar_id: str, eventos: List[dict]):
+    """
+    Upsert em lote. Cancelamentos de uma sincronização incremental podem
+    vir sem dados (só id e status): apenas marcam a linha existente.
+    """
+    completos = []
+    cancelados = []
+    for evento in eventos:
+        if evento.get("status") == CANCELADO and "start" not in evento:
+            cancelados.append(evento["id"])
+        else:
+            completos.append(_linha(calendar_id, evento))
+
+    EventoCalendarioEspelho.objects.bulk_create(
+        completos,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["calendar_id", "event_id"],
+        update_fields=CAMPOS_ATUALIZAVEIS,
+    )
+    if cancelados:
+        EventoCalendarioEspelho.objects.filter(
+            calendar_id=calendar_id, event_id__in=cancelados
+        ).update(status=CANCELADO, atualizado_em=timezone.now())
+
+
+def _baixar(service: GoogleCalendarService, sync_token: Optional[str]):
+    params = {"singleEvents": True, "showDeleted": True}
+    if sync_token:
+        params["syncToken"] = sync_token
+
+    eventos = []
+    paginas = 0
+    proximo_token = None
+    for pagina in service.iter_event_pages(**params):
+        paginas += 1
+        eventos.extend(pagina.get("items", []))
+        proximo_token = pagina.get("nextSyncToken")
+    return eventos, paginas, proximo_token
+
+
+def sincronizar(
+    calendar_id: Optional[str] = None,
+    service: Optional[GoogleCalendarService] = None,
+    completo: bool = False,
+) -> dict:
+    """
+    Atualiza o espelho de um calendário.
+
+    Args:
+        calendar_id: padrão GOOGLE_CALENDAR_CALENDAR_ID
+        service: GoogleCalendarService já configurado (opcional)
+        completo: ignora o syncToken e recarrega o calendário inteiro
+
+    Returns:
+        {"calendar_id", "incremental", "paginas", "eventos"}
+    """
+    service = service or GoogleCalendarService(calendar_id=calendar_id)
+    calendar_id = service.calendar_id
+    estado, _ = SincronizacaoCalendario.objects.get_or_create(calendar_id=calendar_id)
+
+    incremental = bool(estado.sync_token) and not completo
+    try:
+        eventos, paginas, token = _baixar(
+            service, estado.sync_token if incremental else None
+        )
+    except Exception as e:
+        if not (incremental and _token_expirado(e)):
+            raise
+        logger.warning(f"syncToken expirado para {calendar_id}; sincronização completa")
+        incremental = False
+        eventos, paginas, token = _baixar(service, None)
+
+    agora = timezone.now()
+    with transaction.atomic():
+        if not incremental:
+            EventoCalendarioEspelho.objects.filter(calendar_id=calendar_id).delete()
+        _gravar(calendar_id, eventos)
+
+        estado.sync_token = token or ""
+        estado.ultima_sincronizacao = agora
+        if not incremental:
+            estado.ultima_sincronizacao_completa = agora
+        estado.save()
+
+    logger.info(
+        f"Espelho {calendar_id}: {len(eventos)} eventos em {paginas} páginas "
+        f"({'incremental' if incremental else 'completa'})"
+    )
+    return {
+        "calendar_id": calendar_id,
+        "incremental": incremental,
+        "paginas": paginas,
+        "eventos": len(eventos),
+    }
+
+
+def sincronizar_se_necessario(
+    calendar_id: Optional[str] = None,
+    service: Optional[GoogleCalendarService] = None,
+    max_idade: Optional[int] = None,
+) -> bool:
+    """
+    Sincroniza se a última sincronização for mais antiga que `max_idade`
+    segundos (padrão GOOGLE_CALENDAR_MIRROR_MAX_AGE). Falhas da API são
+    registradas e o espelho atual continua sendo usado.
+
+    Returns:
+        True se sincronizou
+    """
+    if max_idade is None:
+        max_idade = getattr(settings, "GOOGLE_CALENDAR_MIRROR_MAX_AGE", 300)
+    calendar_id = service.calendar_id if service else calendar_id
+    calendar_id = calendar_id or getattr(
+        settings, "GOOGLE_CALENDAR_CALENDAR_ID", "primary"
+    )
+
+    ultima = (
+        SincronizacaoCalendario.objects.filter(calendar_id=calendar_id)
+        .values_list("ultima_sincronizacao", flat=True)
+        .first()
+    )
+    if ultima and timezone.now() - ultima < timedelta(seconds=max_idade):
+        return False
+
+    try:
+        sincronizar(calendar_id, service=service)
+        return True
+    except Exception as e:
+        logger.error(f"Falha ao sincronizar espelho {calendar_id}: {e}")
+        return False
+
+
+def eventos_no_intervalo(inicio: datetime, fim: datetime, calendar_ids: Iterable[str]):
+    """Eventos ativos do espelho que se sobrepõem a [inicio, fim)"""
+    return (
+        EventoCalendarioEspelho.objects.filter(
+            calendar_id__in=list(calendar_ids), inicio__lt=fim, fim__gt=inicio
+        )
+        .exclude(status=CANCELADO)
+        .order_by("inicio")
+    )
@@ -0,0 +1,420 @@
+"""
+Outbox das operações no Google Calendar
+
+As views não chamam mais a API: gravam uma OperacaoCalendario na mesma
+transação que altera a Solicitacao e respondem na hora. Após o commit,
+um trabalho em segundo plano (background_jobs: Celery ou thread) drena a
+fila; o progresso fica em EventoGoogleCalendar.status_sincronizacao.
+
+Operações pendentes da mesma solicitação são combinadas numa só chamada:
+várias atualizações viram uma (com os dados atuais da solicitação),
+criar + atualizar vira criar e criar + remover não chega à API.
+
+Falhas voltam para a fila com backoff exponencial, sem bloquear ninguém;
+após GOOGLE_CALENDAR_OUTBOX_MAX_TENTATIVAS o evento fica com status Erro.
+
+A operação guarda o id e o título da solicitação (solicitacao_ref,
+titulo_evento): uma remoção continua válida depois que a solicitação for
+apagada. O id do evento no Calendar de uma remoção é resolvido na
+execução, pois pode ter sido registrada com a criação ainda em andamento.
+"""
+
+import logging
+import threading
+from datetime import timedelta
+from itertools import groupby
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.models import (
+    EventoGoogleCalendar,
+    LogAuditoria,
+    OperacaoCalendario,
+    Solicitacao,
+)
+from core.services.background_jobs import enfileirar_apos_commit
+from core.services.integrations.calendar_mapper import map_solicitacao_to_google_event
+from core.services.integrations.error_handling import GoogleCalendarNotFoundError
+from core.services.integrations.google_calendar import (
+    GoogleCalendarService,
+)
+from core.services.integrations.google_calendar import is_enabled as google_enabled
+
+logger = logging.getLogger(__name__)
+
+Tipo = OperacaoCalendario.Tipo
+Status = OperacaoCalendario.Status
+Sincronizacao = EventoGoogleCalendar.SincronizacaoStatus
+
+# Um dreno por processo; entre processos, select_for_update(skip_locked)
+_lock = threading.Lock()
+
+
+def _config(nome: str, padrao):
+    return getattr(settings, f"GOOGLE_CALENDAR_OUTBOX_{nome}", padrao)
+
+
+def registrar(
+    solicitacao: Solicitacao, tipo: str, usuario=None, provider_event_id: str = ""
+) -> OperacaoCalendario:
+    """
+    Grava a operação na transação corrente e agenda o processamento para
+    depois do commit.
+
+    Uma atualização com outra criação/atualização ainda pendente para a
+    mesma solicitação não gera nova linha: o worker lê os dados atuais.
+    """
+    if tipo == Tipo.ATUALIZAR:
+        pendente = (
+            OperacaoCalendario.objects.filter(
+                solicitacao=solicitacao,
+                status=Status.PENDENTE,
+                tipo__in=[Tipo.CRIAR, Tipo.ATUALIZAR],
+            )
+            .order_by("-id")
+            .first()
+        )
+        if pendente:
+            _agendar()
+            return pendente
+
+    operacao = OperacaoCalendario.objects.create(
+        solicitacao=solicitacao,
+        solicitacao_ref=solicitacao.pk,
+        titulo_evento=solicitacao.titulo_evento,
+        tipo=tipo,
+        usuario=usuario,
+        provider_event_id=provider_event_id,
+    )
+    _agendar()
+    return operacao
+
+
+def _agendar():
+    enfileirar_apos_commit("processar_operacoes_calendar_task", processar_pendentes)
+
+
+def _reservar(limite: int) -> List[OperacaoCalendario]:
+    """
+    Marca como PROCESSANDO as operações vencidas e devolve-as. A reserva
+    expira após GOOGLE_CALENDAR_OUTBOX_TIMEOUT, caso o worker morra.
+    """
+    agora = timezone.now()
+    with transaction.atomic():
+        qs = OperacaoCalendario.objects.filter(
+            status__in=[Status.PENDENTE, Status.PROCESSANDO],
+            proxima_tentativa__lte=agora,
+        ).order_by("id")
+        if connection.features.has_select_for_update_skip_locked:
+            qs = qs.select_for_update(skip_locked=True)
+        operacoes = list(qs[:limite])
+        if operacoes:
+            OperacaoCalendario.objects.filter(
+                pk__in=[op.pk for op in operacoes]
+            ).update(
+                status=Status.PROCESSANDO,
+                proxima_tentativa=agora + timedelta(seconds=_config("TIMEOUT", 600)),
+            )
+    return operacoes
+
+
+def _combinar(operacoes: List[OperacaoCalendario]):
+    """
+    Reduz as operações (em ordem) de uma solicitação a uma ação.
+
+    Returns:
+        (ação ou None, operações combinadas, operações deixadas para depois)
+        Uma criação após uma remoção é outro evento: fica para a próxima
+        rodada, depois que a remoção tiver sido feita.
+    """
+    acao = None
+    for i, op in enumerate(operacoes):
+        if op.tipo == Tipo.CRIAR:
+            if acao == Tipo.REMOVER:
+                return acao, operacoes[:i], operacoes[i:]
+            acao = Tipo.CRIAR
+        elif op.tipo == Tipo.ATUALIZAR:
+            acao = acao or Tipo.ATUALIZAR
+        elif acao == Tipo.CRIAR:
+            # Nunca chegou ao Calendar: nada a remover
+            acao = None
+        else:
+            acao = Tipo.REMOVER
+    return acao, operacoes, []
+
+
+def processar_pendentes(
+    service: Optional[GoogleCalendarService] = None, limite: Optional[int] = None
+) -> dict:
+    """
+    Drena a outbox.
+
+    Returns:
+        {"operacoes", "chamadas", "erros"}
+    """
+    if not google_enabled():
+        return {"operacoes": 0, "chamadas": 0, "erros": 0}
+
+    limite = limite or _config("LOTE", 100)
+    service = service or GoogleCalendarService()
+    resumo = {"operacoes": 0, "chamadas": 0, "erros": 0}
+
+    with _lock:
+        while True:
+            operacoes = _reservar(limite)
+            if not operacoes:
+                break
+            resumo["operacoes"] += len(operacoes)
+
+            por_solicitacao = groupby(
+                sorted(operacoes, key=lambda op: (str(op.solicitacao_ref), op.id)),
+                key=lambda op: op.solicitacao_ref,
+            )
+            for solicitacao_id, grupo in por_solicitacao:
+                acao, combinadas, adiadas = _combinar(list(grupo))
+                if adiadas:
+                    OperacaoCalendario.objects.filter(
+                        pk__in=[op.pk for op in adiadas]
+                    ).update(status=Status.PENDENTE, proxima_tentativa=timezone.now())
+                if acao is None:
+                    # Criado e removido antes de chegar ao Calendar
+                    with transaction.atomic():
+                        EventoGoogleCalendar.objects.filter(
+                            solicitacao_id=solicitacao_id, provider_event_id=""
+                        ).delete()
+                        _concluir(combinadas, None)
+                    continue
+
+                resumo["chamadas"] += 1
+                if not _executar(service, acao, combinadas):
+                    resumo["erros"] += 1
+
+    if resumo["operacoes"]:
+        logger.info(
+            f"Outbox Calendar: {resumo['operacoes']} operações, "
+            f"{resumo['chamadas']} chamadas, {resumo['erros']} erros"
+        )
+    return resumo
+
+
+def _concluir(operacoes, principal):
+    agora = timezone.now()
+    agrupadas = [op.pk for op in operacoes if op is not principal]
+    if agrupadas:
+        OperacaoCalendario.objects.filter(pk__in=agrupadas).update(
+            status=Status.AGRUPADA, processado_em=agora, erro=""
+        )
+    if principal is not None:
+        OperacaoCalendario.objects.filter(pk=principal.pk).update(
+            status=Status.CONCLUIDA, processado_em=agora, erro=""
+        )
+
+
+def _executar(service, acao, operacoes) -> bool:
+    """Faz a chamada à API fora de transação e grava o resultado"""
+    principal = operacoes[-1]
+    usuario = next((op.usuario for op in reversed(operacoes) if op.usuario_id), None)
+    solicitacao = (
+        Solicitacao.objects.select_related("municipio", "projeto", "tipo_evento")
+        .filter(pk=principal.solicitacao_ref)
+        .first()
+    )
+    evento = EventoGoogleCalendar.objects.filter(
+        solicitacao_id=principal.solicitacao_ref
+    ).first()
+
+    if acao == Tipo.REMOVER:
+        provider_event_id = _evento_a_remover(operacoes, evento)
+        if provider_event_id is None:
+            # Criação ainda em andamento: a remoção espera o id do evento
+            _adiar(operacoes)
+            return True
+    elif solicitacao is None:
+        # Solicitação apagada antes do envio: nada a criar ou atualizar
+        with transaction.atomic():
+            _concluir(operacoes, principal)
+        return True
+
+    try:
+        if acao == Tipo.CRIAR:
+            resposta = service.create_event(
+                map_solicitacao_to_google_event(solicitacao)
+            )
+        elif acao == Tipo.ATUALIZAR:
+            resposta = service.update_event(
+                evento.provider_event_id, map_solicitacao_to_google_event(solicitacao)
+            )
+        elif provider_event_id:
+            try:
+                service.delete_event(provider_event_id)
+            except GoogleCalendarNotFoundError:
+                logger.info(f"Evento {provider_event_id} já removido do Calendar")
+            resposta = None
+        else:
+            # A criação nunca chegou ao Calendar
+            resposta = None
+    except Exception as e:
+        _falhar(operacoes, evento, principal, usuario, e)
+        return False
+
+    with transaction.atomic():
+        if acao == Tipo.REMOVER:
+            _registrar_remocao(evento, principal, usuario, provider_event_id)
+        else:
+            _registrar_evento(acao, evento, solicitacao, usuario, resposta)
+        _concluir(operacoes, principal)
+
+    if acao == Tipo.CRIAR:
+        _notificar_criacao(solicitacao, evento, usuario)
+    return True
+
+
+def _evento_a_remover(operacoes, evento) -> Optional[str]:
+    """
+    Id do evento no Calendar a remover: o gravado na operação ou, se ela foi
+    registrada antes da criação concluir, o atual do EventoGoogleCalendar.
+
+    Returns:
+        O id; "" se não há evento no Calendar; None se uma criação da mesma
+        solicitação ainda está em andamento
+    """
+    provider_event_id = next(
+        (
+            op.provider_event_id
+            for op in reversed(operacoes)
+            if op.tipo == Tipo.REMOVER and op.provider_event_id
+        ),
+        "",
+    )
+    if not provider_event_id and evento is not None:
+        provider_event_id = evento.provider_event_id
+    if provider_event_id:
+        return provider_event_id
+
+    criando = (
+        OperacaoCalendario.objects.filter(
+            solicitacao_ref=operacoes[-1].solicitacao_ref,
+            tipo=Tipo.CRIAR,
+            status__in=[Status.PENDENTE, Status.PROCESSANDO],
+        )
+        .exclude(pk__in=[op.pk for op in operacoes])
+        .exists()
+    )
+    return None if criando else ""
+
+
+def _adiar(operacoes):
+    """Devolve as operações à fila, sem contar tentativa"""
+    OperacaoCalendario.objects.filter(pk__in=[op.pk for op in operacoes]).update(
+        status=Status.PENDENTE,
+        proxima_tentativa=timezone.now() + timedelta(seconds=_config("BACKOFF", 30)),
+    )
+
+
+def _registrar_evento(acao, evento, solicitacao, usuario, resposta):
+    if acao == Tipo.CRIAR:
+        # Remoções registradas durante a criação ficam com o id do evento
+        OperacaoCalendario.objects.filter(
+            solicitacao_ref=solicitacao.pk,
+            tipo=Tipo.REMOVER,
+            provider_event_id="",
+            status__in=[Status.PENDENTE, Status.PROCESSANDO],
+        ).update(provider_event_id=resposta["id"])
+
+    evento.html_link = resposta.get("htmlLink", evento.html_link)
+    evento.meet_link = resposta.get("hangoutLink", evento.meet_link)
+    evento.status_sincronizacao = Sincronizacao.OK
+    evento.mensagem_erro = None
+    campos = ["html_link", "meet_link", "status_sincronizacao", "mensagem_erro"]
+    if acao == Tipo.CRIAR:
+        evento.provider_event_id = resposta["id"]
+        evento.raw_payload = resposta
+        campos += ["provider_event_id", "raw_payload"]
+    evento.save(update_fields=campos)
+
+    if acao == Tipo.CRIAR:
+        LogAuditoria.objects.create(
+            usuario=usuario,
+            acao="RF05: Controle criou evento manual",
+            entidade_afetada_id=solicitacao.id,
+            detalhes=f"Evento '{solicitacao.titulo_evento}' criado manualmente pelo Controle "
+            f"— ID: {resposta['id']} "
+            f"— Meet: {'Sim' if resposta.get('hangoutLink') else 'Não'}",
+        )
+    else:
+        LogAuditoria.objects.create(
+            usuario=usuario,
+            acao="RF05: Atualizar evento Google Calendar",
+            entidade_afetada_id=solicitacao.id,
+            detalhes=f"Evento '{solicitacao.titulo_evento}' atualizado no Google Calendar "
+            f"— ID: {evento.provider_event_id}",
+        )
+
+
+def _registrar_remocao(evento, operacao, usuario, provider_event_id):
+    LogAuditoria.objects.create(
+        usuario=usuario,
+        acao="RF05: Deletar evento Google Calendar",
+        entidade_afetada_id=operacao.solicitacao_ref,
+        detalhes=f"Evento '{operacao.titulo_evento}' removido do Google Calendar "
+        f"— ID: {provider_event_id or '(não criado)'}",
+    )
+    if evento and evento.provider_event_id == provider_event_id:
+        evento.delete()
+
+
+def _notificar_criacao(solicitacao, evento, usuario):
+    from core.services.notifications_simplified import notify_event_created
+
+    try:
+        resultado = notify_event_created(solicitacao, evento, usuario)
+        if resultado["success"]:
+            LogAuditoria.objects.create(
+                usuario=usuario,
+                acao="RF07: Notificações de evento criado enviadas",
+                entidade_afetada_id=solicitacao.id,
+                detalhes=f"Notificações enviadas: {resultado['notifications_sent']}",
+            )
+    except Exception as e:
+        # Erro nas notificações não desfaz o evento criado
+        LogAuditoria.objects.create(
+            usuario=usuario,
+            acao="RF07: Erro em notificações de evento criado",
+            entidade_afetada_id=solicitacao.id,
+            detalhes=f"Erro: {str(e)}",
+        )
+
+
+def _falhar(operacoes, evento, operacao, usuario, erro):
+    tentativas = max(op.tentativas for op in operacoes) + 1
+    definitivo = tentativas >= _config("MAX_TENTATIVAS", 5)
+    espera = _config("BACKOFF", 30) * 2 ** (tentativas - 1)
+    logger.error(
+        f"Outbox Calendar: falha na solicitação {operacao.solicitacao_ref} "
+        f"(tentativa {tentativas}): {erro}"
+    )
+
+    with transaction.atomic():
+        OperacaoCalendario.objects.filter(pk__in=[op.pk for op in operacoes]).update(
+            status=Status.ERRO if definitivo else Status.PENDENTE,
+            tentativas=tentativas,
+            proxima_tentativa=timezone.now() + timedelta(seconds=espera),
+            erro=str(erro),
+        )
+        if evento:
+            evento.mensagem_erro = str(erro)
+            campos = ["mensagem_erro"]
+            if definitivo:
+                evento.status_sincronizacao = Sincronizacao.ERRO
+                campos.append("status_sincronizacao")
+            evento.save(update_fields=campos)
+        if definitivo:
+            LogAuditoria.objects.create(
+                usuario=usuario,
+                acao="RF05: ERRO sincronização Google Calendar",
+                entidade_afetada_id=operacao.solicitacao_ref,
+                detalhes=f"Falha após {tentativas} tentativas: {erro}",
+            )
@@ -4,13 +4,13 @@ Substitui os stubs por chamadas reais à API do Google.
 """
 
 import logging
-import os
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
 
 from django.conf import settings
 
+from . import google_clients
 from .error_handling import GoogleCalendarError, safe_google_calendar_operation
 
 logger = logging.getLogger(__name__)
@@ -48,54 +48,9 @@ class GoogleCalendarService:
             return self._service
 
         try:
-            import json
-
-            from google.oauth2.credentials import Credentials
-            from googleapiclient.discovery import build
-
-            # Tentar usar OAuth2 credentials first (working)
-            oauth_path = os.path.join(
-                os.path.dirname(__file__),
-                "..",
-                "..",
-                "..",
-                "google_authorized_user.json",
-            )
-            oauth_path = os.path.abspath(oauth_path)
-
-            if os.path.exists(oauth_path):
-                with open(oauth_path, "r") as f:
-                    cred_info = json.load(f)
-
-                # Adicionar escopo calendar se não existir
-                scopes = cred_info.get("scopes", [])
-                if "https://www.googleapis.com/auth/calendar" not in scopes:
-                    scopes.append("https://www.googleapis.com/auth/calendar")
-                    cred_info["scopes"] = scopes
-
-                credentials = Credentials.from_authorized_user_info(cred_info, scopes)
-
-                self._service = build("calendar", "v3", credentials=credentials)
-                logger.info("Google Calendar service inicializado com OAuth2")
-                return self._service
-
-            # Fallback para service account
-            from google.oauth2 import service_account
-
-            credentials_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-            if credentials_path and os.path.exists(credentials_path):
-                SCOPES = ["https://www.googleapis.com/auth/calendar"]
-                credentials = service_account.Credentials.from_service_account_file(
-                    credentials_path, scopes=SCOPES
-                )
-
-                self._service = build("calendar", "v3", credentials=credentials)
-                logger.info("Google Calendar service inicializado com Service Account")
-                return self._service
-
-            raise ValueError(
-                "Nenhuma credencial válida encontrada (OAuth2 ou Service Account)"
-            )
+            # Credenciais e cliente vêm do cache do processo (google_clients)
+            self._service = google_clients.calendar_client()
+            return self._service
 
         except ImportError as e:
             logger.error(f"Bibliotecas Google não instaladas: {e}")
@@ -151,18 +106,17 @@ class GoogleCalendarService:
             # Adicionar participantes se houver
             if hasattr(gevent, "attendees") and gevent.attendees:
                 event_data["attendees"] = [
-                    {"email": email} for email in gevent.attendees
+                    {"email": attendee.email} for attendee in gevent.attendees
                 ]
 
             # Criar evento via API
-            event = (
-                service.events()
-                .insert(
+            event = google_clients.fabrica.executar(
+                service.events().insert(
                     calendarId=self.calendar_id,
                     body=event_data,
                     conferenceDataVersion=1 if gevent.conference else 0,
-                )
-                .execute()
+                ),
+                "calendar.events.insert",
             )
 
             logger.info(f"Evento criado com sucesso: {event.get('id')}")
@@ -202,10 +156,11 @@ class GoogleCalendarService:
             service = self._get_service()
 
             # Buscar evento atual
-            current_event = (
-                service.events()
-                .get(calendarId=self.calendar_id, eventId=provider_event_id)
-                .execute()
+            current_event = google_clients.fabrica.executar(
+                service.events().get(
+                    calendarId=self.calendar_id, eventId=provider_event_id
+                ),
+                "calendar.events.get",
             )
 
             # Atualizar campos
@@ -226,14 +181,13 @@ class GoogleCalendarService:
             )
 
             # Atualizar evento via API
-            updated_event = (
-                service.events()
-                .update(
+            updated_event = google_clients.fabrica.executar(
+                service.events().update(
                     calendarId=self.calendar_id,
                     eventId=provider_event_id,
                     body=current_event,
-                )
-                .execute()
+                ),
+                "calendar.events.update",
             )
 
             logger.info(f"Evento atualizado com sucesso: {updated_event.get('id')}")
@@ -268,9 +222,12 @@ class GoogleCalendarService:
         try:
             service = self._get_service()
 
-            service.events().delete(
-                calendarId=self.calendar_id, eventId=provider_event_id
-            ).execute()
+            google_clients.fabrica.executar(
+                service.events().delete(
+                    calendarId=self.calendar_id, eventId=provider_event_id
+                ),
+                "calendar.events.delete",
+            )
 
             logger.info(f"Evento deletado com sucesso: {provider_event_id}")
             return True
@@ -279,15 +236,41 @@ class GoogleCalendarService:
             logger.error(f"Erro ao deletar evento do Google Calendar: {e}")
             raise
 
+    # Máximo de eventos por página aceito pela API
+    PAGE_SIZE = 2500
+
+    def iter_event_pages(self, **params):
+        """
+        Percorre todas as páginas de events().list, seguindo nextPageToken.
+
+        Gera as respostas brutas de cada página; a última traz
+        nextSyncToken quando a listagem permite sincronização incremental.
+        Erros da API são propagados (ex.: HTTP 410 para syncToken expirado).
+        """
+        service = self._get_service()
+        params = {"calendarId": self.calendar_id, **params}
+        params.setdefault("maxResults", self.PAGE_SIZE)
+
+        while True:
+            page = google_clients.fabrica.executar(
+                service.events().list(**params), "calendar.events.list"
+            )
+            yield page
+            page_token = page.get("nextPageToken")
+            if not page_token:
+                return
+            params["pageToken"] = page_token
+
     @safe_google_calendar_operation(max_attempts=2, operation_name="list_events")
     def list_events(
-        self, max_results: int = 10, time_min: Optional[datetime] = None
+        self, max_results: Optional[int] = 10, time_min: Optional[datetime] = None
     ) -> list:
         """
         Lista eventos do calendário (útil para debugging e testes).
 
         Args:
-            max_results: Número máximo de eventos a retornar
+            max_results: Número máximo de eventos a retornar (None: todos,
+                percorrendo todas as páginas)
             time_min: Data/hora mínima para filtrar eventos
 
         Returns:
@@ -297,11 +280,8 @@ class GoogleCalendarService:
             return []
 
         try:
-            service = self._get_service()
-
             params = {
-                "calendarId": self.calendar_id,
-                "maxResults": max_results,
+                "maxResults": min(max_results or self.PAGE_SIZE, self.PAGE_SIZE),
                 "singleEvents": True,
                 "orderBy": "startTime",
             }
@@ -309,8 +289,12 @@ class GoogleCalendarService:
             if time_min:
                 params["timeMin"] = time_min.isoformat() + "Z"
 
-            events_result = service.events().list(**params).execute()
-            events = events_result.get("items", [])
+            events = []
+            for page in self.iter_event_pages(**params):
+                events.extend(page.get("items", []))
+                if max_results and len(events) >= max_results:
+                    events = events[:max_results]
+                    break
 
             logger.info(f"Listados {len(events)} eventos do calendário")
             return events
@@ -0,0 +1,292 @@
+"""
+Fábrica de clientes das APIs Google
+
+Credenciais são carregadas uma vez por processo (por arquivo) e renovadas
+antes de expirar, sob um lock, em vez de cada serviço reler o JSON e
+esbarrar no token vencido na primeira chamada. Clientes discovery e
+sessões gspread ficam em cache e mantêm a conexão HTTP aberta entre
+instâncias dos serviços.
+
+Os clientes do googleapiclient (httplib2) não são thread-safe: ficam em
+cache por thread. As sessões gspread (requests) são compartilhadas.
+
+metricas() separa o tempo gasto construindo clientes do tempo das
+chamadas à API.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Any, Callable, Hashable, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_SCOPE = "https://www.googleapis.com/auth/calendar"
+
+
+def _auth_request():
+    from google.auth.transport.requests import Request
+
+    return Request()
+
+
+class ClientFactory:
+    """
+    Cache de credenciais e clientes por processo.
+
+    Args:
+        margem: renova o token quando faltar menos que isso (segundos) para
+            expirar; padrão GOOGLE_TOKEN_REFRESH_MARGIN
+        auth_request: cria o transporte usado em credentials.refresh()
+        clock: relógio das métricas
+    """
+
+    def __init__(
+        self,
+        margem: Optional[int] = None,
+        auth_request: Callable[[], Any] = _auth_request,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self.margem = margem
+        self.auth_request = auth_request
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._locks = {}
+        self._credenciais = {}
+        self._compartilhados = {}
+        self._local = threading.local()
+        self.limpar_metricas()
+
+    # Métricas
+
+    def limpar_metricas(self):
+        self._metricas = {
+            "construcoes": 0,
+            "construcao_segundos": 0.0,
+            "reusos": 0,
+            "renovacoes": 0,
+            "chamadas": {},
+        }
+
+    def metricas(self) -> dict:
+        """
+        Returns:
+            {"construcoes", "construcao_segundos", "reusos", "renovacoes",
+             "chamadas": {nome: {"quantidade", "segundos"}}}
+        """
+        with self._lock:
+            return {
+                **self._metricas,
+                "chamadas": {
+                    nome: dict(valores)
+                    for nome, valores in self._metricas["chamadas"].items()
+                },
+            }
+
+    @contextmanager
+    def medir(self, nome: str):
+        """Cronometra uma chamada à API"""
+        inicio = self.clock()
+        try:
+            yield
+        finally:
+            duracao = self.clock() - inicio
+            with self._lock:
+                chamada = self._metricas["chamadas"].setdefault(
+                    nome, {"quantidade": 0, "segundos": 0.0}
+                )
+                chamada["quantidade"] += 1
+                chamada["segundos"] += duracao
+
+    def executar(self, requisicao, nome: str):
+        """requisicao.execute() cronometrado sob `nome`"""
+        with self.medir(nome):
+            return requisicao.execute()
+
+    # Credenciais
+
+    def _lock_de(self, chave: Hashable) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(chave, threading.Lock())
+
+    def _precisa_renovar(self, credenciais) -> bool:
+        if not getattr(credenciais, "refresh_token", None) and not hasattr(
+            credenciais, "service_account_email"
+        ):
+            return False
+        expiry = getattr(credenciais, "expiry", None)
+        if expiry is None:
+            return not getattr(credenciais, "token", None)
+        margem = self.margem
+        if margem is None:
+            margem = getattr(settings, "GOOGLE_TOKEN_REFRESH_MARGIN", 300)
+        # google-auth guarda expiry como datetime UTC ingênuo
+        agora = datetime.now(dt_timezone.utc).replace(tzinfo=None)
+        return expiry - agora < timedelta(seconds=margem)
+
+    def credenciais(
+        self,
+        chave: Hashable,
+        carregar: Callable[[], Any],
+        ao_renovar: Optional[Callable[[Any], None]] = None,
+    ):
+        """
+        Credenciais em cache para `chave`, renovadas se perto de expirar.
+
+        Args:
+            chave: identifica a origem (ex.: caminho do arquivo)
+            carregar: lê as credenciais; None não é guardado em cache
+            ao_renovar: chamado após renovar (ex.: persistir o token)
+        """
+        with self._lock_de(chave):
+            credenciais = self._credenciais.get(chave)
+            if credenciais is None:
+                credenciais = carregar()
+                if credenciais is None:
+                    return None
+                self._credenciais[chave] = credenciais
+
+            if self._precisa_renovar(credenciais):
+                credenciais.refresh(self.auth_request())
+                with self._lock:
+                    self._metricas["renovacoes"] += 1
+                logger.info(f"Token Google renovado: {chave}")
+                if ao_renovar:
+                    ao_renovar(credenciais)
+            return credenciais
+
+    # Clientes
+
+    def cliente(
+        self,
+        chave: Hashable,
+        construir: Callable[[], Any],
+        compartilhado: bool = False,
+    ):
+        """
+        Cliente em cache para `chave`.
+
+        Args:
+            construir: cria o cliente na primeira vez
+            compartilhado: um cliente por processo (thread-safe) em vez de
+                um por thread
+        """
+        if compartilhado:
+            cache = self._compartilhados
+        else:
+            cache = getattr(self._local, "clientes", None)
+            if cache is None:
+                cache = self._local.clientes = {}
+
+        cliente = cache.get(chave)
+        if cliente is not None:
+            with self._lock:
+                self._metricas["reusos"] += 1
+            return cliente
+
+        lock = self._lock_de(("cliente", chave)) if compartilhado else None
+        if lock:
+            lock.acquire()
+        try:
+            cliente = cache.get(chave)
+            if cliente is None:
+                inicio = self.clock()
+                cliente = construir()
+                duracao = self.clock() - inicio
+                cache[chave] = cliente
+                with self._lock:
+                    self._metricas["construcoes"] += 1
+                    self._metricas["construcao_segundos"] += duracao
+                logger.info(f"Cliente Google construído: {chave} ({duracao:.3f}s)")
+            return cliente
+        finally:
+            if lock:
+                lock.release()
+
+    def limpar(self):
+        """Descarta credenciais e clientes (ex.: após trocar credenciais)"""
+        with self._lock:
+            self._credenciais.clear()
+            self._compartilhados.clear()
+            self._locks.clear()
+        self._local = threading.local()
+
+
+fabrica = ClientFactory()
+
+
+def discovery(api: str, versao: str, chave_credenciais: Hashable, credenciais):
+    """Cliente googleapiclient da thread atual para a API e credencial"""
+
+    def construir():
+        from googleapiclient.discovery import build
+
+        return build(api, versao, credentials=credenciais, cache_discovery=False)
+
+    return fabrica.cliente((api, versao, chave_credenciais), construir)
+
+
+def _oauth_calendar_path() -> str:
+    return os.path.abspath(
+        os.path.join(
+            os.path.dirname(__file__), "..", "..", "..", "google_authorized_user.json"
+        )
+    )
+
+
+def credenciais_calendar():
+    """
+    Credenciais do Calendar: OAuth2 (google_authorized_user.json) ou, como
+    fallback, service account (GOOGLE_APPLICATION_CREDENTIALS).
+
+    Returns:
+        (chave, credenciais)
+    """
+    oauth_path = _oauth_calendar_path()
+    if os.path.exists(oauth_path):
+
+        def carregar_oauth():
+            from google.oauth2.credentials import Credentials
+
+            with open(oauth_path, "r") as f:
+                cred_info = json.load(f)
+            scopes = cred_info.get("scopes", [])
+            if CALENDAR_SCOPE not in scopes:
+                scopes.append(CALENDAR_SCOPE)
+                cred_info["scopes"] = scopes
+            return Credentials.from_authorized_user_info(cred_info, scopes)
+
+        chave = ("oauth", oauth_path)
+        return chave, fabrica.credenciais(chave, carregar_oauth)
+
+    credentials_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+    if credentials_path and os.path.exists(credentials_path):
+
+        def carregar_service_account():
+            from google.oauth2 import service_account
+
+            return service_account.Credentials.from_service_account_file(
+                credentials_path, scopes=[CALENDAR_SCOPE]
+            )
+
+        chave = ("service_account", credentials_path)
+        return chave, fabrica.credenciais(chave, carregar_service_account)
+
+    raise ValueError("Nenhuma credencial válida encontrada (OAuth2 ou Service Account)")
+
+
+def calendar_client():
+    """Cliente Calendar v3 da thread atual"""
+    chave, credenciais = credenciais_calendar()
+    return discovery("calendar", "v3", chave, credenciais)
+
+
+def metricas() -> dict:
+    return fabrica.metricas()
@@ -13,6 +13,8 @@ import gspread
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 
+from . import google_clients
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,9 +42,14 @@ class GoogleSheetsService:
 
             # Para desenvolvimento - usar conta de usuário
             # Em produção - migrar para Service Account
-            self.client = gspread.oauth(
-                credentials_filename="google_oauth_credentials.json",
-                authorized_user_filename="google_authorized_user.json",
+            # Cliente compartilhado pelo processo (sessão HTTP reaproveitada)
+            self.client = google_clients.fabrica.cliente(
+                ("gspread-oauth", os.path.abspath("google_authorized_user.json")),
+                lambda: gspread.oauth(
+                    credentials_filename="google_oauth_credentials.json",
+                    authorized_user_filename="google_authorized_user.json",
+                ),
+                compartilhado=True,
             )
 
             logger.info("Cliente Google Sheets inicializado com sucesso")
@@ -0,0 +1,182 @@
+"""
+Extração de planilhas Google Sheets com snapshots em disco
+
+Cada planilha é lida com uma única chamada values_batch_get (todas as abas
+de uma vez) e planilhas diferentes são lidas em paralelo, com limite de
+GOOGLE_SHEETS_MAX_WORKERS threads. O resultado bruto fica em disco,
+identificado pela revisão da planilha (horário da última alteração no
+Drive): enquanto a planilha não muda, novas execuções leem o snapshot e
+não baixam os valores de novo.
+
+Snapshot: {"chave", "revisao", "abas": {titulo: [[celula, ...], ...]}}
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+
+from . import google_clients
+
+logger = logging.getLogger(__name__)
+
+
+def diretorio_padrao() -> str:
+    return getattr(
+        settings,
+        "GOOGLE_SHEETS_CACHE_DIR",
+        os.path.join(settings.BASE_DIR, ".cache", "planilhas"),
+    )
+
+
+def _intervalo(titulo: str) -> str:
+    # Aba inteira em notação A1; aspas simples escapadas duplicando
+    return "'{}'".format(titulo.replace("'", "''"))
+
+
+class ExtratorPlanilhas:
+    """
+    Args:
+        cliente: cliente gspread (open_by_key)
+        diretorio: onde guardar os snapshots; None desliga o cache
+        max_workers: planilhas lidas ao mesmo tempo
+    """
+
+    def __init__(
+        self,
+        cliente,
+        diretorio: Optional[str] = "",
+        max_workers: Optional[int] = None,
+    ):
+        self.cliente = cliente
+        self.diretorio = diretorio_padrao() if diretorio == "" else diretorio
+        self.max_workers = max_workers or getattr(
+            settings, "GOOGLE_SHEETS_MAX_WORKERS", 4
+        )
+        self.estatisticas = {"baixadas": 0, "em_cache": 0, "erros": 0}
+        self._lock = threading.Lock()
+
+    def _contar(self, chave: str):
+        with self._lock:
+            self.estatisticas[chave] += 1
+
+    # Revisão e cache
+
+    def revisao(self, planilha) -> Optional[str]:
+        """Horário da última alteração (Drive), ou None se indisponível"""
+        try:
+            if hasattr(planilha, "get_lastUpdateTime"):
+                return planilha.get_lastUpdateTime()
+            return planilha.lastUpdateTime
+        except Exception as e:
+            logger.warning(f"Revisão indisponível para {planilha.id}: {e}")
+            return None
+
+    def _caminho(self, chave: str, revisao: str, abas: Optional[Iterable[str]]) -> str:
+        assinatura = hashlib.sha1(
+            json.dumps([revisao, sorted(abas) if abas else None]).encode("utf-8")
+        ).hexdigest()[:16]
+        return os.path.join(self.diretorio, chave, f"{assinatura}.json")
+
+    def _ler_cache(self, caminho: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(caminho, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Snapshot ilegível, baixando de novo: {caminho} ({e})")
+            return None
+
+    def _gravar_cache(self, caminho: str, snapshot: Dict[str, Any]):
+        pasta = os.path.dirname(caminho)
+        os.makedirs(pasta, exist_ok=True)
+        # Arquivo temporário + replace: leitor concorrente nunca vê JSON pela metade
+        fd, temporario = tempfile.mkstemp(dir=pasta, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(temporario, caminho)
+        except Exception:
+            if os.path.exists(temporario):
+                os.unlink(temporario)
+            raise
+        # Revisões anteriores da mesma planilha não servem mais
+        for nome in os.listdir(pasta):
+            if nome.endswith(".json") and os.path.join(pasta, nome) != caminho:
+                os.unlink(os.path.join(pasta, nome))
+
+    # Extração
+
+    def extrair(self, chave: str, abas: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Snapshot de uma planilha (todas as abas ou só `abas`)
+        """
+        with google_clients.fabrica.medir("sheets.metadata"):
+            planilha = self.cliente.open_by_key(chave)
+            revisao = self.revisao(planilha)
+
+        caminho = None
+        if self.diretorio and revisao:
+            caminho = self._caminho(chave, revisao, abas)
+            snapshot = self._ler_cache(caminho)
+            if snapshot is not None:
+                self._contar("em_cache")
+                logger.info(f"Planilha {chave} sem alterações (revisão {revisao})")
+                return snapshot
+
+        titulos = abas or [aba.title for aba in planilha.worksheets()]
+        with google_clients.fabrica.medir("sheets.values_batch_get"):
+            resposta = planilha.values_batch_get(
+                ranges=[_intervalo(titulo) for titulo in titulos]
+            )
+        intervalos = resposta.get("valueRanges", [])
+        snapshot = {
+            "chave": chave,
+            "revisao": revisao,
+            "abas": {
+                titulo: intervalo.get("values", [])
+                for titulo, intervalo in zip(titulos, intervalos)
+            },
+        }
+        self._contar("baixadas")
+
+        if caminho:
+            self._gravar_cache(caminho, snapshot)
+        return snapshot
+
+    def extrair_todas(
+        self, planilhas: Dict[str, str], abas: Optional[Dict[str, List[str]]] = None
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Lê várias planilhas em paralelo.
+
+        Args:
+            planilhas: nome → chave da planilha
+            abas: nome → abas a ler (padrão: todas)
+
+        Returns:
+            nome → snapshot; None para planilhas que falharam
+        """
+        abas = abas or {}
+        resultados = {}
+        workers = max(1, min(self.max_workers, len(planilhas)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futuros = {
+                nome: executor.submit(self.extrair, chave, abas.get(nome))
+                for nome, chave in planilhas.items()
+            }
+            for nome, futuro in futuros.items():
+                try:
+                    resultados[nome] = futuro.result()
+                except Exception as e:
+                    self._contar("erros")
+                    logger.error(f"Erro ao extrair planilha {nome}: {e}")
+                    resultados[nome] = None
+        return resultados
@@ -0,0 +1,146 @@
+"""
+Mapa mensal de disponibilidade materializado (formador × dia).
+
+Cada célula do mapa é gravada em MapaDisponibilidadeDia com o mesmo marcador
+produzido por gerar_mapa_mensal_otimizado. Os signals recalculam apenas as
+células afetadas por uma alteração e a leitura do mapa passa a ser uma
+varredura por faixa de datas no índice (formador, data).
+"""
+
+import logging
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from core.models import Formador, MapaDisponibilidadeDia
+from core.services.calendar_codes import gerar_mapa_mensal_otimizado
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+def dias_do_periodo(dia_inicio: date, dia_fim: date) -> List[date]:
+    """Lista de dias do período, inclusive"""
+    total = (dia_fim - dia_inicio).days + 1
+    return [dia_inicio + timedelta(days=i) for i in range(max(total, 0))]
+
+
+def dias_do_mes(ano: int, mes: int) -> List[date]:
+    inicio = date(ano, mes, 1)
+    proximo = date(ano + (mes // 12), (mes % 12) + 1, 1)
+    return dias_do_periodo(inicio, proximo - timedelta(days=1))
+
+
+def recalcular_celulas(formadores, dias: List[date]) -> Dict:
+    """
+    Recalcula e grava (upsert) as células dos formadores nos dias informados.
+
+    Aceita instâncias de Formador ou ids. Retorna o mapa calculado no formato
+    de gerar_mapa_mensal_otimizado: {formador_id: [codigo por dia]}.
+    """
+    formadores = list(formadores)
+    if formadores and not isinstance(formadores[0], Formador):
+        formadores = list(Formador.objects.filter(id__in=formadores))
+    if not formadores or not dias:
+        return {}
+
+    mapa = gerar_mapa_mensal_otimizado(formadores, dias)
+    celulas = [
+        MapaDisponibilidadeDia(formador_id=formador_id, data=dia, codigo=codigo)
+        for formador_id, codigos in mapa.items()
+        for dia, codigo in zip(dias, codigos)
+    ]
+    MapaDisponibilidadeDia.objects.bulk_create(
+        celulas,
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["formador", "data"],
+        update_fields=["codigo", "atualizado_em"],
+    )
+    return mapa
+
+
+def recalcular_faixas(faixas: Iterable[Tuple[Iterable, date, date]]):
+    """
+    Recalcula faixas (formador_ids, dia_inicio, dia_fim) afetadas por uma
+    alteração. Falhas são registradas e não interrompem a operação de origem:
+    o comando de reconstrução corrige qualquer divergência.
+    """
+    for formador_ids, dia_inicio, dia_fim in faixas:
+        try:
+            recalcular_celulas(formador_ids, dias_do_periodo(dia_inicio, dia_fim))
+        except Exception as e:
+            logger.error(
+                f"Erro ao recalcular mapa materializado ({dia_inicio} a {dia_fim}): {e}"
+            )
+
+
+def ler_mapa(formadores, dias: List[date]) -> Dict:
+    """
+    Lê o mapa do período em uma única consulta por faixa de datas.
+
+    Formadores sem todas as células materializadas (período nunca calculado)
+    são calculados e gravados na hora, para que a próxima leitura já os encontre.
+    """
+    formadores = list(formadores)
+    if not formadores or not dias:
+        return {}
+
+    posicao = {dia: i for i, dia in enumerate(dias)}
+    mapa = {f.id: [None] * len(dias) for f in formadores}
+
+    for formador_id, data, codigo in MapaDisponibilidadeDia.objects.filter(
+        formador_id__in=list(mapa),
+        data__gte=dias[0],
+        data__lte=dias[-1],
+    ).values_list("formador_id", "data", "codigo"):
+        i = posicao.get(data)
+        if i is not None:
+            mapa[formador_id][i] = codigo
+
+    incompletos = [f for f in formadores if None in mapa[f.id]]
+    if incompletos:
+        mapa.update(recalcular_celulas(incompletos, dias))
+
+    return mapa
+
+
+def reconstruir(formadores, dias: List[date]) -> int:
+    """Reconstrução completa do período: apaga e recalcula todas as células"""
+    formadores = list(formadores)
+    MapaDisponibilidadeDia.objects.filter(
+        formador__in=formadores, data__gte=dias[0], data__lte=dias[-1]
+    ).delete()
+    mapa = recalcular_celulas(formadores, dias)
+    return sum(len(codigos) for codigos in mapa.values())
+
+
+def verificar(formadores, dias: List[date]) -> List[Tuple]:
+    """
+    Compara a tabela materializada com o cálculo ao vivo.
+
+    Returns:
+        Lista de (formador, dia, codigo_materializado, codigo_calculado) para
+        cada célula divergente; células ausentes aparecem com None.
+    """
+    formadores = list(formadores)
+    if not formadores or not dias:
+        return []
+
+    posicao = {dia: i for i, dia in enumerate(dias)}
+    materializado = {f.id: [None] * len(dias) for f in formadores}
+    for formador_id, data, codigo in MapaDisponibilidadeDia.objects.filter(
+        formador_id__in=list(materializado),
+        data__gte=dias[0],
+        data__lte=dias[-1],
+    ).values_list("formador_id", "data", "codigo"):
+        materializado[formador_id][posicao[data]] = codigo
+
+    calculado = gerar_mapa_mensal_otimizado(formadores, dias)
+    divergencias = []
+    for formador in formadores:
+        gravados, esperados = materializado[formador.id], calculado[formador.id]
+        for dia, gravado, esperado in zip(dias, gravados, esperados):
+            if gravado != esperado:
+                divergencias.append((formador, dia, gravado, esperado))
+    return divergencias
@@ -0,0 +1,151 @@
+"""
+Contador de notificações não lidas por usuário
+
+Mantido no cache (Redis em produção) e atualizado atomicamente com
+incr/decr na criação, remoção e leitura de notificações. A leitura do
+badge vira um GET; em cache vazio o valor é recontado uma vez no banco.
+O comando reconciliar_contadores_notificacoes detecta e corrige desvios.
+
+Com cache local (LocMemCache: desenvolvimento, produção sem REDIS_URL) o
+incr feito num worker não chega aos outros; o contador então expira em
+poucos segundos e é recontado no banco, em vez de ficar errado por dias.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+
+from core.models import Notificacao
+from core.services.cache_service import cache_compartilhado
+from core.services.notification_push import publicar_contagem
+
+CACHE_KEY = "notificacoes:nao_lidas:{}"
+
+
+def _timeout():
+    timeout = getattr(settings, "NOTIFICATION_COUNTER_TIMEOUT", None)
+    if timeout is not None:
+        return timeout
+    return 7 * 24 * 3600 if cache_compartilhado() else 5
+
+
+def _key(usuario_id) -> str:
+    return CACHE_KEY.format(usuario_id)
+
+
+def contar_no_banco(usuario_id) -> int:
+    return Notificacao.objects.filter(usuario_id=usuario_id, lida=False).count()
+
+
+def get_unread_count(usuario_id) -> int:
+    """Contagem de não lidas: O(1) no cache, recontagem apenas em cache vazio"""
+    valor = cache.get(_key(usuario_id))
+    if valor is None:
+        valor = contar_no_banco(usuario_id)
+        # add(): não sobrescreve um valor gravado por outra requisição
+        cache.add(_key(usuario_id), valor, _timeout())
+    return valor
+
+
+async def aget_unread_count(usuario_id) -> int:
+    valor = await cache.aget(_key(usuario_id))
+    if valor is None:
+        valor = await Notificacao.objects.filter(
+            usuario_id=usuario_id, lida=False
+        ).acount()
+        await cache.aadd(_key(usuario_id), valor, _timeout())
+    return valor
+
+
+def ajustar(usuario_id, delta: int):
+    """
+    Soma `delta` ao contador, se ele existir no cache. Sem valor em cache
+    não há o que ajustar: a próxima leitura reconta no banco.
+
+    Returns:
+        Novo valor, ou None se o contador não estava em cache
+    """
+    try:
+        valor = cache.incr(_key(usuario_id), delta)
+    except ValueError:
+        return None
+    if valor < 0:
+        # Desvio (ex.: alteração fora dos fluxos instrumentados): recontar
+        cache.delete(_key(usuario_id))
+        return None
+    return valor
+
+
+def definir(usuario_id, valor: int):
+    cache.set(_key(usuario_id), valor, _timeout())
+
+
+def invalidar(usuario_id):
+    cache.delete(_key(usuario_id))
+
+
+def ajustar_apos_commit(usuario_id, delta: int):
+    """Ajuste aplicado somente se a transação for confirmada"""
+    transaction.on_commit(lambda: ajustar(usuario_id, delta))
+
+
+def marcar_como_lida(notificacao) -> int:
+    """
+    Marca a notificação como lida, atualiza o contador e avisa o canal do
+    usuário. Retorna a contagem de não lidas resultante.
+    """
+    usuario_id = notificacao.usuario_id
+    if notificacao.lida:
+        return get_unread_count(usuario_id)
+
+    atualizadas = Notificacao.objects.filter(pk=notificacao.pk, lida=False).update(
+        lida=True
+    )
+    notificacao.lida = True
+    if atualizadas:
+        valor = ajustar(usuario_id, -1)
+        if valor is None:
+            valor = get_unread_count(usuario_id)
+        publicar_contagem(usuario_id, valor)
+        return valor
+    return get_unread_count(usuario_id)
+
+
+def marcar_todas_como_lidas(usuario_id) -> int:
+    """Marca todas como lidas; retorna quantas foram alteradas"""
+    atualizadas = Notificacao.objects.filter(usuario_id=usuario_id, lida=False).update(
+        lida=True
+    )
+    definir(usuario_id, 0)
+    if atualizadas:
+        publicar_contagem(usuario_id, 0)
+    return atualizadas
+
+
+def reconciliar(corrigir: bool = False):
+    """
+    Compara os contadores em cache com a contagem no banco.
+
+    Uma única agregação por usuário e um get_many no cache. Contadores
+    ausentes do cache não são desvio (serão recontados na leitura).
+
+    Returns:
+        Lista de (usuario_id, valor_cache, valor_banco) divergentes
+    """
+    contagens = dict(
+        Notificacao.objects.values("usuario_id")
+        .annotate(nao_lidas=Count("id", filter=Q(lida=False)))
+        .values_list("usuario_id", "nao_lidas")
+    )
+    chaves = {_key(uid): uid for uid in contagens}
+    em_cache = cache.get_many(list(chaves))
+
+    divergencias = []
+    for chave, valor in em_cache.items():
+        uid = chaves[chave]
+        if valor != contagens[uid]:
+            divergencias.append((uid, valor, contagens[uid]))
+            if corrigir:
+                definir(uid, contagens[uid])
+    return divergencias
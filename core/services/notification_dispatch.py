@@ -0,0 +1,242 @@
+"""
+Fila de envio das comunicações (e-mail, WhatsApp, SMS)
+
+Os serviços de notificação não entregam mensagens durante a requisição:
+gravam o LogComunicacao como "pendente" e, após o commit, um trabalho em
+segundo plano (background_jobs: Celery ou thread) drena a fila em lotes:
+
+- cada lote abre uma conexão com o EMAIL_BACKEND (SMTP em produção) e uma
+  instância do backend móvel, reaproveitadas por todas as mensagens;
+- o resultado do lote é gravado de uma vez (update/bulk_update);
+- falhas voltam para a fila com backoff exponencial; após
+  NOTIFICATION_DISPATCH_MAX_TENTATIVAS o log fica "falhado".
+
+WhatsApp e SMS só são despachados com NOTIFICATION_DISPATCH_MOBILE_BACKEND
+configurado: caminho de uma classe com enviar(canal, endereco, assunto,
+conteudo) e, opcionalmente, close(). Sem ele os logs seguem pendentes.
+"""
+
+import logging
+import threading
+from datetime import timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from core.models import LogComunicacao
+from core.services.background_jobs import enfileirar_apos_commit
+
+logger = logging.getLogger(__name__)
+
+CANAIS_MOVEIS = ("whatsapp", "sms")
+
+# Um dreno por processo; entre processos, select_for_update(skip_locked)
+_lock = threading.Lock()
+
+
+def _config(nome: str, padrao):
+    return getattr(settings, f"NOTIFICATION_DISPATCH_{nome}", padrao)
+
+
+def agendar():
+    """Agenda o dreno da fila para depois do commit da transação atual"""
+    enfileirar_apos_commit("despachar_comunicacoes_task", processar_pendentes)
+
+
+def enfileirar_emails(
+    destinatarios: Iterable[Tuple[Optional[object], str]],
+    assunto: str,
+    conteudo: str,
+    html: str = "",
+    **campos,
+) -> List[LogComunicacao]:
+    """
+    Grava um LogComunicacao pendente por destinatário e agenda o envio.
+
+    Args:
+        destinatarios: pares (usuário ou None, e-mail)
+        html: versão HTML da mensagem (opcional)
+        campos: demais campos do LogComunicacao (entidade_relacionada_id...)
+    """
+    metadados = dict(campos.pop("metadados", None) or {})
+    if html:
+        metadados["html"] = html
+    logs = [
+        LogComunicacao(
+            usuario_destinatario=usuario,
+            tipo_comunicacao="email",
+            endereco_destinatario=email,
+            assunto=assunto[:200],
+            conteudo=conteudo,
+            status_envio="pendente",
+            metadados=metadados,
+            **campos,
+        )
+        for usuario, email in destinatarios
+        if email
+    ]
+    if logs:
+        LogComunicacao.objects.bulk_create(
+            logs, batch_size=getattr(settings, "BULK_CREATE_BATCH_SIZE", 1000)
+        )
+        agendar()
+    return logs
+
+
+def _backend_movel():
+    caminho = _config("MOBILE_BACKEND", None)
+    return import_string(caminho) if caminho else None
+
+
+def _reservar(limite: int) -> List[LogComunicacao]:
+    """
+    Marca como "processando" os logs vencidos dos canais despacháveis e
+    devolve-os. A reserva expira após NOTIFICATION_DISPATCH_TIMEOUT, caso o
+    worker morra.
+    """
+    canais = ["email"]
+    if _backend_movel():
+        canais += CANAIS_MOVEIS
+
+    agora = timezone.now()
+    with transaction.atomic():
+        qs = LogComunicacao.objects.filter(
+            status_envio__in=["pendente", "processando"],
+            tipo_comunicacao__in=canais,
+            proxima_tentativa__lte=agora,
+        ).order_by("proxima_tentativa", "created_at")
+        if connection.features.has_select_for_update_skip_locked:
+            qs = qs.select_for_update(skip_locked=True)
+        logs = list(qs[:limite])
+        if logs:
+            LogComunicacao.objects.filter(pk__in=[log.pk for log in logs]).update(
+                status_envio="processando",
+                proxima_tentativa=agora + timedelta(seconds=_config("TIMEOUT", 600)),
+            )
+    return logs
+
+
+def processar_pendentes(limite: Optional[int] = None) -> dict:
+    """
+    Drena a fila de comunicações.
+
+    Returns:
+        {"mensagens", "lotes", "enviadas", "falhas"}
+    """
+    limite = limite or _config("LOTE", 100)
+    resumo = {"mensagens": 0, "lotes": 0, "enviadas": 0, "falhas": 0}
+
+    with _lock:
+        while True:
+            logs = _reservar(limite)
+            if not logs:
+                break
+            resumo["lotes"] += 1
+            resumo["mensagens"] += len(logs)
+
+            enviados, falhas = [], []
+            emails = [log for log in logs if log.tipo_comunicacao == "email"]
+            moveis = [log for log in logs if log.tipo_comunicacao != "email"]
+            if emails:
+                _enviar_emails(emails, enviados, falhas)
+            if moveis:
+                _enviar_moveis(moveis, enviados, falhas)
+            _gravar_resultado(enviados, falhas)
+
+            resumo["enviadas"] += len(enviados)
+            resumo["falhas"] += len(falhas)
+
+    if resumo["mensagens"]:
+        logger.info(
+            f"Fila de comunicações: {resumo['enviadas']} enviadas, "
+            f"{resumo['falhas']} falhas em {resumo['lotes']} lotes"
+        )
+    return resumo
+
+
+def _enviar_emails(logs, enviados, falhas):
+    """Envia o lote por uma única conexão do EMAIL_BACKEND"""
+    conexao = get_connection(fail_silently=False)
+    try:
+        conexao.open()
+    except Exception as e:
+        falhas.extend((log, e) for log in logs)
+        return
+
+    try:
+        for log in logs:
+            mensagem = EmailMultiAlternatives(
+                subject=log.assunto,
+                body=log.conteudo,
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                to=[log.endereco_destinatario],
+                connection=conexao,
+            )
+            html = (log.metadados or {}).get("html")
+            if html:
+                mensagem.attach_alternative(html, "text/html")
+            try:
+                mensagem.send()
+                enviados.append(log)
+            except Exception as e:
+                falhas.append((log, e))
+    finally:
+        conexao.close()
+
+
+def _enviar_moveis(logs, enviados, falhas):
+    """Envia o lote por uma única instância do backend móvel"""
+    try:
+        backend = _backend_movel()()
+    except Exception as e:
+        falhas.extend((log, e) for log in logs)
+        return
+
+    try:
+        for log in logs:
+            try:
+                backend.enviar(
+                    log.tipo_comunicacao,
+                    log.endereco_destinatario,
+                    log.assunto,
+                    log.conteudo,
+                )
+                enviados.append(log)
+            except Exception as e:
+                falhas.append((log, e))
+    finally:
+        if hasattr(backend, "close"):
+            backend.close()
+
+
+def _gravar_resultado(enviados, falhas):
+    agora = timezone.now()
+    maximo = _config("MAX_TENTATIVAS", 5)
+    backoff = _config("BACKOFF", 60)
+
+    for log, erro in falhas:
+        log.tentativas += 1
+        log.status_envio = "falhado" if log.tentativas >= maximo else "pendente"
+        log.proxima_tentativa = agora + timedelta(
+            seconds=backoff * 2 ** (log.tentativas - 1)
+        )
+        log.erro_envio = str(erro)
+        logger.warning(
+            f"Fila de comunicações: falha no envio para {log.endereco_destinatario} "
+            f"(tentativa {log.tentativas}): {erro}"
+        )
+
+    with transaction.atomic():
+        if enviados:
+            LogComunicacao.objects.filter(pk__in=[log.pk for log in enviados]).update(
+                status_envio="enviado", enviado_em=agora, erro_envio=""
+            )
+        if falhas:
+            LogComunicacao.objects.bulk_update(
+                [log for log, _ in falhas],
+                ["status_envio", "tentativas", "proxima_tentativa", "erro_envio"],
+            )
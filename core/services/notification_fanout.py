@@ -0,0 +1,111 @@
+"""
+Distribuição de notificações em lote
+
+Um evento (nova solicitação, aprovação, evento criado...) notifica grupos
+inteiros. Em vez de um INSERT de Notificacao e outro de LogComunicacao por
+destinatário, os serviços de notificação acumulam as linhas de um evento
+numa Distribuicao e gravam tudo no fim com dois bulk_create:
+
+- os membros ativos de cada grupo são lidos uma vez e ficam em cache no
+  objeto (o serviço reaproveita a mesma Distribuicao num lote de eventos);
+- os campos das mensagens são montados uma vez por evento; só o
+  destinatário muda entre as linhas.
+
+O custo em consultas por evento fica constante, qualquer que seja o
+tamanho do grupo.
+
+bulk_create não dispara post_save: o canal em tempo real e o contador de
+não lidas são atualizados explicitamente, como em notificacao_signals.
+Logs pendentes (WhatsApp/SMS) ficam para a fila de notification_dispatch.
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import LogComunicacao, Notificacao
+from core.services import notification_counter, notification_dispatch
+from core.services.notification_push import publicar_notificacao
+
+
+class Distribuicao:
+    """Notificações e logs de comunicação pendentes de gravação"""
+
+    def __init__(self):
+        self.batch_size = getattr(settings, "BULK_CREATE_BATCH_SIZE", 1000)
+        self.notificacoes: List[Notificacao] = []
+        self.logs: List[LogComunicacao] = []
+        self._membros: Dict[str, list] = {}
+
+    def membros(self, grupo: str) -> list:
+        """Usuários ativos do grupo; uma consulta por grupo"""
+        if grupo not in self._membros:
+            self._membros[grupo] = list(
+                get_user_model()
+                .objects.filter(groups__name=grupo, is_active=True)
+                .order_by("pk")
+            )
+        return self._membros[grupo]
+
+    def notificar(self, usuarios: Iterable, **campos) -> int:
+        """Uma Notificacao com os mesmos `campos` para cada usuário"""
+        novas = [Notificacao(usuario=usuario, **campos) for usuario in usuarios]
+        self.notificacoes.extend(novas)
+        return len(novas)
+
+    def registrar(
+        self, usuarios: Iterable, status_envio: str = "enviado", **campos
+    ) -> int:
+        """Um LogComunicacao (remetente: sistema) para cada usuário"""
+        enviado_em = timezone.now() if status_envio == "enviado" else None
+        novos = [
+            LogComunicacao(
+                usuario_remetente=None,
+                usuario_destinatario=usuario,
+                status_envio=status_envio,
+                enviado_em=enviado_em,
+                **campos,
+            )
+            for usuario in usuarios
+        ]
+        self.logs.extend(novos)
+        return len(novos)
+
+    def gravar(self) -> Tuple[int, int]:
+        """
+        Grava as linhas pendentes (dois bulk_create) e agenda, para depois
+        do commit, a publicação nos canais e o ajuste dos contadores.
+
+        Returns:
+            (notificações, logs) gravados
+        """
+        notificacoes, logs = self.notificacoes, self.logs
+        self.descartar()
+        if not notificacoes and not logs:
+            return 0, 0
+
+        with transaction.atomic():
+            Notificacao.objects.bulk_create(notificacoes, batch_size=self.batch_size)
+            LogComunicacao.objects.bulk_create(logs, batch_size=self.batch_size)
+
+            nao_lidas = Counter()
+            for notificacao in notificacoes:
+                publicar_notificacao(notificacao)
+                if not notificacao.lida:
+                    nao_lidas[notificacao.usuario_id] += 1
+            for usuario_id, delta in nao_lidas.items():
+                notification_counter.ajustar_apos_commit(usuario_id, delta)
+            if any(log.status_envio == "pendente" for log in logs):
+                # Entrega fora da requisição (notification_dispatch)
+                notification_dispatch.agendar()
+
+        return len(notificacoes), len(logs)
+
+    def descartar(self):
+        """Esquece as linhas pendentes (ex.: erro no meio do evento)"""
+        self.notificacoes = []
+        self.logs = []
@@ -0,0 +1,88 @@
+"""
+Canal de notificações por usuário
+
+Cada usuário tem um canal no broker de tempo real. Novas notificações e
+mudanças na contagem de não lidas são publicadas no canal após o commit;
+o stream SSE do usuário apenas repassa as mensagens, sem consultar o banco.
+
+Mensagens:
+- {"type": "notification", "notification": {...}, "unread_delta": 1}
+- {"type": "unread_count", "unread_count": N}
+"""
+
+from functools import partial
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.services.realtime_broker import publish
+
+NOTIFICATION_ICONS = {
+    "solicitacao_nova": "bi-plus-circle",
+    "solicitacao_confirmacao": "bi-check-circle",
+    "solicitacao_aprovada": "bi-check-circle-fill text-success",
+    "solicitacao_reprovada": "bi-x-circle-fill text-danger",
+    "pre_agenda_nova": "bi-calendar-plus",
+    "pre_agenda_aprovada": "bi-calendar-check",
+    "evento_preparacao": "bi-hourglass-split",
+    "evento_confirmado": "bi-calendar-event",
+    "evento_criado": "bi-calendar-check-fill text-success",
+    "evento_cancelado": "bi-calendar-x text-danger",
+    "processo_concluido": "bi-check-all text-success",
+    "sistema_manutencao": "bi-tools",
+    "sistema_atualizacao": "bi-arrow-up-circle",
+}
+
+
+def canal_usuario(usuario_id) -> str:
+    return f"notificacoes:{usuario_id}"
+
+
+def tempo_relativo(dt) -> str:
+    """Retorna tempo relativo."""
+    diff = timezone.now() - dt
+
+    if diff.days > 0:
+        return f"há {diff.days} dia{'s' if diff.days > 1 else ''}"
+    elif diff.seconds > 3600:
+        hours = diff.seconds // 3600
+        return f"há {hours} hora{'s' if hours > 1 else ''}"
+    elif diff.seconds > 60:
+        minutes = diff.seconds // 60
+        return f"há {minutes} minuto{'s' if minutes > 1 else ''}"
+    else:
+        return "agora mesmo"
+
+
+def serializar_notificacao(n) -> dict:
+    """Mesmo formato das APIs de notificações"""
+    return {
+        "id": str(n.id),
+        "tipo": n.tipo,
+        "tipo_display": n.get_tipo_display(),
+        "titulo": n.titulo,
+        "mensagem": n.mensagem,
+        "link_acao": n.link_acao,
+        "lida": n.lida,
+        "created_at": n.created_at.isoformat(),
+        "tempo_relativo": tempo_relativo(n.created_at),
+        "icon": NOTIFICATION_ICONS.get(n.tipo, "bi-info-circle"),
+    }
+
+
+def publicar_notificacao(notificacao):
+    """Envia a notificação recém-criada ao canal do destinatário"""
+    mensagem = {
+        "type": "notification",
+        "notification": serializar_notificacao(notificacao),
+        "unread_delta": 0 if notificacao.lida else 1,
+    }
+    transaction.on_commit(
+        partial(publish, canal_usuario(notificacao.usuario_id), mensagem)
+    )
+
+
+def publicar_contagem(usuario_id, unread_count: int):
+    """Informa a nova contagem de não lidas (ex.: após marcar como lida)"""
+    mensagem = {"type": "unread_count", "unread_count": unread_count}
+    transaction.on_commit(partial(publish, canal_usuario(usuario_id), mensagem))
@@ -14,7 +14,6 @@ from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
 from django.conf import settings
-from django.contrib.auth.models import Group
 from django.core.mail import send_mail, send_mass_mail
 from django.template.loader import render_to_string
 from django.utils import timezone
@@ -29,6 +28,8 @@ from core.models import (
     SolicitacaoStatus,
     Usuario,
 )
+from core.services import notification_counter
+from core.services.notification_fanout import Distribuicao
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +47,9 @@ class NotificationService:
             settings, "NOTIFICATION_WHATSAPP_ENABLED", False
         )
 
+        # Notificações pendentes do evento e membros dos grupos em cache
+        self.distribuicao = Distribuicao()
+
     # ==================== NOTIFICAÇÕES DE SOLICITAÇÃO ====================
 
     def notify_solicitacao_created(self, solicitacao: Solicitacao) -> Dict[str, Any]:
@@ -82,6 +86,9 @@ class NotificationService:
             result = self._notify_solicitante_confirmacao(solicitacao)
             results.append(result)
 
+            # Todas as notificações do evento em dois bulk_create
+            self.distribuicao.gravar()
+
             # Log de auditoria
             LogAuditoria.objects.create(
                 usuario=solicitacao.usuario_solicitante,
@@ -98,6 +105,7 @@ class NotificationService:
             }
 
         except Exception as e:
+            self.distribuicao.descartar()
             logger.error(
                 f"Erro ao notificar criação de solicitação {solicitacao.id}: {e}"
             )
@@ -126,6 +134,9 @@ class NotificationService:
             result = self._notify_formadores_pre_evento(solicitacao)
             results.append(result)
 
+            # Todas as notificações do evento em dois bulk_create
+            self.distribuicao.gravar()
+
             # Log de auditoria
             LogAuditoria.objects.create(
                 usuario=aprovador,
@@ -142,6 +153,7 @@ class NotificationService:
             }
 
         except Exception as e:
+            self.distribuicao.descartar()
             logger.error(
                 f"Erro ao notificar aprovação de solicitação {solicitacao.id}: {e}"
             )
@@ -167,6 +179,9 @@ class NotificationService:
                 result = self._notify_formadores_cancelamento(solicitacao, motivo)
                 results.append(result)
 
+            # Todas as notificações do evento em dois bulk_create
+            self.distribuicao.gravar()
+
             # Log de auditoria
             LogAuditoria.objects.create(
                 usuario=reprovador,
@@ -183,6 +198,7 @@ class NotificationService:
             }
 
         except Exception as e:
+            self.distribuicao.descartar()
             logger.error(
                 f"Erro ao notificar reprovação de solicitação {solicitacao.id}: {e}"
             )
@@ -217,6 +233,9 @@ class NotificationService:
                 )
                 results.append(result)
 
+            # Todas as notificações do evento em dois bulk_create
+            self.distribuicao.gravar()
+
             # Log de auditoria
             LogAuditoria.objects.create(
                 usuario=criador,
@@ -234,135 +253,125 @@ class NotificationService:
             }
 
         except Exception as e:
+            self.distribuicao.descartar()
             logger.error(f"Erro ao notificar criação de evento {solicitacao.id}: {e}")
             return {"success": False, "error": str(e)}
 
     # ==================== MÉTODOS INTERNOS DE NOTIFICAÇÃO ====================
+    # As notificações no sistema são acumuladas em self.distribuicao e
+    # gravadas pelos métodos públicos ao final do evento.
+
+    def _formadores(self, solicitacao: Solicitacao) -> List[Usuario]:
+        """Formadores (usuários) ativos vinculados à solicitação."""
+        return list(solicitacao.formadores.filter(is_active=True).order_by("pk"))
+
+    def _notificar_grupo(
+        self,
+        usuarios: List[Usuario],
+        tipo_resultado: str,
+        target_group: str,
+        subject: str,
+        template: str,
+        context: Dict[str, Any],
+        notificacao: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Mesmo e-mail e mesma notificação para todo o grupo: a mensagem é
+        montada uma vez e a notificação gravada numa chamada para quem
+        recebeu o e-mail. Só o send_mail continua por destinatário.
+        """
+        html_message = render_to_string(template, context)
+        plain_message = strip_tags(html_message)
+
+        enviados = []
+        for usuario in usuarios:
+            if not usuario.email:
+                continue
+            try:
+                send_mail(
+                    subject=subject,
+                    message=plain_message,
+                    html_message=html_message,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    recipient_list=[usuario.email],
+                    fail_silently=False,
+                )
+                enviados.append(usuario)
+            except Exception as e:
+                logger.error(f"Erro ao enviar e-mail para {usuario.email}: {e}")
+
+        if enviados:
+            self.distribuicao.notificar(enviados, **notificacao)
+
+        return {
+            "success": len(enviados) > 0,
+            "type": tipo_resultado,
+            "emails_sent": len(enviados),
+            "target_group": target_group,
+        }
 
     def _notify_superintendencia_nova_solicitacao(
         self, solicitacao: Solicitacao
     ) -> Dict[str, Any]:
         """Notifica superintendência sobre nova solicitação para análise."""
 
-        superintendencia_group = Group.objects.get(name="superintendencia")
-        usuarios_super = superintendencia_group.user_set.filter(is_active=True)
+        usuarios_super = self.distribuicao.membros("superintendencia")
 
-        if not usuarios_super.exists():
+        if not usuarios_super:
             return {
                 "success": False,
                 "error": "Nenhum usuário ativo na superintendência",
             }
 
-        # Template de e-mail
-        subject = f"[SISTEMA APRENDER] Nova Solicitação para Análise - {solicitacao.titulo_evento}"
-
-        context = {
-            "solicitacao": solicitacao,
-            "url_aprovacao": f"{settings.BASE_URL}/aprovacoes/pendentes/",
-            "projeto_vinculado": True,
-        }
-
-        html_message = render_to_string(
-            "core/emails/nova_solicitacao_superintendencia.html", context
+        return self._notificar_grupo(
+            usuarios_super,
+            "superintendencia_nova_solicitacao",
+            "superintendencia",
+            subject=f"[SISTEMA APRENDER] Nova Solicitação para Análise - {solicitacao.titulo_evento}",
+            template="core/emails/nova_solicitacao_superintendencia.html",
+            context={
+                "solicitacao": solicitacao,
+                "url_aprovacao": f"{settings.BASE_URL}/aprovacoes/pendentes/",
+                "projeto_vinculado": True,
+            },
+            notificacao={
+                "tipo": "solicitacao_nova",
+                "titulo": "Nova solicitação para análise",
+                "mensagem": f"Nova solicitação '{solicitacao.titulo_evento}' aguarda sua análise.",
+                "link_acao": "/aprovacoes/pendentes/",
+                "entidade_relacionada_id": solicitacao.id,
+            },
         )
-        plain_message = strip_tags(html_message)
-
-        # Enviar para todos da superintendência
-        emails_sent = 0
-        for usuario in usuarios_super:
-            if usuario.email:
-                try:
-                    send_mail(
-                        subject=subject,
-                        message=plain_message,
-                        html_message=html_message,
-                        from_email=settings.DEFAULT_FROM_EMAIL,
-                        recipient_list=[usuario.email],
-                        fail_silently=False,
-                    )
-
-                    # Criar notificação no sistema
-                    Notificacao.objects.create(
-                        usuario=usuario,
-                        tipo="solicitacao_nova",
-                        titulo="Nova solicitação para análise",
-                        mensagem=f"Nova solicitação '{solicitacao.titulo_evento}' aguarda sua análise.",
-                        link_acao=f"/aprovacoes/pendentes/",
-                        entidade_relacionada_id=solicitacao.id,
-                    )
-
-                    emails_sent += 1
-
-                except Exception as e:
-                    logger.error(f"Erro ao enviar e-mail para {usuario.email}: {e}")
-
-        return {
-            "success": emails_sent > 0,
-            "type": "superintendencia_nova_solicitacao",
-            "emails_sent": emails_sent,
-            "target_group": "superintendencia",
-        }
 
     def _notify_controle_nova_solicitacao(
         self, solicitacao: Solicitacao
     ) -> Dict[str, Any]:
         """Notifica controle sobre solicitação que vai direto para PRE_AGENDA."""
 
-        controle_group = Group.objects.get(name="controle")
-        usuarios_controle = controle_group.user_set.filter(is_active=True)
+        usuarios_controle = self.distribuicao.membros("controle")
 
-        if not usuarios_controle.exists():
+        if not usuarios_controle:
             return {"success": False, "error": "Nenhum usuário ativo no controle"}
 
-        # Template de e-mail
-        subject = f"[SISTEMA APRENDER] Nova Solicitação em Pré-Agenda - {solicitacao.titulo_evento}"
-
-        context = {
-            "solicitacao": solicitacao,
-            "url_pre_agenda": f"{settings.BASE_URL}/controle/pre-agenda/",
-            "projeto_direto": True,
-        }
-
-        html_message = render_to_string(
-            "core/emails/nova_solicitacao_controle.html", context
+        return self._notificar_grupo(
+            usuarios_controle,
+            "controle_nova_solicitacao",
+            "controle",
+            subject=f"[SISTEMA APRENDER] Nova Solicitação em Pré-Agenda - {solicitacao.titulo_evento}",
+            template="core/emails/nova_solicitacao_controle.html",
+            context={
+                "solicitacao": solicitacao,
+                "url_pre_agenda": f"{settings.BASE_URL}/controle/pre-agenda/",
+                "projeto_direto": True,
+            },
+            notificacao={
+                "tipo": "pre_agenda_nova",
+                "titulo": "Nova solicitação em pré-agenda",
+                "mensagem": f"Solicitação '{solicitacao.titulo_evento}' está na pré-agenda para criação no Google Calendar.",
+                "link_acao": "/controle/pre-agenda/",
+                "entidade_relacionada_id": solicitacao.id,
+            },
         )
-        plain_message = strip_tags(html_message)
-
-        # Enviar para todos do controle
-        emails_sent = 0
-        for usuario in usuarios_controle:
-            if usuario.email:
-                try:
-                    send_mail(
-                        subject=subject,
-                        message=plain_message,
-                        html_message=html_message,
-                        from_email=settings.DEFAULT_FROM_EMAIL,
-                        recipient_list=[usuario.email],
-                        fail_silently=False,
-                    )
-
-                    # Criar notificação no sistema
-                    Notificacao.objects.create(
-                        usuario=usuario,
-                        tipo="pre_agenda_nova",
-                        titulo="Nova solicitação em pré-agenda",
-                        mensagem=f"Solicitação '{solicitacao.titulo_evento}' está na pré-agenda para criação no Google Calendar.",
-                        link_acao=f"/controle/pre-agenda/",
-                        entidade_relacionada_id=solicitacao.id,
-                    )
-
-                    emails_sent += 1
-
-                except Exception as e:
-                    logger.error(f"Erro ao enviar e-mail para {usuario.email}: {e}")
-
-        return {
-            "success": emails_sent > 0,
-            "type": "controle_nova_solicitacao",
-            "emails_sent": emails_sent,
-            "target_group": "controle",
-        }
 
     def _notify_solicitante_confirmacao(
         self, solicitacao: Solicitacao
@@ -399,8 +408,8 @@ class NotificationService:
             )
 
             # Criar notificação no sistema
-            Notificacao.objects.create(
-                usuario=solicitacao.usuario_solicitante,
+            self.distribuicao.notificar(
+                [solicitacao.usuario_solicitante],
                 tipo="solicitacao_confirmacao",
                 titulo="Solicitação recebida com sucesso",
                 mensagem=f"Sua solicitação '{solicitacao.titulo_evento}' foi recebida e está sendo processada.",
@@ -455,8 +464,8 @@ class NotificationService:
             )
 
             # Criar notificação no sistema
-            Notificacao.objects.create(
-                usuario=solicitacao.usuario_solicitante,
+            self.distribuicao.notificar(
+                [solicitacao.usuario_solicitante],
                 tipo="solicitacao_aprovada",
                 titulo="Solicitação aprovada! ✅",
                 mensagem=f"Sua solicitação '{solicitacao.titulo_evento}' foi aprovada por {aprovador.get_full_name() or aprovador.username}.",
@@ -510,8 +519,8 @@ class NotificationService:
             )
 
             # Criar notificação no sistema
-            Notificacao.objects.create(
-                usuario=solicitacao.usuario_solicitante,
+            self.distribuicao.notificar(
+                [solicitacao.usuario_solicitante],
                 tipo="solicitacao_reprovada",
                 titulo="Solicitação não aprovada ❌",
                 mensagem=f"Sua solicitação '{solicitacao.titulo_evento}' não foi aprovada. Motivo: {motivo}",
@@ -534,185 +543,79 @@ class NotificationService:
     def _notify_controle_pre_agenda(self, solicitacao: Solicitacao) -> Dict[str, Any]:
         """Notifica controle sobre solicitação aprovada que foi para PRE_AGENDA."""
 
-        controle_group = Group.objects.get(name="controle")
-        usuarios_controle = controle_group.user_set.filter(is_active=True)
+        usuarios_controle = self.distribuicao.membros("controle")
 
-        if not usuarios_controle.exists():
+        if not usuarios_controle:
             return {"success": False, "error": "Nenhum usuário ativo no controle"}
 
-        # Template de e-mail
-        subject = f"[SISTEMA APRENDER] Solicitação Aprovada → Pré-Agenda - {solicitacao.titulo_evento}"
-
-        context = {
-            "solicitacao": solicitacao,
-            "url_pre_agenda": f"{settings.BASE_URL}/controle/pre-agenda/",
-        }
-
-        html_message = render_to_string(
-            "core/emails/aprovacao_para_pre_agenda.html", context
+        return self._notificar_grupo(
+            usuarios_controle,
+            "controle_pre_agenda",
+            "controle",
+            subject=f"[SISTEMA APRENDER] Solicitação Aprovada → Pré-Agenda - {solicitacao.titulo_evento}",
+            template="core/emails/aprovacao_para_pre_agenda.html",
+            context={
+                "solicitacao": solicitacao,
+                "url_pre_agenda": f"{settings.BASE_URL}/controle/pre-agenda/",
+            },
+            notificacao={
+                "tipo": "pre_agenda_aprovada",
+                "titulo": "Solicitação aprovada → Pré-agenda",
+                "mensagem": f"Solicitação '{solicitacao.titulo_evento}' foi aprovada e está na pré-agenda.",
+                "link_acao": "/controle/pre-agenda/",
+                "entidade_relacionada_id": solicitacao.id,
+            },
         )
-        plain_message = strip_tags(html_message)
-
-        # Enviar para todos do controle
-        emails_sent = 0
-        for usuario in usuarios_controle:
-            if usuario.email:
-                try:
-                    send_mail(
-                        subject=subject,
-                        message=plain_message,
-                        html_message=html_message,
-                        from_email=settings.DEFAULT_FROM_EMAIL,
-                        recipient_list=[usuario.email],
-                        fail_silently=False,
-                    )
-
-                    # Criar notificação no sistema
-                    Notificacao.objects.create(
-                        usuario=usuario,
-                        tipo="pre_agenda_aprovada",
-                        titulo="Solicitação aprovada → Pré-agenda",
-                        mensagem=f"Solicitação '{solicitacao.titulo_evento}' foi aprovada e está na pré-agenda.",
-                        link_acao=f"/controle/pre-agenda/",
-                        entidade_relacionada_id=solicitacao.id,
-                    )
-
-                    emails_sent += 1
-
-                except Exception as e:
-                    logger.error(f"Erro ao enviar e-mail para {usuario.email}: {e}")
-
-        return {
-            "success": emails_sent > 0,
-            "type": "controle_pre_agenda",
-            "emails_sent": emails_sent,
-            "target_group": "controle",
-        }
 
     def _notify_formadores_pre_evento(self, solicitacao: Solicitacao) -> Dict[str, Any]:
         """Notifica formadores sobre possível evento (ainda em PRE_AGENDA)."""
 
-        formadores = solicitacao.formadores.filter(ativo=True)
+        formadores = self._formadores(solicitacao)
 
-        if not formadores.exists():
+        if not formadores:
             return {"success": False, "error": "Nenhum formador ativo na solicitação"}
 
-        # Template de e-mail
-        subject = (
-            f"[SISTEMA APRENDER] Evento em Preparação - {solicitacao.titulo_evento}"
+        return self._notificar_grupo(
+            formadores,
+            "formadores_pre_evento",
+            "formadores",
+            subject=f"[SISTEMA APRENDER] Evento em Preparação - {solicitacao.titulo_evento}",
+            template="core/emails/formador_pre_evento.html",
+            context={"solicitacao": solicitacao},
+            notificacao={
+                "tipo": "evento_preparacao",
+                "titulo": "Evento em preparação",
+                "mensagem": f"O evento '{solicitacao.titulo_evento}' está sendo preparado e você foi designado como formador.",
+                "entidade_relacionada_id": solicitacao.id,
+            },
         )
 
-        emails_sent = 0
-        for formador in formadores:
-            if formador.usuario and formador.usuario.email:
-                try:
-                    context = {
-                        "solicitacao": solicitacao,
-                        "formador": formador,
-                        "usuario": formador.usuario,
-                    }
-
-                    html_message = render_to_string(
-                        "core/emails/formador_pre_evento.html", context
-                    )
-                    plain_message = strip_tags(html_message)
-
-                    send_mail(
-                        subject=subject,
-                        message=plain_message,
-                        html_message=html_message,
-                        from_email=settings.DEFAULT_FROM_EMAIL,
-                        recipient_list=[formador.usuario.email],
-                        fail_silently=False,
-                    )
-
-                    # Criar notificação no sistema
-                    Notificacao.objects.create(
-                        usuario=formador.usuario,
-                        tipo="evento_preparacao",
-                        titulo="Evento em preparação",
-                        mensagem=f"O evento '{solicitacao.titulo_evento}' está sendo preparado e você foi designado como formador.",
-                        entidade_relacionada_id=solicitacao.id,
-                    )
-
-                    emails_sent += 1
-
-                except Exception as e:
-                    logger.error(
-                        f"Erro ao enviar e-mail para formador {formador.usuario.email}: {e}"
-                    )
-
-        return {
-            "success": emails_sent > 0,
-            "type": "formadores_pre_evento",
-            "emails_sent": emails_sent,
-            "target_group": "formadores",
-        }
-
     def _notify_formadores_evento_criado(
         self, solicitacao: Solicitacao, evento_gc: EventoGoogleCalendar
     ) -> Dict[str, Any]:
         """Notifica formadores sobre evento criado no Google Calendar com link do Meet."""
 
-        formadores = solicitacao.formadores.filter(ativo=True)
+        formadores = self._formadores(solicitacao)
 
-        if not formadores.exists():
+        if not formadores:
             return {"success": False, "error": "Nenhum formador ativo na solicitação"}
 
-        # Template de e-mail
-        subject = (
-            f"[SISTEMA APRENDER] 📅 Evento Confirmado - {solicitacao.titulo_evento}"
+        return self._notificar_grupo(
+            formadores,
+            "formadores_evento_criado",
+            "formadores",
+            subject=f"[SISTEMA APRENDER] 📅 Evento Confirmado - {solicitacao.titulo_evento}",
+            template="core/emails/formador_evento_criado.html",
+            context={"solicitacao": solicitacao, "evento_gc": evento_gc},
+            notificacao={
+                "tipo": "evento_confirmado",
+                "titulo": "Evento confirmado! 📅",
+                "mensagem": f"O evento '{solicitacao.titulo_evento}' foi criado no Google Calendar.",
+                "link_acao": evento_gc.html_link,
+                "entidade_relacionada_id": solicitacao.id,
+            },
         )
 
-        emails_sent = 0
-        for formador in formadores:
-            if formador.usuario and formador.usuario.email:
-                try:
-                    context = {
-                        "solicitacao": solicitacao,
-                        "evento_gc": evento_gc,
-                        "formador": formador,
-                        "usuario": formador.usuario,
-                    }
-
-                    html_message = render_to_string(
-                        "core/emails/formador_evento_criado.html", context
-                    )
-                    plain_message = strip_tags(html_message)
-
-                    send_mail(
-                        subject=subject,
-                        message=plain_message,
-                        html_message=html_message,
-                        from_email=settings.DEFAULT_FROM_EMAIL,
-                        recipient_list=[formador.usuario.email],
-                        fail_silently=False,
-                    )
-
-                    # Criar notificação no sistema
-                    Notificacao.objects.create(
-                        usuario=formador.usuario,
-                        tipo="evento_confirmado",
-                        titulo="Evento confirmado! 📅",
-                        mensagem=f"O evento '{solicitacao.titulo_evento}' foi criado no Google Calendar.",
-                        link_acao=evento_gc.html_link,
-                        entidade_relacionada_id=solicitacao.id,
-                    )
-
-                    emails_sent += 1
-
-                except Exception as e:
-                    logger.error(
-                        f"Erro ao enviar e-mail para formador {formador.usuario.email}: {e}"
-                    )
-
-        return {
-            "success": emails_sent > 0,
-            "type": "formadores_evento_criado",
-            "emails_sent": emails_sent,
-            "target_group": "formadores",
-        }
-
     def _notify_solicitante_evento_criado(
         self, solicitacao: Solicitacao, evento_gc: EventoGoogleCalendar
     ) -> Dict[str, Any]:
@@ -746,8 +649,8 @@ class NotificationService:
             )
 
             # Criar notificação no sistema
-            Notificacao.objects.create(
-                usuario=solicitacao.usuario_solicitante,
+            self.distribuicao.notificar(
+                [solicitacao.usuario_solicitante],
                 tipo="evento_criado",
                 titulo="Evento criado com sucesso! 🎉",
                 mensagem=f"Seu evento '{solicitacao.titulo_evento}' foi criado no Google Calendar com sucesso!",
@@ -773,129 +676,55 @@ class NotificationService:
     ) -> Dict[str, Any]:
         """Notifica superintendência sobre conclusão do processo (evento criado)."""
 
-        superintendencia_group = Group.objects.get(name="superintendencia")
-        usuarios_super = superintendencia_group.user_set.filter(is_active=True)
+        usuarios_super = self.distribuicao.membros("superintendencia")
 
-        if not usuarios_super.exists():
+        if not usuarios_super:
             return {
                 "success": False,
                 "error": "Nenhum usuário ativo na superintendência",
             }
 
-        # Template de e-mail
-        subject = (
-            f"[SISTEMA APRENDER] ✅ Processo Concluído - {solicitacao.titulo_evento}"
-        )
-
-        context = {
-            "solicitacao": solicitacao,
-            "evento_gc": evento_gc,
-        }
-
-        html_message = render_to_string(
-            "core/emails/superintendencia_evento_criado.html", context
+        return self._notificar_grupo(
+            usuarios_super,
+            "superintendencia_evento_criado",
+            "superintendencia",
+            subject=f"[SISTEMA APRENDER] ✅ Processo Concluído - {solicitacao.titulo_evento}",
+            template="core/emails/superintendencia_evento_criado.html",
+            context={"solicitacao": solicitacao, "evento_gc": evento_gc},
+            notificacao={
+                "tipo": "processo_concluido",
+                "titulo": "Processo concluído com sucesso ✅",
+                "mensagem": f"A solicitação '{solicitacao.titulo_evento}' foi processada e o evento foi criado no Google Calendar.",
+                "link_acao": evento_gc.html_link,
+                "entidade_relacionada_id": solicitacao.id,
+            },
         )
-        plain_message = strip_tags(html_message)
-
-        # Enviar para todos da superintendência
-        emails_sent = 0
-        for usuario in usuarios_super:
-            if usuario.email:
-                try:
-                    send_mail(
-                        subject=subject,
-                        message=plain_message,
-                        html_message=html_message,
-                        from_email=settings.DEFAULT_FROM_EMAIL,
-                        recipient_list=[usuario.email],
-                        fail_silently=False,
-                    )
-
-                    # Criar notificação no sistema
-                    Notificacao.objects.create(
-                        usuario=usuario,
-                        tipo="processo_concluido",
-                        titulo="Processo concluído com sucesso ✅",
-                        mensagem=f"A solicitação '{solicitacao.titulo_evento}' foi processada e o evento foi criado no Google Calendar.",
-                        link_acao=evento_gc.html_link,
-                        entidade_relacionada_id=solicitacao.id,
-                    )
-
-                    emails_sent += 1
-
-                except Exception as e:
-                    logger.error(f"Erro ao enviar e-mail para {usuario.email}: {e}")
-
-        return {
-            "success": emails_sent > 0,
-            "type": "superintendencia_evento_criado",
-            "emails_sent": emails_sent,
-            "target_group": "superintendencia",
-        }
 
     def _notify_formadores_cancelamento(
         self, solicitacao: Solicitacao, motivo: str
     ) -> Dict[str, Any]:
         """Notifica formadores sobre cancelamento de evento."""
 
-        formadores = solicitacao.formadores.filter(ativo=True)
+        formadores = self._formadores(solicitacao)
 
-        if not formadores.exists():
+        if not formadores:
             return {"success": False, "error": "Nenhum formador ativo na solicitação"}
 
-        # Template de e-mail
-        subject = (
-            f"[SISTEMA APRENDER] ❌ Evento Cancelado - {solicitacao.titulo_evento}"
+        return self._notificar_grupo(
+            formadores,
+            "formadores_cancelamento",
+            "formadores",
+            subject=f"[SISTEMA APRENDER] ❌ Evento Cancelado - {solicitacao.titulo_evento}",
+            template="core/emails/formador_evento_cancelado.html",
+            context={"solicitacao": solicitacao, "motivo": motivo},
+            notificacao={
+                "tipo": "evento_cancelado",
+                "titulo": "Evento cancelado ❌",
+                "mensagem": f"O evento '{solicitacao.titulo_evento}' foi cancelado. Motivo: {motivo}",
+                "entidade_relacionada_id": solicitacao.id,
+            },
         )
 
-        emails_sent = 0
-        for formador in formadores:
-            if formador.usuario and formador.usuario.email:
-                try:
-                    context = {
-                        "solicitacao": solicitacao,
-                        "formador": formador,
-                        "motivo": motivo,
-                        "usuario": formador.usuario,
-                    }
-
-                    html_message = render_to_string(
-                        "core/emails/formador_evento_cancelado.html", context
-                    )
-                    plain_message = strip_tags(html_message)
-
-                    send_mail(
-                        subject=subject,
-                        message=plain_message,
-                        html_message=html_message,
-                        from_email=settings.DEFAULT_FROM_EMAIL,
-                        recipient_list=[formador.usuario.email],
-                        fail_silently=False,
-                    )
-
-                    # Criar notificação no sistema
-                    Notificacao.objects.create(
-                        usuario=formador.usuario,
-                        tipo="evento_cancelado",
-                        titulo="Evento cancelado ❌",
-                        mensagem=f"O evento '{solicitacao.titulo_evento}' foi cancelado. Motivo: {motivo}",
-                        entidade_relacionada_id=solicitacao.id,
-                    )
-
-                    emails_sent += 1
-
-                except Exception as e:
-                    logger.error(
-                        f"Erro ao enviar e-mail para formador {formador.usuario.email}: {e}"
-                    )
-
-        return {
-            "success": emails_sent > 0,
-            "type": "formadores_cancelamento",
-            "emails_sent": emails_sent,
-            "target_group": "formadores",
-        }
-
     # ==================== MÉTODOS UTILITÁRIOS ====================
 
     def get_user_notifications(self, usuario: Usuario, limit: int = 10) -> List[Dict]:
@@ -926,8 +755,7 @@ class NotificationService:
         """
         try:
             notification = Notificacao.objects.get(id=notification_id, usuario=usuario)
-            notification.lida = True
-            notification.save(update_fields=["lida"])
+            notification_counter.marcar_como_lida(notification)
             return True
         except Notificacao.DoesNotExist:
             return False
@@ -936,7 +764,7 @@ class NotificationService:
         """
         Retorna quantidade de notificações não lidas do usuário.
         """
-        return Notificacao.objects.filter(usuario=usuario, lida=False).count()
+        return notification_counter.get_unread_count(usuario.id)
 
     def _get_relative_time(self, dt: datetime) -> str:
         """
@@ -16,18 +16,18 @@ from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
 from django.conf import settings
-from django.contrib.auth.models import Group
 from django.utils import timezone
 
 from core.models import (
     EventoGoogleCalendar,
     LogAuditoria,
-    LogComunicacao,
     Notificacao,
     Solicitacao,
     SolicitacaoStatus,
     Usuario,
 )
+from core.services import notification_counter
+from core.services.notification_fanout import Distribuicao
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +48,9 @@ class NotificationService:
             settings, "NOTIFICATION_WHATSAPP_ENABLED", False
         )
 
+        # Notificações pendentes do evento e membros dos grupos em cache
+        self.distribuicao = Distribuicao()
+
     # ==================== NOTIFICAÇÕES DE SOLICITAÇÃO ====================
 
     def notify_solicitacao_created(self, solicitacao: Solicitacao) -> Dict[str, Any]:
@@ -84,6 +87,9 @@ class NotificationService:
             result = self._notify_solicitante_confirmacao(solicitacao)
             results.append(result)
 
+            # Todas as notificações do evento em dois bulk_create
+            self.distribuicao.gravar()
+
             # Log de auditoria
             LogAuditoria.objects.create(
                 usuario=solicitacao.usuario_solicitante,
@@ -100,6 +106,7 @@ class NotificationService:
             }
 
         except Exception as e:
+            self.distribuicao.descartar()
             logger.error(
                 f"Erro ao notificar criação de solicitação {solicitacao.id}: {e}"
             )
@@ -126,6 +133,9 @@ class NotificationService:
             result = self._notify_formadores_pre_evento(solicitacao)
             results.append(result)
 
+            # Todas as notificações do evento em dois bulk_create
+            self.distribuicao.gravar()
+
             # Log de auditoria
             LogAuditoria.objects.create(
                 usuario=aprovador,
@@ -142,6 +152,7 @@ class NotificationService:
             }
 
         except Exception as e:
+            self.distribuicao.descartar()
             logger.error(
                 f"Erro ao notificar aprovação de solicitação {solicitacao.id}: {e}"
             )
@@ -174,6 +185,9 @@ class NotificationService:
                 )
                 results.append(result)
 
+            # Todas as notificações do evento em dois bulk_create
+            self.distribuicao.gravar()
+
             # Log de auditoria
             LogAuditoria.objects.create(
                 usuario=criador,
@@ -191,475 +205,374 @@ class NotificationService:
             }
 
         except Exception as e:
+            self.distribuicao.descartar()
             logger.error(f"Erro ao notificar criação de evento {solicitacao.id}: {e}")
             return {"success": False, "error": str(e)}
 
     # ==================== MÉTODOS INTERNOS DE NOTIFICAÇÃO ====================
+    # Os métodos abaixo só acumulam linhas em self.distribuicao; os métodos
+    # públicos gravam tudo de uma vez ao final do evento.
+
+    def _notificar_destinatarios(
+        self,
+        usuarios: List[Usuario],
+        tipo_resultado: str,
+        target_group: str,
+        notificacao: Dict[str, Any],
+        log: Dict[str, Any],
+        grupo_log: str = "",
+    ) -> Dict[str, Any]:
+        """Mesma notificação e mesmo log para todos os destinatários."""
+        notificacoes_criadas = self.distribuicao.notificar(usuarios, **notificacao)
+        self.distribuicao.registrar(
+            usuarios,
+            tipo_comunicacao="notificacao_sistema",
+            grupo_destinatario=grupo_log,
+            **log,
+        )
+        return {
+            "success": notificacoes_criadas > 0,
+            "type": tipo_resultado,
+            "notifications_created": notificacoes_criadas,
+            "target_group": target_group,
+        }
+
+    def _formadores(self, solicitacao: Solicitacao) -> List[Usuario]:
+        """Formadores (usuários) ativos vinculados à solicitação."""
+        return list(solicitacao.formadores.filter(is_active=True).order_by("pk"))
 
     def _notify_superintendencia_nova_solicitacao(
         self, solicitacao: Solicitacao
     ) -> Dict[str, Any]:
         """Notifica superintendência sobre nova solicitação para análise."""
 
-        superintendencia_group = Group.objects.get(name="superintendencia")
-        usuarios_super = superintendencia_group.user_set.filter(is_active=True)
+        usuarios_super = self.distribuicao.membros("superintendencia")
 
-        if not usuarios_super.exists():
+        if not usuarios_super:
             return {
                 "success": False,
                 "error": "Nenhum usuário ativo na superintendência",
             }
 
-        # Criar notificações internas
-        notificacoes_criadas = 0
-        for usuario in usuarios_super:
-            try:
-                notificacao = Notificacao.objects.create(
-                    usuario=usuario,
-                    tipo="solicitacao_nova",
-                    titulo="Nova solicitação para análise",
-                    mensagem=f"Nova solicitação '{solicitacao.titulo_evento}' do projeto '{solicitacao.projeto.nome}' aguarda sua análise.",
-                    link_acao=f"/aprovacoes/pendentes/",
-                    entidade_relacionada_id=solicitacao.id,
-                )
-
-                # Log de comunicação
-                self._log_communication(
-                    tipo="notificacao_sistema",
-                    destinatario=usuario,
-                    grupo="superintendencia",
-                    assunto="Nova solicitação para análise",
-                    conteudo=f"Solicitação '{solicitacao.titulo_evento}' aguarda análise.",
-                    entidade_id=solicitacao.id,
-                    entidade_tipo="solicitacao",
-                    status="enviado",
-                )
-
-                notificacoes_criadas += 1
-
-            except Exception as e:
-                logger.error(f"Erro ao criar notificação para {usuario.username}: {e}")
-
-        return {
-            "success": notificacoes_criadas > 0,
-            "type": "superintendencia_nova_solicitacao",
-            "notifications_created": notificacoes_criadas,
-            "target_group": "superintendencia",
-        }
+        return self._notificar_destinatarios(
+            usuarios_super,
+            "superintendencia_nova_solicitacao",
+            "superintendencia",
+            notificacao={
+                "tipo": "solicitacao_nova",
+                "titulo": "Nova solicitação para análise",
+                "mensagem": f"Nova solicitação '{solicitacao.titulo_evento}' do projeto '{solicitacao.projeto.nome}' aguarda sua análise.",
+                "link_acao": "/aprovacoes/pendentes/",
+                "entidade_relacionada_id": solicitacao.id,
+            },
+            log={
+                "assunto": "Nova solicitação para análise",
+                "conteudo": f"Solicitação '{solicitacao.titulo_evento}' aguarda análise.",
+                "entidade_relacionada_id": solicitacao.id,
+                "entidade_relacionada_tipo": "solicitacao",
+            },
+            grupo_log="superintendencia",
+        )
 
     def _notify_controle_nova_solicitacao(
         self, solicitacao: Solicitacao
     ) -> Dict[str, Any]:
         """Notifica controle sobre solicitação que vai direto para PRE_AGENDA."""
 
-        controle_group = Group.objects.get(name="controle")
-        usuarios_controle = controle_group.user_set.filter(is_active=True)
+        usuarios_controle = self.distribuicao.membros("controle")
 
-        if not usuarios_controle.exists():
+        if not usuarios_controle:
             return {"success": False, "error": "Nenhum usuário ativo no controle"}
 
-        # Criar notificações internas
-        notificacoes_criadas = 0
-        for usuario in usuarios_controle:
-            try:
-                notificacao = Notificacao.objects.create(
-                    usuario=usuario,
-                    tipo="pre_agenda_nova",
-                    titulo="Nova solicitação em pré-agenda",
-                    mensagem=f"Solicitação '{solicitacao.titulo_evento}' está na pré-agenda para criação no Google Calendar.",
-                    link_acao=f"/controle/pre-agenda/",
-                    entidade_relacionada_id=solicitacao.id,
-                )
-
-                # Log de comunicação
-                self._log_communication(
-                    tipo="notificacao_sistema",
-                    destinatario=usuario,
-                    grupo="controle",
-                    assunto="Nova solicitação em pré-agenda",
-                    conteudo=f"Solicitação '{solicitacao.titulo_evento}' está na pré-agenda.",
-                    entidade_id=solicitacao.id,
-                    entidade_tipo="solicitacao",
-                    status="enviado",
-                )
-
-                notificacoes_criadas += 1
-
-            except Exception as e:
-                logger.error(f"Erro ao criar notificação para {usuario.username}: {e}")
-
-        return {
-            "success": notificacoes_criadas > 0,
-            "type": "controle_nova_solicitacao",
-            "notifications_created": notificacoes_criadas,
-            "target_group": "controle",
-        }
+        return self._notificar_destinatarios(
+            usuarios_controle,
+            "controle_nova_solicitacao",
+            "controle",
+            notificacao={
+                "tipo": "pre_agenda_nova",
+                "titulo": "Nova solicitação em pré-agenda",
+                "mensagem": f"Solicitação '{solicitacao.titulo_evento}' está na pré-agenda para criação no Google Calendar.",
+                "link_acao": "/controle/pre-agenda/",
+                "entidade_relacionada_id": solicitacao.id,
+            },
+            log={
+                "assunto": "Nova solicitação em pré-agenda",
+                "conteudo": f"Solicitação '{solicitacao.titulo_evento}' está na pré-agenda.",
+                "entidade_relacionada_id": solicitacao.id,
+                "entidade_relacionada_tipo": "solicitacao",
+            },
+            grupo_log="controle",
+        )
 
     def _notify_solicitante_confirmacao(
         self, solicitacao: Solicitacao
     ) -> Dict[str, Any]:
         """Notifica solicitante sobre confirmação de recebimento da solicitação."""
 
-        try:
-            # Criar notificação interna
-            notificacao = Notificacao.objects.create(
-                usuario=solicitacao.usuario_solicitante,
-                tipo="solicitacao_confirmacao",
-                titulo="Solicitação recebida com sucesso",
-                mensagem=f"Sua solicitação '{solicitacao.titulo_evento}' foi recebida e está sendo processada.",
-                entidade_relacionada_id=solicitacao.id,
-            )
+        solicitante = solicitacao.usuario_solicitante
+        self._notificar_destinatarios(
+            [solicitante],
+            "solicitante_confirmacao",
+            "",
+            notificacao={
+                "tipo": "solicitacao_confirmacao",
+                "titulo": "Solicitação recebida com sucesso",
+                "mensagem": f"Sua solicitação '{solicitacao.titulo_evento}' foi recebida e está sendo processada.",
+                "entidade_relacionada_id": solicitacao.id,
+            },
+            log={
+                "assunto": "Solicitação recebida",
+                "conteudo": f"Solicitação '{solicitacao.titulo_evento}' recebida com sucesso.",
+                "entidade_relacionada_id": solicitacao.id,
+                "entidade_relacionada_tipo": "solicitacao",
+            },
+        )
 
-            # Log de comunicação
-            self._log_communication(
-                tipo="notificacao_sistema",
-                destinatario=solicitacao.usuario_solicitante,
-                assunto="Solicitação recebida",
-                conteudo=f"Solicitação '{solicitacao.titulo_evento}' recebida com sucesso.",
+        # Preparação para WhatsApp/SMS (se habilitado no futuro)
+        if self.whatsapp_enabled or self.sms_enabled:
+            self._prepare_mobile_notification(
+                usuario=solicitante,
+                tipo="confirmacao",
+                mensagem=f"✅ Solicitação '{solicitacao.titulo_evento}' recebida!",
                 entidade_id=solicitacao.id,
-                entidade_tipo="solicitacao",
-                status="enviado",
             )
 
-            # Preparação para WhatsApp/SMS (se habilitado no futuro)
-            if self.whatsapp_enabled or self.sms_enabled:
-                self._prepare_mobile_notification(
-                    usuario=solicitacao.usuario_solicitante,
-                    tipo="confirmacao",
-                    mensagem=f"✅ Solicitação '{solicitacao.titulo_evento}' recebida!",
-                    entidade_id=solicitacao.id,
-                )
-
-            return {
-                "success": True,
-                "type": "solicitante_confirmacao",
-                "notifications_created": 1,
-                "recipient": solicitacao.usuario_solicitante.username,
-            }
-
-        except Exception as e:
-            logger.error(
-                f"Erro ao notificar solicitante {solicitacao.usuario_solicitante.username}: {e}"
-            )
-            return {"success": False, "error": str(e)}
+        return {
+            "success": True,
+            "type": "solicitante_confirmacao",
+            "notifications_created": 1,
+            "recipient": solicitante.username,
+        }
 
     def _notify_solicitante_aprovacao(
         self, solicitacao: Solicitacao, aprovador: Usuario
     ) -> Dict[str, Any]:
         """Notifica solicitante sobre aprovação da solicitação."""
 
-        try:
-            # Criar notificação interna
-            notificacao = Notificacao.objects.create(
-                usuario=solicitacao.usuario_solicitante,
-                tipo="solicitacao_aprovada",
-                titulo="Solicitação aprovada! ✅",
-                mensagem=f"Sua solicitação '{solicitacao.titulo_evento}' foi aprovada por {aprovador.get_full_name() or aprovador.username}.",
-                entidade_relacionada_id=solicitacao.id,
-            )
+        solicitante = solicitacao.usuario_solicitante
+        self._notificar_destinatarios(
+            [solicitante],
+            "solicitante_aprovacao",
+            "",
+            notificacao={
+                "tipo": "solicitacao_aprovada",
+                "titulo": "Solicitação aprovada! ✅",
+                "mensagem": f"Sua solicitação '{solicitacao.titulo_evento}' foi aprovada por {aprovador.get_full_name() or aprovador.username}.",
+                "entidade_relacionada_id": solicitacao.id,
+            },
+            log={
+                "assunto": "Solicitação aprovada",
+                "conteudo": f"Solicitação '{solicitacao.titulo_evento}' aprovada por {aprovador.username}.",
+                "entidade_relacionada_id": solicitacao.id,
+                "entidade_relacionada_tipo": "solicitacao",
+            },
+        )
 
-            # Log de comunicação
-            self._log_communication(
-                tipo="notificacao_sistema",
-                destinatario=solicitacao.usuario_solicitante,
-                assunto="Solicitação aprovada",
-                conteudo=f"Solicitação '{solicitacao.titulo_evento}' aprovada por {aprovador.username}.",
+        # Preparação para WhatsApp/SMS
+        if self.whatsapp_enabled or self.sms_enabled:
+            self._prepare_mobile_notification(
+                usuario=solicitante,
+                tipo="aprovacao",
+                mensagem=f"🎉 Solicitação '{solicitacao.titulo_evento}' aprovada!",
                 entidade_id=solicitacao.id,
-                entidade_tipo="solicitacao",
-                status="enviado",
             )
 
-            # Preparação para WhatsApp/SMS
-            if self.whatsapp_enabled or self.sms_enabled:
-                self._prepare_mobile_notification(
-                    usuario=solicitacao.usuario_solicitante,
-                    tipo="aprovacao",
-                    mensagem=f"🎉 Solicitação '{solicitacao.titulo_evento}' aprovada!",
-                    entidade_id=solicitacao.id,
-                )
-
-            return {
-                "success": True,
-                "type": "solicitante_aprovacao",
-                "notifications_created": 1,
-                "recipient": solicitacao.usuario_solicitante.username,
-            }
-
-        except Exception as e:
-            logger.error(
-                f"Erro ao notificar aprovação para {solicitacao.usuario_solicitante.username}: {e}"
-            )
-            return {"success": False, "error": str(e)}
+        return {
+            "success": True,
+            "type": "solicitante_aprovacao",
+            "notifications_created": 1,
+            "recipient": solicitante.username,
+        }
 
     def _notify_controle_pre_agenda(self, solicitacao: Solicitacao) -> Dict[str, Any]:
         """Notifica controle sobre solicitação aprovada que foi para PRE_AGENDA."""
 
-        controle_group = Group.objects.get(name="controle")
-        usuarios_controle = controle_group.user_set.filter(is_active=True)
+        usuarios_controle = self.distribuicao.membros("controle")
 
-        if not usuarios_controle.exists():
+        if not usuarios_controle:
             return {"success": False, "error": "Nenhum usuário ativo no controle"}
 
-        # Criar notificações internas
-        notificacoes_criadas = 0
-        for usuario in usuarios_controle:
-            try:
-                notificacao = Notificacao.objects.create(
-                    usuario=usuario,
-                    tipo="pre_agenda_aprovada",
-                    titulo="Solicitação aprovada → Pré-agenda",
-                    mensagem=f"Solicitação '{solicitacao.titulo_evento}' foi aprovada e está na pré-agenda.",
-                    link_acao=f"/controle/pre-agenda/",
-                    entidade_relacionada_id=solicitacao.id,
-                )
-
-                # Log de comunicação
-                self._log_communication(
-                    tipo="notificacao_sistema",
-                    destinatario=usuario,
-                    grupo="controle",
-                    assunto="Solicitação aprovada → Pré-agenda",
-                    conteudo=f"Solicitação '{solicitacao.titulo_evento}' aprovada e na pré-agenda.",
-                    entidade_id=solicitacao.id,
-                    entidade_tipo="solicitacao",
-                    status="enviado",
-                )
-
-                notificacoes_criadas += 1
-
-            except Exception as e:
-                logger.error(f"Erro ao criar notificação para {usuario.username}: {e}")
-
-        return {
-            "success": notificacoes_criadas > 0,
-            "type": "controle_pre_agenda",
-            "notifications_created": notificacoes_criadas,
-            "target_group": "controle",
-        }
+        return self._notificar_destinatarios(
+            usuarios_controle,
+            "controle_pre_agenda",
+            "controle",
+            notificacao={
+                "tipo": "pre_agenda_aprovada",
+                "titulo": "Solicitação aprovada → Pré-agenda",
+                "mensagem": f"Solicitação '{solicitacao.titulo_evento}' foi aprovada e está na pré-agenda.",
+                "link_acao": "/controle/pre-agenda/",
+                "entidade_relacionada_id": solicitacao.id,
+            },
+            log={
+                "assunto": "Solicitação aprovada → Pré-agenda",
+                "conteudo": f"Solicitação '{solicitacao.titulo_evento}' aprovada e na pré-agenda.",
+                "entidade_relacionada_id": solicitacao.id,
+                "entidade_relacionada_tipo": "solicitacao",
+            },
+            grupo_log="controle",
+        )
 
     def _notify_formadores_pre_evento(self, solicitacao: Solicitacao) -> Dict[str, Any]:
         """Notifica formadores sobre possível evento (ainda em PRE_AGENDA)."""
 
-        formadores = solicitacao.formadores.filter(ativo=True)
+        formadores = self._formadores(solicitacao)
 
-        if not formadores.exists():
+        if not formadores:
             return {"success": False, "error": "Nenhum formador ativo na solicitação"}
 
-        # Criar notificações internas
-        notificacoes_criadas = 0
-        for formador in formadores:
-            if formador.usuario:
-                try:
-                    notificacao = Notificacao.objects.create(
-                        usuario=formador.usuario,
-                        tipo="evento_preparacao",
-                        titulo="Evento em preparação",
-                        mensagem=f"O evento '{solicitacao.titulo_evento}' está sendo preparado e você foi designado como formador.",
-                        entidade_relacionada_id=solicitacao.id,
-                    )
-
-                    # Log de comunicação
-                    self._log_communication(
-                        tipo="notificacao_sistema",
-                        destinatario=formador.usuario,
-                        grupo="formador",
-                        assunto="Evento em preparação",
-                        conteudo=f"Evento '{solicitacao.titulo_evento}' em preparação.",
-                        entidade_id=solicitacao.id,
-                        entidade_tipo="solicitacao",
-                        status="enviado",
-                    )
-
-                    notificacoes_criadas += 1
-
-                except Exception as e:
-                    logger.error(
-                        f"Erro ao criar notificação para formador {formador.usuario.username}: {e}"
-                    )
-
-        return {
-            "success": notificacoes_criadas > 0,
-            "type": "formadores_pre_evento",
-            "notifications_created": notificacoes_criadas,
-            "target_group": "formadores",
-        }
+        return self._notificar_destinatarios(
+            formadores,
+            "formadores_pre_evento",
+            "formadores",
+            notificacao={
+                "tipo": "evento_preparacao",
+                "titulo": "Evento em preparação",
+                "mensagem": f"O evento '{solicitacao.titulo_evento}' está sendo preparado e você foi designado como formador.",
+                "entidade_relacionada_id": solicitacao.id,
+            },
+            log={
+                "assunto": "Evento em preparação",
+                "conteudo": f"Evento '{solicitacao.titulo_evento}' em preparação.",
+                "entidade_relacionada_id": solicitacao.id,
+                "entidade_relacionada_tipo": "solicitacao",
+            },
+            grupo_log="formador",
+        )
 
     def _notify_formadores_evento_criado(
         self, solicitacao: Solicitacao, evento_gc: EventoGoogleCalendar
     ) -> Dict[str, Any]:
         """Notifica formadores sobre evento criado no Google Calendar com link do Meet."""
 
-        formadores = solicitacao.formadores.filter(ativo=True)
+        formadores = self._formadores(solicitacao)
 
-        if not formadores.exists():
+        if not formadores:
             return {"success": False, "error": "Nenhum formador ativo na solicitação"}
 
-        # Criar notificações internas
-        notificacoes_criadas = 0
-        for formador in formadores:
-            if formador.usuario:
-                try:
-                    notificacao = Notificacao.objects.create(
-                        usuario=formador.usuario,
-                        tipo="evento_confirmado",
-                        titulo="Evento confirmado! 📅",
-                        mensagem=f"O evento '{solicitacao.titulo_evento}' foi criado no Google Calendar.",
-                        link_acao=evento_gc.html_link,
-                        entidade_relacionada_id=solicitacao.id,
-                    )
-
-                    # Log de comunicação
-                    self._log_communication(
-                        tipo="notificacao_sistema",
-                        destinatario=formador.usuario,
-                        grupo="formador",
-                        assunto="Evento confirmado",
-                        conteudo=f"Evento '{solicitacao.titulo_evento}' criado no Google Calendar.",
-                        entidade_id=solicitacao.id,
-                        entidade_tipo="evento",
-                        status="enviado",
-                        metadados={
-                            "google_calendar_link": evento_gc.html_link,
-                            "meet_link": evento_gc.meet_link,
-                        },
-                    )
+        resultado = self._notificar_destinatarios(
+            formadores,
+            "formadores_evento_criado",
+            "formadores",
+            notificacao={
+                "tipo": "evento_confirmado",
+                "titulo": "Evento confirmado! 📅",
+                "mensagem": f"O evento '{solicitacao.titulo_evento}' foi criado no Google Calendar.",
+                "link_acao": evento_gc.html_link,
+                "entidade_relacionada_id": solicitacao.id,
+            },
+            log={
+                "assunto": "Evento confirmado",
+                "conteudo": f"Evento '{solicitacao.titulo_evento}' criado no Google Calendar.",
+                "entidade_relacionada_id": solicitacao.id,
+                "entidade_relacionada_tipo": "evento",
+                "metadados": {
+                    "google_calendar_link": evento_gc.html_link,
+                    "meet_link": evento_gc.meet_link,
+                },
+            },
+            grupo_log="formador",
+        )
 
-                    # Preparação para WhatsApp/SMS com link do Meet
-                    if self.whatsapp_enabled or self.sms_enabled:
-                        meet_info = (
-                            f"\n🎥 Google Meet: {evento_gc.meet_link}"
-                            if evento_gc.meet_link
-                            else ""
-                        )
-                        self._prepare_mobile_notification(
-                            usuario=formador.usuario,
-                            tipo="evento_confirmado",
-                            mensagem=f"📅 Evento '{solicitacao.titulo_evento}' confirmado!{meet_info}",
-                            entidade_id=solicitacao.id,
-                        )
-
-                    notificacoes_criadas += 1
-
-                except Exception as e:
-                    logger.error(
-                        f"Erro ao criar notificação para formador {formador.usuario.username}: {e}"
-                    )
+        # Preparação para WhatsApp/SMS com link do Meet
+        if self.whatsapp_enabled or self.sms_enabled:
+            meet_info = (
+                f"\n🎥 Google Meet: {evento_gc.meet_link}"
+                if evento_gc.meet_link
+                else ""
+            )
+            mensagem = f"📅 Evento '{solicitacao.titulo_evento}' confirmado!{meet_info}"
+            for formador in formadores:
+                self._prepare_mobile_notification(
+                    usuario=formador,
+                    tipo="evento_confirmado",
+                    mensagem=mensagem,
+                    entidade_id=solicitacao.id,
+                )
 
-        return {
-            "success": notificacoes_criadas > 0,
-            "type": "formadores_evento_criado",
-            "notifications_created": notificacoes_criadas,
-            "target_group": "formadores",
-        }
+        return resultado
 
     def _notify_solicitante_evento_criado(
         self, solicitacao: Solicitacao, evento_gc: EventoGoogleCalendar
     ) -> Dict[str, Any]:
         """Notifica solicitante sobre evento criado no Google Calendar."""
 
-        try:
-            # Criar notificação interna
-            notificacao = Notificacao.objects.create(
-                usuario=solicitacao.usuario_solicitante,
-                tipo="evento_criado",
-                titulo="Evento criado com sucesso! 🎉",
-                mensagem=f"Seu evento '{solicitacao.titulo_evento}' foi criado no Google Calendar com sucesso!",
-                link_acao=evento_gc.html_link,
-                entidade_relacionada_id=solicitacao.id,
-            )
-
-            # Log de comunicação
-            self._log_communication(
-                tipo="notificacao_sistema",
-                destinatario=solicitacao.usuario_solicitante,
-                assunto="Evento criado com sucesso",
-                conteudo=f"Evento '{solicitacao.titulo_evento}' criado no Google Calendar.",
-                entidade_id=solicitacao.id,
-                entidade_tipo="evento",
-                status="enviado",
-                metadados={
+        solicitante = solicitacao.usuario_solicitante
+        self._notificar_destinatarios(
+            [solicitante],
+            "solicitante_evento_criado",
+            "",
+            notificacao={
+                "tipo": "evento_criado",
+                "titulo": "Evento criado com sucesso! 🎉",
+                "mensagem": f"Seu evento '{solicitacao.titulo_evento}' foi criado no Google Calendar com sucesso!",
+                "link_acao": evento_gc.html_link,
+                "entidade_relacionada_id": solicitacao.id,
+            },
+            log={
+                "assunto": "Evento criado com sucesso",
+                "conteudo": f"Evento '{solicitacao.titulo_evento}' criado no Google Calendar.",
+                "entidade_relacionada_id": solicitacao.id,
+                "entidade_relacionada_tipo": "evento",
+                "metadados": {
                     "google_calendar_link": evento_gc.html_link,
                     "meet_link": evento_gc.meet_link,
                 },
-            )
-
-            # Preparação para WhatsApp/SMS
-            if self.whatsapp_enabled or self.sms_enabled:
-                meet_info = (
-                    f"\n🎥 Google Meet: {evento_gc.meet_link}"
-                    if evento_gc.meet_link
-                    else ""
-                )
-                self._prepare_mobile_notification(
-                    usuario=solicitacao.usuario_solicitante,
-                    tipo="evento_criado",
-                    mensagem=f"🎉 Evento '{solicitacao.titulo_evento}' criado!{meet_info}",
-                    entidade_id=solicitacao.id,
-                )
-
-            return {
-                "success": True,
-                "type": "solicitante_evento_criado",
-                "notifications_created": 1,
-                "recipient": solicitacao.usuario_solicitante.username,
-            }
+            },
+        )
 
-        except Exception as e:
-            logger.error(
-                f"Erro ao notificar solicitante {solicitacao.usuario_solicitante.username}: {e}"
+        # Preparação para WhatsApp/SMS
+        if self.whatsapp_enabled or self.sms_enabled:
+            meet_info = (
+                f"\n🎥 Google Meet: {evento_gc.meet_link}"
+                if evento_gc.meet_link
+                else ""
+            )
+            self._prepare_mobile_notification(
+                usuario=solicitante,
+                tipo="evento_criado",
+                mensagem=f"🎉 Evento '{solicitacao.titulo_evento}' criado!{meet_info}",
+                entidade_id=solicitacao.id,
             )
-            return {"success": False, "error": str(e)}
+
+        return {
+            "success": True,
+            "type": "solicitante_evento_criado",
+            "notifications_created": 1,
+            "recipient": solicitante.username,
+        }
 
     def _notify_superintendencia_evento_criado(
         self, solicitacao: Solicitacao, evento_gc: EventoGoogleCalendar
     ) -> Dict[str, Any]:
         """Notifica superintendência sobre conclusão do processo (evento criado)."""
 
-        superintendencia_group = Group.objects.get(name="superintendencia")
-        usuarios_super = superintendencia_group.user_set.filter(is_active=True)
+        usuarios_super = self.distribuicao.membros("superintendencia")
 
-        if not usuarios_super.exists():
+        if not usuarios_super:
             return {
                 "success": False,
                 "error": "Nenhum usuário ativo na superintendência",
             }
 
-        # Criar notificações internas
-        notificacoes_criadas = 0
-        for usuario in usuarios_super:
-            try:
-                notificacao = Notificacao.objects.create(
-                    usuario=usuario,
-                    tipo="processo_concluido",
-                    titulo="Processo concluído com sucesso ✅",
-                    mensagem=f"A solicitação '{solicitacao.titulo_evento}' foi processada e o evento foi criado no Google Calendar.",
-                    link_acao=evento_gc.html_link,
-                    entidade_relacionada_id=solicitacao.id,
-                )
-
-                # Log de comunicação
-                self._log_communication(
-                    tipo="notificacao_sistema",
-                    destinatario=usuario,
-                    grupo="superintendencia",
-                    assunto="Processo concluído",
-                    conteudo=f"Solicitação '{solicitacao.titulo_evento}' processada e evento criado.",
-                    entidade_id=solicitacao.id,
-                    entidade_tipo="evento",
-                    status="enviado",
-                )
-
-                notificacoes_criadas += 1
-
-            except Exception as e:
-                logger.error(f"Erro ao criar notificação para {usuario.username}: {e}")
-
-        return {
-            "success": notificacoes_criadas > 0,
-            "type": "superintendencia_evento_criado",
-            "notifications_created": notificacoes_criadas,
-            "target_group": "superintendencia",
-        }
+        return self._notificar_destinatarios(
+            usuarios_super,
+            "superintendencia_evento_criado",
+            "superintendencia",
+            notificacao={
+                "tipo": "processo_concluido",
+                "titulo": "Processo concluído com sucesso ✅",
+                "mensagem": f"A solicitação '{solicitacao.titulo_evento}' foi processada e o evento foi criado no Google Calendar.",
+                "link_acao": evento_gc.html_link,
+                "entidade_relacionada_id": solicitacao.id,
+            },
+            log={
+                "assunto": "Processo concluído",
+                "conteudo": f"Solicitação '{solicitacao.titulo_evento}' processada e evento criado.",
+                "entidade_relacionada_id": solicitacao.id,
+                "entidade_relacionada_tipo": "evento",
+            },
+            grupo_log="superintendencia",
+        )
 
     # ==================== PREPARAÇÃO WHATSAPP/SMS ====================
 
@@ -670,40 +583,27 @@ class NotificationService:
         Prepara notificação para WhatsApp/SMS (para implementação futura).
         Registra no log de comunicações como 'pendente'.
         """
-        try:
-            # WhatsApp (se habilitado)
-            if self.whatsapp_enabled and usuario.telefone:
-                self._log_communication(
-                    tipo="whatsapp",
-                    destinatario=usuario,
-                    endereco=usuario.telefone,
-                    assunto=f"Sistema Aprender - {tipo}",
-                    conteudo=mensagem,
-                    entidade_id=entidade_id,
-                    entidade_tipo="solicitacao",
-                    status="pendente",  # Aguardando implementação
-                    metadados={"preparado_para": "whatsapp_futuro"},
-                )
-
-            # SMS (se habilitado)
-            if self.sms_enabled and usuario.telefone:
+        telefone = getattr(usuario, "telefone", "")
+        if not telefone:
+            return
+
+        for canal, habilitado in (
+            ("whatsapp", self.whatsapp_enabled),
+            ("sms", self.sms_enabled),
+        ):
+            if habilitado:
                 self._log_communication(
-                    tipo="sms",
+                    tipo=canal,
                     destinatario=usuario,
-                    endereco=usuario.telefone,
+                    endereco=telefone,
                     assunto=f"Sistema Aprender - {tipo}",
                     conteudo=mensagem,
                     entidade_id=entidade_id,
                     entidade_tipo="solicitacao",
                     status="pendente",  # Aguardando implementação
-                    metadados={"preparado_para": "sms_futuro"},
+                    metadados={"preparado_para": f"{canal}_futuro"},
                 )
 
-        except Exception as e:
-            logger.error(
-                f"Erro ao preparar notificação mobile para {usuario.username}: {e}"
-            )
-
     # ==================== LOG DE COMUNICAÇÕES ====================
 
     def _log_communication(
@@ -721,25 +621,20 @@ class NotificationService:
     ) -> None:
         """
         Registra comunicação no log (visível apenas para admin).
+        Gravado junto com as notificações do evento.
         """
-        try:
-            LogComunicacao.objects.create(
-                usuario_remetente=None,  # Sistema
-                usuario_destinatario=destinatario,
-                grupo_destinatario=grupo,
-                tipo_comunicacao=tipo,
-                assunto=assunto,
-                conteudo=conteudo,
-                endereco_destinatario=endereco,
-                status_envio=status,
-                entidade_relacionada_id=entidade_id,
-                entidade_relacionada_tipo=entidade_tipo,
-                metadados=metadados,
-                enviado_em=timezone.now() if status == "enviado" else None,
-            )
-
-        except Exception as e:
-            logger.error(f"Erro ao registrar log de comunicação: {e}")
+        self.distribuicao.registrar(
+            [destinatario],
+            status_envio=status,
+            grupo_destinatario=grupo,
+            tipo_comunicacao=tipo,
+            assunto=assunto,
+            conteudo=conteudo,
+            endereco_destinatario=endereco,
+            entidade_relacionada_id=entidade_id,
+            entidade_relacionada_tipo=entidade_tipo,
+            metadados=metadados,
+        )
 
     # ==================== MÉTODOS UTILITÁRIOS ====================
 
@@ -771,8 +666,7 @@ class NotificationService:
         """
         try:
             notification = Notificacao.objects.get(id=notification_id, usuario=usuario)
-            notification.lida = True
-            notification.save(update_fields=["lida"])
+            notification_counter.marcar_como_lida(notification)
             return True
         except Notificacao.DoesNotExist:
             return False
@@ -781,7 +675,7 @@ class NotificationService:
         """
         Retorna quantidade de notificações não lidas do usuário.
         """
-        return Notificacao.objects.filter(usuario=usuario, lida=False).count()
+        return notification_counter.get_unread_count(usuario.id)
 
     def _get_relative_time(self, dt: datetime) -> str:
         """
@@ -821,6 +715,87 @@ def notify_solicitacao_approved(
     return service.notify_solicitacao_approved(solicitacao, aprovador)
 
 
+def _notificar_lote(solicitacoes, usuario, notificar, acao_sucesso, acao_erro):
+    """
+    Executa `notificar(solicitacao)` para cada item do lote e grava os logs
+    de auditoria em um único bulk_create. Erro em um item não interrompe os
+    demais.
+    """
+    logs = []
+    enviados = 0
+    for solicitacao in solicitacoes:
+        try:
+            notify_result = notificar(solicitacao)
+            if notify_result["success"]:
+                enviados += 1
+                logs.append(
+                    LogAuditoria(
+                        usuario=usuario,
+                        acao=acao_sucesso,
+                        entidade_afetada_id=solicitacao.id,
+                        detalhes=f"Notificações enviadas: {notify_result['notifications_sent']}",
+                    )
+                )
+        except Exception as e:
+            logs.append(
+                LogAuditoria(
+                    usuario=usuario,
+                    acao=acao_erro,
+                    entidade_afetada_id=solicitacao.id,
+                    detalhes=f"Erro: {str(e)}",
+                )
+            )
+
+    LogAuditoria.objects.bulk_create(logs)
+    return {"success": True, "solicitacoes_notificadas": enviados}
+
+
+def notify_solicitacoes_approved_batch(
+    solicitacao_ids: List[str], aprovador_id
+) -> Dict[str, Any]:
+    """
+    Notifica as aprovações de um lote (trabalho em segundo plano, após o
+    commit da aprovação em lote).
+    """
+    from django.contrib.auth import get_user_model
+
+    aprovador = get_user_model().objects.get(pk=aprovador_id)
+    solicitacoes = Solicitacao.objects.filter(pk__in=solicitacao_ids).select_related(
+        "usuario_solicitante", "projeto", "municipio", "tipo_evento"
+    )
+    service = NotificationService()
+    return _notificar_lote(
+        solicitacoes,
+        aprovador,
+        lambda s: service.notify_solicitacao_approved(s, aprovador),
+        "RF07: Notificações de aprovação enviadas",
+        "RF07: Erro em notificações de aprovação",
+    )
+
+
+def notify_events_created_batch(
+    solicitacao_ids: List[str], criador_id
+) -> Dict[str, Any]:
+    """
+    Notifica os eventos criados por uma criação em lote no Google Calendar
+    (trabalho em segundo plano, após o commit).
+    """
+    from django.contrib.auth import get_user_model
+
+    criador = get_user_model().objects.get(pk=criador_id)
+    solicitacoes = Solicitacao.objects.filter(pk__in=solicitacao_ids).select_related(
+        "usuario_solicitante", "projeto", "municipio", "tipo_evento", "evento_google"
+    )
+    service = NotificationService()
+    return _notificar_lote(
+        solicitacoes,
+        criador,
+        lambda s: service.notify_event_created(s, s.evento_google, criador),
+        "RF07: Notificações de evento criado enviadas",
+        "RF07: Erro em notificações de evento criado",
+    )
+
+
 def notify_event_created(
     solicitacao: Solicitacao, evento_gc: EventoGoogleCalendar, criador: Usuario
 ) -> Dict[str, Any]:
@@ -0,0 +1,164 @@
+"""
+Papéis do usuário (grupos, vínculo do setor e permissões) resolvidos uma vez
+
+Usuario.role_names, has_role, has_any_role, is_coordenador_superintendencia...
+e os toolsets MCP consultavam `groups` (ou o setor) a cada chamada; uma
+página chegava a repetir dezenas de vezes a mesma consulta. Agora tudo vem
+de um PapeisUsuario carregado uma vez:
+
+- por requisição: guardado na própria instância do usuário, como o
+  _perm_cache do ModelBackend;
+- por sessão: o PapeisMiddleware guarda o resultado na sessão com um
+  carimbo de versão; as requisições seguintes da sessão não consultam o
+  banco enquanto o carimbo não mudar.
+
+O carimbo (no cache) junta uma versão global e uma por usuário. Trocam a
+do usuário: m2m_changed em groups e user_permissions e o save de
+is_superuser, is_staff, is_active, cargo ou setor. Trocam a global:
+m2m_changed em Group.permissions, setup_roles, sync_roles_from_papel e
+alterações de Setor.
+
+O carimbo só é confiável se todos os processos virem o mesmo cache: com
+LocMemCache (desenvolvimento, produção sem REDIS_URL) a invalidação feita
+num worker não chega aos outros. Nesse caso o cache por sessão fica
+desligado e vale apenas o por requisição (PAPEIS_CACHE_SESSAO força).
+"""
+
+import uuid
+from dataclasses import dataclass
+from typing import Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from core.services.cache_service import cache_compartilhado
+
+SESSION_KEY = "_papeis"
+VERSAO_GLOBAL = "papeis:versao"
+VERSAO_USUARIO = "papeis:versao:{}"
+
+
+@dataclass(frozen=True)
+class PapeisUsuario:
+    """Grupos, vínculo do setor e permissões de um usuário"""
+
+    grupos: Tuple[str, ...]
+    setor_id: Optional[int]
+    # None: sem setor; senão Setor.vinculado_superintendencia
+    setor_superintendencia: Optional[bool]
+    permissoes: frozenset
+
+    def tem(self, grupo: str) -> bool:
+        return grupo in self.grupos
+
+    def tem_algum(self, grupos: Iterable[str]) -> bool:
+        return any(grupo in self.grupos for grupo in grupos)
+
+
+def _carregar(usuario) -> PapeisUsuario:
+    from core.models import Setor
+
+    setor_id = getattr(usuario, "setor_id", None)
+    vinculado = None
+    if setor_id:
+        vinculado = (
+            Setor.objects.filter(pk=setor_id)
+            .values_list("vinculado_superintendencia", flat=True)
+            .first()
+        )
+    grupos = (
+        get_user_model()
+        ._default_manager.filter(pk=usuario.pk, groups__isnull=False)
+        .order_by("groups__id")
+        .values_list("groups__name", flat=True)
+    )
+    return PapeisUsuario(
+        grupos=tuple(grupos),
+        setor_id=setor_id,
+        setor_superintendencia=vinculado,
+        permissoes=frozenset(usuario.get_all_permissions()),
+    )
+
+
+def _memorizar(usuario, papeis: PapeisUsuario) -> PapeisUsuario:
+    usuario._papeis = papeis
+    # has_perm() do ModelBackend passa a usar as permissões já carregadas
+    usuario._perm_cache = set(papeis.permissoes)
+    return papeis
+
+
+def papeis_de(usuario) -> PapeisUsuario:
+    """Papéis do usuário, consultados no máximo uma vez por instância"""
+    papeis = getattr(usuario, "_papeis", None)
+    if papeis is None or papeis.setor_id != getattr(usuario, "setor_id", None):
+        papeis = _memorizar(usuario, _carregar(usuario))
+    return papeis
+
+
+def sessao_habilitada() -> bool:
+    """Cache por sessão só com cache compartilhado (ou PAPEIS_CACHE_SESSAO)"""
+    habilitada = getattr(settings, "PAPEIS_CACHE_SESSAO", None)
+    if habilitada is not None:
+        return habilitada
+    return cache_compartilhado()
+
+
+def versao(usuario_id) -> str:
+    """Carimbo atual dos papéis do usuário (uma leitura no cache)"""
+    chaves = [VERSAO_GLOBAL, VERSAO_USUARIO.format(usuario_id)]
+    valores = cache.get_many(chaves)
+    for chave in chaves:
+        if chave not in valores:
+            # add(): não sobrescreve um carimbo gravado por outro processo
+            cache.add(chave, uuid.uuid4().hex, None)
+            valores[chave] = cache.get(chave)
+    return ":".join(str(valores[chave]) for chave in chaves)
+
+
+def carregar_da_sessao(usuario, session) -> PapeisUsuario:
+    """
+    Papéis do usuário a partir da sessão, se o carimbo ainda vale; senão
+    consulta o banco e regrava a sessão. Sem cache compartilhado, apenas
+    memoriza na instância (papeis_de).
+    """
+    if not sessao_habilitada():
+        session.pop(SESSION_KEY, None)
+        return papeis_de(usuario)
+
+    atual = versao(usuario.pk)
+    dados = session.get(SESSION_KEY)
+    if (
+        dados
+        and dados["versao"] == atual
+        and dados["usuario"] == usuario.pk
+        and dados["setor_id"] == getattr(usuario, "setor_id", None)
+    ):
+        return _memorizar(
+            usuario,
+            PapeisUsuario(
+                grupos=tuple(dados["grupos"]),
+                setor_id=dados["setor_id"],
+                setor_superintendencia=dados["setor_superintendencia"],
+                permissoes=frozenset(dados["permissoes"]),
+            ),
+        )
+
+    papeis = _memorizar(usuario, _carregar(usuario))
+    session[SESSION_KEY] = {
+        "versao": atual,
+        "usuario": usuario.pk,
+        "grupos": list(papeis.grupos),
+        "setor_id": papeis.setor_id,
+        "setor_superintendencia": papeis.setor_superintendencia,
+        "permissoes": sorted(papeis.permissoes),
+    }
+    return papeis
+
+
+def invalidar_usuario(usuario_id):
+    cache.set(VERSAO_USUARIO.format(usuario_id), uuid.uuid4().hex, None)
+
+
+def invalidar_todos():
+    cache.set(VERSAO_GLOBAL, uuid.uuid4().hex, None)
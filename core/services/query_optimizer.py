@@ -220,77 +220,53 @@ class OptimizedQueryManager:
     @staticmethod
     def get_monthly_availability_map(ano: int, mes: int):
         """
-        Optimized monthly availability map query
+        Monthly availability map read from the materialized formador × day table.
+        The table is kept current by signals, so no TTL cache is needed here.
         """
-        cache_key = cache_service.generate_key('availability_map', ano, mes)
-        
-        def fetch_data():
-            from calendar import monthrange
-            import datetime
-            
-            first_day = datetime.date(ano, mes, 1)
-            last_day = datetime.date(ano, mes, monthrange(ano, mes)[1])
-            
-            # Get all formadores with their availability
-            formadores = (
-                Formador.objects
-                .filter(ativo=True)
-                .select_related('usuario')
-                .prefetch_related(
-                    Prefetch(
-                        'disponibilidadeformadores_set',
-                        queryset=DisponibilidadeFormadores.objects.filter(
-                            data__range=[first_day, last_day]
-                        ),
-                        to_attr='month_availability'
-                    ),
-                    Prefetch(
-                        'solicitacao_set',
-                        queryset=Solicitacao.objects.filter(
-                            status__in=['Aprovado', 'PreAgenda'],
-                            data_inicio__month=mes,
-                            data_inicio__year=ano
-                        ).select_related('municipio', 'projeto'),
-                        to_attr='month_events'
-                    )
-                )
+        from core.services.mapa_materializado import dias_do_mes, ler_mapa
+
+        dias = dias_do_mes(ano, mes)
+        formadores = list(
+            Formador.objects.filter(ativo=True).select_related('usuario').order_by('nome')
+        )
+        mapa = ler_mapa(formadores, dias)
+
+        # Approved events of the month, one query for every formador
+        eventos_por_usuario = {}
+        for usuario_id, titulo, inicio, fim, municipio, projeto, status in (
+            Solicitacao.objects
+            .filter(
+                status='Aprovado',
+                formadores__in=[f.usuario_id for f in formadores if f.usuario_id],
+                data_inicio__date__lte=dias[-1],
+                data_fim__date__gte=dias[0],
             )
-            
-            availability_map = {}
-            
-            for formador in formadores:
-                formador_data = {
-                    'nome': formador.usuario.get_full_name(),
-                    'email': formador.usuario.email,
-                    'disponibilidade': {},
-                    'eventos': []
-                }
-                
-                # Process availability blocks
-                for disp in formador.month_availability:
-                    day = disp.data.day
-                    formador_data['disponibilidade'][day] = {
-                        'disponivel': disp.disponivel,
-                        'tipo_bloqueio': disp.tipo_bloqueio,
-                        'observacoes': disp.observacoes
-                    }
-                
-                # Process events
-                for evento in formador.month_events:
-                    formador_data['eventos'].append({
-                        'titulo': evento.titulo,
-                        'data_inicio': evento.data_inicio.isoformat(),
-                        'data_fim': evento.data_fim.isoformat(),
-                        'municipio': evento.municipio.nome,
-                        'projeto': evento.projeto.nome,
-                        'status': evento.status
-                    })
-                
-                availability_map[str(formador.id)] = formador_data
-            
-            return availability_map
-        
-        return cache_service.get_or_set_json(cache_key, fetch_data, 'medium')
+            .values_list(
+                'formadores', 'titulo_evento', 'data_inicio', 'data_fim',
+                'municipio__nome', 'projeto__nome', 'status'
+            )
+        ):
+            eventos_por_usuario.setdefault(usuario_id, []).append({
+                'titulo': titulo,
+                'data_inicio': inicio.isoformat(),
+                'data_fim': fim.isoformat(),
+                'municipio': municipio,
+                'projeto': projeto,
+                'status': status
+            })
+
+        availability_map = {}
+        for formador in formadores:
+            availability_map[str(formador.id)] = {
+                'nome': formador.nome,
+                'email': formador.email,
+                'disponibilidade': {
+                    dia.day: codigo for dia, codigo in zip(dias, mapa[formador.id])
+                },
+                'eventos': eventos_por_usuario.get(formador.usuario_id, [])
+            }
+
+        return availability_map
     
     @staticmethod
     def get_dashboard_analytics():
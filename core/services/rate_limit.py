@@ -0,0 +1,163 @@
+"""
+Limite de requisições por janela deslizante
+
+Cada decisão é O(1): o contador da janela atual soma-se ao da anterior,
+ponderado pela fração dela que ainda cabe na janela deslizante
+(aproximação de janela deslizante com dois contadores).
+
+Dois backends com a mesma interface:
+
+- JanelaDeslizanteCache: contadores no cache do Django (Redis em
+  produção), compartilhados entre workers e servidores; incr atômico.
+  Em produção RATE_LIMIT_CACHE precisa apontar para um cache compartilhado:
+  num LocMemCache cada worker conta sozinho e o limite efetivo vira
+  limite × workers (criar_limitador avisa disso em produção);
+- JanelaDeslizanteMemoria: contadores em memória do processo, com
+  descarte LRU; para um único processo (desenvolvimento, testes).
+
+Os limites valem por grupo de rotas (RATE_LIMIT_GRUPOS: login, stream do
+mapa, API...) e por identidade: o usuário autenticado ou, sem login, o IP.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+from core.services.cache_service import cache_compartilhado
+
+logger = logging.getLogger(__name__)
+
+# Primeiro grupo cujo prefixo casa com o caminho; janela em segundos
+GRUPOS_PADRAO = [
+    {
+        "nome": "login",
+        "prefixos": ["/login/", "/accounts/login/", "/api/auth/"],
+        "limite": 10,
+        "janela": 60,
+    },
+    {
+        "nome": "mapa_stream",
+        "prefixos": [
+            "/api/mapa/realtime/",
+            "/api/notifications/stream/",
+            "/api/notifications/realtime/",
+        ],
+        "limite": 30,
+        "janela": 60,
+    },
+    {"nome": "api", "prefixos": ["/api/"], "limite": 300, "janela": 60},
+    {"nome": "geral", "prefixos": ["/"], "limite": 100, "janela": 60},
+]
+
+
+@dataclass(frozen=True)
+class Decisao:
+    permitido: bool
+    limite: int
+    restantes: int
+    # Segundos até a requisição voltar a ser aceita (0 se permitida)
+    tentar_em: int
+
+
+def _decidir(
+    atual: int, anterior: int, limite: int, janela: int, agora: float
+) -> Decisao:
+    decorrido = (agora % janela) / janela
+    estimado = anterior * (1 - decorrido) + atual
+    if estimado <= limite:
+        return Decisao(True, limite, int(limite - estimado), 0)
+    # Até o peso da janela anterior cair o bastante (no máximo, a virada)
+    tentar_em = int(janela - agora % janela) + 1
+    if anterior:
+        excesso = estimado - limite
+        tentar_em = min(tentar_em, int(excesso / anterior * janela) + 1)
+    return Decisao(False, limite, 0, tentar_em)
+
+
+class JanelaDeslizanteCache:
+    """Contadores no cache do Django (RATE_LIMIT_CACHE); incr + get por decisão"""
+
+    def __init__(self, alias: Optional[str] = None):
+        self.cache = caches[alias or getattr(settings, "RATE_LIMIT_CACHE", "default")]
+
+    def permitir(self, chave: str, limite: int, janela: int) -> Decisao:
+        agora = time.time()
+        indice = int(agora // janela)
+        chave_atual = f"ratelimit:{chave}:{janela}:{indice}"
+        chave_anterior = f"ratelimit:{chave}:{janela}:{indice - 1}"
+
+        # incr() é atômico no Redis; o primeiro da janela cria o contador
+        try:
+            atual = self.cache.incr(chave_atual)
+        except ValueError:
+            if self.cache.add(chave_atual, 1, janela * 2):
+                atual = 1
+            else:
+                atual = self.cache.incr(chave_atual)
+        anterior = self.cache.get(chave_anterior) or 0
+        return _decidir(atual, anterior, limite, janela, agora)
+
+
+class JanelaDeslizanteMemoria:
+    """Contadores em memória do processo, com no máximo `max_chaves` (LRU)"""
+
+    def __init__(self, max_chaves: int = 10000):
+        self.max_chaves = max_chaves
+        # chave → [índice da janela atual, contagem atual, contagem anterior]
+        self._contadores: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def permitir(self, chave: str, limite: int, janela: int) -> Decisao:
+        agora = time.time()
+        indice = int(agora // janela)
+        chave = f"{chave}:{janela}"
+        with self._lock:
+            contador = self._contadores.get(chave)
+            if contador is None:
+                contador = self._contadores[chave] = [indice, 0, 0]
+                if len(self._contadores) > self.max_chaves:
+                    self._contadores.popitem(last=False)
+            else:
+                self._contadores.move_to_end(chave)
+                if contador[0] != indice:
+                    # Virou a janela: a atual passa a anterior (ou zera)
+                    contador[2] = contador[1] if contador[0] == indice - 1 else 0
+                    contador[0], contador[1] = indice, 0
+            contador[1] += 1
+            atual, anterior = contador[1], contador[2]
+        return _decidir(atual, anterior, limite, janela, agora)
+
+
+def criar_limitador():
+    """Backend de RATE_LIMIT_BACKEND: "cache" (padrão) ou "memoria" """
+    if getattr(settings, "RATE_LIMIT_BACKEND", "cache") == "memoria":
+        return JanelaDeslizanteMemoria(
+            getattr(settings, "RATE_LIMIT_MAX_CHAVES", 10000)
+        )
+    alias = getattr(settings, "RATE_LIMIT_CACHE", "default")
+    # Fora de produção o middleware não limita; o LocMem do dev é esperado
+    if getattr(settings, "IS_PRODUCTION", False) and not cache_compartilhado(alias):
+        logger.warning(
+            "RATE_LIMIT_CACHE=%r é um cache local: cada processo conta à parte "
+            "e o limite vale por worker; configure um cache compartilhado "
+            "(Redis) em produção",
+            alias,
+        )
+    return JanelaDeslizanteCache(alias)
+
+
+def grupos() -> List[dict]:
+    return getattr(settings, "RATE_LIMIT_GRUPOS", GRUPOS_PADRAO)
+
+
+def grupo_da_rota(path: str) -> Optional[dict]:
+    for grupo in grupos():
+        if any(path.startswith(prefixo) for prefixo in grupo["prefixos"]):
+            return grupo
+    return None
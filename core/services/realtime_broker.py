@@ -0,0 +1,279 @@
+"""
+Pub/sub para eventos em tempo real (Server-Sent Events)
+
+Os signals publicam mensagens em um canal e cada conexão SSE assina o canal.
+Sob ASGI a assinatura é assíncrona: nenhuma thread fica presa por cliente
+conectado, o cliente ocioso é apenas uma fila aguardando no event loop. Sob
+WSGI (runserver, implantação atual) a assinatura é bloqueante e ocupa a
+thread do worker enquanto o cliente está conectado.
+
+Implementações:
+- InMemoryBroker: processo único (testes e implantação em um nó)
+- RedisBroker: PUBLISH/SUBSCRIBE de qualquer servidor compatível com Redis
+
+Configuração: REALTIME_BROKER_URL (redis://...). Sem URL, usa o broker em memória.
+"""
+
+import asyncio
+import json
+import logging
+import queue
+import threading
+from collections import defaultdict
+from typing import Optional
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+try:
+    import redis
+    import redis.asyncio as redis_asyncio
+except ImportError:
+    redis = None
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+# Canais conhecidos
+MAPA_CHANNEL = "mapa"
+
+
+class InMemorySubscription:
+    """Assinatura de um canal no broker em memória"""
+
+    def __init__(self, broker: "InMemoryBroker", channel: str, max_queue: int):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=max_queue)
+
+    def deliver(self, message: dict):
+        """Chamado pelo publish() de qualquer thread"""
+        try:
+            self.loop.call_soon_threadsafe(self.offer, message)
+        except RuntimeError:
+            # Event loop encerrado: a assinatura será removida no __aexit__
+            pass
+
+    def offer(self, message: dict):
+        """Entrega no event loop do assinante; descarta a mais antiga se cheia"""
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """Próxima mensagem, ou None se `timeout` expirar"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def __aenter__(self):
+        self.broker._add(self)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.broker._remove(self)
+
+
+class InMemorySyncSubscription:
+    """Assinatura bloqueante no broker em memória (streams sob WSGI)"""
+
+    def __init__(self, broker: "InMemoryBroker", channel: str, max_queue: int):
+        self.broker = broker
+        self.channel = channel
+        self.queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+
+    def deliver(self, message: dict):
+        """Descarta a mensagem mais antiga se a fila estiver cheia"""
+        with self._lock:
+            if self.queue.full():
+                self.queue.get_nowait()
+            self.queue.put_nowait(message)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """Próxima mensagem, ou None se `timeout` expirar"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def __enter__(self):
+        self.broker._add(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.broker._remove(self)
+
+
+class InMemoryBroker:
+    """
+    Broker em memória: publish() pode ser chamado de qualquer thread
+    (signals síncronos) e entrega às filas de cada assinante.
+    """
+
+    def __init__(self, max_queue: int = 100):
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def publish(self, channel: str, message: dict) -> int:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.deliver(message)
+        return len(subscribers)
+
+    def subscribe(self, channel: str) -> InMemorySubscription:
+        """Uso: async with broker.subscribe(canal) as assinatura: ..."""
+        return InMemorySubscription(self, channel, self.max_queue)
+
+    def subscribe_sync(self, channel: str) -> InMemorySyncSubscription:
+        """Uso: with broker.subscribe_sync(canal) as assinatura: ..."""
+        return InMemorySyncSubscription(self, channel, self.max_queue)
+
+    def subscriber_count(self, channel: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(channel, ()))
+
+    def _add(self, subscription):
+        with self._lock:
+            self._subscribers[subscription.channel].add(subscription)
+
+    def _remove(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+
+class RedisSubscription:
+    """Assinatura de um canal via SUBSCRIBE (cliente redis.asyncio)"""
+
+    def __init__(self, broker: "RedisBroker", channel: str):
+        self.broker = broker
+        self.channel = channel
+        self.client = None
+        self.pubsub = None
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        message = await self.pubsub.get_message(
+            ignore_subscribe_messages=True, timeout=timeout
+        )
+        if message is None:
+            return None
+        return json.loads(message["data"])
+
+    async def __aenter__(self):
+        self.client = self.broker.async_client_factory()
+        self.pubsub = self.client.pubsub()
+        await self.pubsub.subscribe(self.broker.prefix + self.channel)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        try:
+            await self.pubsub.unsubscribe()
+            await self.pubsub.aclose()
+        finally:
+            await self.client.aclose()
+
+
+class RedisSyncSubscription:
+    """Assinatura bloqueante via SUBSCRIBE (cliente redis síncrono)"""
+
+    def __init__(self, broker: "RedisBroker", channel: str):
+        self.broker = broker
+        self.channel = channel
+        self.pubsub = None
+
+    def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        message = self.pubsub.get_message(
+            ignore_subscribe_messages=True, timeout=timeout
+        )
+        if message is None:
+            return None
+        return json.loads(message["data"])
+
+    def __enter__(self):
+        self.pubsub = self.broker.client.pubsub()
+        self.pubsub.subscribe(self.broker.prefix + self.channel)
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            self.pubsub.unsubscribe()
+        finally:
+            self.pubsub.close()
+
+
+class RedisBroker:
+    """
+    Broker para servidores compatíveis com Redis (PUBLISH/SUBSCRIBE).
+
+    Os clientes podem ser injetados (fábricas sem argumentos) para usar um
+    servidor local substituto em testes.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        client=None,
+        async_client_factory=None,
+        prefix: str = "aprender_sistema:realtime:",
+    ):
+        if (client is None or async_client_factory is None) and redis is None:
+            raise ImproperlyConfigured(
+                "Pacote 'redis' não instalado para REALTIME_BROKER_URL"
+            )
+        self.prefix = prefix
+        self.client = client or redis.Redis.from_url(url)
+        self.async_client_factory = async_client_factory or (
+            lambda: redis_asyncio.Redis.from_url(url)
+        )
+
+    def publish(self, channel: str, message: dict) -> int:
+        return self.client.publish(
+            self.prefix + channel, json.dumps(message, default=str)
+        )
+
+    def subscribe(self, channel: str) -> RedisSubscription:
+        return RedisSubscription(self, channel)
+
+    def subscribe_sync(self, channel: str) -> RedisSyncSubscription:
+        return RedisSyncSubscription(self, channel)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Broker configurado para o processo (criado no primeiro uso)"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                url = getattr(settings, "REALTIME_BROKER_URL", None)
+                _broker = RedisBroker(url) if url else InMemoryBroker()
+    return _broker
+
+
+def set_broker(broker):
+    """Substitui o broker do processo (testes)"""
+    global _broker
+    _broker = broker
+
+
+def publish(channel: str, message: dict) -> int:
+    """
+    Publica sem propagar falhas do broker: quem publica são signals de
+    operações de negócio, que não devem falhar por causa do tempo real.
+    """
+    try:
+        return get_broker().publish(channel, message)
+    except Exception as e:
+        logger.error(f"Erro ao publicar no canal {channel}: {e}")
+        return 0
@@ -1,2 +1,5 @@
-# Importar signals do mapa
-from . import mapa_signals
+# Importar os módulos registra os receivers
+from . import mapa_disponibilidade_signals  # mapa de disponibilidade materializado
+from . import mapa_signals  # signals do mapa
+from . import notificacao_signals  # canal de notificações por usuário
+from . import papeis_signals  # cache de papéis dos usuários
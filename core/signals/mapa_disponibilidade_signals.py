@@ -0,0 +1,199 @@
+"""
+Signals que mantêm o mapa de disponibilidade materializado.
+
+Cada alteração recalcula somente as células (formador × dia) que ela toca,
+considerando o estado anterior (pre_save/pre_delete) e o novo. O recálculo
+roda após o commit da transação.
+"""
+
+from collections import defaultdict
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.models import (
+    Deslocamento,
+    DisponibilidadeFormadores,
+    Formador,
+    FormadoresSolicitacao,
+    Solicitacao,
+    SolicitacaoStatus,
+)
+from core.services.calendar_codes import PESSOA_FIELDS
+from core.services.mapa_materializado import recalcular_faixas
+
+
+def _formadores_dos_usuarios(usuario_ids):
+    return list(
+        Formador.objects.filter(usuario_id__in=usuario_ids).values_list("id", flat=True)
+    )
+
+
+def _dias_do_evento(solicitacao):
+    if not solicitacao.data_inicio or not solicitacao.data_fim:
+        return None
+    return (
+        timezone.localtime(solicitacao.data_inicio).date(),
+        timezone.localtime(solicitacao.data_fim).date(),
+    )
+
+
+def _celulas_solicitacao(solicitacao):
+    dias = _dias_do_evento(solicitacao)
+    if solicitacao.status != SolicitacaoStatus.APROVADO or not dias:
+        return []
+    usuarios = FormadoresSolicitacao.objects.filter(
+        solicitacao_id=solicitacao.pk
+    ).values("usuario_id")
+    return [(_formadores_dos_usuarios(usuarios), *dias)]
+
+
+def _celulas_vinculo(vinculo):
+    solicitacao = Solicitacao.objects.filter(pk=vinculo.solicitacao_id).first()
+    dias = solicitacao and _dias_do_evento(solicitacao)
+    if not dias or solicitacao.status != SolicitacaoStatus.APROVADO:
+        return []
+    return [(_formadores_dos_usuarios([vinculo.usuario_id]), *dias)]
+
+
+def _celulas_bloqueio(bloqueio):
+    return [
+        (
+            _formadores_dos_usuarios([bloqueio.usuario_id]),
+            bloqueio.data_bloqueio,
+            bloqueio.data_bloqueio,
+        )
+    ]
+
+
+def _celulas_deslocamento(deslocamento):
+    pessoas = [getattr(deslocamento, campo) for campo in PESSOA_FIELDS]
+    return [([p for p in pessoas if p], deslocamento.data, deslocamento.data)]
+
+
+CELULAS_POR_MODELO = {
+    Solicitacao: _celulas_solicitacao,
+    FormadoresSolicitacao: _celulas_vinculo,
+    DisponibilidadeFormadores: _celulas_bloqueio,
+    Deslocamento: _celulas_deslocamento,
+}
+
+
+def _agendar(celulas):
+    faixas = [(ids, inicio, fim) for ids, inicio, fim in celulas if ids]
+    if faixas:
+        transaction.on_commit(partial(recalcular_faixas, faixas))
+
+
+def recalcular_solicitacoes_em_lote(solicitacoes):
+    """
+    Agenda o recálculo das células de solicitações cujo status foi alterado
+    com queryset.update(), que não dispara pre_save/post_save. Usa duas
+    consultas para o lote inteiro.
+    """
+    dias_por_solicitacao = {
+        s.pk: _dias_do_evento(s)
+        for s in solicitacoes
+        if s.status == SolicitacaoStatus.APROVADO
+    }
+    dias_por_solicitacao = {pk: d for pk, d in dias_por_solicitacao.items() if d}
+    if not dias_por_solicitacao:
+        return
+
+    vinculos = list(
+        FormadoresSolicitacao.objects.filter(
+            solicitacao_id__in=list(dias_por_solicitacao)
+        ).values_list("solicitacao_id", "usuario_id")
+    )
+    formadores_por_usuario = defaultdict(list)
+    for formador_id, usuario_id in Formador.objects.filter(
+        usuario_id__in={usuario_id for _, usuario_id in vinculos}
+    ).values_list("id", "usuario_id"):
+        formadores_por_usuario[usuario_id].append(formador_id)
+
+    formadores_por_solicitacao = defaultdict(list)
+    for solicitacao_id, usuario_id in vinculos:
+        formadores_por_solicitacao[solicitacao_id].extend(
+            formadores_por_usuario[usuario_id]
+        )
+
+    _agendar(
+        [
+            (formadores_por_solicitacao[pk], *dias)
+            for pk, dias in dias_por_solicitacao.items()
+        ]
+    )
+
+
+def recalcular_bloqueios_em_lote(bloqueios):
+    """
+    Agenda o recálculo das células de bloqueios gravados com bulk_create ou
+    bulk_update, que não disparam pre_save/post_save. Usa uma consulta para
+    o lote inteiro; dias consecutivos do mesmo formador viram uma só faixa.
+    """
+    dias_por_usuario = defaultdict(set)
+    for bloqueio in bloqueios:
+        if bloqueio.usuario_id:
+            dias_por_usuario[bloqueio.usuario_id].add(bloqueio.data_bloqueio)
+    if not dias_por_usuario:
+        return
+
+    formadores_por_usuario = defaultdict(list)
+    for formador_id, usuario_id in Formador.objects.filter(
+        usuario_id__in=list(dias_por_usuario)
+    ).values_list("id", "usuario_id"):
+        formadores_por_usuario[usuario_id].append(formador_id)
+
+    celulas = []
+    for usuario_id, dias in dias_por_usuario.items():
+        dias = sorted(dias)
+        inicio = fim = dias[0]
+        for dia in dias[1:]:
+            if (dia - fim).days > 1:
+                celulas.append((formadores_por_usuario[usuario_id], inicio, fim))
+                inicio = dia
+            fim = dia
+        celulas.append((formadores_por_usuario[usuario_id], inicio, fim))
+    _agendar(celulas)
+
+
+def _guardar_estado_anterior(sender, instance, **kwargs):
+    """Guarda as células do registro como está no banco antes da alteração"""
+    if instance._state.adding:
+        instance._mapa_celulas_anteriores = []
+        return
+    anterior = sender.objects.filter(pk=instance.pk).first()
+    instance._mapa_celulas_anteriores = (
+        CELULAS_POR_MODELO[sender](anterior) if anterior else []
+    )
+
+
+def _recalcular_apos_salvar(sender, instance, **kwargs):
+    celulas = getattr(instance, "_mapa_celulas_anteriores", [])
+    _agendar(celulas + CELULAS_POR_MODELO[sender](instance))
+
+
+def _guardar_antes_de_remover(sender, instance, **kwargs):
+    instance._mapa_celulas_anteriores = CELULAS_POR_MODELO[sender](instance)
+
+
+def _recalcular_apos_remover(sender, instance, **kwargs):
+    _agendar(getattr(instance, "_mapa_celulas_anteriores", []))
+
+
+for _modelo in CELULAS_POR_MODELO:
+    receiver(
+        pre_save, sender=_modelo, dispatch_uid=f"mapa_pre_save_{_modelo.__name__}"
+    )(_guardar_estado_anterior)
+    receiver(
+        post_save, sender=_modelo, dispatch_uid=f"mapa_post_save_{_modelo.__name__}"
+    )(_recalcular_apos_salvar)
+    receiver(
+        pre_delete, sender=_modelo, dispatch_uid=f"mapa_pre_delete_{_modelo.__name__}"
+    )(_guardar_antes_de_remover)
+    receiver(
+        post_delete, sender=_modelo, dispatch_uid=f"mapa_post_delete_{_modelo.__name__}"
+    )(_recalcular_apos_remover)
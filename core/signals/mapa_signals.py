@@ -1,12 +1,71 @@
 """
 Signals para atualizações automáticas do mapa
 """
+from functools import partial
+
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.core.cache import cache
 from django.utils import timezone
 
 from core.models import Solicitacao, SolicitacaoStatus
+from core.services.realtime_broker import MAPA_CHANNEL, publish
+
+
+def _municipio_afetado(instance):
+    return {
+        'uf': instance.municipio.uf,
+        'municipio': instance.municipio.nome,
+        'projeto': instance.projeto.nome,
+        'data': instance.data_solicitacao.isoformat() if instance.data_solicitacao else None,
+    }
+
+
+def _publicar_atualizacao(instance, acao):
+    """
+    Publica a mudança no canal do mapa para as conexões SSE.
+    Enviado após o commit, quando os dados já estão visíveis.
+    """
+    municipio = instance.municipio
+    evento = {
+        'type': 'mapa_update',
+        'acao': acao,
+        'timestamp': timezone.now().isoformat(),
+        'estados_afetados': [municipio.uf],
+        'municipios_afetados': [_municipio_afetado(instance)],
+        'message': f'Projeto {acao} em {municipio.nome}/{municipio.uf}',
+    }
+    transaction.on_commit(partial(publish, MAPA_CHANNEL, evento))
+
+
+def publicar_atualizacao_em_lote(solicitacoes, acao='atualizado'):
+    """
+    Equivalente ao on_solicitacao_saved para alterações em lote feitas com
+    queryset.update(), que não disparam post_save: invalida o cache uma vez
+    e publica um único evento com todos os municípios afetados.
+    """
+    relevantes = [
+        s for s in solicitacoes
+        if s.status in [SolicitacaoStatus.APROVADO, SolicitacaoStatus.PRE_AGENDA]
+    ]
+    if not relevantes:
+        return
+
+    cache.delete('mapa_dados_brasil')
+    cache.delete('mapa_estatisticas')
+    cache.set('mapa_last_update', timezone.now().isoformat(), timeout=3600)
+
+    estados = sorted({s.municipio.uf for s in relevantes})
+    evento = {
+        'type': 'mapa_update',
+        'acao': acao,
+        'timestamp': timezone.now().isoformat(),
+        'estados_afetados': estados,
+        'municipios_afetados': [_municipio_afetado(s) for s in relevantes],
+        'message': f'{len(relevantes)} projetos {acao}s em {", ".join(estados)}',
+    }
+    transaction.on_commit(partial(publish, MAPA_CHANNEL, evento))
 
 
 @receiver(post_save, sender=Solicitacao)
@@ -25,6 +84,7 @@ def on_solicitacao_saved(sender, instance, created, **kwargs):
         
         # Marcar que houve mudança para o tempo real
         cache.set('mapa_last_update', timezone.now().isoformat(), timeout=3600)
+        _publicar_atualizacao(instance, 'adicionado' if created else 'atualizado')
         
         # Log da atualização
         print(f"🗺️ Mapa atualizado: Nova solicitação em {instance.municipio.nome}/{instance.municipio.uf}")
@@ -41,6 +101,7 @@ def on_solicitacao_deleted(sender, instance, **kwargs):
     
     # Marcar que houve mudança para o tempo real
     cache.set('mapa_last_update', timezone.now().isoformat(), timeout=3600)
+    _publicar_atualizacao(instance, 'removido')
     
     # Log da atualização
     print(f"🗺️ Mapa atualizado: Solicitação removida de {instance.municipio.nome}/{instance.municipio.uf}")
@@ -0,0 +1,29 @@
+"""
+Signals do canal de notificações por usuário
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import Notificacao
+from core.services import notification_counter
+from core.services.notification_push import publicar_notificacao
+
+
+@receiver(post_save, sender=Notificacao)
+def on_notificacao_criada(sender, instance, created, **kwargs):
+    """
+    Envia a nova notificação ao canal do destinatário e incrementa o
+    contador de não lidas.
+    Cobre todos os serviços que criam Notificacao via save()/create().
+    """
+    if created:
+        publicar_notificacao(instance)
+        if not instance.lida:
+            notification_counter.ajustar_apos_commit(instance.usuario_id, 1)
+
+
+@receiver(post_delete, sender=Notificacao)
+def on_notificacao_removida(sender, instance, **kwargs):
+    if not instance.lida:
+        notification_counter.ajustar_apos_commit(instance.usuario_id, -1)
@@ -0,0 +1,73 @@
+"""
+Signals que invalidam o cache de papéis dos usuários (core.services.papeis)
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import Setor
+from core.services import papeis
+
+
+@receiver(
+    m2m_changed,
+    sender=get_user_model().groups.through,
+    dispatch_uid="papeis_grupos_alterados",
+)
+def on_grupos_alterados(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        # Usuário alterado: a própria instância também é recarregada
+        instance.__dict__.pop("_papeis", None)
+        papeis.invalidar_usuario(instance.pk)
+    elif pk_set:
+        for usuario_id in pk_set:
+            papeis.invalidar_usuario(usuario_id)
+    else:
+        # group.user_set.clear(): não se sabe quem saiu
+        papeis.invalidar_todos()
+
+
+@receiver(
+    m2m_changed,
+    sender=get_user_model().user_permissions.through,
+    dispatch_uid="papeis_permissoes_usuario_alteradas",
+)
+def on_permissoes_usuario_alteradas(sender, **kwargs):
+    # Mesmo tratamento dos grupos: permissões diretas também entram no carimbo
+    on_grupos_alterados(sender, **kwargs)
+
+
+@receiver(
+    m2m_changed,
+    sender=Group.permissions.through,
+    dispatch_uid="papeis_permissoes_grupo_alteradas",
+)
+def on_permissoes_grupo_alteradas(sender, action, **kwargs):
+    # Afeta todos os membros do grupo (ou dos grupos, pelo lado da permissão)
+    if action in ("post_add", "post_remove", "post_clear"):
+        papeis.invalidar_todos()
+
+
+# Campos do usuário que mudam permissões ou papéis
+CAMPOS_PAPEIS = {"is_superuser", "is_staff", "is_active", "cargo", "setor"}
+
+
+@receiver(post_save, sender=get_user_model(), dispatch_uid="papeis_usuario_salvo")
+def on_usuario_salvo(sender, instance, created, update_fields, **kwargs):
+    if created:
+        return
+    # save(update_fields=["last_login"]) e afins não mexem nos papéis
+    if update_fields is not None and not CAMPOS_PAPEIS.intersection(update_fields):
+        return
+    instance.__dict__.pop("_papeis", None)
+    papeis.invalidar_usuario(instance.pk)
+
+
+@receiver(post_save, sender=Setor, dispatch_uid="papeis_setor_salvo")
+@receiver(post_delete, sender=Setor, dispatch_uid="papeis_setor_removido")
+def on_setor_alterado(sender, **kwargs):
+    papeis.invalidar_todos()
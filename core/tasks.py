@@ -242,3 +242,55 @@ def monitor_migration_progress():
     except Exception as exc:
         logger.error(f"Erro no monitoramento: {exc}")
         return {"status": "error", "message": str(exc)}
+
+
+@shared_task(queue="notifications")
+def notify_solicitacoes_approved_batch_task(solicitacao_ids, aprovador_id):
+    """
+    Task para notificar as aprovações de um lote (BulkApprovalAPI)
+    """
+    from core.services.notifications_simplified import (
+        notify_solicitacoes_approved_batch,
+    )
+
+    return notify_solicitacoes_approved_batch(solicitacao_ids, aprovador_id)
+
+
+@shared_task(queue="notifications")
+def notify_events_created_batch_task(solicitacao_ids, criador_id):
+    """
+    Task para notificar os eventos de uma criação em lote no Google Calendar
+    """
+    from core.services.notifications_simplified import notify_events_created_batch
+
+    return notify_events_created_batch(solicitacao_ids, criador_id)
+
+
+@shared_task(queue="notifications")
+def processar_operacoes_calendar_task():
+    """
+    Task para drenar a outbox de operações no Google Calendar
+    """
+    from core.services.integrations.calendar_outbox import processar_pendentes
+
+    return processar_pendentes()
+
+
+@shared_task(queue="notifications")
+def despachar_comunicacoes_task():
+    """
+    Task para drenar a fila de envio de e-mails e mensagens (LogComunicacao)
+    """
+    from core.services.notification_dispatch import processar_pendentes
+
+    return processar_pendentes()
+
+
+@shared_task
+def gravar_auditoria_task(registros):
+    """
+    Task para gravar em lote os registros de auditoria das requisições
+    """
+    from core.services.audit_sink import gravar_registros
+
+    return gravar_registros(registros)
@@ -0,0 +1,278 @@
+"""
+Servidor HTTP local que imita a API REST do Google Calendar (v3).
+
+Usado nos testes da integração no lugar de www.googleapis.com. O cliente
+FakeCalendarClient expõe a mesma interface encadeada do googleapiclient
+(service.events().insert(...).execute()), falando HTTP com o servidor.
+"""
+
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.parse import parse_qs, quote, unquote, urlencode, urlparse
+from urllib.request import Request, urlopen
+
+
+class FakeCalendarServer:
+    """
+    Args:
+        latency: atraso (s) de cada resposta, para observar concorrência
+        fail_marker: eventos cujo summary contém o marcador recebem HTTP 400
+    """
+
+    def __init__(self, latency: float = 0.0, fail_marker: str = "FALHA"):
+        self.latency = latency
+        self.fail_marker = fail_marker
+        self.events = {}
+        self.versions = {}
+        self.requests = 0
+        self.list_requests = 0
+        self.operations = []
+        self.token_generation = 0
+        self._seq = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address
+        return f"http://{host}:{port}/calendar/v3"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def client(self) -> "FakeCalendarClient":
+        return FakeCalendarClient(self.base_url)
+
+    def _insert(self, calendar_id, body):
+        if self.fail_marker and self.fail_marker in body.get("summary", ""):
+            return 400, {"error": {"code": 400, "message": "Invalid event"}}
+        event_id = uuid.uuid4().hex
+        event = dict(
+            body,
+            id=event_id,
+            status="confirmed",
+            htmlLink=f"https://calendar.test/event?eid={event_id}",
+        )
+        if "conferenceData" in body:
+            event["hangoutLink"] = f"https://meet.test/{event_id[:10]}"
+        self._store(calendar_id, event)
+        return 200, event
+
+    def _get(self, event_id):
+        if event_id not in self.events:
+            return 404, {"error": {"code": 404, "message": "Not Found"}}
+        return 200, self.events[event_id][1]
+
+    def _update(self, calendar_id, event_id, body):
+        if event_id not in self.events:
+            return 404, {"error": {"code": 404, "message": "Not Found"}}
+        if self.fail_marker and self.fail_marker in body.get("summary", ""):
+            return 400, {"error": {"code": 400, "message": "Invalid event"}}
+        event = dict(body, id=event_id)
+        self._store(calendar_id, event)
+        return 200, event
+
+    def _delete(self, event_id):
+        if event_id not in self.events:
+            return 404, {"error": {"code": 404, "message": "Not Found"}}
+        self.cancel_event(event_id)
+        return 204, None
+
+    def _store(self, calendar_id, event):
+        with self._lock:
+            self._seq += 1
+            self.events[event["id"]] = (calendar_id, event)
+            self.versions[event["id"]] = self._seq
+
+    def add_event(self, calendar_id, summary, start, end, **extra):
+        """Cria um evento diretamente no servidor (fora do sistema)"""
+        event_id = uuid.uuid4().hex
+        event = {
+            "id": event_id,
+            "status": "confirmed",
+            "summary": summary,
+            "start": {"dateTime": start.isoformat()},
+            "end": {"dateTime": end.isoformat()},
+            "htmlLink": f"https://calendar.test/event?eid={event_id}",
+            **extra,
+        }
+        self._store(calendar_id, event)
+        return event
+
+    def cancel_event(self, event_id):
+        calendar_id, event = self.events[event_id]
+        self._store(calendar_id, dict(event, status="cancelled"))
+
+    def expire_sync_tokens(self):
+        """Invalida os syncTokens emitidos até agora (API responde 410)"""
+        self.token_generation += 1
+
+    def _list(self, calendar_id, params):
+        with self._lock:
+            self.list_requests += 1
+            seq_atual = self._seq
+            eventos = [
+                (self.versions[eid], ev)
+                for eid, (cal, ev) in self.events.items()
+                if cal == calendar_id
+            ]
+
+        desde = 0
+        if "syncToken" in params:
+            _, geracao, desde = params["syncToken"].split("-")
+            desde = int(desde)
+            if int(geracao) != self.token_generation:
+                return 410, {
+                    "error": {"code": 410, "message": "Sync token is no longer valid"}
+                }
+        elif params.get("showDeleted") != "True":
+            eventos = [(v, ev) for v, ev in eventos if ev["status"] != "cancelled"]
+
+        eventos.sort(key=lambda par: par[1].get("start", {}).get("dateTime", ""))
+        itens = [ev for versao, ev in eventos if versao > desde]
+        inicio = int(params.get("pageToken", 0))
+        tamanho = int(params.get("maxResults", 250))
+        pagina = {"items": itens[inicio : inicio + tamanho]}
+        if inicio + tamanho < len(itens):
+            pagina["nextPageToken"] = str(inicio + tamanho)
+        else:
+            pagina["nextSyncToken"] = f"tok-{self.token_generation}-{seq_atual}"
+        return 200, pagina
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _responder(self, status, payload):
+                corpo = json.dumps(payload).encode() if payload is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def _partes(self):
+                # /calendar/v3/calendars/<id>/events[/<eventId>]
+                partes = urlparse(self.path).path.split("/")
+                event_id = unquote(partes[6]) if len(partes) > 6 else None
+                return unquote(partes[4]), event_id
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                calendar_id, event_id = self._partes()
+                if event_id:
+                    self._responder(*server._get(event_id))
+                    return
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                self._responder(*server._list(calendar_id, params))
+
+            def do_PUT(self):
+                calendar_id, event_id = self._partes()
+                server.operations.append(("update", event_id))
+                tamanho = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(tamanho) or b"{}")
+                self._responder(*server._update(calendar_id, event_id, body))
+
+            def do_DELETE(self):
+                _, event_id = self._partes()
+                server.operations.append(("delete", event_id))
+                self._responder(*server._delete(event_id))
+
+            def do_POST(self):
+                with server._lock:
+                    server.requests += 1
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    time.sleep(server.latency)
+                    partes = urlparse(self.path).path.split("/")
+                    # /calendar/v3/calendars/<id>/events
+                    calendar_id = unquote(partes[4])
+                    server.operations.append(("insert", None))
+                    tamanho = int(self.headers.get("Content-Length", 0))
+                    body = json.loads(self.rfile.read(tamanho) or b"{}")
+                    self._responder(*server._insert(calendar_id, body))
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+        return Handler
+
+
+class FakeCalendarClient:
+    """Subconjunto do recurso `calendar v3` do googleapiclient"""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+
+    def events(self):
+        return _EventsResource(self.base_url)
+
+
+class _HttpRequest:
+    def __init__(self, method, url, body=None):
+        self.method = method
+        self.url = url
+        self.body = body
+
+    def execute(self):
+        data = json.dumps(self.body).encode() if self.body is not None else None
+        request = Request(
+            self.url,
+            data=data,
+            method=self.method,
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urlopen(request, timeout=5) as response:
+                return json.loads(response.read() or b"{}")
+        except HTTPError as e:
+            # Mesmo formato textual do googleapiclient.errors.HttpError
+            raise RuntimeError(f"<HttpError {e.code} {e.read().decode()}>") from None
+
+
+class _EventsResource:
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+    def insert(self, calendarId, body, conferenceDataVersion=0, **kwargs):
+        url = (
+            f"{self.base_url}/calendars/{quote(calendarId, safe='')}/events"
+            f"?conferenceDataVersion={conferenceDataVersion}"
+        )
+        return _HttpRequest("POST", url, body)
+
+    def _url(self, calendarId, eventId):
+        return (
+            f"{self.base_url}/calendars/{quote(calendarId, safe='')}"
+            f"/events/{quote(eventId, safe='')}"
+        )
+
+    def get(self, calendarId, eventId):
+        return _HttpRequest("GET", self._url(calendarId, eventId))
+
+    def update(self, calendarId, eventId, body, **kwargs):
+        return _HttpRequest("PUT", self._url(calendarId, eventId), body)
+
+    def delete(self, calendarId, eventId):
+        return _HttpRequest("DELETE", self._url(calendarId, eventId))
+
+    def list(self, calendarId, **params):
+        query = urlencode({k: str(v) for k, v in params.items()})
+        url = f"{self.base_url}/calendars/{quote(calendarId, safe='')}/events?{query}"
+        return _HttpRequest("GET", url)
@@ -0,0 +1,87 @@
+"""
+Servidor SMTP local mínimo para os testes da fila de envio.
+
+Entende o suficiente do protocolo para o smtplib (EHLO/HELO, MAIL, RCPT,
+DATA, RSET, NOOP, QUIT), guarda as mensagens recebidas e conta as conexões
+abertas. Destinatários que contêm `fail_marker` são recusados com 550.
+"""
+
+import socketserver
+import threading
+
+
+class FakeSMTPServer:
+    def __init__(self, fail_marker: str = "falha"):
+        self.fail_marker = fail_marker
+        self.messages = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = socketserver.ThreadingTCPServer(
+            ("127.0.0.1", 0), self._handler()
+        )
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        servidor = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def responder(self, linha):
+                self.wfile.write(f"{linha}\r\n".encode())
+
+            def handle(self):
+                with servidor._lock:
+                    servidor.connections += 1
+                self.responder("220 fake-smtp")
+                destinatarios = []
+                while True:
+                    linha = self.rfile.readline()
+                    if not linha:
+                        return
+                    comando = linha.decode().strip()
+                    verbo = comando[:4].upper()
+                    if verbo in ("EHLO", "HELO"):
+                        self.responder("250 fake-smtp")
+                    elif verbo == "MAIL":
+                        destinatarios = []
+                        self.responder("250 OK")
+                    elif verbo == "RCPT":
+                        if servidor.fail_marker in comando:
+                            self.responder("550 Mailbox unavailable")
+                        else:
+                            destinatarios.append(comando[8:].strip("<>"))
+                            self.responder("250 OK")
+                    elif verbo == "DATA":
+                        self.responder("354 End data with <CR><LF>.<CR><LF>")
+                        corpo = []
+                        while True:
+                            linha = self.rfile.readline().decode()
+                            if linha.rstrip("\r\n") == ".":
+                                break
+                            corpo.append(linha)
+                        with servidor._lock:
+                            servidor.messages.append(
+                                {"to": destinatarios, "data": "".join(corpo)}
+                            )
+                        self.responder("250 OK")
+                    elif verbo in ("RSET", "NOOP"):
+                        self.responder("250 OK")
+                    elif verbo == "QUIT":
+                        self.responder("221 Bye")
+                        return
+                    else:
+                        self.responder("502 Command not implemented")
+
+        return Handler
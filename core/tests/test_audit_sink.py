@@ -0,0 +1,81 @@
+"""
+Testes da gravação em lote da auditoria das requisições
+"""
+
+import os
+import tempfile
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from core.middleware.security import AuditLogMiddleware
+from core.models import LogAuditoria
+from core.services import audit_sink
+
+Usuario = get_user_model()
+
+
+class AuditSinkTest(TestCase):
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user(username="auditado")
+        pasta = tempfile.TemporaryDirectory()
+        self.addCleanup(pasta.cleanup)
+        self.reserva = os.path.join(pasta.name, "auditoria.jsonl")
+        config = override_settings(
+            AUDIT_SINK_ARQUIVO_RESERVA=self.reserva,
+            AUDIT_SINK_INTERVALO=3600,
+            AUDIT_SINK_LOTE=1000,
+        )
+        config.enable()
+        self.addCleanup(config.disable)
+        self.addCleanup(audit_sink._buffer.clear)
+
+    def _requisicao(self, path):
+        request = RequestFactory().get(path)
+        request.user = self.usuario
+        middleware = AuditLogMiddleware(lambda r: HttpResponse("OK"))
+        return middleware(request)
+
+    def test_requisicao_nao_grava_e_lote_preserva_horario(self):
+        with self.assertNumQueries(0):
+            for path in ("/api/a/", "/controle/b/", "/aprovacoes/c/"):
+                self._requisicao(path)
+        depois = timezone.now() + timedelta(minutes=5)
+
+        with patch("django.utils.timezone.now", return_value=depois):
+            # Um INSERT (entre SAVEPOINT e RELEASE)
+            with self.assertNumQueries(3):
+                self.assertEqual(audit_sink.descarregar(imediato=True), 3)
+
+        self.assertEqual(
+            sorted(LogAuditoria.objects.values_list("acao", flat=True)),
+            ["GET /api/a/", "GET /aprovacoes/c/", "GET /controle/b/"],
+        )
+        self.assertFalse(LogAuditoria.objects.filter(data_hora__gte=depois).exists())
+        self.assertIn("'status_code': 200", LogAuditoria.objects.first().detalhes)
+
+    def test_banco_indisponivel_vai_para_a_reserva(self):
+        audit_sink.registrar(self.usuario.id, "GET /api/a/", {"ip": "1.2.3.4"})
+        with patch.object(
+            LogAuditoria.objects,
+            "bulk_create",
+            side_effect=OperationalError("fora do ar"),
+        ):
+            audit_sink.descarregar(imediato=True)
+
+        self.assertFalse(LogAuditoria.objects.exists())
+        self.assertTrue(os.path.exists(self.reserva))
+
+        audit_sink.registrar(self.usuario.id, "GET /api/b/", None)
+        audit_sink.descarregar(imediato=True)
+
+        self.assertEqual(
+            sorted(LogAuditoria.objects.values_list("acao", flat=True)),
+            ["GET /api/a/", "GET /api/b/"],
+        )
+        self.assertFalse(os.path.exists(self.reserva))
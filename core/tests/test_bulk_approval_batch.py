@@ -0,0 +1,138 @@
+"""
+Testes da aprovação em lote com operações em conjunto (BulkApprovalAPI).
+"""
+
+import json
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import (
+    Aprovacao,
+    LogAuditoria,
+    Municipio,
+    Notificacao,
+    Projeto,
+    Setor,
+    Solicitacao,
+    SolicitacaoStatus,
+    TipoEvento,
+)
+
+Usuario = get_user_model()
+
+
+@override_settings(BACKGROUND_JOBS_BACKEND="sync")
+class BulkApprovalBatchTest(TestCase):
+    def setUp(self):
+        self.superintendente = Usuario.objects.create_superuser(
+            username="super.lote", email="super@test.com", password="testpass123"
+        )
+        self.coordenador = Usuario.objects.create_user(username="coord.lote")
+        Group.objects.create(name="controle")
+
+        setor = Setor.objects.create(
+            nome="Superintendência", sigla="SUPER", vinculado_superintendencia=True
+        )
+        self.projeto = Projeto.objects.create(nome="Projeto Lote", setor=setor)
+        self.municipio = Municipio.objects.create(nome="Fortaleza", uf="CE")
+        self.tipo_evento = TipoEvento.objects.create(nome="Formação Lote")
+
+        self.url = reverse("core:bulk_approval_api")
+        self.client.force_login(self.superintendente)
+
+    def _criar_pendentes(self, n):
+        return [
+            Solicitacao.objects.create(
+                usuario_solicitante=self.coordenador,
+                projeto=self.projeto,
+                municipio=self.municipio,
+                tipo_evento=self.tipo_evento,
+                titulo_evento=f"Evento {i}",
+                data_inicio=timezone.now() + timedelta(days=i + 1),
+                data_fim=timezone.now() + timedelta(days=i + 1, hours=4),
+            )
+            for i in range(n)
+        ]
+
+    def _post(self, ids, acao="aprovar"):
+        return self.client.post(
+            self.url,
+            json.dumps({"solicitacao_ids": ids, "acao": acao, "justificativa": "ok"}),
+            content_type="application/json",
+        ).json()
+
+    def test_report_keeps_order_and_per_item_outcome(self):
+        a, b = self._criar_pendentes(2)
+        inexistente = str(uuid.uuid4())
+        ids = [str(a.id), "nao-e-uuid", inexistente, str(b.id), str(a.id)]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = self._post(ids)
+
+        self.assertEqual(result["processadas"], 3)
+        self.assertEqual(result["sucessos"], 2)
+        self.assertEqual(result["erros"], 2)
+        self.assertEqual(
+            [(d["solicitacao_id"], d["success"]) for d in result["detalhes"]],
+            [(str(a.id), True), (str(b.id), True), (str(a.id), False)],
+        )
+        self.assertEqual(
+            [e["solicitacao_id"] for e in result["erros_detalhes"]],
+            ["nao-e-uuid", inexistente],
+        )
+
+        for solicitacao in (a, b):
+            solicitacao.refresh_from_db()
+            self.assertEqual(solicitacao.status, SolicitacaoStatus.PRE_AGENDA)
+            self.assertEqual(solicitacao.usuario_aprovador, self.superintendente)
+        self.assertEqual(Aprovacao.objects.count(), 2)
+        self.assertEqual(
+            LogAuditoria.objects.filter(
+                acao="RF04: aprovar solicitação (lote)"
+            ).count(),
+            2,
+        )
+        self.assertTrue(
+            LogAuditoria.objects.filter(
+                acao="RF04: ERRO na aprovação em lote",
+                entidade_afetada_id=inexistente,
+            ).exists()
+        )
+
+    def test_notifications_run_after_commit(self):
+        (solicitacao,) = self._criar_pendentes(1)
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self._post([str(solicitacao.id)])
+        self.assertFalse(
+            Notificacao.objects.filter(tipo="solicitacao_aprovada").exists()
+        )
+
+        for callback in callbacks:
+            callback()
+        self.assertTrue(
+            Notificacao.objects.filter(
+                usuario=self.coordenador,
+                tipo="solicitacao_aprovada",
+                entidade_relacionada_id=solicitacao.id,
+            ).exists()
+        )
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        def consultas(n, acao):
+            ids = [str(s.id) for s in self._criar_pendentes(n)]
+            with CaptureQueriesContext(connection) as ctx:
+                result = self._post(ids, acao=acao)
+            self.assertEqual(result["sucessos"], n)
+            Solicitacao.objects.filter(pk__in=ids).delete()
+            return len(ctx.captured_queries)
+
+        self.assertEqual(consultas(2, "reprovar"), consultas(8, "reprovar"))
@@ -0,0 +1,220 @@
+"""
+Testes da criação concorrente de eventos no Google Calendar, contra um
+servidor local que imita a API.
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from core.models import (
+    EventoGoogleCalendar,
+    LogAuditoria,
+    Municipio,
+    Projeto,
+    Setor,
+    Solicitacao,
+    SolicitacaoStatus,
+    TipoEvento,
+)
+from core.services import google_calendar_automation
+from core.services.google_calendar_automation import GoogleCalendarManagementService
+from core.services.integrations.calendar_bulk import (
+    RateLimiter,
+    create_events_concurrently,
+)
+from core.services.integrations.google_calendar import GoogleCalendarService
+from core.tests.fake_google_calendar import FakeCalendarServer
+
+Usuario = get_user_model()
+
+
+class RateLimiterTest(SimpleTestCase):
+    def test_waits_when_bucket_is_empty(self):
+        agora = [0.0]
+        esperas = []
+
+        def sleep(segundos):
+            esperas.append(segundos)
+            agora[0] += segundos
+
+        limiter = RateLimiter(rate=2, burst=2, clock=lambda: agora[0], sleep=sleep)
+        for _ in range(4):
+            limiter.acquire()
+
+        # Duas fichas da rajada, depois uma a cada 0,5 s
+        self.assertEqual(esperas, [0.5, 0.5])
+
+
+@override_settings(
+    FEATURE_GOOGLE_SYNC=True,
+    BACKGROUND_JOBS_BACKEND="sync",
+    GOOGLE_CALENDAR_BULK_WORKERS=4,
+    GOOGLE_CALENDAR_RATE_LIMIT=1000,
+)
+class BulkCreateEventsTest(TestCase):
+    def setUp(self):
+        self.server = FakeCalendarServer(latency=0.05).start()
+        self.addCleanup(self.server.stop)
+
+        self.controle = Usuario.objects.create_user(username="controle.lote")
+        setor = Setor.objects.create(
+            nome="Vidas", sigla="VIDAS", vinculado_superintendencia=False
+        )
+        self.projeto = Projeto.objects.create(nome="Projeto Agenda", setor=setor)
+        self.municipio = Municipio.objects.create(nome="Sobral", uf="CE")
+        self.tipo_evento = TipoEvento.objects.create(nome="Encontro", online=False)
+
+        server = self.server
+
+        class Servico(GoogleCalendarManagementService):
+            def _calendar_service_factory(self):
+                service = GoogleCalendarService(calendar_id="agenda-teste")
+                service._service = server.client()
+                return service
+
+        self.service = Servico()
+
+    def _criar(self, titulo, status=SolicitacaoStatus.PRE_AGENDA):
+        solicitacao = Solicitacao.objects.create(
+            usuario_solicitante=self.controle,
+            projeto=self.projeto,
+            municipio=self.municipio,
+            tipo_evento=self.tipo_evento,
+            titulo_evento=titulo,
+            data_inicio=timezone.now() + timedelta(days=3),
+            data_fim=timezone.now() + timedelta(days=3, hours=2),
+        )
+        Solicitacao.objects.filter(pk=solicitacao.pk).update(status=status)
+        return solicitacao
+
+    def test_creates_pending_events_concurrently_and_persists_in_bulk(self):
+        pendentes = [self._criar(f"Evento {i}") for i in range(8)]
+        ja_criada = self._criar("Com evento")
+        EventoGoogleCalendar.objects.create(
+            solicitacao=ja_criada, usuario_criador=self.controle, provider_event_id="x"
+        )
+        self._criar("Aprovada", status=SolicitacaoStatus.APROVADO)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resultado = self.service.bulk_create_events_for_controle(self.controle)
+
+        self.assertTrue(resultado["success"])
+        self.assertEqual(resultado["processed"], 8)
+        self.assertEqual(resultado["successful"], 8)
+        self.assertEqual(self.server.requests, 8)
+        self.assertGreater(self.server.max_in_flight, 1)
+        self.assertLessEqual(self.server.max_in_flight, 4)
+
+        for solicitacao in pendentes:
+            solicitacao.refresh_from_db()
+            self.assertEqual(solicitacao.status, SolicitacaoStatus.APROVADO)
+            evento = solicitacao.evento_google
+            calendario, remoto = self.server.events[evento.provider_event_id]
+            self.assertEqual(calendario, "agenda-teste")
+            self.assertEqual(evento.meet_link, remoto["hangoutLink"])
+            self.assertEqual(evento.usuario_criador, self.controle)
+
+        # Segunda execução: nada pendente
+        resultado = self.service.bulk_create_events_for_controle(self.controle)
+        self.assertEqual(resultado["action"], "no_events_to_create")
+
+    def test_failed_items_are_reported_without_blocking_the_batch(self):
+        ok = self._criar("Evento válido")
+        falha = self._criar("Evento FALHA")
+
+        resultado = self.service.bulk_create_events_for_controle(self.controle)
+
+        self.assertFalse(resultado["success"])
+        self.assertEqual((resultado["successful"], resultado["failed"]), (1, 1))
+        por_id = {r["solicitacao_id"]: r for r in resultado["results"]}
+        self.assertTrue(por_id[str(ok.id)]["success"])
+        self.assertFalse(por_id[str(falha.id)]["success"])
+        self.assertIn("400", por_id[str(falha.id)]["message"])
+
+        falha.refresh_from_db()
+        self.assertEqual(falha.status, SolicitacaoStatus.PRE_AGENDA)
+        self.assertFalse(
+            EventoGoogleCalendar.objects.filter(solicitacao=falha).exists()
+        )
+        self.assertTrue(
+            LogAuditoria.objects.filter(
+                acao="RF05: ERRO criação manual", entidade_afetada_id=falha.id
+            ).exists()
+        )
+
+    def test_concurrent_run_skips_reserved_solicitacoes(self):
+        pendentes = [self._criar(f"Evento {i}") for i in range(3)]
+        concorrentes = []
+
+        def criar_e_concorrer(*args, **kwargs):
+            # Outra execução começa enquanto esta chama a API
+            concorrentes.append(
+                self.service.bulk_create_events_for_controle(self.controle)
+            )
+            return create_events_concurrently(*args, **kwargs)
+
+        with patch.object(
+            google_calendar_automation,
+            "create_events_concurrently",
+            side_effect=criar_e_concorrer,
+        ):
+            resultado = self.service.bulk_create_events_for_controle(self.controle)
+
+        self.assertEqual(concorrentes[0]["action"], "no_events_to_create")
+        self.assertEqual(resultado["successful"], 3)
+        self.assertEqual(self.server.requests, 3)
+        self.assertEqual(
+            EventoGoogleCalendar.objects.filter(
+                solicitacao__in=pendentes,
+                status_sincronizacao=EventoGoogleCalendar.SincronizacaoStatus.OK,
+            ).count(),
+            3,
+        )
+
+    def test_reservations_released_when_batch_aborts(self):
+        pendente = self._criar("Evento")
+
+        with patch.object(
+            google_calendar_automation,
+            "create_events_concurrently",
+            side_effect=RuntimeError("worker encerrado"),
+        ):
+            with self.assertRaises(RuntimeError):
+                self.service.bulk_create_events_for_controle(self.controle)
+
+        self.assertFalse(
+            EventoGoogleCalendar.objects.filter(solicitacao=pendente).exists()
+        )
+        resultado = self.service.bulk_create_events_for_controle(self.controle)
+        self.assertEqual(resultado["successful"], 1)
+
+    @override_settings(GOOGLE_CALENDAR_RESERVA_TIMEOUT=600)
+    def test_stale_reservation_is_pending_again(self):
+        abandonada = self._criar("Processo morto")
+        recente = self._criar("Lote em andamento")
+        manual = self._criar("Na outbox", status=SolicitacaoStatus.APROVADO)
+        for solicitacao in (abandonada, recente, manual):
+            EventoGoogleCalendar.objects.create(
+                solicitacao=solicitacao,
+                usuario_criador=self.controle,
+                provider_event_id="",
+                status_sincronizacao=EventoGoogleCalendar.SincronizacaoStatus.PENDENTE,
+            )
+        EventoGoogleCalendar.objects.filter(
+            solicitacao__in=[abandonada, manual]
+        ).update(data_criacao=timezone.now() - timedelta(hours=1))
+
+        resultado = self.service.bulk_create_events_for_controle(self.controle)
+
+        self.assertEqual(resultado["processed"], 1)
+        self.assertEqual(resultado["results"][0]["solicitacao_id"], str(abandonada.id))
+        self.assertEqual(
+            EventoGoogleCalendar.objects.get(solicitacao=recente).provider_event_id, ""
+        )
+        self.assertTrue(
+            EventoGoogleCalendar.objects.filter(solicitacao=manual).exists()
+        )
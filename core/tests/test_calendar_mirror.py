@@ -0,0 +1,109 @@
+"""
+Testes do espelho local do Google Calendar (sincronização incremental),
+contra um servidor local que imita a API.
+"""
+
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import EventoCalendarioEspelho, SincronizacaoCalendario
+from core.services.google_apis_integration import AdvancedCalendarService
+from core.services.integrations.calendar_mirror import (
+    eventos_no_intervalo,
+    sincronizar,
+)
+from core.services.integrations.google_calendar import GoogleCalendarService
+from core.tests.fake_google_calendar import FakeCalendarServer
+
+CALENDARIO = "formacoes@group.calendar.google.com"
+
+
+@override_settings(FEATURE_GOOGLE_SYNC=True)
+class CalendarMirrorTest(TestCase):
+    def setUp(self):
+        self.server = FakeCalendarServer().start()
+        self.addCleanup(self.server.stop)
+        self.base = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        self.eventos = [
+            self.server.add_event(
+                CALENDARIO,
+                f"Formação {i}",
+                self.base + timedelta(hours=i),
+                self.base + timedelta(hours=i, minutes=50),
+            )
+            for i in range(5)
+        ]
+
+    def _service(self, page_size=2):
+        service = GoogleCalendarService(calendar_id=CALENDARIO)
+        service._service = self.server.client()
+        service.PAGE_SIZE = page_size
+        return service
+
+    def test_full_then_incremental_sync(self):
+        resultado = sincronizar(service=self._service())
+
+        self.assertFalse(resultado["incremental"])
+        self.assertEqual(resultado["paginas"], 3)
+        self.assertEqual(EventoCalendarioEspelho.objects.count(), 5)
+
+        # Sem mudanças: uma requisição, nenhum evento
+        resultado = sincronizar(service=self._service())
+        self.assertTrue(resultado["incremental"])
+        self.assertEqual((resultado["paginas"], resultado["eventos"]), (1, 0))
+
+        novo = self.server.add_event(
+            CALENDARIO,
+            "Nova",
+            self.base + timedelta(days=2),
+            self.base + timedelta(days=2, hours=1),
+        )
+        self.server.cancel_event(self.eventos[0]["id"])
+        resultado = sincronizar(service=self._service())
+
+        self.assertTrue(resultado["incremental"])
+        self.assertEqual(resultado["eventos"], 2)
+        self.assertTrue(
+            EventoCalendarioEspelho.objects.filter(event_id=novo["id"]).exists()
+        )
+        ativos = eventos_no_intervalo(
+            self.base, self.base + timedelta(hours=1), [CALENDARIO]
+        )
+        self.assertEqual(list(ativos), [])
+
+    def test_expired_sync_token_falls_back_to_full_sync(self):
+        sincronizar(service=self._service())
+        self.server.expire_sync_tokens()
+
+        resultado = sincronizar(service=self._service())
+
+        self.assertFalse(resultado["incremental"])
+        self.assertEqual(EventoCalendarioEspelho.objects.count(), 5)
+        estado = SincronizacaoCalendario.objects.get(calendar_id=CALENDARIO)
+        self.assertTrue(estado.sync_token)
+
+    def test_list_events_follows_every_page(self):
+        service = self._service()
+
+        self.assertEqual(len(service.list_events(max_results=None)), 5)
+        self.assertEqual(len(service.list_events(max_results=3)), 3)
+
+    def test_conflicts_are_answered_from_the_mirror(self):
+        calendar = AdvancedCalendarService()
+        calendar.calendar_service = self.server.client()
+
+        conflitos = calendar.get_calendar_conflicts(
+            self.base + timedelta(minutes=30),
+            self.base + timedelta(hours=1, minutes=10),
+            [CALENDARIO],
+        )
+        self.assertEqual([c["title"] for c in conflitos], ["Formação 0", "Formação 1"])
+
+        requisicoes = self.server.list_requests
+        calendar.get_calendar_conflicts(
+            self.base, self.base + timedelta(hours=3), [CALENDARIO]
+        )
+        # Espelho recente: nenhuma ida à API
+        self.assertEqual(self.server.list_requests, requisicoes)
@@ -0,0 +1,246 @@
+"""
+Testes da outbox de operações no Google Calendar, contra um servidor local
+que imita a API.
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import (
+    EventoGoogleCalendar,
+    LogAuditoria,
+    Municipio,
+    OperacaoCalendario,
+    Projeto,
+    Setor,
+    Solicitacao,
+    SolicitacaoStatus,
+    TipoEvento,
+)
+from core.services.google_calendar_automation import GoogleCalendarManagementService
+from core.services.integrations.calendar_outbox import _executar, processar_pendentes
+from core.services.integrations.google_calendar import GoogleCalendarService
+from core.tests.fake_google_calendar import FakeCalendarServer
+
+Usuario = get_user_model()
+
+Sincronizacao = EventoGoogleCalendar.SincronizacaoStatus
+
+
+@override_settings(FEATURE_GOOGLE_SYNC=True, BACKGROUND_JOBS_BACKEND="sync")
+class CalendarOutboxTest(TestCase):
+    def setUp(self):
+        self.server = FakeCalendarServer().start()
+        self.addCleanup(self.server.stop)
+
+        self.controle = Usuario.objects.create_user(username="controle.outbox")
+        setor = Setor.objects.create(
+            nome="Vidas", sigla="VIDAS", vinculado_superintendencia=False
+        )
+        self.projeto = Projeto.objects.create(nome="Projeto Agenda", setor=setor)
+        self.municipio = Municipio.objects.create(nome="Sobral", uf="CE")
+        self.tipo_evento = TipoEvento.objects.create(nome="Encontro", online=False)
+        self.service = GoogleCalendarManagementService()
+
+    def _criar(self, titulo="Formação"):
+        solicitacao = Solicitacao.objects.create(
+            usuario_solicitante=self.controle,
+            projeto=self.projeto,
+            municipio=self.municipio,
+            tipo_evento=self.tipo_evento,
+            titulo_evento=titulo,
+            data_inicio=timezone.now() + timedelta(days=3),
+            data_fim=timezone.now() + timedelta(days=3, hours=2),
+        )
+        Solicitacao.objects.filter(pk=solicitacao.pk).update(
+            status=SolicitacaoStatus.PRE_AGENDA
+        )
+        solicitacao.refresh_from_db()
+        return solicitacao
+
+    def _calendar(self):
+        calendar = GoogleCalendarService(calendar_id="agenda-teste")
+        calendar._service = self.server.client()
+        return calendar
+
+    def _drenar(self):
+        return processar_pendentes(service=self._calendar())
+
+    def test_criacao_responde_sem_chamar_a_api(self):
+        solicitacao = self._criar()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            resultado = self.service.create_event_for_controle(
+                solicitacao, self.controle
+            )
+
+        self.assertEqual(resultado["action"], "queued")
+        self.assertTrue(callbacks)
+        self.assertEqual(self.server.operations, [])
+        evento = EventoGoogleCalendar.objects.get(solicitacao=solicitacao)
+        self.assertEqual(evento.status_sincronizacao, Sincronizacao.PENDENTE)
+        solicitacao.refresh_from_db()
+        self.assertEqual(solicitacao.status, SolicitacaoStatus.APROVADO)
+
+        resumo = self._drenar()
+
+        self.assertEqual(resumo, {"operacoes": 1, "chamadas": 1, "erros": 0})
+        evento.refresh_from_db()
+        self.assertEqual(evento.status_sincronizacao, Sincronizacao.OK)
+        calendario, remoto = self.server.events[evento.provider_event_id]
+        self.assertEqual(calendario, "agenda-teste")
+        self.assertEqual(evento.html_link, remoto["htmlLink"])
+
+    def test_atualizacoes_pendentes_viram_uma_chamada(self):
+        solicitacao = self._criar()
+        self.service.create_event_for_controle(solicitacao, self.controle)
+        # Atualizações antes da criação ser enviada entram na própria criação
+        self.service.update_calendar_event(solicitacao, self.controle)
+        self._drenar()
+        self.assertEqual(self.server.operations, [("insert", None)])
+
+        for titulo in ("Formação A", "Formação B", "Formação C"):
+            Solicitacao.objects.filter(pk=solicitacao.pk).update(titulo_evento=titulo)
+            solicitacao.refresh_from_db()
+            self.service.update_calendar_event(solicitacao, self.controle)
+
+        self.assertEqual(
+            OperacaoCalendario.objects.filter(
+                tipo=OperacaoCalendario.Tipo.ATUALIZAR
+            ).count(),
+            1,
+        )
+        self._drenar()
+
+        evento = EventoGoogleCalendar.objects.get(solicitacao=solicitacao)
+        self.assertEqual(
+            self.server.operations[1:], [("update", evento.provider_event_id)]
+        )
+        _, remoto = self.server.events[evento.provider_event_id]
+        self.assertIn("Formação C", remoto["summary"])
+        self.assertEqual(evento.status_sincronizacao, Sincronizacao.OK)
+
+    def test_atualizar_e_remover_viram_so_remocao(self):
+        solicitacao = self._criar()
+        self.service.create_event_for_controle(solicitacao, self.controle)
+        self._drenar()
+        evento = EventoGoogleCalendar.objects.get(solicitacao=solicitacao)
+
+        self.service.update_calendar_event(solicitacao, self.controle)
+        self.service.delete_calendar_event(solicitacao, self.controle)
+        self._drenar()
+
+        self.assertEqual(
+            self.server.operations[1:], [("delete", evento.provider_event_id)]
+        )
+        self.assertFalse(EventoGoogleCalendar.objects.filter(pk=evento.pk).exists())
+        self.assertEqual(
+            set(OperacaoCalendario.objects.values_list("status", flat=True)),
+            {OperacaoCalendario.Status.CONCLUIDA, OperacaoCalendario.Status.AGRUPADA},
+        )
+
+    def test_criar_e_remover_antes_do_envio_nao_chama_a_api(self):
+        solicitacao = self._criar()
+        self.service.create_event_for_controle(solicitacao, self.controle)
+        self.service.delete_calendar_event(solicitacao, self.controle)
+
+        resumo = self._drenar()
+
+        self.assertEqual(resumo["chamadas"], 0)
+        self.assertEqual(self.server.operations, [])
+        self.assertFalse(
+            EventoGoogleCalendar.objects.filter(solicitacao=solicitacao).exists()
+        )
+
+    @override_settings(GOOGLE_CALENDAR_OUTBOX_MAX_TENTATIVAS=2)
+    def test_falha_volta_para_a_fila_com_backoff(self):
+        solicitacao = self._criar("Evento FALHA")
+        self.service.create_event_for_controle(solicitacao, self.controle)
+
+        resumo = self._drenar()
+
+        self.assertEqual(resumo["erros"], 1)
+        operacao = OperacaoCalendario.objects.get()
+        self.assertEqual(operacao.status, OperacaoCalendario.Status.PENDENTE)
+        self.assertEqual(operacao.tentativas, 1)
+        self.assertGreater(operacao.proxima_tentativa, timezone.now())
+        evento = EventoGoogleCalendar.objects.get(solicitacao=solicitacao)
+        self.assertEqual(evento.status_sincronizacao, Sincronizacao.PENDENTE)
+        self.assertIn("400", evento.mensagem_erro)
+
+        # Ainda no backoff: nada a fazer
+        self.assertEqual(self._drenar()["operacoes"], 0)
+
+        OperacaoCalendario.objects.update(proxima_tentativa=timezone.now())
+        self._drenar()
+
+        operacao.refresh_from_db()
+        evento.refresh_from_db()
+        self.assertEqual(operacao.status, OperacaoCalendario.Status.ERRO)
+        self.assertEqual(evento.status_sincronizacao, Sincronizacao.ERRO)
+
+    def test_remocao_registrada_durante_a_criacao(self):
+        solicitacao = self._criar()
+        self.service.create_event_for_controle(solicitacao, self.controle)
+        criar = OperacaoCalendario.objects.get()
+        # Outro worker reservou a criação e ainda não terminou
+        OperacaoCalendario.objects.filter(pk=criar.pk).update(
+            status=OperacaoCalendario.Status.PROCESSANDO,
+            proxima_tentativa=timezone.now() + timedelta(hours=1),
+        )
+        self.service.delete_calendar_event(solicitacao, self.controle)
+        remover = OperacaoCalendario.objects.get(tipo=OperacaoCalendario.Tipo.REMOVER)
+        self.assertEqual(remover.provider_event_id, "")
+
+        # Sem o id do evento, a remoção espera a criação
+        self._drenar()
+        self.assertEqual(self.server.operations, [])
+        remover.refresh_from_db()
+        self.assertEqual(remover.status, OperacaoCalendario.Status.PENDENTE)
+        self.assertEqual(remover.tentativas, 0)
+
+        criar.refresh_from_db()
+        self.assertTrue(
+            _executar(self._calendar(), OperacaoCalendario.Tipo.CRIAR, [criar])
+        )
+        evento = EventoGoogleCalendar.objects.get(solicitacao=solicitacao)
+        remover.refresh_from_db()
+        self.assertEqual(remover.provider_event_id, evento.provider_event_id)
+
+        OperacaoCalendario.objects.filter(pk=remover.pk).update(
+            proxima_tentativa=timezone.now()
+        )
+        self._drenar()
+
+        self.assertEqual(
+            self.server.operations,
+            [("insert", None), ("delete", evento.provider_event_id)],
+        )
+        self.assertFalse(EventoGoogleCalendar.objects.filter(pk=evento.pk).exists())
+
+    def test_remocao_sobrevive_a_solicitacao_apagada(self):
+        solicitacao = self._criar("Formação Cancelada")
+        self.service.create_event_for_controle(solicitacao, self.controle)
+        self._drenar()
+        evento = EventoGoogleCalendar.objects.get(solicitacao=solicitacao)
+
+        self.service.delete_calendar_event(solicitacao, self.controle)
+        solicitacao_id = solicitacao.pk
+        solicitacao.delete()
+
+        remover = OperacaoCalendario.objects.get(tipo=OperacaoCalendario.Tipo.REMOVER)
+        self.assertIsNone(remover.solicitacao_id)
+        self.assertEqual(remover.solicitacao_ref, solicitacao_id)
+
+        resumo = self._drenar()
+
+        self.assertEqual(resumo["erros"], 0)
+        self.assertEqual(
+            self.server.operations[1:], [("delete", evento.provider_event_id)]
+        )
+        log = LogAuditoria.objects.get(acao="RF05: Deletar evento Google Calendar")
+        self.assertEqual(log.entidade_afetada_id, solicitacao_id)
+        self.assertIn("Formação Cancelada", log.detalhes)
@@ -0,0 +1,148 @@
+"""
+Testes do índice de intervalos usado pelas regras de conflito (RD-01..RD-05).
+Usa AgendaIndex montado em memória, sem acesso ao banco.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+
+from core.models import DisponibilidadeFormadores, Formador, Municipio, Solicitacao
+from core.services.conflicts import (
+    AgendaIndex,
+    IntervalIndex,
+    check_conflicts,
+    check_daily_capacity_conflict,
+    check_travel_buffer_conflict,
+)
+
+
+class IntervalIndexTest(SimpleTestCase):
+    def setUp(self):
+        base = timezone.make_aware(datetime(2025, 3, 10, 8, 0))
+        self.base = base
+        self.index = IntervalIndex(
+            [
+                (base, base + timedelta(hours=2), "a"),
+                (base + timedelta(hours=3), base + timedelta(hours=4), "b"),
+                (base + timedelta(hours=1), base + timedelta(hours=9), "longo"),
+            ]
+        )
+
+    def _h(self, horas):
+        return self.base + timedelta(hours=horas)
+
+    def test_overlapping_uses_half_open_intervals(self):
+        h = self._h
+
+        self.assertEqual(sorted(self.index.overlapping(h(2), h(3))), ["longo"])
+        self.assertEqual(
+            sorted(self.index.overlapping(h(1.5), h(3.5))), ["a", "b", "longo"]
+        )
+        self.assertEqual(self.index.overlapping(h(9), h(10)), [])
+        self.assertEqual(self.index.overlapping(h(-2), h(0)), [])
+
+    def test_starting_between_is_inclusive(self):
+        h = self._h
+
+        self.assertEqual(self.index.starting_between(h(1), h(3)), ["longo", "b"])
+
+
+@override_settings(TRAVEL_BUFFER_MINUTES=90, MAX_DAILY_HOURS=8)
+class AgendaIndexRulesTest(SimpleTestCase):
+    def setUp(self):
+        self.fortaleza = Municipio(nome="Fortaleza", uf="CE")
+        self.caucaia = Municipio(nome="Caucaia", uf="CE")
+        self.formador = Formador(nome="Formador Índice")
+        self.outro = Formador(nome="Outro Formador")
+        self.dia = datetime(2025, 3, 10).date()
+        self.index = AgendaIndex()
+
+    def _at(self, hora, minuto=0):
+        return timezone.make_aware(datetime.combine(self.dia, time(hora, minuto)))
+
+    def _evento(self, formador, inicio, fim, municipio, titulo):
+        evento = Solicitacao(
+            titulo_evento=titulo,
+            data_inicio=inicio,
+            data_fim=fim,
+            municipio=municipio,
+            status="Aprovado",
+        )
+        self.index.add_event(formador.id, evento)
+        return evento
+
+    def test_travel_buffer_uses_nearest_events(self):
+        anterior = self._evento(
+            self.formador, self._at(7), self._at(9, 30), self.caucaia, "Anterior"
+        )
+        self._evento(self.formador, self._at(14), self._at(15), self.caucaia, "Longe")
+        self._evento(
+            self.formador, self._at(12, 30), self._at(13), self.fortaleza, "Mesmo lugar"
+        )
+
+        conflitos = check_travel_buffer_conflict(
+            self.formador, self.fortaleza, self._at(10), self._at(12), index=self.index
+        )
+
+        self.assertEqual([c["solicitacao"] for c in conflitos], [anterior])
+        self.assertEqual(conflitos[0]["gap_minutes"], 30)
+
+    def test_daily_capacity_sums_events_of_the_day(self):
+        self._evento(self.formador, self._at(7), self._at(12), self.fortaleza, "Manhã")
+        self._evento(
+            self.formador,
+            self._at(23),
+            self._at(23) + timedelta(hours=3),
+            self.fortaleza,
+            "Madrugada",
+        )
+
+        conflito = check_daily_capacity_conflict(
+            self.formador, self._at(14), self._at(17), index=self.index
+        )
+
+        self.assertIsNotNone(conflito)
+        self.assertEqual(conflito["horas_ocupadas"], 8)
+        self.assertEqual(conflito["total_com_novo"], 11)
+        self.assertEqual(len(conflito["eventos_do_dia"]), 2)
+
+    def test_daily_capacity_ignores_event_being_edited(self):
+        self._evento(
+            self.formador, self._at(8), self._at(16), self.fortaleza, "Própria"
+        )
+
+        conflito = check_daily_capacity_conflict(
+            self.formador, self._at(8), self._at(16), index=self.index
+        )
+
+        self.assertIsNone(conflito)
+
+    def test_check_conflicts_what_if_without_database(self):
+        compartilhado = self._evento(
+            self.formador, self._at(9), self._at(11), self.fortaleza, "Compartilhado"
+        )
+        self.index.add_event(self.outro.id, compartilhado)
+        self.index.add_block(
+            self.outro.id,
+            DisponibilidadeFormadores(
+                data_bloqueio=self.dia,
+                hora_inicio=time(13),
+                hora_fim=time(14),
+                tipo_bloqueio="P",
+            ),
+        )
+
+        conflitos = check_conflicts(
+            [self.formador, self.outro],
+            self._at(10),
+            self._at(13, 30),
+            self.fortaleza,
+            index=self.index,
+        )
+
+        self.assertEqual(len(conflitos["bloqueios"]), 1)
+        self.assertEqual(conflitos["solicitacoes"], [compartilhado])
+        self.assertEqual(conflitos["deslocamentos"], [])
+        self.assertEqual(conflitos["capacidade_diaria"], [])
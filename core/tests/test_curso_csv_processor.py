@@ -0,0 +1,160 @@
+"""
+Testes da importação de cursos da plataforma via CSV
+"""
+
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase
+
+from core.models import CursoPlataforma, ImportacaoCursosCSV, Projeto, ProjetoCursoLink
+from core.services.curso_csv_processor import (
+    AutomatoPalavras,
+    CursoCSVProcessor,
+    limpar_linha,
+)
+
+CSV = (
+    "ID;Categoria;Nome breve;Nome completo\n"
+    "\n"
+    "10;2025 Acerta;ACERTA LP - Leitura;Acerta Leitura\n"
+    "11;2025 Outros;A COR DA GENTE;A Cor da Gente\n"
+    "12;2024 Vidas;VIDAS - Ciencias;Vidas Ciencias\n"
+    "13;;Curso sem projeto;Curso sem projeto\n"
+)
+
+
+class LimpezaEAutomatoTest(SimpleTestCase):
+    def test_limpar_linha(self):
+        self.assertEqual(
+            limpar_linha('" I D ";" N o m e   b r e v e "\n'), '"ID";"Nome breve"'
+        )
+        self.assertEqual(limpar_linha("1\x00;\x00A\x00"), "1;A")
+        self.assertEqual(limpar_linha('"A B";C'), '"A B";C')
+
+    def test_campo_entre_aspas_com_quebra_de_linha(self):
+        processor = CursoCSVProcessor()
+        conteudo = 'ID;Nome breve\n1;"C u r s o\n\nn o v o" ; " A B "\n2;B\n'
+
+        linhas = list(processor._linhas_limpas(conteudo.splitlines(keepends=True)))
+
+        # As aspas são pareadas no registro inteiro, não por linha física
+        self.assertEqual(
+            linhas, ["ID;Nome breve\n", '1;"Curso\n\nnovo" ; "AB"\n', "2;B\n"]
+        )
+        self.assertEqual(
+            processor._detect_and_clean_encoding(conteudo),
+            'ID;Nome breve\n1;"Curso\n\nnovo" ; "AB"\n2;B',
+        )
+
+    def test_automato_encontra_sobrepostas(self):
+        automato = AutomatoPalavras(
+            ["COR", "COR DA GENTE", "TEMA", "MATEMATICA", "PRE"]
+        )
+        self.assertEqual(
+            automato.encontrar("A COR DA GENTE EM MATEMATICA"),
+            {"COR", "COR DA GENTE", "TEMA", "MATEMATICA"},
+        )
+        self.assertEqual(automato.encontrar("APRENDENDO"), {"PRE"})
+        self.assertEqual(automato.encontrar(""), set())
+
+
+class CursoCSVProcessorTest(TestCase):
+    def setUp(self):
+        for nome in ("ACerta", "Vidas", "Outros"):
+            Projeto.objects.create(nome=nome)
+
+    def test_arquivo_em_lotes_com_vinculos(self):
+        arquivo = SimpleUploadedFile("cursos.csv", CSV.encode("latin1"))
+
+        resultado = CursoCSVProcessor(chunk_size=2).process_csv_file(
+            arquivo, ano_filter=2025
+        )
+
+        self.assertEqual(resultado["errors"], [])
+        self.assertEqual(
+            (resultado["cursos_criados"], resultado["cursos_atualizados"]), (3, 0)
+        )
+        self.assertEqual(resultado["vinculos_criados"], 2)
+        self.assertFalse(arquivo.closed)
+        self.assertEqual(
+            dict(
+                ProjetoCursoLink.objects.values_list(
+                    "curso_plataforma__id_curso", "projeto__nome"
+                )
+            ),
+            {"10": "ACerta", "11": "Outros"},
+        )
+        self.assertEqual(
+            CursoPlataforma.objects.get(id_curso="10").nome_limpo, "Leitura"
+        )
+
+        importacao = ImportacaoCursosCSV.objects.get(pk=resultado["importacao_id"])
+        self.assertEqual(importacao.arquivo_nome, "cursos.csv")
+        self.assertEqual(importacao.status, "CONCLUIDA")
+        self.assertEqual(
+            (
+                importacao.total_linhas,
+                importacao.cursos_importados,
+                importacao.vinculos_criados,
+            ),
+            (4, 3, 2),
+        )
+
+    def test_reimportacao_atualiza_sem_duplicar(self):
+        CursoCSVProcessor().process_csv_content(CSV)
+        curso = CursoPlataforma.objects.get(id_curso="13")
+
+        resultado = CursoCSVProcessor().process_csv_content(
+            "ID;Nome breve\n13;Curso renomeado\n14;Novo curso\n14;Novo curso 2\n"
+        )
+
+        self.assertEqual(
+            (resultado["cursos_criados"], resultado["cursos_atualizados"]), (1, 2)
+        )
+        curso.refresh_from_db()
+        self.assertEqual(curso.nome_breve, "Curso renomeado")
+        # Colunas ausentes no arquivo não apagam o que já estava gravado
+        self.assertEqual(
+            CursoPlataforma.objects.get(id_curso="12").categoria, "2024 Vidas"
+        )
+        self.assertEqual(
+            CursoPlataforma.objects.get(id_curso="14").nome_breve, "Novo curso 2"
+        )
+        self.assertEqual(CursoPlataforma.objects.count(), 5)
+        self.assertEqual(ProjetoCursoLink.objects.count(), 3)
+
+    def test_lote_desfeito_nao_entra_nas_contagens(self):
+        processor = CursoCSVProcessor(chunk_size=2)
+        vincular = processor.vincular_projetos
+
+        def falhar_no_segundo_lote(cursos):
+            if any(curso.id_curso == "13" for curso in cursos):
+                raise RuntimeError("falha no banco")
+            return vincular(cursos)
+
+        with patch.object(
+            processor, "vincular_projetos", side_effect=falhar_no_segundo_lote
+        ):
+            resultado = processor.process_csv_content(CSV)
+
+        self.assertEqual(
+            (resultado["cursos_criados"], resultado["cursos_atualizados"]), (2, 0)
+        )
+        self.assertEqual(resultado["vinculos_criados"], 2)
+        self.assertEqual(len(resultado["errors"]), 1)
+        self.assertIn("linhas 4 a 5", resultado["errors"][0])
+        self.assertFalse(
+            CursoPlataforma.objects.filter(id_curso__in=["12", "13"]).exists()
+        )
+
+        importacao = ImportacaoCursosCSV.objects.get(pk=resultado["importacao_id"])
+        self.assertEqual(importacao.status, "ERRO")
+        self.assertEqual(
+            (
+                importacao.total_linhas,
+                importacao.cursos_importados,
+                importacao.vinculos_criados,
+            ),
+            (4, 2, 2),
+        )
@@ -0,0 +1,356 @@
+"""
+Testes do modo em lote do DisponibilidadeEngine.
+A agenda (bloqueios e vínculos com solicitações) é lida do banco, gravada
+pelo usuário do formador; as regras RD-01..RD-05 são avaliadas em memória
+sobre um AgendaSnapshot.
+"""
+
+from datetime import datetime, time, timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import (
+    DisponibilidadeFormadores,
+    Formador,
+    FormadoresSolicitacao,
+    Municipio,
+    Projeto,
+    Setor,
+    Solicitacao,
+    TipoEvento,
+)
+from core.services.availability_service import AvailabilityService
+from core.services.disponibilidade_engine import (
+    AgendaSnapshot,
+    DisponibilidadeEngine,
+    FreeSlot,
+    _agenda_ids,
+    check_formador_availability,
+)
+
+Usuario = get_user_model()
+
+
+class AgendaFixtureMixin:
+    """Formadores com usuário, bloqueios e eventos aprovados gravados no banco"""
+
+    def _base(self):
+        self.engine = DisponibilidadeEngine()
+        self.tz = timezone.get_current_timezone()
+        self.fortaleza = Municipio.objects.create(nome="Fortaleza", uf="CE")
+        self.caucaia = Municipio.objects.create(nome="Caucaia", uf="CE")
+        self.solicitante = Usuario.objects.create_user(username="controle.agenda")
+        setor = Setor.objects.create(
+            nome="Vidas", sigla="VIDAS", vinculado_superintendencia=False
+        )
+        self.projeto = Projeto.objects.create(nome="Projeto Agenda", setor=setor)
+        self.tipo_evento = TipoEvento.objects.create(nome="Encontro", online=False)
+
+    def _formador(self, nome):
+        username = nome.lower().replace(" ", ".")
+        usuario = Usuario.objects.create_user(
+            username=username, email=f"{username}@agenda.teste"
+        )
+        return Formador.objects.create(
+            nome=nome, email=f"{username}@agenda.teste", usuario=usuario
+        )
+
+    def _bloqueio(self, formador, dia, tipo, hora_inicio, hora_fim):
+        return DisponibilidadeFormadores.objects.create(
+            usuario_id=formador.usuario_id,
+            data_bloqueio=dia,
+            hora_inicio=hora_inicio,
+            hora_fim=hora_fim,
+            tipo_bloqueio=tipo,
+        )
+
+    def _evento(self, formador, inicio, fim, municipio, titulo):
+        # Setor fora da superintendência: aprovação automática
+        solicitacao = Solicitacao.objects.create(
+            usuario_solicitante=self.solicitante,
+            projeto=self.projeto,
+            municipio=municipio,
+            tipo_evento=self.tipo_evento,
+            titulo_evento=titulo,
+            data_inicio=inicio,
+            data_fim=fim,
+        )
+        FormadoresSolicitacao.objects.create(
+            solicitacao=solicitacao, usuario_id=formador.usuario_id
+        )
+        return solicitacao
+
+    def _snapshot(self, formadores, inicio, fim):
+        """Agenda do período inteiro, para a verificação célula a célula"""
+        blocks, events = self.engine._fetch_agenda(
+            _agenda_ids(formadores), inicio, fim, inicio.date(), fim.date()
+        )
+        snapshot = AgendaSnapshot()
+        for usuario_id, block in blocks:
+            snapshot.blocks[usuario_id].append(block)
+        for usuario_id, event in events:
+            snapshot.events[usuario_id].append(event)
+        return snapshot
+
+
+class DisponibilidadeEngineBatchTest(AgendaFixtureMixin, TestCase):
+    """Verificação de disponibilidade em lote sobre a agenda do banco"""
+
+    def setUp(self):
+        self._base()
+        self.formadores = [self._formador(f"Formador {i}") for i in range(6)]
+
+        self.dia = timezone.now().date() + timedelta(days=10)
+        self.inicio = timezone.make_aware(datetime.combine(self.dia, time(9)), self.tz)
+        self.fim = self.inicio + timedelta(hours=2)
+
+        f_total, f_parcial, f_evento, f_desloc, f_capacidade, _ = self.formadores
+        self._bloqueio(f_total, self.dia, "T", time(8), time(18))
+        self._bloqueio(f_parcial, self.dia, "P", time(10), time(12))
+        self._evento(
+            f_evento,
+            self.inicio + timedelta(hours=1),
+            self.fim + timedelta(hours=1),
+            self.fortaleza,
+            "Sobreposto",
+        )
+        self._evento(
+            f_desloc,
+            self.fim + timedelta(minutes=30),
+            self.fim + timedelta(hours=2),
+            self.caucaia,
+            "Outro município",
+        )
+        self._evento(
+            f_capacidade,
+            self.fim + timedelta(hours=1),
+            self.fim + timedelta(hours=8),
+            self.fortaleza,
+            "Dia longo",
+        )
+
+    def test_conflicts_detected_from_database(self):
+        """Cada regra gera o código esperado para o formador afetado"""
+        resultado = self.engine.check_availability(
+            self.formadores, self.inicio, self.fim, self.fortaleza
+        )
+
+        self.assertFalse(resultado.available)
+        self.assertEqual(resultado.code, "T")
+        self.assertEqual(
+            [(c.formador, c.code) for c in resultado.conflicts],
+            list(zip(self.formadores, ["T", "P", "X", "D", "M"])),
+        )
+        self.assertEqual(len(resultado.formadores_checked), 6)
+        self.assertIn("1 formador(es) disponível(eis)", resultado.summary_message)
+
+    def test_usuario_and_formador_share_agenda(self):
+        """Formador legado e Usuario encontram a mesma agenda"""
+        f_total, _, f_evento = self.formadores[:3]
+
+        por_usuario = self.engine.check_availability(
+            [f_total.usuario], self.inicio, self.fim, self.fortaleza
+        )
+        por_formador = check_formador_availability(
+            f_evento, self.inicio, self.fim, self.fortaleza
+        )
+
+        self.assertEqual(por_usuario.code, "T")
+        self.assertFalse(por_formador.available)
+        self.assertEqual(por_formador.code, "X")
+
+    def test_query_count_independent_of_formadores(self):
+        """Bloqueios e eventos vêm em duas consultas, para 6 ou 12 formadores"""
+        with self.assertNumQueries(2):
+            self.engine.check_availability(
+                self.formadores, self.inicio, self.fim, self.fortaleza
+            )
+
+        mais = [self._formador(f"Formador Extra {i}") for i in range(6)]
+        for formador in mais:
+            self._bloqueio(formador, self.dia, "P", time(9, 30), time(10))
+            self._evento(
+                formador,
+                self.fim - timedelta(minutes=30),
+                self.fim + timedelta(hours=1),
+                self.fortaleza,
+                f"Extra {formador.nome}",
+            )
+
+        with self.assertNumQueries(2):
+            resultado = self.engine.check_availability(
+                self.formadores + mais, self.inicio, self.fim, self.fortaleza
+            )
+        self.assertEqual(len(resultado.conflicts), 5 + 2 * len(mais))
+
+    def test_adjacent_event_same_municipio_is_available(self):
+        """Fim == início no mesmo município não conflita (RD-01)"""
+        livre = self.formadores[-1]
+        self._evento(
+            livre, self.fim, self.fim + timedelta(hours=1), self.fortaleza, "Adjacente"
+        )
+
+        resultado = self.engine.check_availability(
+            [livre], self.inicio, self.fim, self.fortaleza
+        )
+
+        self.assertTrue(resultado.available)
+        self.assertEqual(resultado.conflicts, [])
+
+
+class DisponibilidadeMatrixTest(AgendaFixtureMixin, TestCase):
+    """Matriz mensal calculada em uma passada deve reproduzir os códigos por célula"""
+
+    def setUp(self):
+        self._base()
+        f0, f1, f2 = [self._formador(f"Formador Mapa {i}") for i in range(3)]
+        # Usuario (modelo atual) e Formador legado na mesma matriz
+        self.formadores = [f0, f1, f2.usuario]
+        self.primeiro_dia = timezone.now().date().replace(day=1) + timedelta(days=40)
+
+        self._bloqueio(
+            f0, self.primeiro_dia + timedelta(days=2), "T", time(8), time(18)
+        )
+        self._bloqueio(
+            f1, self.primeiro_dia + timedelta(days=5), "P", time(13), time(15)
+        )
+        eventos = [
+            (f0, self._at(4, 9), self._at(4, 12), self.fortaleza),
+            (f1, self._at(7, 18), self._at(7, 23), self.caucaia),
+            (f1, self._at(9, 6), self._at(9, 7), self.caucaia),
+            (f2, self._at(11, 22), self._at(12, 7, 30), self.caucaia),
+            (f2, self._at(14, 17, 30), self._at(14, 19), self.fortaleza),
+        ]
+        for n, (formador, inicio, fim, municipio) in enumerate(eventos):
+            self._evento(formador, inicio, fim, municipio, f"Evento {n}")
+
+    def _at(self, dia_offset, hora, minuto=0):
+        dia = self.primeiro_dia + timedelta(days=dia_offset)
+        return timezone.make_aware(datetime.combine(dia, time(hora, minuto)), self.tz)
+
+    def test_matrix_matches_per_cell_check(self):
+        inicio = self._at(0, 8)
+        fim = self._at(20, 17)
+
+        with patch.object(Municipio, "objects") as municipios:
+            municipios.first.return_value = self.fortaleza
+            # Bloqueios e eventos do período inteiro: duas consultas
+            with self.assertNumQueries(2):
+                matrix = self.engine.get_availability_matrix(
+                    self.formadores, inicio, fim
+                )
+
+        snapshot = self._snapshot(self.formadores, self._at(-1, 0), self._at(21, 23))
+        esperado = {}
+        for formador, nome in zip(
+            self.formadores, ["Formador Mapa 0", "Formador Mapa 1", "formador.mapa.2"]
+        ):
+            for offset in range(21):
+                dia = self.primeiro_dia + timedelta(days=offset)
+                conflitos = self.engine._check_formador_availability(
+                    formador,
+                    self._at(offset, 8),
+                    self._at(offset, 17),
+                    self.fortaleza,
+                    None,
+                    snapshot=snapshot,
+                )
+                esperado.setdefault(nome, {})[dia.strftime("%Y-%m-%d")] = (
+                    self.engine._determine_primary_code(conflitos, [], dia)
+                )
+
+        self.assertEqual(matrix, esperado)
+        self.assertIn("T", matrix["Formador Mapa 0"].values())
+        self.assertIn("P", matrix["Formador Mapa 1"].values())
+        self.assertIn("D", matrix["formador.mapa.2"].values())
+
+
+class FreeSlotSearchTest(AgendaFixtureMixin, TestCase):
+    """Varredura de janelas livres deve concordar com a verificação por candidato"""
+
+    def setUp(self):
+        self._base()
+        self.formadores = [self._formador(f"Formador Slot {i}") for i in range(3)]
+        self.dias = [datetime(2025, 6, 2).date() + timedelta(days=i) for i in range(3)]
+
+    def _at(self, dia, hora, minuto=0):
+        return timezone.make_aware(
+            datetime.combine(self.dias[dia], time(hora, minuto)), self.tz
+        )
+
+    def _agenda(self):
+        f0, f1, f2 = self.formadores
+        self._bloqueio(f0, self.dias[0], "T", time(13), time(15))
+        self._bloqueio(f1, self.dias[1], "P", time(9), time(10, 30))
+        eventos = [
+            (f0, self._at(1, 10), self._at(1, 12), self.fortaleza),
+            (f1, self._at(0, 9), self._at(0, 11), self.caucaia),
+            (f1, self._at(0, 11), self._at(0, 12), self.fortaleza),
+            (f2, self._at(2, 7), self._at(2, 13), self.fortaleza),
+            (f2, self._at(1, 14, 15), self._at(1, 15), self.caucaia),
+        ]
+        for n, (formador, inicio, fim, municipio) in enumerate(eventos):
+            self._evento(formador, inicio, fim, municipio, f"Evento {n}")
+
+    def test_sweep_matches_per_candidate_rules(self):
+        self._agenda()
+        duracao = timedelta(hours=2)
+
+        with self.assertNumQueries(2):
+            slots = self.engine.find_free_slots(
+                self.formadores,
+                self.dias,
+                duracao,
+                self.fortaleza,
+                step=timedelta(minutes=15),
+                max_conflicted=2,
+            )
+
+        snapshot = self._snapshot(self.formadores, self._at(0, 0), self._at(2, 23))
+        esperado = []
+        for dia in range(len(self.dias)):
+            inicio = self._at(dia, 8)
+            while inicio + duracao <= self._at(dia, 17):
+                conflitados = [
+                    f.id
+                    for f in self.formadores
+                    if self.engine._check_formador_availability(
+                        f, inicio, inicio + duracao, self.fortaleza, None, snapshot
+                    )
+                ]
+                if len(conflitados) < len(self.formadores):
+                    esperado.append(FreeSlot(inicio, inicio + duracao, conflitados))
+                inicio += timedelta(minutes=15)
+
+        self.assertEqual(slots, esperado)
+        self.assertTrue(any(slot.conflicted for slot in slots))
+        # Candidato termina exatamente no início de outro evento: livre
+        self.assertIn(FreeSlot(self._at(1, 12, 15), self._at(1, 14, 15), []), slots)
+
+    def test_suggestions_ranked_by_fewest_conflicts(self):
+        f0, f1, f2 = self.formadores
+        slots = [
+            FreeSlot(self._at(0, 8), self._at(0, 10), [f0.id, f1.id]),
+            FreeSlot(self._at(0, 10), self._at(0, 12), [f2.id]),
+            FreeSlot(self._at(1, 8), self._at(1, 10), []),
+        ]
+        service = AvailabilityService()
+
+        with patch.object(service.engine, "find_free_slots", return_value=slots):
+            sugestoes = service.suggest_alternative_slots(
+                self.formadores,
+                self._at(0, 8),
+                self._at(0, 10),
+                self.fortaleza,
+                order_by="conflitos",
+                limit=2,
+            )
+
+        self.assertEqual(
+            [s["inicio"] for s in sugestoes], [self._at(1, 8), self._at(0, 10)]
+        )
+        self.assertEqual(sugestoes[0]["confidence"], "high")
+        self.assertEqual(sugestoes[1]["formadores_livres"], [f0, f1])
@@ -0,0 +1,155 @@
+"""
+Testes das validações vetorizadas do extract_google_sheets_master
+
+Cada função em lote é comparada com a versão antiga, aplicada valor a
+valor com .apply(), sobre as mesmas colunas.
+"""
+
+import re
+import unittest
+
+from django.test import SimpleTestCase
+
+try:
+    import pandas as pd
+
+    from core.management.commands.extract_google_sheets_master import (
+        cpfs_validos,
+        emails_validos,
+        normalizar_nomes,
+        usernames,
+    )
+except ImportError:
+    pd = None
+
+
+# Versões por valor, como eram antes da vetorização
+def normalize_name(name):
+    if not name or pd.isna(name):
+        return ""
+    name = re.sub(r"\s+", " ", str(name).strip())
+    exceptions = {
+        "da": "da",
+        "de": "de",
+        "do": "do",
+        "dos": "dos",
+        "das": "das",
+        "e": "e",
+        "em": "em",
+        "na": "na",
+        "no": "no",
+        "ii": "II",
+        "iii": "III",
+        "iv": "IV",
+        "jr": "Jr.",
+        "sr": "Sr.",
+    }
+    words = []
+    for word in name.split():
+        if word.lower() in exceptions:
+            words.append(exceptions[word.lower()])
+        else:
+            words.append(word.capitalize())
+    return " ".join(words)
+
+
+def validate_email(email):
+    if not email or pd.isna(email):
+        return False
+    pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
+    return bool(re.match(pattern, str(email).strip()))
+
+
+def validate_cpf(cpf):
+    if not cpf or pd.isna(cpf):
+        return False
+    cpf = re.sub(r"\D", "", str(cpf))
+    if len(cpf) != 11 or cpf == cpf[0] * 11:
+        return False
+
+    def calc_digit(cpf_digits, weights):
+        remainder = sum(int(d) * w for d, w in zip(cpf_digits, weights)) % 11
+        return 0 if remainder < 2 else 11 - remainder
+
+    if calc_digit(cpf[:9], range(10, 1, -1)) != int(cpf[9]):
+        return False
+    return calc_digit(cpf[:10], range(11, 1, -1)) == int(cpf[10])
+
+
+def generate_username(nome_completo):
+    base = nome_completo.lower().replace(" ", "_")
+    base = re.sub(r"[^a-z0-9_]", "", base)
+    return base[:30]
+
+
+NOMES = [
+    "maria  da silva",
+    "  JOÃO DOS SANTOS jr ",
+    "ana e josé",
+    "pedro ii",
+    "Élida Conceição",
+    "",
+    "   ",
+    None,
+    float("nan"),
+]
+
+EMAILS = [
+    "maria@example.com",
+    " joao.santos@aprender.com.br ",
+    "sem-arroba.com",
+    "a@b.c",
+    "josé@example.com",
+    "",
+    None,
+    float("nan"),
+]
+
+CPFS = [
+    "529.982.247-25",
+    "52998224725",
+    "529.982.247-24",
+    "111.111.111-11",
+    "123",
+    "000.000.001-91",
+    "",
+    None,
+    float("nan"),
+]
+
+
+@unittest.skipUnless(pd, "pandas não instalado")
+class ValidacoesVetorizadasTest(SimpleTestCase):
+    def assertMesmaSaida(self, vetorizada, por_valor, valores):
+        serie = pd.Series(valores, dtype=object, index=range(10, 10 + len(valores)))
+        self.assertEqual(
+            vetorizada(serie).tolist(),
+            serie.apply(por_valor).tolist(),
+        )
+
+    def test_normalizar_nomes(self):
+        self.assertMesmaSaida(normalizar_nomes, normalize_name, NOMES)
+
+    def test_normalizar_nomes_preserva_indice(self):
+        serie = pd.Series(["maria da silva", None], index=[7, 3])
+        self.assertEqual(
+            normalizar_nomes(serie).to_dict(), {7: "Maria da Silva", 3: ""}
+        )
+
+    def test_emails_validos(self):
+        self.assertMesmaSaida(emails_validos, validate_email, EMAILS)
+
+    def test_cpfs_validos(self):
+        self.assertMesmaSaida(cpfs_validos, validate_cpf, CPFS)
+
+    def test_cpfs_sem_candidatos(self):
+        self.assertMesmaSaida(cpfs_validos, validate_cpf, ["", "123", None])
+
+    def test_usernames(self):
+        nomes = ["Maria da Silva", "José Álvaro", "Maria da Silva", "x" * 40, ""]
+        serie = pd.Series(nomes)
+        resultado = usernames(serie).tolist()
+
+        self.assertEqual(resultado, serie.apply(generate_username).tolist())
+        # Nomes repetidos continuam gerando o mesmo username
+        self.assertEqual(resultado[0], resultado[2])
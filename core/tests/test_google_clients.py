@@ -0,0 +1,139 @@
+"""
+Testes da fábrica de clientes Google (cache, renovação antecipada, métricas)
+"""
+
+import threading
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.test import SimpleTestCase, override_settings
+
+from core.services.integrations import google_clients
+from core.services.integrations.google_calendar import GoogleCalendarService
+from core.services.integrations.google_clients import ClientFactory
+from core.tests.fake_google_calendar import FakeCalendarServer
+
+
+class FakeCredentials:
+    """Mesma interface usada das credenciais do google-auth"""
+
+    def __init__(self, validade):
+        self.refresh_token = "refresh"
+        self.token = "token"
+        self.expiry = self._agora() + validade
+        self.refreshes = 0
+
+    @staticmethod
+    def _agora():
+        return datetime.now(dt_timezone.utc).replace(tzinfo=None)
+
+    def refresh(self, request):
+        self.refreshes += 1
+        self.expiry = self._agora() + timedelta(hours=1)
+
+
+class ClientFactoryTest(SimpleTestCase):
+    def setUp(self):
+        self.fabrica = ClientFactory(margem=300, auth_request=lambda: None)
+
+    def test_credenciais_carregadas_uma_vez(self):
+        carregamentos = []
+
+        def carregar():
+            carregamentos.append(1)
+            return FakeCredentials(timedelta(hours=1))
+
+        a = self.fabrica.credenciais("arquivo", carregar)
+        b = self.fabrica.credenciais("arquivo", carregar)
+        self.assertIs(a, b)
+        self.assertEqual(len(carregamentos), 1)
+        self.assertEqual(a.refreshes, 0)
+
+    def test_renova_antes_de_expirar(self):
+        credenciais = FakeCredentials(timedelta(seconds=60))
+        renovadas = []
+
+        self.fabrica.credenciais(
+            "arquivo", lambda: credenciais, ao_renovar=renovadas.append
+        )
+        self.fabrica.credenciais("arquivo", lambda: credenciais)
+
+        self.assertEqual(credenciais.refreshes, 1)
+        self.assertEqual(renovadas, [credenciais])
+        self.assertEqual(self.fabrica.metricas()["renovacoes"], 1)
+
+    def test_credencial_ausente_nao_fica_em_cache(self):
+        self.assertIsNone(self.fabrica.credenciais("arquivo", lambda: None))
+        credenciais = FakeCredentials(timedelta(hours=1))
+        self.assertIs(
+            self.fabrica.credenciais("arquivo", lambda: credenciais), credenciais
+        )
+
+    def test_cliente_por_thread(self):
+        construidos = []
+
+        def construir():
+            construidos.append(threading.get_ident())
+            return object()
+
+        principal = self.fabrica.cliente("calendar", construir)
+        self.assertIs(self.fabrica.cliente("calendar", construir), principal)
+
+        outros = []
+        thread = threading.Thread(
+            target=lambda: outros.append(self.fabrica.cliente("calendar", construir))
+        )
+        thread.start()
+        thread.join()
+
+        self.assertIsNot(outros[0], principal)
+        self.assertEqual(len(construidos), 2)
+        metricas = self.fabrica.metricas()
+        self.assertEqual(metricas["construcoes"], 2)
+        self.assertEqual(metricas["reusos"], 1)
+
+    def test_cliente_compartilhado(self):
+        construidos = []
+
+        def construir():
+            construidos.append(1)
+            return object()
+
+        principal = self.fabrica.cliente("sheets", construir, compartilhado=True)
+        outros = []
+        threads = [
+            threading.Thread(
+                target=lambda: outros.append(
+                    self.fabrica.cliente("sheets", construir, compartilhado=True)
+                )
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(construidos), 1)
+        self.assertTrue(all(cliente is principal for cliente in outros))
+
+
+@override_settings(FEATURE_GOOGLE_SYNC=True)
+class CalendarMetricasTest(SimpleTestCase):
+    def setUp(self):
+        self.server = FakeCalendarServer().start()
+        google_clients.fabrica.limpar_metricas()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_chamadas_da_api_cronometradas(self):
+        service = GoogleCalendarService(calendar_id="formacoes")
+        service._service = self.server.client()
+
+        service.list_events(max_results=None)
+        service.list_events(max_results=None)
+
+        chamadas = google_clients.metricas()["chamadas"]
+        self.assertEqual(chamadas["calendar.events.list"]["quantidade"], 2)
+        self.assertGreater(chamadas["calendar.events.list"]["segundos"], 0)
@@ -0,0 +1,172 @@
+"""
+Testes do motor de importação das planilhas de agenda
+"""
+
+from datetime import date, datetime
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.test import TestCase
+
+from core.models import (
+    Formador,
+    FormadoresSolicitacao,
+    Municipio,
+    Projeto,
+    Setor,
+    Solicitacao,
+    SolicitacaoStatus,
+    TipoEvento,
+)
+from core.services.importacao_agenda import (
+    ImportadorAgenda,
+    LinhaImportada,
+    normalizar,
+    separar_uf,
+)
+
+Usuario = get_user_model()
+
+FUSO = ZoneInfo("America/Fortaleza")
+
+
+def _linha(n, municipio="Sobral", projeto="ACerta", formadores=("Ana Souza",), **extra):
+    dia = extra.pop("dia", 10)
+    dados = dict(
+        linha=n,
+        titulo=f"{projeto} - {municipio}",
+        municipio=municipio,
+        projeto=projeto,
+        tipo_evento="Formação",
+        data_inicio=datetime(2025, 3, dia, 8, tzinfo=FUSO),
+        data_fim=datetime(2025, 3, dia, 17, tzinfo=FUSO),
+        status=SolicitacaoStatus.APROVADO,
+        formadores=list(formadores),
+    )
+    dados.update(extra)
+    return LinhaImportada(**dados)
+
+
+class ImportadorAgendaTest(TestCase):
+    def setUp(self):
+        self.admin = Usuario.objects.create_superuser(
+            username="admin.importacao", password="x"
+        )
+        Group.objects.get_or_create(name="formador")
+        self.existente = Usuario.objects.create_user(
+            username="ana", first_name="Ana", last_name="Souza"
+        )
+        self.sobral = Municipio.objects.create(nome="Sobral", uf="CE")
+
+    def test_normalizacao(self):
+        self.assertEqual(normalizar("  Antônio   GONÇALVES "), "antonio goncalves")
+        self.assertEqual(separar_uf("Dias d'Avila - BA"), ("Dias d'Avila", "BA"))
+        self.assertEqual(separar_uf("Amigos do Bem"), ("Amigos do Bem", "CE"))
+
+    def test_referencias_criadas_uma_vez_por_lote(self):
+        linhas = [
+            _linha(1, dia=10),
+            _linha(2, municipio="Atibaia - SP", formadores=["Bruno Lima"], dia=11),
+            _linha(3, municipio="atibaia - sp", formadores=["bruno lima"], dia=12),
+        ]
+
+        with self.assertNumQueries(29):
+            resumo = ImportadorAgenda("Super").importar(linhas)
+
+        self.assertEqual(resumo["criadas"], 3)
+        self.assertEqual(
+            resumo["referencias_criadas"],
+            {"municipios": 1, "projetos": 1, "tipos_evento": 1, "usuarios": 1},
+        )
+        self.assertEqual(Municipio.objects.get(nome="Atibaia").uf, "SP")
+        projeto = Projeto.objects.get(nome="ACerta")
+        self.assertEqual(projeto.setor, Setor.objects.get(nome="Sem Setor", sigla="SS"))
+        self.assertEqual(TipoEvento.objects.filter(nome="Formação").count(), 1)
+
+        bruno = Usuario.objects.get(first_name="Bruno", last_name="Lima")
+        self.assertEqual(bruno.email, "bruno.lima@planilha.super")
+        self.assertTrue(bruno.groups.filter(name="formador").exists())
+        self.assertTrue(Formador.objects.filter(usuario=bruno).exists())
+
+        # Ana já existia: vinculada sem criar outro usuário
+        self.assertEqual(
+            FormadoresSolicitacao.objects.filter(usuario=self.existente).count(), 1
+        )
+        self.assertEqual(FormadoresSolicitacao.objects.filter(usuario=bruno).count(), 2)
+        self.assertEqual(
+            set(Solicitacao.objects.values_list("usuario_solicitante", flat=True)),
+            {self.admin.pk},
+        )
+
+    def test_reimportacao_ignora_ou_atualiza_existentes(self):
+        ImportadorAgenda("Super").importar([_linha(1)])
+
+        resumo = ImportadorAgenda("Super").importar(
+            [_linha(1, observacoes="nova"), _linha(2, dia=11)]
+        )
+        self.assertEqual((resumo["criadas"], resumo["ignoradas"]), (1, 1))
+        self.assertEqual(Solicitacao.objects.count(), 2)
+
+        resumo = ImportadorAgenda("Super", atualizar_existentes=True).importar(
+            [_linha(1, observacoes="nova", formadores=["Ana Souza", "Caio"])]
+        )
+        self.assertEqual(resumo["atualizadas"], 1)
+        solicitacao = Solicitacao.objects.get(data_inicio__day=10)
+        self.assertEqual(solicitacao.observacoes, "nova")
+        self.assertEqual(
+            FormadoresSolicitacao.objects.filter(solicitacao=solicitacao).count(), 2
+        )
+
+    def test_atualizacao_sincroniza_vinculos_e_recalcula_celulas_antigas(self):
+        ImportadorAgenda("Super").importar(
+            [_linha(1, formadores=["Ana Souza", "Caio Mendes"])]
+        )
+        caio = Formador.objects.get(nome="Caio Mendes")
+
+        with (
+            patch(
+                "core.signals.mapa_disponibilidade_signals.recalcular_faixas"
+            ) as recalcular,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            resumo = ImportadorAgenda("Super", atualizar_existentes=True).importar(
+                [_linha(1, status=SolicitacaoStatus.PENDENTE)]
+            )
+
+        self.assertEqual((resumo["atualizadas"], resumo["vinculos_removidos"]), (1, 1))
+        self.assertEqual(
+            list(FormadoresSolicitacao.objects.values_list("usuario_id", flat=True)),
+            [self.existente.pk],
+        )
+        # Deixou de ser aprovada: só as células antigas mudam, inclusive a de Caio
+        faixas = [
+            faixa for chamada in recalcular.call_args_list for faixa in chamada.args[0]
+        ]
+        self.assertIn(([caio.pk], date(2025, 3, 10), date(2025, 3, 10)), faixas)
+
+    def test_linhas_invalidas_e_dry_run(self):
+        invalida = _linha(
+            2, data_fim=datetime(2025, 3, 10, 7, tzinfo=FUSO), titulo="Outra"
+        )
+
+        resumo = ImportadorAgenda("Super").importar([_linha(1), invalida], dry_run=True)
+
+        self.assertEqual(resumo["criadas"], 1)
+        self.assertEqual(resumo["erros"], [(2, "fim anterior ao início")])
+        self.assertFalse(Solicitacao.objects.exists())
+        self.assertFalse(Projeto.objects.exists())
+
+    def test_nomes_aproximados_usam_cadastro_existente(self):
+        resumo = ImportadorAgenda("Super").importar(
+            [_linha(1, municipio="SOBRÁL", formadores=["Souza, Ana"])]
+        )
+
+        self.assertEqual(resumo["referencias_criadas"]["usuarios"], 0)
+        self.assertEqual(resumo["referencias_criadas"]["municipios"], 0)
+        self.assertEqual(Solicitacao.objects.get().municipio, self.sobral)
+        self.assertEqual(
+            [(a["nome"], a["encontrado"], a["metodo"]) for a in resumo["aproximacoes"]],
+            [("Souza, Ana", "Ana Souza", "tokens")],
+        )
@@ -0,0 +1,200 @@
+"""
+Testes da importação em lote das disponibilidades dos formadores
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, time
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from core.models import DisponibilidadeFormadores, Formador
+from core.services import importacao_disponibilidades
+from core.services.importacao_disponibilidades import (
+    FORMATOS_DATA,
+    FORMATOS_HORA,
+    ImportadorDisponibilidades,
+    converter_coluna,
+    converter_linhas,
+    mesclar_intervalos,
+)
+
+Usuario = get_user_model()
+
+
+def _bruta(n, data, inicio="", fim="", nome="Ana Souza", email="", **extra):
+    dados = dict(
+        linha=n,
+        formador_nome=nome,
+        formador_email=email,
+        data=data,
+        hora_inicio=inicio,
+        hora_fim=fim,
+        tipo_bloqueio="",
+        motivo="",
+    )
+    dados.update(extra)
+    return dados
+
+
+class ConversaoColunasTest(SimpleTestCase):
+    def test_formato_unico_para_a_coluna(self):
+        # "04/03" sozinho seria dia/mês; a coluna inteira só cabe em mês/dia
+        datas = converter_coluna(
+            ["04/03/2025", "04/13/2025", "04/03/2025"],
+            FORMATOS_DATA[None],
+            datetime.date,
+            lambda texto: None,
+        )
+        self.assertEqual(
+            datas, {"04/03/2025": date(2025, 4, 3), "04/13/2025": date(2025, 4, 13)}
+        )
+
+    @unittest.skipUnless(importacao_disponibilidades.pd, "pandas não instalado")
+    def test_pandas_e_strptime_convertem_igual(self):
+        datas = ["10/03/2025", "3/4/25", "2025-3-1", "1-2-2025", "31/02/2025", "xx"]
+        horas = ["8h", "12.30", "9", "14:30", "14:30:15", "7,45", "24:00", "9h5"]
+        casos = [
+            (datas, fmts, datetime.date, lambda t: None)
+            for fmts in FORMATOS_DATA.values()
+        ]
+        casos += [
+            (
+                ["04/03/2025", "04/13/2025"],
+                FORMATOS_DATA[None],
+                datetime.date,
+                lambda t: None,
+            ),
+            (horas, FORMATOS_HORA, datetime.time, lambda t: "alternativa"),
+        ]
+        for valores, formatos, conversor, alternativa in casos:
+            vetorizado = converter_coluna(valores, formatos, conversor, alternativa)
+            with patch.object(importacao_disponibilidades, "pd", None):
+                por_valor = converter_coluna(valores, formatos, conversor, alternativa)
+            self.assertEqual(vetorizado, por_valor)
+
+    def test_linhas_com_padroes_e_recusadas(self):
+        linhas, erros = converter_linhas(
+            [
+                _bruta(2, "2025-03-10"),
+                _bruta(3, "10/03/2025", "8h", "12.30"),
+                _bruta(4, datetime(2025, 3, 11, 0, 0), time(14), "9"),
+                _bruta(5, "31/02/2025"),
+            ]
+        )
+
+        self.assertEqual(
+            [(l["data_bloqueio"], l["hora_inicio"], l["hora_fim"]) for l in linhas],
+            [
+                (date(2025, 3, 10), time(9), time(17)),
+                (date(2025, 3, 10), time(8), time(12, 30)),
+            ],
+        )
+        self.assertEqual([linha for linha, _ in erros], [4, 5])
+        self.assertEqual(linhas[0]["tipo_bloqueio"], "Bloqueio")
+
+    def test_mesclar_intervalos(self):
+        self.assertEqual(
+            mesclar_intervalos(
+                [
+                    (time(13), time(15)),
+                    (time(8), time(10)),
+                    (time(9), time(11)),
+                    (time(11), time(12)),
+                ]
+            ),
+            [(time(8), time(11)), (time(11), time(12)), (time(13), time(15))],
+        )
+
+
+class ImportadorDisponibilidadesTest(TestCase):
+    def setUp(self):
+        self.ana = Usuario.objects.create_user(username="ana")
+        self.bia = Usuario.objects.create_user(username="bia")
+        Formador.objects.create(
+            nome="Ana Souza", email="ana@exemplo.com", usuario=self.ana
+        )
+        Formador.objects.create(
+            nome="Beatriz Lima", email="bia@exemplo.com", usuario=self.bia
+        )
+        Formador.objects.create(nome="Carla Sem Usuario", email="carla@exemplo.com")
+        DisponibilidadeFormadores.objects.create(
+            usuario=self.ana,
+            data_bloqueio=date(2025, 3, 10),
+            hora_inicio=time(8),
+            hora_fim=time(10),
+            tipo_bloqueio="Bloqueio",
+        )
+
+    def _linhas(self):
+        linhas, _ = converter_linhas(
+            [
+                _bruta(2, "10/03/2025", "08:00", "10:00", tipo_bloqueio="Ferias"),
+                _bruta(3, "10/03/2025", "09:00", "11:00"),
+                _bruta(4, "10/03/2025", "10:00", "12:00", nome="Ana S."),
+                _bruta(5, "10/03/2025", "11:00", "13:00", email="ANA@exemplo.com"),
+                _bruta(6, "11/03/2025", nome="", email="bia@exemplo.com"),
+                _bruta(7, "11/03/2025", nome="Carla Sem Usuario"),
+                _bruta(8, "11/03/2025", nome="Desconhecida"),
+            ]
+        )
+        return linhas
+
+    def test_dry_run_produz_o_mesmo_relatorio(self):
+        simulado = ImportadorDisponibilidades(atualizar_existentes=True).importar(
+            self._linhas(), dry_run=True
+        )
+        self.assertEqual(DisponibilidadeFormadores.objects.count(), 1)
+
+        real = ImportadorDisponibilidades(atualizar_existentes=True).importar(
+            self._linhas()
+        )
+
+        self.assertEqual(simulado, real)
+        self.assertEqual(
+            (real["criados"], real["atualizados"], real["duplicados"], real["erros"]),
+            (2, 1, 0, 4),
+        )
+        self.assertEqual(
+            set(
+                DisponibilidadeFormadores.objects.values_list(
+                    "usuario__username", "data_bloqueio", "hora_inicio", "tipo_bloqueio"
+                )
+            ),
+            {
+                ("ana", date(2025, 3, 10), time(8), "Ferias"),
+                ("ana", date(2025, 3, 10), time(10), "Bloqueio"),
+                ("bia", date(2025, 3, 11), time(9), "Bloqueio"),
+            },
+        )
+        erros = " ".join(real["detalhes_erros"])
+        self.assertIn("Linha 3: Sobreposicao com bloqueio existente", erros)
+        self.assertIn("Linha 5: Sobreposicao com outra linha do arquivo", erros)
+        self.assertIn("Formador sem usuario vinculado", erros)
+        self.assertIn("Formador nao encontrado: Desconhecida", erros)
+
+    def test_comando_csv_reimportado_so_duplica(self):
+        arquivo = tempfile.NamedTemporaryFile(
+            "w", suffix=".csv", delete=False, encoding="utf-8"
+        )
+        arquivo.write(
+            "Formador;Email;Data;Inicio;Fim;Tipo\n"
+            "Beatriz Lima;;12/03/2025;08:00;12:00;Viagem\n"
+            ";bia@exemplo.com;13/03/2025;;;\n"
+        )
+        arquivo.close()
+        self.addCleanup(os.unlink, arquivo.name)
+
+        for _ in range(2):
+            saida = StringIO()
+            call_command("import_disponibilidades", file=arquivo.name, stdout=saida)
+
+        self.assertIn("Duplicados (ignorados): 2", saida.getvalue())
+        self.assertEqual(
+            DisponibilidadeFormadores.objects.filter(usuario=self.bia).count(), 2
+        )
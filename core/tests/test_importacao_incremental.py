@@ -0,0 +1,110 @@
+"""
+Testes da importação incremental por assinatura de linhas
+"""
+
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from core.models import AssinaturaLinha, Solicitacao
+from core.services.importacao_agenda import ImportadorAgenda
+from core.services.importacao_incremental import RegistroAssinaturas, assinatura
+from core.tests.test_importacao_agenda import _linha
+
+Usuario = get_user_model()
+
+
+class RegistroAssinaturasTest(TestCase):
+    def test_assinatura_ignora_espacos_ordem_e_numero_da_linha(self):
+        self.assertEqual(
+            assinatura({"nome": " Ana  Souza", "data": date(2025, 3, 1), "linha": 2}),
+            assinatura({"data": date(2025, 3, 1), "nome": "Ana Souza", "linha": 9}),
+        )
+        self.assertNotEqual(assinatura({"nome": "Ana"}), assinatura({"nome": "Ana S."}))
+
+    def test_diferenca_entre_execucoes(self):
+        registro = RegistroAssinaturas("planilha", "Formadores")
+        registro.comparar([("a", {"v": 1}), ("b", {"v": 1}), ("c", {"v": 1})])
+        registro.confirmar(falhas=["c"])
+        self.assertEqual(AssinaturaLinha.objects.count(), 2)
+
+        registro = RegistroAssinaturas("planilha", "Formadores")
+        diferenca = registro.comparar(
+            [("b", {"v": 2}), ("c", {"v": 1}), ("d", {"v": 1})]
+        )
+        self.assertEqual(
+            diferenca.resumo(),
+            {"inseridas": 2, "alteradas": 1, "removidas": 1, "inalteradas": 0},
+        )
+        self.assertEqual(diferenca.removidas, ["a"])
+        self.assertEqual(sorted(diferenca.inseridas), ["c", "d"])
+
+        registro.confirmar()
+        self.assertEqual(
+            set(AssinaturaLinha.objects.values_list("chave", flat=True)),
+            {"b", "c", "d"},
+        )
+        # Outra aba da mesma fonte não é afetada
+        self.assertEqual(
+            RegistroAssinaturas("planilha", "Projetos")
+            .comparar([])
+            .resumo()["removidas"],
+            0,
+        )
+
+    def test_comparacao_parcial_nao_remove_ausentes(self):
+        registro = RegistroAssinaturas("arquivo.csv")
+        registro.comparar([("a", 1), ("b", 1)])
+        registro.confirmar()
+
+        diferenca = registro.comparar([("a", 1)], completo=False)
+
+        self.assertEqual(diferenca.removidas, [])
+        self.assertEqual(diferenca.inalteradas, 1)
+
+
+class ImportacaoAgendaIncrementalTest(TestCase):
+    def setUp(self):
+        Usuario.objects.create_superuser(username="admin.importacao", password="x")
+
+    def _importar(self, linhas):
+        return ImportadorAgenda("Super").importar(
+            linhas, assinaturas=RegistroAssinaturas("planilha-agenda", "Super")
+        )
+
+    def test_reimportacao_grava_so_o_que_mudou(self):
+        self._importar([_linha(1, dia=10), _linha(2, dia=11), _linha(3, dia=12)])
+
+        # Só a leitura das assinaturas (e o savepoint da transação)
+        with self.assertNumQueries(3):
+            resumo = self._importar(
+                [_linha(1, dia=10), _linha(2, dia=11), _linha(3, dia=12)]
+            )
+        self.assertEqual(resumo["inalteradas"], 3)
+        self.assertEqual(resumo["criadas"] + resumo["atualizadas"], 0)
+
+        # Linha 2 mudou (sem atualizar_existentes), linha 3 saiu, linha 4 entrou
+        resumo = self._importar(
+            [
+                _linha(7, dia=10),
+                _linha(2, dia=11, observacoes="remarcada"),
+                _linha(4, dia=13),
+            ]
+        )
+        self.assertEqual(
+            (resumo["criadas"], resumo["atualizadas"], resumo["inalteradas"]), (1, 1, 1)
+        )
+        self.assertEqual(len(resumo["diferenca"].removidas), 1)
+        self.assertEqual(
+            Solicitacao.objects.get(data_inicio__day=11).observacoes, "remarcada"
+        )
+
+    def test_dry_run_nao_grava_assinaturas(self):
+        ImportadorAgenda("Super").importar(
+            [_linha(1)],
+            dry_run=True,
+            assinaturas=RegistroAssinaturas("planilha-agenda", "Super"),
+        )
+
+        self.assertFalse(AssinaturaLinha.objects.exists())
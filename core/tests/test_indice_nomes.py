@@ -0,0 +1,77 @@
+"""
+Testes do índice de resolução de nomes
+"""
+
+from django.test import SimpleTestCase
+
+from core.services.indice_nomes import IndiceNomes, agrupar, normalizar, tokens
+
+
+class IndiceNomesTest(SimpleTestCase):
+    def setUp(self):
+        self.indice = IndiceNomes(
+            [
+                ("Ana Souza", 1),
+                ("Maria Clara Souza", 2),
+                ("José da Silva", 3),
+                ("Ana Beatriz", 4),
+                ("Francisca Lima", 5),
+                ("Francisco Lima", 6),
+            ]
+        )
+
+    def test_normalizacao(self):
+        self.assertEqual(normalizar("  JOSÉ   da Conceição "), "jose da conceicao")
+        self.assertEqual(tokens("José da Silva-Costa"), ["jose", "silva", "costa"])
+
+    def test_metodos_em_ordem(self):
+        casos = {
+            "ana  SOUZA": (1, "exato", 1.0),
+            "Souza Ana": (1, "tokens", 0.97),
+            "Jose Silva": (3, "tokens", 0.97),
+            "Maria Souza": (2, "extremos", 0.9),
+            "Ana S.": (1, "prefixo", 0.85),
+        }
+        for nome, (valor, metodo, confianca) in casos.items():
+            with self.subTest(nome=nome):
+                resultado = self.indice.buscar(nome)
+                self.assertEqual(
+                    (resultado.valor, resultado.metodo, resultado.confianca),
+                    (valor, metodo, confianca),
+                )
+
+    def test_trigramas_com_limiar(self):
+        resultado = self.indice.buscar("Jose da Silvva")
+        self.assertEqual((resultado.valor, resultado.metodo), (3, "trigramas"))
+        self.assertGreater(resultado.confianca, 0.8)
+
+        self.assertIsNone(self.indice.buscar("Pedro Alves"))
+        self.assertEqual(self.indice.estatisticas["sem_correspondencia"], 1)
+
+    def test_ambiguidade_nao_resolve_por_regra(self):
+        # "Ana" é prefixo de dois nomes: sem vencedor pelas regras
+        self.assertIsNone(self.indice.buscar("Ana", limiar=0.8))
+
+    def test_resultado_reprodutivel(self):
+        # Nomes quase iguais: o empate fica com o inserido primeiro
+        indice = IndiceNomes([("Francisco Lima", "a"), ("Francisca Lima", "b")])
+        self.assertEqual(
+            [indice.buscar("Francisc Lima", limiar=0.5).valor for _ in range(3)],
+            ["a", "a", "a"],
+        )
+
+    def test_agrupar(self):
+        grupos = agrupar(
+            [
+                ("Maria Souza", "a"),
+                ("Pedro", "x"),
+                ("Maria Clara Souza", "b"),
+                ("MARIA SOUZA", "c"),
+                ("Pedro", "d"),
+                ("", "vazio"),
+            ]
+        )
+        self.assertEqual(
+            grupos,
+            [[("a", 1.0), ("b", 0.9), ("c", 1.0)], [("x", 1.0), ("d", 1.0)]],
+        )
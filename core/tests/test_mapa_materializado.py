@@ -0,0 +1,111 @@
+"""
+Testes do mapa de disponibilidade materializado (formador × dia).
+"""
+
+from datetime import date, time
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.models import (
+    Deslocamento,
+    DisponibilidadeFormadores,
+    Formador,
+    MapaDisponibilidadeDia,
+)
+from core.services.mapa_materializado import dias_do_mes, ler_mapa, verificar
+
+User = get_user_model()
+
+
+class MapaMaterializadoTest(TestCase):
+    def setUp(self):
+        self.usuario = User.objects.create_user(
+            username="formador.mapa", email="formador.mapa@planilha.super"
+        )
+        self.formador = Formador.objects.create(
+            nome="Formador Mapa",
+            email="formador.mapa@planilha.super",
+            usuario=self.usuario,
+        )
+        self.outro = Formador.objects.create(
+            nome="Outro Formador", email="outro@planilha.super"
+        )
+        self.dias = dias_do_mes(2025, 3)
+
+    def _codigo(self, formador, dia):
+        return MapaDisponibilidadeDia.objects.get(formador=formador, data=dia).codigo
+
+    def test_leitura_materializa_periodo_nunca_calculado(self):
+        mapa = ler_mapa([self.formador, self.outro], self.dias)
+
+        self.assertEqual(mapa[self.formador.id], ["-"] * 31)
+        self.assertEqual(MapaDisponibilidadeDia.objects.count(), 2 * len(self.dias))
+        self.assertEqual(verificar([self.formador, self.outro], self.dias), [])
+
+    def test_signals_recalculam_apenas_celulas_afetadas(self):
+        ler_mapa([self.formador, self.outro], self.dias)
+        dia = date(2025, 3, 12)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bloqueio = DisponibilidadeFormadores.objects.create(
+                usuario=self.usuario,
+                data_bloqueio=dia,
+                hora_inicio=time(8),
+                hora_fim=time(18),
+                tipo_bloqueio="total",
+            )
+        self.assertEqual(self._codigo(self.formador, dia), "T")
+        self.assertEqual(
+            MapaDisponibilidadeDia.objects.filter(formador=self.formador)
+            .exclude(codigo="-")
+            .count(),
+            1,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Deslocamento.objects.create(
+                data=date(2025, 3, 20),
+                origem="Fortaleza",
+                destino="Caucaia",
+                pessoa_1=self.outro,
+            )
+        self.assertEqual(self._codigo(self.outro, date(2025, 3, 20)), "D")
+
+        # Mover o bloqueio recalcula o dia antigo e o novo
+        with self.captureOnCommitCallbacks(execute=True):
+            bloqueio.data_bloqueio = date(2025, 3, 13)
+            bloqueio.save()
+        self.assertEqual(self._codigo(self.formador, dia), "-")
+        self.assertEqual(self._codigo(self.formador, date(2025, 3, 13)), "T")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bloqueio.delete()
+        self.assertEqual(self._codigo(self.formador, date(2025, 3, 13)), "-")
+
+        self.assertEqual(verificar([self.formador, self.outro], self.dias), [])
+
+    def test_comando_reconstroi_e_detecta_divergencia(self):
+        ler_mapa([self.formador], self.dias)
+        MapaDisponibilidadeDia.objects.filter(
+            formador=self.formador, data=date(2025, 3, 5)
+        ).update(codigo="T")
+
+        divergencias = verificar([self.formador], self.dias)
+        self.assertEqual(
+            [(d, gravado, esperado) for _, d, gravado, esperado in divergencias],
+            [(date(2025, 3, 5), "T", "-")],
+        )
+
+        saida = StringIO()
+        call_command(
+            "materializar_mapa_disponibilidade",
+            ano=2025,
+            mes=3,
+            meses=1,
+            stdout=saida,
+        )
+        self.assertIn("Tabela consistente", saida.getvalue())
+        self.assertEqual(self._codigo(self.formador, date(2025, 3, 5)), "-")
@@ -0,0 +1,94 @@
+"""
+Testes do contador de notificações não lidas.
+"""
+
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.models import Notificacao
+from core.services import notification_counter
+
+User = get_user_model()
+
+
+class NotificationCounterTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.usuario = User.objects.create_user(username="contador.user")
+
+    def _criar(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Notificacao.objects.create(
+                usuario=self.usuario,
+                tipo="sistema_atualizacao",
+                titulo="Aviso",
+                mensagem="...",
+                **kwargs,
+            )
+
+    def test_counter_follows_create_read_and_delete_without_counting(self):
+        primeira = self._criar()
+        self.assertEqual(notification_counter.get_unread_count(self.usuario.id), 1)
+
+        segunda = self._criar()
+        self._criar(lida=True)
+        with self.assertNumQueries(0):
+            self.assertEqual(notification_counter.get_unread_count(self.usuario.id), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(notification_counter.marcar_como_lida(primeira), 1)
+            # Marcar de novo não decrementa
+            self.assertEqual(notification_counter.marcar_como_lida(primeira), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            segunda.delete()
+        self.assertEqual(notification_counter.get_unread_count(self.usuario.id), 0)
+
+    def test_mark_all_resets_counter(self):
+        self._criar()
+        self._criar()
+        notification_counter.get_unread_count(self.usuario.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            alteradas = notification_counter.marcar_todas_como_lidas(self.usuario.id)
+
+        self.assertEqual(alteradas, 2)
+        self.assertEqual(notification_counter.get_unread_count(self.usuario.id), 0)
+
+    def test_reconciliation_command_detects_and_fixes_drift(self):
+        self._criar()
+        notification_counter.definir(self.usuario.id, 5)
+
+        with self.assertRaises(CommandError):
+            call_command("reconciliar_contadores_notificacoes", stdout=StringIO())
+
+        call_command(
+            "reconciliar_contadores_notificacoes", "--corrigir", stdout=StringIO()
+        )
+        self.assertEqual(notification_counter.get_unread_count(self.usuario.id), 1)
+        self.assertEqual(notification_counter.reconciliar(), [])
+
+
+class CounterTimeoutTest(SimpleTestCase):
+    def test_local_cache_expires_within_seconds(self):
+        with override_settings(
+            CACHES={
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+            }
+        ):
+            self.assertEqual(notification_counter._timeout(), 5)
+        with override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                    "LOCATION": "redis://localhost:6379/1",
+                }
+            }
+        ):
+            self.assertEqual(notification_counter._timeout(), 7 * 24 * 3600)
+        with override_settings(NOTIFICATION_COUNTER_TIMEOUT=60):
+            self.assertEqual(notification_counter._timeout(), 60)
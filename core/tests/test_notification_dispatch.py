@@ -0,0 +1,165 @@
+"""
+Testes da fila de envio das comunicações (e-mail e canais móveis)
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import (
+    FormadoresSolicitacao,
+    LogComunicacao,
+    Municipio,
+    Projeto,
+    Setor,
+    Solicitacao,
+    TipoEvento,
+)
+from core.services import notification_dispatch
+from core.services.google_apis_integration import GmailService
+from core.tests.fake_smtp import FakeSMTPServer
+
+Usuario = get_user_model()
+
+
+class BackendMovelFake:
+    """Backend móvel de teste: registra instâncias e mensagens"""
+
+    instancias = []
+
+    def __init__(self):
+        self.enviadas = []
+        self.fechado = False
+        BackendMovelFake.instancias.append(self)
+
+    def enviar(self, canal, endereco, assunto, conteudo):
+        self.enviadas.append((canal, endereco))
+
+    def close(self):
+        self.fechado = True
+
+
+@override_settings(BACKGROUND_JOBS_BACKEND="sync")
+class FilaComunicacoesTest(TestCase):
+    def setUp(self):
+        self.server = FakeSMTPServer().start()
+        self.addCleanup(self.server.stop)
+        smtp = self.settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST="127.0.0.1",
+            EMAIL_PORT=self.server.port,
+            EMAIL_USE_TLS=False,
+            EMAIL_HOST_USER="",
+            EMAIL_HOST_PASSWORD="",
+        )
+        smtp.enable()
+        self.addCleanup(smtp.disable)
+
+        self.solicitante = Usuario.objects.create_user(
+            username="coord.fila", email="coord@exemplo.com"
+        )
+        setor = Setor.objects.create(nome="Setor Fila", sigla="SFIL")
+        self.solicitacao = Solicitacao.objects.create(
+            usuario_solicitante=self.solicitante,
+            projeto=Projeto.objects.create(nome="Projeto Fila", setor=setor),
+            municipio=Municipio.objects.create(nome="Sobral", uf="CE"),
+            tipo_evento=TipoEvento.objects.create(nome="Formação Fila"),
+            titulo_evento="Evento Fila",
+            data_inicio=timezone.now() + timedelta(days=1),
+            data_fim=timezone.now() + timedelta(days=1, hours=4),
+        )
+
+    def _formadores(self, *emails):
+        for i, email in enumerate(emails):
+            formador = Usuario.objects.create_user(username=f"formador{i}", email=email)
+            FormadoresSolicitacao.objects.create(
+                solicitacao=self.solicitacao, usuario=formador
+            )
+
+    def test_notificacao_enfileira_e_envia_o_lote_numa_conexao(self):
+        self._formadores("f1@exemplo.com", "f2@exemplo.com", "")
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.assertTrue(
+                GmailService().send_event_notification(self.solicitacao, "approval")
+            )
+
+        # Nada foi entregue durante a chamada
+        self.assertEqual(self.server.connections, 0)
+        self.assertEqual(
+            LogComunicacao.objects.filter(
+                tipo_comunicacao="email", status_envio="pendente"
+            ).count(),
+            3,
+        )
+
+        for callback in callbacks:
+            callback()
+
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(
+            sorted(m["to"][0] for m in self.server.messages),
+            ["coord@exemplo.com", "f1@exemplo.com", "f2@exemplo.com"],
+        )
+        self.assertFalse(
+            LogComunicacao.objects.exclude(status_envio="enviado").exists()
+        )
+        self.assertFalse(
+            LogComunicacao.objects.filter(enviado_em__isnull=True).exists()
+        )
+
+    @override_settings(NOTIFICATION_DISPATCH_MAX_TENTATIVAS=2)
+    def test_falha_volta_para_a_fila_com_backoff(self):
+        self._formadores("falha@exemplo.com")
+        notification_dispatch.enfileirar_emails(
+            [(self.solicitante, "coord@exemplo.com"), (None, "falha@exemplo.com")],
+            assunto="Aviso",
+            conteudo="Texto",
+            html="<p>Texto</p>",
+        )
+
+        resumo = notification_dispatch.processar_pendentes()
+
+        self.assertEqual((resumo["enviadas"], resumo["falhas"]), (1, 1))
+        self.assertEqual(self.server.connections, 1)
+        self.assertIn("text/html", self.server.messages[0]["data"])
+        falha = LogComunicacao.objects.get(endereco_destinatario="falha@exemplo.com")
+        self.assertEqual((falha.status_envio, falha.tentativas), ("pendente", 1))
+        self.assertGreater(falha.proxima_tentativa, timezone.now())
+        self.assertIn("550", falha.erro_envio)
+
+        # Ainda no backoff: nada a enviar
+        self.assertEqual(notification_dispatch.processar_pendentes()["mensagens"], 0)
+
+        LogComunicacao.objects.filter(pk=falha.pk).update(
+            proxima_tentativa=timezone.now()
+        )
+        notification_dispatch.processar_pendentes()
+        falha.refresh_from_db()
+        self.assertEqual((falha.status_envio, falha.tentativas), ("falhado", 2))
+
+    def test_canais_moveis_so_com_backend_configurado(self):
+        for canal in ("whatsapp", "sms"):
+            LogComunicacao.objects.create(
+                usuario_destinatario=self.solicitante,
+                tipo_comunicacao=canal,
+                endereco_destinatario="+5585999990000",
+                assunto="Aviso",
+                conteudo="Texto",
+            )
+
+        self.assertEqual(notification_dispatch.processar_pendentes()["mensagens"], 0)
+
+        BackendMovelFake.instancias = []
+        with self.settings(
+            NOTIFICATION_DISPATCH_MOBILE_BACKEND=f"{__name__}.BackendMovelFake"
+        ):
+            resumo = notification_dispatch.processar_pendentes()
+
+        self.assertEqual(resumo["enviadas"], 2)
+        (backend,) = BackendMovelFake.instancias
+        self.assertTrue(backend.fechado)
+        self.assertEqual(sorted(c for c, _ in backend.enviadas), ["sms", "whatsapp"])
+        self.assertEqual(self.server.connections, 0)
@@ -0,0 +1,134 @@
+"""
+Testes da distribuição em lote das notificações de grupo
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.models import (
+    FormadoresSolicitacao,
+    LogComunicacao,
+    Municipio,
+    Notificacao,
+    Projeto,
+    Setor,
+    Solicitacao,
+    TipoEvento,
+)
+from core.services import notification_counter, notifications
+from core.services.notification_fanout import Distribuicao
+from core.services.notifications_simplified import NotificationService
+
+Usuario = get_user_model()
+
+
+class DistribuicaoNotificacoesTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.aprovador = Usuario.objects.create_user(username="super.fanout")
+        self.solicitante = Usuario.objects.create_user(username="coord.fanout")
+        self.controle = Group.objects.create(name="controle")
+        setor = Setor.objects.create(nome="Setor Fanout", sigla="SFAN")
+        projeto = Projeto.objects.create(nome="Projeto Fanout", setor=setor)
+        municipio = Municipio.objects.create(nome="Crato", uf="CE")
+        tipo_evento = TipoEvento.objects.create(nome="Formação Fanout")
+        self.solicitacoes = [
+            Solicitacao.objects.create(
+                usuario_solicitante=self.solicitante,
+                projeto=projeto,
+                municipio=municipio,
+                tipo_evento=tipo_evento,
+                titulo_evento=f"Evento {i}",
+                data_inicio=timezone.now() + timedelta(days=1),
+                data_fim=timezone.now() + timedelta(days=1, hours=4),
+            )
+            for i in range(2)
+        ]
+
+    def _membros(self, n, prefixo):
+        usuarios = [
+            Usuario.objects.create_user(username=f"{prefixo}{i}") for i in range(n)
+        ]
+        for usuario in usuarios:
+            usuario.groups.add(self.controle)
+            FormadoresSolicitacao.objects.create(
+                solicitacao=self.solicitacoes[0], usuario=usuario
+            )
+        return usuarios
+
+    def _consultas(self):
+        Notificacao.objects.all().delete()
+        LogComunicacao.objects.all().delete()
+        with CaptureQueriesContext(connection) as ctx:
+            resultado = NotificationService().notify_solicitacao_approved(
+                self.solicitacoes[0], self.aprovador
+            )
+        self.assertTrue(resultado["success"])
+        return len(ctx.captured_queries)
+
+    def test_consultas_nao_crescem_com_o_grupo(self):
+        self._membros(2, "a")
+        poucos = self._consultas()
+        self._membros(6, "b")
+        muitos = self._consultas()
+
+        self.assertEqual(poucos, muitos)
+        # Solicitante + 8 do controle + 8 formadores
+        self.assertEqual(Notificacao.objects.count(), 17)
+        self.assertEqual(LogComunicacao.objects.count(), 17)
+        self.assertEqual(
+            LogComunicacao.objects.filter(grupo_destinatario="controle").count(), 8
+        )
+
+    def test_lote_le_os_membros_uma_vez_e_atualiza_contadores(self):
+        (membro,) = self._membros(1, "c")
+        notification_counter.definir(membro.id, 0)
+        servico = NotificationService()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            servico.notify_solicitacao_approved(self.solicitacoes[0], self.aprovador)
+        with CaptureQueriesContext(connection) as ctx:
+            servico.notify_solicitacao_approved(self.solicitacoes[1], self.aprovador)
+
+        self.assertFalse(
+            any("auth_user_groups" in q["sql"] for q in ctx.captured_queries)
+        )
+        # Membro do controle e formador da primeira solicitação
+        self.assertEqual(notification_counter.get_unread_count(membro.id), 2)
+
+    @override_settings(BASE_URL="http://testserver")
+    def test_grupo_monta_a_mensagem_uma_vez(self):
+        membros = self._membros(4, "d")
+        for i, membro in enumerate(membros[:3]):
+            membro.email = f"membro{i}@example.com"
+            membro.save()
+        servico = notifications.NotificationService()
+
+        with (
+            patch.object(
+                notifications, "render_to_string", return_value="<p>Pré-agenda</p>"
+            ) as render,
+            patch.object(notifications, "send_mail") as envio,
+            patch.object(
+                Distribuicao, "notificar", autospec=True, return_value=3
+            ) as notificar,
+        ):
+            resultado = servico._notify_controle_pre_agenda(self.solicitacoes[0])
+
+        self.assertEqual(resultado["emails_sent"], 3)
+        render.assert_called_once()
+        # send_mail continua por destinatário; quem não tem e-mail fica de fora
+        self.assertEqual(
+            [c.kwargs["recipient_list"] for c in envio.call_args_list],
+            [[f"membro{i}@example.com"] for i in range(3)],
+        )
+        notificar.assert_called_once()
+        self.assertEqual(list(notificar.call_args.args[1]), membros[:3])
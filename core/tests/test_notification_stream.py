@@ -0,0 +1,107 @@
+"""
+Testes do canal de notificações por usuário (push SSE).
+"""
+
+import asyncio
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, RequestFactory, TestCase
+
+from asgiref.sync import sync_to_async
+
+from core.models import Notificacao
+from core.services.notification_push import canal_usuario
+from core.services.realtime_broker import InMemoryBroker, get_broker, set_broker
+from core.views.api_notifications import NotificationStreamAPI
+
+User = get_user_model()
+
+
+class NotificationStreamTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.anterior = get_broker()
+        self.broker = InMemoryBroker()
+        set_broker(self.broker)
+        self.usuario = User.objects.create_user(username="stream.user")
+        Notificacao.objects.create(
+            usuario=self.usuario,
+            tipo="sistema_atualizacao",
+            titulo="Antiga",
+            mensagem="...",
+        )
+
+    def tearDown(self):
+        set_broker(self.anterior)
+
+    async def _proximo(self, stream):
+        chunk = await asyncio.wait_for(anext(stream), timeout=1)
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode()
+        return json.loads(chunk[len("data: ") :])
+
+    def _request(self, usuario, factory=AsyncRequestFactory):
+        request = factory().get("/api/notifications/stream/")
+        request.user = usuario
+        return request
+
+    def _criar_notificacao(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Notificacao.objects.create(
+                usuario=self.usuario,
+                tipo="solicitacao_aprovada",
+                titulo="Solicitação aprovada",
+                mensagem="Sua solicitação foi aprovada",
+            )
+
+    def test_wsgi_stream_is_sync(self):
+        response = NotificationStreamAPI.as_view()(
+            self._request(self.usuario, factory=RequestFactory)
+        )
+        self.assertFalse(response.is_async)
+        stream = iter(response.streaming_content)
+
+        conectado = json.loads(next(stream).decode()[len("data: ") :])
+        self.assertEqual(conectado["type"], "connected")
+        self.assertEqual(conectado["unread_count"], 1)
+
+        self._criar_notificacao()
+        mensagem = json.loads(next(stream).decode()[len("data: ") :])
+        self.assertEqual(mensagem["type"], "notification")
+        self.assertEqual(mensagem["notification"]["titulo"], "Solicitação aprovada")
+
+        response.close()
+        self.assertEqual(
+            self.broker.subscriber_count(canal_usuario(self.usuario.id)), 0
+        )
+
+    async def test_stream_pushes_new_notifications_without_polling(self):
+        response = NotificationStreamAPI.as_view()(self._request(self.usuario))
+        self.assertTrue(response.is_async)
+        stream = aiter(response.streaming_content)
+
+        conectado = await self._proximo(stream)
+        self.assertEqual(conectado["type"], "connected")
+        self.assertEqual(conectado["unread_count"], 1)
+        self.assertEqual(
+            self.broker.subscriber_count(canal_usuario(self.usuario.id)), 1
+        )
+
+        await sync_to_async(self._criar_notificacao)()
+        mensagem = await self._proximo(stream)
+
+        self.assertEqual(mensagem["type"], "notification")
+        self.assertEqual(mensagem["unread_delta"], 1)
+        self.assertEqual(mensagem["notification"]["titulo"], "Solicitação aprovada")
+        self.assertEqual(
+            mensagem["notification"]["icon"], "bi-check-circle-fill text-success"
+        )
+
+    async def test_stream_requires_authentication(self):
+        from django.contrib.auth.models import AnonymousUser
+
+        response = NotificationStreamAPI.as_view()(self._request(AnonymousUser()))
+
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,103 @@
+"""
+Testes do cache de papéis por requisição e por sessão
+"""
+
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from core.services.papeis import carregar_da_sessao, papeis_de
+
+Usuario = get_user_model()
+
+
+@override_settings(PAPEIS_CACHE_SESSAO=True)
+class PapeisTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.usuario = Usuario.objects.create_user(username="coord.papeis")
+        self.coordenador = Group.objects.create(name="coordenador")
+        self.controle = Group.objects.create(name="controle")
+        self.usuario.groups.add(self.coordenador)
+
+    def _requisicao(self, session):
+        """Nova instância do usuário, como em cada requisição"""
+        return carregar_da_sessao(Usuario.objects.get(pk=self.usuario.pk), session)
+
+    def test_consulta_uma_vez_por_requisicao(self):
+        usuario = Usuario.objects.get(pk=self.usuario.pk)
+        papeis = papeis_de(usuario)
+
+        with self.assertNumQueries(0):
+            for _ in range(5):
+                self.assertTrue(papeis_de(usuario).tem("coordenador"))
+                self.assertFalse(papeis_de(usuario).tem_algum(["controle", "admin"]))
+                usuario.has_perm("core.add_solicitacao")
+        self.assertEqual(papeis.grupos, ("coordenador",))
+
+    def test_sessao_reaproveita_ate_mudar_o_carimbo(self):
+        session = {}
+        self._requisicao(session)
+        with self.assertNumQueries(1):  # só o usuário
+            self.assertEqual(self._requisicao(session).grupos, ("coordenador",))
+
+        self.usuario.groups.add(self.controle)
+        self.assertTrue(self._requisicao(session).tem("controle"))
+
+        self.usuario.groups.remove(self.coordenador)
+        self.assertEqual(self._requisicao(session).grupos, ("controle",))
+
+        with self.assertNumQueries(1):
+            self._requisicao(session)
+        call_command("setup_roles", stdout=StringIO())
+        with self.assertNumQueries(4):  # usuário, grupos e permissões
+            self._requisicao(session)
+
+    def test_permissoes_e_superusuario_trocam_o_carimbo(self):
+        session = {}
+        self._requisicao(session)
+        carimbos = [session["_papeis"]["versao"]]
+
+        def alterado():
+            self._requisicao(session)
+            carimbos.append(session["_papeis"]["versao"])
+            return carimbos[-1] != carimbos[-2]
+
+        self.coordenador.permissions.add(
+            Permission.objects.get(codename="change_solicitacao")
+        )
+        self.assertTrue(alterado())
+
+        self.usuario.user_permissions.add(
+            Permission.objects.get(codename="delete_solicitacao")
+        )
+        self.assertTrue(alterado())
+
+        # save(update_fields) de campos alheios aos papéis não invalida
+        self.usuario.save(update_fields=["last_login"])
+        self.assertFalse(alterado())
+
+        self.usuario.is_superuser = True
+        self.usuario.save()
+        self.assertTrue(alterado())
+        self.assertIn("core.add_solicitacao", self._requisicao(session).permissoes)
+
+    @override_settings(PAPEIS_CACHE_SESSAO=None)
+    def test_sem_cache_compartilhado_fica_na_requisicao(self):
+        # LocMemCache: cada processo teria o próprio carimbo
+        session = {}
+        self.assertEqual(self._requisicao(session).grupos, ("coordenador",))
+        self.assertNotIn("_papeis", session)
+
+        self.client.force_login(self.usuario)
+        self.client.get("/")
+        self.assertNotIn("_papeis", self.client.session)
+
+    def test_middleware_usa_a_sessao(self):
+        self.client.force_login(self.usuario)
+        self.client.get("/")
+        self.assertEqual(self.client.session["_papeis"]["grupos"], ["coordenador"])
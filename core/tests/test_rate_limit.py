@@ -0,0 +1,111 @@
+"""
+Testes do limite de requisições por janela deslizante
+"""
+
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from core.middleware.security import RateLimitingMiddleware
+from core.services.rate_limit import (
+    JanelaDeslizanteCache,
+    JanelaDeslizanteMemoria,
+    criar_limitador,
+)
+
+Usuario = get_user_model()
+
+GRUPOS = [
+    {"nome": "login", "prefixos": ["/login/"], "limite": 2, "janela": 60},
+    {"nome": "api", "prefixos": ["/api/"], "limite": 3, "janela": 60},
+]
+
+
+class JanelaDeslizanteTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _permitidas(self, limitador, instante, n, limite=10):
+        with patch("time.time", return_value=instante):
+            return sum(
+                limitador.permitir("ip:1", limite, 60).permitido for _ in range(n)
+            )
+
+    def test_janela_anterior_pesa_pela_fracao_restante(self):
+        for limitador in (JanelaDeslizanteMemoria(), JanelaDeslizanteCache()):
+            self.assertEqual(self._permitidas(limitador, 600.0, 12), 10)
+            # 15 s na janela seguinte: 12 × 0,75 = 9 da anterior ainda contam
+            self.assertEqual(self._permitidas(limitador, 675.0, 3), 1)
+            # Duas janelas depois a anterior está vazia
+            self.assertEqual(self._permitidas(limitador, 780.0, 12), 10)
+
+    def test_recusa_informa_quando_tentar(self):
+        limitador = JanelaDeslizanteMemoria()
+        self._permitidas(limitador, 630.0, 10)
+        with patch("time.time", return_value=630.0):
+            decisao = limitador.permitir("ip:1", 10, 60)
+        self.assertFalse(decisao.permitido)
+        self.assertEqual(decisao.tentar_em, 31)
+
+    def test_memoria_descarta_as_chaves_mais_antigas(self):
+        limitador = JanelaDeslizanteMemoria(max_chaves=2)
+        for chave in ("a", "b", "a", "c"):
+            limitador.permitir(chave, 10, 60)
+        self.assertEqual(list(limitador._contadores), ["a:60", "c:60"])
+
+    @override_settings(IS_PRODUCTION=True)
+    def test_avisa_quando_o_cache_e_local(self):
+        locmem = {
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        }
+        with override_settings(CACHES=locmem):
+            with self.assertLogs("core.services.rate_limit", "WARNING"):
+                criar_limitador()
+        redis = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "redis://localhost:6379",
+            }
+        }
+        with override_settings(CACHES=redis):
+            with self.assertNoLogs("core.services.rate_limit", "WARNING"):
+                criar_limitador()
+
+
+@override_settings(IS_PRODUCTION=True, RATE_LIMIT_GRUPOS=GRUPOS)
+class RateLimitingMiddlewareGruposTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _status(self, middleware, path, user=None, ip="10.0.0.1"):
+        request = RequestFactory().get(path, REMOTE_ADDR=ip)
+        request.user = user or AnonymousUser()
+        response = middleware.process_request(request)
+        return response.status_code if response else 200
+
+    def test_limite_por_grupo_e_identidade_compartilhado(self):
+        # Dois workers com o mesmo cache
+        workers = [RateLimitingMiddleware(lambda r: HttpResponse()) for _ in range(2)]
+        usuario = Usuario.objects.create_user(username="limitado")
+
+        self.assertEqual(
+            [self._status(workers[i % 2], "/login/") for i in range(3)], [200, 200, 429]
+        )
+        # Outro grupo e outro IP têm contadores próprios
+        self.assertEqual(self._status(workers[0], "/api/x/"), 200)
+        self.assertEqual(self._status(workers[0], "/login/", ip="10.0.0.2"), 200)
+        # Autenticado: conta por usuário, não pelo IP
+        self.assertEqual(
+            [self._status(workers[i % 2], "/api/x/", usuario) for i in range(4)],
+            [200, 200, 200, 429],
+        )
+        # Rotas fora dos grupos não são limitadas
+        self.assertEqual(self._status(workers[0], "/mapa/"), 200)
+
+        request = RequestFactory().get("/login/", REMOTE_ADDR="10.0.0.1")
+        request.user = AnonymousUser()
+        self.assertIn("Retry-After", workers[0].process_request(request))
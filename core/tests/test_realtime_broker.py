@@ -0,0 +1,144 @@
+"""
+Testes do pub/sub em tempo real e do stream SSE do mapa.
+"""
+
+import asyncio
+import json
+import threading
+
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase, TestCase
+
+from core.services.realtime_broker import (
+    MAPA_CHANNEL,
+    InMemoryBroker,
+    get_broker,
+    set_broker,
+)
+from core.views.mapa_realtime_views import MapaRealtimeAPIView
+
+
+class InMemoryBrokerTest(SimpleTestCase):
+    async def test_publish_from_other_thread_reaches_subscribers(self):
+        broker = InMemoryBroker()
+
+        async with broker.subscribe("canal") as a, broker.subscribe("canal") as b:
+            self.assertEqual(broker.subscriber_count("canal"), 2)
+            thread = threading.Thread(target=broker.publish, args=("canal", {"n": 1}))
+            thread.start()
+            thread.join()
+
+            self.assertEqual(await a.get(timeout=1), {"n": 1})
+            self.assertEqual(await b.get(timeout=1), {"n": 1})
+            self.assertIsNone(await a.get(timeout=0.01))
+
+        self.assertEqual(broker.subscriber_count("canal"), 0)
+        self.assertEqual(broker.publish("canal", {"n": 2}), 0)
+
+    def test_sync_subscription_receives_from_other_thread(self):
+        broker = InMemoryBroker(max_queue=2)
+
+        with broker.subscribe_sync("canal") as assinatura:
+            self.assertEqual(broker.subscriber_count("canal"), 1)
+            for n in range(3):
+                thread = threading.Thread(
+                    target=broker.publish, args=("canal", {"n": n})
+                )
+                thread.start()
+                thread.join()
+
+            self.assertEqual(assinatura.get(timeout=1), {"n": 1})
+            self.assertEqual(assinatura.get(timeout=1), {"n": 2})
+            self.assertIsNone(assinatura.get(timeout=0.01))
+
+        self.assertEqual(broker.subscriber_count("canal"), 0)
+
+    async def test_slow_subscriber_keeps_latest_messages(self):
+        broker = InMemoryBroker(max_queue=2)
+
+        async with broker.subscribe("canal") as assinatura:
+            for n in range(3):
+                broker.publish("canal", {"n": n})
+            await asyncio.sleep(0)
+
+            self.assertEqual(await assinatura.get(timeout=1), {"n": 1})
+            self.assertEqual(await assinatura.get(timeout=1), {"n": 2})
+
+
+class MapaRealtimeStreamTest(TestCase):
+    # TestCase: response.close() dispara request_finished, que fecha as
+    # conexões antigas do banco
+    def setUp(self):
+        self.anterior = get_broker()
+        self.broker = InMemoryBroker()
+        set_broker(self.broker)
+
+    def tearDown(self):
+        set_broker(self.anterior)
+
+    async def _proximo(self, stream):
+        chunk = await asyncio.wait_for(anext(stream), timeout=1)
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode()
+        self.assertTrue(chunk.startswith("data: "))
+        return json.loads(chunk[len("data: ") :])
+
+    def _proximo_sync(self, stream):
+        chunk = next(stream)
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode()
+        self.assertTrue(chunk.startswith("data: "))
+        return json.loads(chunk[len("data: ") :])
+
+    def test_wsgi_stream_is_sync_and_delivers_updates(self):
+        request = RequestFactory().get("/api/mapa/realtime/")
+        view = MapaRealtimeAPIView.as_view(heartbeat_seconds=0.05)
+
+        response = view(request)
+        self.assertFalse(response.is_async)
+        stream = iter(response.streaming_content)
+
+        self.assertEqual(self._proximo_sync(stream)["type"], "connected")
+        self.assertEqual(self._proximo_sync(stream)["type"], "heartbeat")
+        self.assertEqual(self.broker.subscriber_count(MAPA_CHANNEL), 1)
+
+        self.broker.publish(
+            MAPA_CHANNEL, {"type": "mapa_update", "estados_afetados": ["CE"]}
+        )
+        evento = self._proximo_sync(stream)
+        while evento["type"] == "heartbeat":
+            evento = self._proximo_sync(stream)
+        self.assertEqual(evento, {"type": "mapa_update", "estados_afetados": ["CE"]})
+
+        # Desconexão do cliente: o servidor WSGI fecha a resposta
+        response.close()
+        self.assertEqual(self.broker.subscriber_count(MAPA_CHANNEL), 0)
+
+    async def test_stream_delivers_published_updates(self):
+        request = AsyncRequestFactory().get("/api/mapa/realtime/")
+        view = MapaRealtimeAPIView.as_view(heartbeat_seconds=0.05)
+
+        response = view(request)
+        self.assertTrue(response.is_async)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+
+        self.assertEqual((await self._proximo(stream))["type"], "connected")
+        self.assertEqual((await self._proximo(stream))["type"], "heartbeat")
+        self.assertEqual(self.broker.subscriber_count(MAPA_CHANNEL), 1)
+
+        self.broker.publish(
+            MAPA_CHANNEL, {"type": "mapa_update", "estados_afetados": ["CE"]}
+        )
+        evento = await self._proximo(stream)
+        while evento["type"] == "heartbeat":
+            evento = await self._proximo(stream)
+
+        self.assertEqual(evento, {"type": "mapa_update", "estados_afetados": ["CE"]})
+
+        # Desconexão do cliente: o servidor ASGI cancela a leitura pendente
+        pendente = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.01)
+        pendente.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pendente
+        self.assertEqual(self.broker.subscriber_count(MAPA_CHANNEL), 0)
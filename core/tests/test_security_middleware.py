@@ -96,7 +96,7 @@ class AuditLogMiddlewareTest(TestCase):
             cpf='12345678901'
         )
 
-    @patch('core.models.LogAuditoria.objects.create')
+    @patch('core.services.audit_sink.registrar')
     def test_audit_sensitive_endpoints(self, mock_create):
         """Testa se endpoints sensíveis são auditados"""
         # Login
@@ -108,10 +108,10 @@ class AuditLogMiddlewareTest(TestCase):
         # Verificar se auditoria foi chamada
         mock_create.assert_called_once()
         call_args = mock_create.call_args[1]
-        self.assertEqual(call_args['usuario'], self.user)
+        self.assertEqual(call_args['usuario_id'], self.user.id)
         self.assertIn('GET /admin/', call_args['acao'])
 
-    @patch('core.models.LogAuditoria.objects.create')
+    @patch('core.services.audit_sink.registrar')
     def test_no_audit_for_non_sensitive_endpoints(self, mock_create):
         """Testa que endpoints não-sensíveis não são auditados"""
         # Login
@@ -123,7 +123,7 @@ class AuditLogMiddlewareTest(TestCase):
         # Auditoria NÃO deve ser chamada
         mock_create.assert_not_called()
 
-    @patch('core.models.LogAuditoria.objects.create')
+    @patch('core.services.audit_sink.registrar')
     def test_no_audit_for_unauthenticated_users(self, mock_create):
         """Testa que usuários não autenticados não geram auditoria"""
         # Request sem login
@@ -174,13 +174,17 @@ class RateLimitingMiddlewareTest(TestCase):
         # Mock time para controlar janela temporal
         mock_time.return_value = 60.0  # 1 minuto
 
+        from django.contrib.auth.models import AnonymousUser
+        from django.core.cache import cache
+        from django.test import RequestFactory
         from core.middleware.security import RateLimitingMiddleware
 
+        cache.clear()
         middleware = RateLimitingMiddleware(lambda r: HttpResponse("OK"))
 
-        # Mock request
-        request = MagicMock()
-        request.META = {'REMOTE_ADDR': '192.168.1.100'}
+        # Request anônimo para rota comum (grupo "geral")
+        request = RequestFactory().get('/', REMOTE_ADDR='192.168.1.100')
+        request.user = AnonymousUser()
 
         # Simular 101 requests (acima do limite de 100)
         for i in range(101):
@@ -0,0 +1,121 @@
+"""
+Testes da extração paralela de planilhas com snapshots por revisão
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+
+from django.test import SimpleTestCase
+
+from core.services.integrations.sheets_snapshots import ExtratorPlanilhas
+
+
+class FakeAba:
+    def __init__(self, title):
+        self.title = title
+
+
+class FakePlanilha:
+    """Mesma interface usada de gspread.Spreadsheet"""
+
+    def __init__(self, cliente, chave):
+        self.cliente = cliente
+        self.id = chave
+
+    def get_lastUpdateTime(self):
+        return self.cliente.revisoes[self.id]
+
+    def worksheets(self):
+        return [FakeAba(titulo) for titulo in self.cliente.abas[self.id]]
+
+    def values_batch_get(self, ranges):
+        with self.cliente.lock:
+            self.cliente.leituras.append((self.id, list(ranges)))
+            self.cliente.simultaneas += 1
+            self.cliente.maximo = max(self.cliente.maximo, self.cliente.simultaneas)
+        self.cliente.barreira.wait(timeout=1)
+        with self.cliente.lock:
+            self.cliente.simultaneas -= 1
+        if self.id == "quebrada":
+            raise RuntimeError("403")
+        return {
+            "valueRanges": [
+                {"range": r, "values": self.cliente.abas[self.id][t]}
+                for r, t in zip(ranges, self.cliente.abas[self.id])
+            ]
+        }
+
+
+class FakeGspread:
+    def __init__(self, abas, paralelas=1):
+        self.abas = abas
+        self.revisoes = {chave: "2025-09-01T10:00:00Z" for chave in abas}
+        self.leituras = []
+        self.lock = threading.Lock()
+        self.simultaneas = 0
+        self.maximo = 0
+        self.barreira = threading.Barrier(paralelas)
+
+    def open_by_key(self, chave):
+        return FakePlanilha(self, chave)
+
+
+class ExtratorPlanilhasTest(SimpleTestCase):
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.diretorio, ignore_errors=True)
+        self.cliente = FakeGspread(
+            {
+                "chave-u": {"Usuários": [["Nome"], ["Ana"]], "O'Brien": [["x"]]},
+                "chave-c": {"Projetos": [["Nome"], ["ACerta"]]},
+            },
+            paralelas=2,
+        )
+
+    def test_planilhas_em_paralelo_uma_leitura_por_planilha(self):
+        extrator = ExtratorPlanilhas(
+            self.cliente, diretorio=self.diretorio, max_workers=2
+        )
+
+        snapshots = extrator.extrair_todas(
+            {"usuarios": "chave-u", "controle": "chave-c"}
+        )
+
+        self.assertEqual(self.cliente.maximo, 2)
+        self.assertEqual(
+            sorted(self.cliente.leituras),
+            [("chave-c", ["'Projetos'"]), ("chave-u", ["'Usuários'", "'O''Brien'"])],
+        )
+        self.assertEqual(snapshots["usuarios"]["abas"]["Usuários"], [["Nome"], ["Ana"]])
+        self.assertEqual(extrator.estatisticas["baixadas"], 2)
+
+    def test_snapshot_reaproveitado_ate_mudar_a_revisao(self):
+        self.cliente.barreira = threading.Barrier(1)
+        ExtratorPlanilhas(self.cliente, diretorio=self.diretorio).extrair("chave-c")
+
+        extrator = ExtratorPlanilhas(self.cliente, diretorio=self.diretorio)
+        snapshot = extrator.extrair("chave-c")
+        self.assertEqual(len(self.cliente.leituras), 1)
+        self.assertEqual(snapshot["abas"], {"Projetos": [["Nome"], ["ACerta"]]})
+        self.assertEqual(extrator.estatisticas["em_cache"], 1)
+
+        self.cliente.revisoes["chave-c"] = "2025-09-02T08:00:00Z"
+        extrator.extrair("chave-c")
+        self.assertEqual(len(self.cliente.leituras), 2)
+        # Snapshot da revisão anterior removido
+        self.assertEqual(len(os.listdir(os.path.join(self.diretorio, "chave-c"))), 1)
+
+    def test_erro_numa_planilha_nao_interrompe_as_outras(self):
+        self.cliente.barreira = threading.Barrier(1)
+        self.cliente.abas["quebrada"] = {"Aba": []}
+        self.cliente.revisoes["quebrada"] = "r1"
+        extrator = ExtratorPlanilhas(self.cliente, diretorio=None)
+
+        snapshots = extrator.extrair_todas({"ok": "chave-c", "falha": "quebrada"})
+
+        self.assertIsNone(snapshots["falha"])
+        self.assertEqual(snapshots["ok"]["revisao"], "2025-09-01T10:00:00Z")
+        self.assertEqual(extrator.estatisticas["erros"], 1)
+        self.assertFalse(os.listdir(self.diretorio))
@@ -54,6 +54,7 @@ from .views.api_notifications import (
     MarkAllNotificationsReadAPI,
     MarkNotificationReadAPI,
     NotificationCountAPI,
+    NotificationStreamAPI,
     RealtimeNotificationsAPI,
     UserNotificationsAPI,
 )
@@ -325,6 +326,11 @@ urlpatterns = [
         RealtimeNotificationsAPI.as_view(),
         name="realtime_notifications_api",
     ),
+    path(
+        "api/notifications/stream/",
+        NotificationStreamAPI.as_view(),
+        name="notification_stream_api",
+    ),
     # APIs para logs de comunicação (apenas admin)
     path(
         "api/communications/logs/",
@@ -4,6 +4,7 @@ SEMANA 3 - DIA 2: Sistema de aprovação/rejeição aprimorado
 """
 
 import json
+import uuid
 
 from django.contrib.auth.decorators import login_required, permission_required
 from django.core.paginator import Paginator
@@ -22,7 +23,10 @@ from core.models import (
     Solicitacao,
     SolicitacaoStatus,
 )
+from core.services.background_jobs import enfileirar_apos_commit
 from core.services.conflicts import check_conflicts
+from core.services.notifications_simplified import notify_solicitacoes_approved_batch
+from core.signals.mapa_signals import publicar_atualizacao_em_lote
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -57,18 +61,10 @@ class BulkApprovalAPI(View):
                 )
 
             # Processar solicitações
-            resultados = []
-            erros = []
-
             with transaction.atomic():
-                for sol_id in solicitacao_ids:
-                    try:
-                        resultado = self._processar_solicitacao(
-                            sol_id, acao, justificativa, request.user
-                        )
-                        resultados.append(resultado)
-                    except Exception as e:
-                        erros.append({"solicitacao_id": sol_id, "erro": str(e)})
+                resultados, erros = self._processar_lote(
+                    solicitacao_ids, acao, justificativa, request.user
+                )
 
             # Preparar resposta
             total_processadas = len(resultados)
@@ -93,94 +89,129 @@ class BulkApprovalAPI(View):
         except Exception as e:
             return JsonResponse({"success": False, "error": f"Erro interno: {str(e)}"})
 
-    def _processar_solicitacao(self, sol_id, acao, justificativa, usuario):
-        """Processa uma solicitação individual"""
-        try:
-            solicitacao = get_object_or_404(Solicitacao, pk=sol_id)
+    def _processar_lote(self, solicitacao_ids, acao, justificativa, usuario):
+        """
+        Processa o lote com operações em conjunto: um SELECT ... FOR UPDATE
+        para todas as solicitações, bulk_create de aprovações e auditoria e
+        um único UPDATE de status. As notificações saem após o commit, em
+        um trabalho em segundo plano.
+
+        Returns:
+            (resultados, erros) na ordem dos IDs recebidos
+        """
+        if acao == "aprovar":
+            novo_status = SolicitacaoStatus.PRE_AGENDA
+            decisao = AprovacaoStatus.APROVADO
+        else:
+            novo_status = SolicitacaoStatus.REPROVADO
+            decisao = AprovacaoStatus.REPROVADO
+
+        pks = [self._parse_uuid(sol_id) for sol_id in solicitacao_ids]
+        solicitacoes = (
+            Solicitacao.objects.select_for_update(of=("self",))
+            .select_related("municipio", "projeto")
+            .in_bulk({pk for pk in pks if pk})
+        )
+
+        resultados = []
+        erros = []
+        aprovadas = []
+        logs = []
+        for sol_id, pk in zip(solicitacao_ids, pks):
+            if pk is None:
+                erros.append(
+                    {
+                        "solicitacao_id": sol_id,
+                        "erro": f"“{sol_id}” não é um UUID válido",
+                    }
+                )
+                continue
+
+            solicitacao = solicitacoes.get(pk)
+            if solicitacao is None:
+                erro = "Solicitação não encontrada"
+                logs.append(
+                    LogAuditoria(
+                        usuario=usuario,
+                        acao="RF04: ERRO na aprovação em lote",
+                        entidade_afetada_id=pk,
+                        detalhes=f"ERRO ao processar {acao}: {erro}",
+                    )
+                )
+                erros.append({"solicitacao_id": sol_id, "erro": erro})
+                continue
 
-            # Verificar se já foi processada
+            # Verificar se já foi processada (inclui IDs repetidos no lote)
             if solicitacao.status != SolicitacaoStatus.PENDENTE:
-                return {
-                    "success": False,
+                resultados.append(
+                    {
+                        "success": False,
+                        "solicitacao_id": sol_id,
+                        "titulo": solicitacao.titulo_evento,
+                        "erro": "Solicitação já foi processada",
+                    }
+                )
+                continue
+
+            solicitacao.status = novo_status
+            aprovadas.append(solicitacao)
+            logs.append(
+                LogAuditoria(
+                    usuario=usuario,
+                    acao=f"RF04: {acao} solicitação (lote)",
+                    entidade_afetada_id=solicitacao.id,
+                    detalhes=f"Solicitação '{solicitacao.titulo_evento}' — {acao}da em lote"
+                    f"{f' — justificativa: {justificativa}' if justificativa else ''}",
+                )
+            )
+            resultados.append(
+                {
+                    "success": True,
                     "solicitacao_id": sol_id,
                     "titulo": solicitacao.titulo_evento,
-                    "erro": "Solicitação já foi processada",
+                    "novo_status": novo_status,
+                    "acao": acao,
                 }
-
-            # Definir status baseado na ação
-            if acao == "aprovar":
-                novo_status = SolicitacaoStatus.PRE_AGENDA
-                decisao = AprovacaoStatus.APROVADO
-            else:
-                novo_status = SolicitacaoStatus.REPROVADO
-                decisao = AprovacaoStatus.REPROVADO
-
-            # Criar aprovação
-            aprovacao = Aprovacao.objects.create(
-                solicitacao=solicitacao,
-                usuario_aprovador=usuario,
-                status_decisao=decisao,
-                justificativa=justificativa,
             )
 
-            # Atualizar solicitação
-            solicitacao.status = novo_status
-            solicitacao.usuario_aprovador = usuario
-            solicitacao.data_aprovacao_rejeicao = timezone.now()
-            solicitacao.save(
-                update_fields=["status", "usuario_aprovador", "data_aprovacao_rejeicao"]
-            )
-
-            # Registrar auditoria
-            LogAuditoria.objects.create(
-                usuario=usuario,
-                acao=f"RF04: {acao} solicitação (lote)",
-                entidade_afetada_id=solicitacao.id,
-                detalhes=f"Solicitação '{solicitacao.titulo_evento}' — {acao}da em lote"
-                f"{f' — justificativa: {justificativa}' if justificativa else ''}",
+        if aprovadas:
+            Aprovacao.objects.bulk_create(
+                [
+                    Aprovacao(
+                        solicitacao=solicitacao,
+                        usuario_aprovador=usuario,
+                        status_decisao=decisao,
+                        justificativa=justificativa,
+                    )
+                    for solicitacao in aprovadas
+                ]
             )
-
-            # Enviar notificações (SEMANA 3 - DIA 4)
-            from core.services.notifications_simplified import (
-                notify_solicitacao_approved,
+            Solicitacao.objects.filter(pk__in=[s.pk for s in aprovadas]).update(
+                status=novo_status,
+                usuario_aprovador=usuario,
+                data_aprovacao_rejeicao=timezone.now(),
             )
+            # update() não dispara post_save: atualizar o mapa explicitamente
+            publicar_atualizacao_em_lote(aprovadas)
 
-            try:
-                if acao == "aprovar":
-                    notify_result = notify_solicitacao_approved(solicitacao, usuario)
-                    if notify_result["success"]:
-                        LogAuditoria.objects.create(
-                            usuario=usuario,
-                            acao="RF07: Notificações de aprovação enviadas",
-                            entidade_afetada_id=solicitacao.id,
-                            detalhes=f"Notificações enviadas: {notify_result['notifications_sent']}",
-                        )
-            except Exception as e:
-                # Erro nas notificações não deve interromper o processo
-                LogAuditoria.objects.create(
-                    usuario=usuario,
-                    acao="RF07: Erro em notificações de aprovação",
-                    entidade_afetada_id=solicitacao.id,
-                    detalhes=f"Erro: {str(e)}",
+            # Enviar notificações (SEMANA 3 - DIA 4) fora da requisição
+            if acao == "aprovar":
+                enfileirar_apos_commit(
+                    "notify_solicitacoes_approved_batch_task",
+                    notify_solicitacoes_approved_batch,
+                    [str(s.pk) for s in aprovadas],
+                    usuario.pk,
                 )
 
-            return {
-                "success": True,
-                "solicitacao_id": sol_id,
-                "titulo": solicitacao.titulo_evento,
-                "novo_status": novo_status,
-                "acao": acao,
-            }
+        LogAuditoria.objects.bulk_create(logs)
+        return resultados, erros
 
-        except Exception as e:
-            # Log do erro
-            LogAuditoria.objects.create(
-                usuario=usuario,
-                acao="RF04: ERRO na aprovação em lote",
-                entidade_afetada_id=sol_id,
-                detalhes=f"ERRO ao processar {acao}: {str(e)}",
-            )
-            raise
+    @staticmethod
+    def _parse_uuid(valor):
+        try:
+            return uuid.UUID(str(valor))
+        except ValueError:
+            return None
 
 
 @method_decorator(login_required, name="dispatch")
@@ -7,7 +7,8 @@ Endpoints para:
 2. ✅ Marcar notificações como lidas
 3. ✅ Contagem de não lidas (para badge)
 4. ✅ Polling em tempo real
-5. ✅ Logs de comunicação (apenas admin)
+5. ✅ Stream SSE por usuário (push, sem polling)
+6. ✅ Logs de comunicação (apenas admin)
 """
 
 import json
@@ -15,8 +16,9 @@ from datetime import timedelta
 
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
+from django.core.handlers.asgi import ASGIRequest
 from django.db.models import Count, Q
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.utils.decorators import method_decorator
@@ -24,10 +26,13 @@ from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 
 from core.models import LogComunicacao, Notificacao, Usuario
+from core.services import notification_counter
+from core.services.notification_push import canal_usuario
 from core.services.notifications_simplified import (
     get_unread_notifications_count,
     get_user_notifications,
 )
+from core.services.realtime_broker import get_broker
 
 
 @method_decorator(login_required, name="dispatch")
@@ -79,9 +84,7 @@ class UserNotificationsAPI(View):
 
             # Contadores
             total_count = Notificacao.objects.filter(usuario=request.user).count()
-            unread_count = Notificacao.objects.filter(
-                usuario=request.user, lida=False
-            ).count()
+            unread_count = notification_counter.get_unread_count(request.user.id)
 
             return JsonResponse(
                 {
@@ -161,14 +164,8 @@ class MarkNotificationReadAPI(View):
                     id=notification_id, usuario=request.user
                 )
 
-                if not notification.lida:
-                    notification.lida = True
-                    notification.save(update_fields=["lida"])
-
-                # Nova contagem de não lidas
-                unread_count = Notificacao.objects.filter(
-                    usuario=request.user, lida=False
-                ).count()
+                # Atualiza o contador e publica a nova contagem no canal
+                unread_count = notification_counter.marcar_como_lida(notification)
 
                 return JsonResponse(
                     {
@@ -202,10 +199,10 @@ class MarkAllNotificationsReadAPI(View):
     def post(self, request):
         """Marca todas as notificações do usuário como lidas."""
         try:
-            # Atualizar todas as não lidas
-            updated_count = Notificacao.objects.filter(
-                usuario=request.user, lida=False
-            ).update(lida=True)
+            # Atualizar todas as não lidas (contador vai a zero)
+            updated_count = notification_counter.marcar_todas_como_lidas(
+                request.user.id
+            )
 
             return JsonResponse(
                 {
@@ -230,9 +227,7 @@ class NotificationCountAPI(View):
     def get(self, request):
         """Retorna contagem de notificações não lidas."""
         try:
-            unread_count = Notificacao.objects.filter(
-                usuario=request.user, lida=False
-            ).count()
+            unread_count = notification_counter.get_unread_count(request.user.id)
 
             return JsonResponse({"success": True, "unread_count": unread_count})
 
@@ -293,9 +288,7 @@ class RealtimeNotificationsAPI(View):
                 )
 
             # Contagem atual de não lidas
-            unread_count = Notificacao.objects.filter(
-                usuario=request.user, lida=False
-            ).count()
+            unread_count = notification_counter.get_unread_count(request.user.id)
 
             return JsonResponse(
                 {
@@ -346,6 +339,72 @@ class RealtimeNotificationsAPI(View):
         return icons.get(tipo, "bi-info-circle")
 
 
+class NotificationStreamAPI(View):
+    """
+    Stream SSE de notificações do usuário logado.
+
+    Na conexão envia a contagem de não lidas; depois apenas repassa o que é
+    publicado no canal do usuário (novas notificações e mudanças de
+    contagem). Conexões ociosas não consultam o banco. Sob ASGI o stream é
+    assíncrono; sob WSGI é um gerador síncrono, como em MapaRealtimeAPIView.
+    """
+
+    heartbeat_seconds = 30
+
+    def get(self, request):
+        if not request.user.is_authenticated:
+            return JsonResponse(
+                {"success": False, "error": "Autenticação necessária"}, status=401
+            )
+
+        canal = canal_usuario(request.user.id)
+        if isinstance(request, ASGIRequest):
+            stream = self.event_stream_async(request.user.id, canal)
+        else:
+            stream = self.event_stream(request.user.id, canal)
+
+        response = StreamingHttpResponse(stream, content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def event_stream(self, usuario_id, canal):
+        with get_broker().subscribe_sync(canal) as assinatura:
+            # Assinar antes de contar: nada publicado depois se perde
+            unread_count = notification_counter.get_unread_count(usuario_id)
+            yield _sse(_conectado(unread_count))
+
+            while True:
+                mensagem = assinatura.get(timeout=self.heartbeat_seconds)
+                yield _sse(mensagem if mensagem is not None else _heartbeat())
+
+    async def event_stream_async(self, usuario_id, canal):
+        async with get_broker().subscribe(canal) as assinatura:
+            # Assinar antes de contar: nada publicado depois se perde
+            unread_count = await notification_counter.aget_unread_count(usuario_id)
+            yield _sse(_conectado(unread_count))
+
+            while True:
+                mensagem = await assinatura.get(timeout=self.heartbeat_seconds)
+                yield _sse(mensagem if mensagem is not None else _heartbeat())
+
+
+def _conectado(unread_count):
+    return {
+        "type": "connected",
+        "unread_count": unread_count,
+        "server_timestamp": timezone.now().isoformat(),
+    }
+
+
+def _heartbeat():
+    return {"type": "heartbeat", "server_timestamp": timezone.now().isoformat()}
+
+
+def _sse(data):
+    return f"data: {json.dumps(data)}\n\n"
+
+
 # ==================== LOGS DE COMUNICAÇÃO (APENAS ADMIN) ====================
 
 
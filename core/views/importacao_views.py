@@ -7,6 +7,7 @@ Funcionalidades migradas da branch feature/importacoes-planilhas
 import json
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.db import transaction
 from django.http import JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse_lazy
@@ -66,35 +67,18 @@ class CursosCSVProcessarView(LoginRequiredMixin, UserPassesTestMixin, View):
                     'error': 'Arquivo muito grande (máximo 10MB)'
                 })
 
-            # Ler conteúdo do arquivo com detecção automática de encoding
-            encodings = ['utf-8', 'utf-8-sig', 'latin1', 'cp1252', 'iso-8859-1']
-            csv_content = None
-
-            for encoding in encodings:
-                try:
-                    csv_file.seek(0)  # Reset file pointer
-                    csv_content = csv_file.read().decode(encoding)
-                    break
-                except (UnicodeDecodeError, UnicodeError):
-                    continue
-
-            if csv_content is None:
-                return JsonResponse({
-                    'success': False,
-                    'error': 'Não foi possível decodificar o arquivo CSV. Formatos suportados: UTF-8, Latin1, CP1252.'
-                })
-
-            # Processar CSV
+            # Processar CSV em streaming (encoding detectado pelo processador)
             processor = CursoCSVProcessor()
             ano_filter = int(ano_filter) if ano_filter and ano_filter.isdigit() else None
 
-            resultado = processor.process_csv_content(csv_content, ano_filter)
+            resultado = processor.process_csv_file(csv_file, ano_filter)
 
             return JsonResponse({
                 'success': True,
                 'importacao_id': str(resultado.get('importacao_id', '')),
                 'cursos_criados': resultado['cursos_criados'],
                 'cursos_atualizados': resultado['cursos_atualizados'],
+                'vinculos_criados': resultado.get('vinculos_criados', 0),
                 'errors': resultado['errors'],
                 'warnings': resultado['warnings']
             })
@@ -326,23 +310,18 @@ class ReprocessarVinculacaoAutomaticaView(LoginRequiredMixin, UserPassesTestMixi
             )
 
             processor = CursoCSVProcessor()
-            vinculos_criados = 0
-            warnings = []
-
-            for curso in cursos_sem_vinculo:
-                # Tentar vincular automaticamente
-                processor._try_link_projeto(curso)
+            cursos = list(cursos_sem_vinculo)
 
-                # Verificar se foi vinculado
-                if ProjetoCursoLink.objects.filter(curso_plataforma=curso).exists():
-                    vinculos_criados += 1
+            # Vinculação em lote (projetos e palavras-chave carregados uma vez)
+            with transaction.atomic():
+                vinculos_criados = processor.vincular_projetos(cursos)
 
             warnings = processor.warnings
 
             return JsonResponse({
                 'success': True,
                 'vinculos_criados': vinculos_criados,
-                'total_processados': cursos_sem_vinculo.count(),
+                'total_processados': len(cursos),
                 'warnings': warnings
             })
 
@@ -2,128 +2,91 @@
 Views para atualizações em tempo real do mapa
 """
 import json
-import time
+from django.core.handlers.asgi import ASGIRequest
 from django.http import StreamingHttpResponse, JsonResponse
 from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db.models import Count, Q
 from django.core.cache import cache
+from django.utils import timezone
 from datetime import datetime, timedelta
 
 from core.models import Municipio, Solicitacao, Projeto, SolicitacaoStatus
+from core.services.realtime_broker import MAPA_CHANNEL, get_broker
+
+
+def _sse(data):
+    return f"data: {json.dumps(data)}\n\n"
+
+
+def _heartbeat():
+    # Mantém a conexão viva
+    return {'type': 'heartbeat', 'timestamp': timezone.now().isoformat()}
+
+
+def _erro(e):
+    return _sse({
+        'type': 'error',
+        'timestamp': timezone.now().isoformat(),
+        'message': f'Erro no stream: {str(e)}'
+    })
 
 
 class MapaRealtimeAPIView(View):
     """
     API Server-Sent Events para atualizações em tempo real do mapa
+
+    Cada conexão é uma assinatura no canal do mapa, alimentada pelos signals
+    de Solicitacao; o cliente só recebe heartbeat periódico quando ocioso.
+    Sob ASGI o stream é assíncrono e não ocupa threads. Sob WSGI o Django
+    consumiria um stream assíncrono inteiro antes de enviar o primeiro byte,
+    então o stream é um gerador síncrono que ocupa a thread do worker.
     """
-    
+
+    heartbeat_seconds = 30
+
     def get(self, request):
         """
         Retorna um stream de Server-Sent Events com atualizações do mapa
-        Apenas quando há mudanças reais, não faz polling constante
+        Apenas quando há mudanças reais, sem polling
         """
-        def event_stream():
-            # Enviar heartbeat inicial
-            yield f"data: {json.dumps({'type': 'connected', 'timestamp': timezone.now().isoformat()})}\n\n"
-            
-            # Usar cache para detectar mudanças
-            last_cache_key = 'mapa_last_update'
-            last_update = cache.get(last_cache_key)
-            
-            if not last_update:
-                # Primeira vez, definir timestamp atual
-                cache.set(last_cache_key, timezone.now().isoformat(), timeout=3600)
-                yield f"data: {json.dumps({'type': 'initialized', 'timestamp': timezone.now().isoformat()})}\n\n"
-            
-            # Manter conexão viva com heartbeat a cada 30 segundos
-            heartbeat_count = 0
-            while True:
-                try:
-                    # Verificar se houve mudanças no cache
-                    current_update = cache.get(last_cache_key)
-                    
-                    if current_update and current_update != last_update:
-                        # Houve mudança! Buscar dados atualizados
-                        novas_solicitacoes = (
-                            Solicitacao.objects
-                            .filter(
-                                status__in=[
-                                    SolicitacaoStatus.APROVADO,
-                                    SolicitacaoStatus.PRE_AGENDA,
-                                ]
-                            )
-                            .select_related('municipio', 'projeto')
-                            .values(
-                                'municipio__nome',
-                                'municipio__uf',
-                                'projeto__nome',
-                                'data_solicitacao'
-                            )
-                            .order_by('-data_solicitacao')[:10]  # Últimas 10
-                        )
-                        
-                        if novas_solicitacoes.exists():
-                            # Processar novas solicitações
-                            estados_afetados = set()
-                            municipios_afetados = []
-                            
-                            for sol in novas_solicitacoes:
-                                uf = sol['municipio__uf']
-                                municipio_nome = sol['municipio__nome']
-                                projeto_nome = sol['projeto__nome']
-                                
-                                estados_afetados.add(uf)
-                                municipios_afetados.append({
-                                    'uf': uf,
-                                    'municipio': municipio_nome,
-                                    'projeto': projeto_nome,
-                                    'data': sol['data_solicitacao'].isoformat()
-                                })
-                            
-                            # Enviar evento de atualização
-                            event_data = {
-                                'type': 'mapa_update',
-                                'timestamp': timezone.now().isoformat(),
-                                'estados_afetados': list(estados_afetados),
-                                'municipios_afetados': municipios_afetados,
-                                'message': f'Novos projetos adicionados em {len(estados_afetados)} estado(s)'
-                            }
-                            
-                            yield f"data: {json.dumps(event_data)}\n\n"
-                            
-                            # Atualizar timestamp
-                            last_update = current_update
-                    
-                    # Heartbeat a cada 30 segundos para manter conexão viva
-                    heartbeat_count += 1
-                    if heartbeat_count >= 6:  # 6 * 5s = 30s
-                        yield f"data: {json.dumps({'type': 'heartbeat', 'timestamp': timezone.now().isoformat()})}\n\n"
-                        heartbeat_count = 0
-                    
-                    # Aguardar 5 segundos
-                    time.sleep(5)
-                    
-                except Exception as e:
-                    # Enviar evento de erro
-                    error_data = {
-                        'type': 'error',
-                        'timestamp': timezone.now().isoformat(),
-                        'message': f'Erro no stream: {str(e)}'
-                    }
-                    yield f"data: {json.dumps(error_data)}\n\n"
-                    time.sleep(10)  # Aguardar mais tempo em caso de erro
-        
-        response = StreamingHttpResponse(
-            event_stream(),
-            content_type='text/event-stream'
-        )
+        if isinstance(request, ASGIRequest):
+            stream = self.event_stream_async()
+        else:
+            stream = self.event_stream()
+
+        response = StreamingHttpResponse(stream, content_type='text/event-stream')
         response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
         response['Access-Control-Allow-Origin'] = '*'
         response['Access-Control-Allow-Headers'] = 'Cache-Control'
-        
+
         return response
 
+    def event_stream(self):
+        yield _sse({'type': 'connected', 'timestamp': timezone.now().isoformat()})
+
+        with get_broker().subscribe_sync(MAPA_CHANNEL) as assinatura:
+            while True:
+                try:
+                    evento = assinatura.get(timeout=self.heartbeat_seconds)
+                except Exception as e:
+                    yield _erro(e)
+                    return
+                yield _sse(evento if evento is not None else _heartbeat())
+
+    async def event_stream_async(self):
+        yield _sse({'type': 'connected', 'timestamp': timezone.now().isoformat()})
+
+        async with get_broker().subscribe(MAPA_CHANNEL) as assinatura:
+            while True:
+                try:
+                    evento = await assinatura.get(timeout=self.heartbeat_seconds)
+                except Exception as e:
+                    yield _erro(e)
+                    return
+                yield _sse(evento if evento is not None else _heartbeat())
+
 
 class MapaStatusAPIView(View):
     """
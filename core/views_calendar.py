@@ -1,5 +1,4 @@
 # aprender_sistema/core/views_calendar.py
-from datetime import date, timedelta
 
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.http import Http404, JsonResponse
@@ -9,7 +8,8 @@ from django.views.generic import TemplateView
 # Import Group-based mixin for calendar access
 from core.mixins import CanViewCalendarMixin, SuperintendenciaSetorRequiredMixin
 from core.models import Formador
-from core.services.calendar_codes import gerar_mapa_mensal_otimizado, marcador_do_dia
+from core.services.calendar_codes import marcador_do_dia
+from core.services.mapa_materializado import dias_do_mes, ler_mapa
 
 
 class MapaMensalView(LoginRequiredMixin, SuperintendenciaSetorRequiredMixin, View):
@@ -20,13 +20,9 @@ class MapaMensalView(LoginRequiredMixin, SuperintendenciaSetorRequiredMixin, Vie
         except (TypeError, ValueError):
             raise Http404("Parâmetros ano/mes inválidos")
 
-        d0 = date(ano, mes, 1)
-        d1 = date(ano + (mes // 12), ((mes % 12) + 1), 1)
-        dias = []
-        d = d0
-        while d < d1:
-            dias.append(d)
-            d += timedelta(days=1)
+        if not 1 <= mes <= 12:
+            raise Http404("Parâmetros ano/mes inválidos")
+        dias = dias_do_mes(ano, mes)
 
         # Buscar formadores ativos filtrados por superintendência
         # Filtrar apenas formadores da superintendência (email @planilha.super)
@@ -36,8 +32,8 @@ class MapaMensalView(LoginRequiredMixin, SuperintendenciaSetorRequiredMixin, Vie
             email__endswith='@planilha.super'
         ).order_by("nome"))
 
-        # Usar função otimizada para gerar todo o mapa de uma vez
-        mapa_otimizado = gerar_mapa_mensal_otimizado(formadores, dias)
+        # Leitura da tabela materializada (mantida pelos signals)
+        mapa_otimizado = ler_mapa(formadores, dias)
 
         linhas = []
         for f in formadores: